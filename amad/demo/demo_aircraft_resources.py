@@ -2,6 +2,7 @@ from cosapp.base import System
 from amad.disciplines.mass.systems import AircraftMass
 from amad.disciplines.design.systems import GenerateAeroGeom
 from amad.disciplines.performance.systems import CruiseFuel
+from amad.disciplines.performance.systems.missionFuel import MissionFuel, PHASE_OUTPUTS
 from amad.tools.pullingFilter import pulling_filter
 
 
@@ -13,16 +14,20 @@ class CalculateAircraft(System):
     ----------
     airplane_geom : dict
         A dictionary representing the aircraft geometry.
+    fuel_surrogate : MissionFuelSurrogate, optional
+        Surrogate of the mission simulation, predicting the fuel instead of `CruiseFuel`.
+    geometry_features : dict, optional
+        Functions of the aircraft geometry, by surrogate feature name.
 
     Methods
     -------
-    setup(airplane_geom)
+    setup(airplane_geom, fuel_surrogate, geometry_features)
         Sets up the CalculateAircraft system with the given aircraft geometry.
 
     compute()
         Computes the mass of the aircraft during cruise.
     """
-    def setup(self, airplane_geom: dict):
+    def setup(self, airplane_geom: dict, fuel_surrogate=None, geometry_features=None):
         """
         Setup of CalculateAircraft
 
@@ -30,15 +35,35 @@ class CalculateAircraft(System):
         ----------
         airplane_geom : dict
             Aircraft geometry dictionary.
+        fuel_surrogate : MissionFuelSurrogate, optional
+            If given, the fuel is predicted by a `MissionFuel` system with this surrogate of the mission simulation,
+            whose climb and descent fuel are connected to the mass model, instead of a `CruiseFuel` system with
+            constant climb and descent fuel inwards. The surrogate is fitted and extended between runs: run the
+            system with `run_with_mission_fuel`. Defaults to None.
+        geometry_features : dict, optional
+            Functions of the aircraft geometry, by surrogate feature name (see `MissionFuel`). Defaults to None.
         """
-        model_list = [
-            GenerateAeroGeom("ac_geom"),
-            AircraftMass("mass"),
-            CruiseFuel("cruise_fuel", asb_aircraft_geometry=airplane_geom),
-        ]
-
         exceptions = ["m_fuel_cruise", "m_fuel_cruise_out", "x_fuse"]
 
+        if fuel_surrogate is None:
+            model_list = [
+                GenerateAeroGeom("ac_geom"),
+                AircraftMass("mass"),
+                CruiseFuel("cruise_fuel", asb_aircraft_geometry=airplane_geom),
+            ]
+        else:
+            # The mission fuel is computed before the mass model, which takes its climb and descent fuel
+            model_list = [
+                GenerateAeroGeom("ac_geom"),
+                MissionFuel(
+                    "cruise_fuel",
+                    surrogate=fuel_surrogate,
+                    geometry_features=geometry_features,
+                ),
+                AircraftMass("mass"),
+            ]
+            exceptions.extend(PHASE_OUTPUTS)
+
         for model in model_list:
             self.add_child(
                 model,
@@ -49,6 +74,8 @@ class CalculateAircraft(System):
 
         self.connect(self.ac_geom.geom_out, self.cruise_fuel.geom_in)
         self.connect(self.ac_geom, self.mass, {"x_fuse_out": "x_fuse"})
+        if fuel_surrogate is not None:
+            self.connect(self.cruise_fuel, self.mass, list(PHASE_OUTPUTS))
         # self.connect(self.cruise_fuel, self.mass, {'m_fuel_cruise.mass': 'm_fuel_cruise'})
 
         self.add_unknown("m_mto", lower_bound=10000.0)
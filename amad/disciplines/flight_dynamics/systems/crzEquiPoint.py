@@ -326,6 +326,61 @@ class CrzEquiPoint(System):
         """        
         return self._calc_t_h(alpha) - self._calc_t_v(alpha)
 
+    def _calc_alpha_equilib(self):
+        """
+        Calculate the equilibrium angle of attack for the current weight force.
+
+        Returns
+        -------
+        float
+            The equilibrium angle of attack in degrees, NaN if no root is found.
+
+        Notes
+        -----
+        Valid alpha ranges are searched by root of the thrust difference using Brent's method.
+        """
+        alpha_equilib = numpy.nan
+        minmax_alpha = [
+            [-self.range_alpha, -1e-10],
+            [1e-10, self.range_alpha],
+            [-1e-10, 1e-10],
+        ]
+        for minmax in minmax_alpha:
+            try:
+                alpha_equilib = scipy.optimize.brentq(
+                    self._calc_thrust, minmax[0], minmax[1]
+                )
+                break
+            except ValueError:
+                pass
+
+        return alpha_equilib
+
+    def required_thrust(self, weight_force):
+        """
+        Calculate the thrust required for the equilibrium at another weight force.
+
+        The lift and drag polars of the last `compute` call are used, so the
+        flight condition (Mach number and altitude) is unchanged.
+
+        Parameters
+        ----------
+        weight_force : float
+            The aircraft weight force in Newtons.
+
+        Returns
+        -------
+        float
+            The required thrust in Newtons.
+        """
+        ac_weight_force = self.ac_weight_force
+        self.ac_weight_force = weight_force
+        try:
+            alpha_equilib = self._calc_alpha_equilib()
+            return max(self._calc_t_h(alpha_equilib), self._calc_t_v(alpha_equilib))
+        finally:
+            self.ac_weight_force = ac_weight_force
+
     def compute(self):
         # send incoming geometry to aero calc
         """
@@ -401,21 +456,7 @@ class CrzEquiPoint(System):
             }
 
         # calculate equilibrium alpha
-        # find valid alpha ranges by root of a function calculation using Brent's method
-        alpha_equilib = numpy.nan
-        minmax_alpha = [
-            [-self.range_alpha, -1e-10],
-            [1e-10, self.range_alpha],
-            [-1e-10, 1e-10],
-        ]
-        for minmax in minmax_alpha:
-            try:
-                alpha_equilib = scipy.optimize.brentq(
-                    self._calc_thrust, minmax[0], minmax[1]
-                )
-                break
-            except ValueError:
-                pass
+        alpha_equilib = self._calc_alpha_equilib()
 
         v_tas = self.aero_calculator.v_tas
         self.v_tas = v_tas[0] if type(v_tas) is list else v_tas
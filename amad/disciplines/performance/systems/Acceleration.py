@@ -50,9 +50,15 @@ class Accelerate(System):
     None
     """
 
-    def setup(self):
+    def setup(self, engine_model=None):
         """
         Setup method defines system structure.
+
+        Parameters
+        ----------
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            used instead of the `enginePerfo` child system. Defaults to None.
         """
 
         # ------------------------------------------------------------------------------
@@ -128,11 +134,19 @@ class Accelerate(System):
         # ------------------------------------------------------------------------------
         ## Syub-systems definition (Diciplines' Modules and Bricks integration)
         # Here the only explicit sub-system comes from the propulsion module using the Mettingly method.
-        self.add_child(
-            eP.EnginePerfoMattingly(
-                name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+        # An engine performance backend, when given, replaces this sub-system; its delta ISA
+        # temperature is then the `temp_delta_ISA` inward of the segment.
+        if engine_model is None:
+            self.add_child(
+                eP.EnginePerfoMattingly(
+                    name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+                )
             )
-        )
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+        self.add_property("engine_model", engine_model)
 
         # ------------------------------------------------------------------------------
         #   Transient variables
@@ -228,15 +242,21 @@ class Accelerate(System):
         #         self.Drag=0.5*self.rho*self.S*self.TAS**2*self.CD
 
         """ Thrust computation  """
-        self.enginePerfo.z_altitude = self.in_p.position[
-            2
-        ]  # Input altitude for Mattingly Module
-        self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
-        self.enginePerfo.rating_eng = "MCT"  # Input rating for Mattingly Module
-        self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
-        self.THR = (
-            self.n_eng * self.enginePerfo.THR_Mattingly
-        )  # Output Thrust from Mattingly Module, input from geometry module.
+        if self.engine_model is None:
+            self.enginePerfo.z_altitude = self.in_p.position[
+                2
+            ]  # Input altitude for Mattingly Module
+            self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
+            self.enginePerfo.rating_eng = "MCT"  # Input rating for Mattingly Module
+            self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+            self.THR = (
+                self.n_eng * self.enginePerfo.THR_Mattingly
+            )  # Output Thrust from Mattingly Module, input from geometry module.
+        else:
+            THR_Mattingly, self.SFC = self.engine_model.evaluate(
+                self.in_p.position[2], self.Mach, "MCT", self.temp_delta_ISA
+            )
+            self.THR = self.n_eng * THR_Mattingly
 
         """Fuel consumption computation"""
         self.CS = np.array(
@@ -267,7 +287,9 @@ class Accelerate(System):
         self.RC = uc.ms2ftm(self.out_p.TAS_speed[2])
         self.CAS = uc.ms2kt(speedsclass.tas2cas(self.TAS, self.in_p.position[2]))
 
-        self.mission_callback.callback({"segment": "Acceleration", "data": self.out_p})
+        self.mission_callback.callback(
+            {"segment": "Acceleration", "time": self.time, "data": self.out_p}
+        )
 
 
 if __name__ == "__main__":
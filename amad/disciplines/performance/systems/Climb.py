@@ -27,6 +27,7 @@ import amad.tools.unit_conversion as uc
 import amad.tools.atmosBADA as atmos
 from amad.disciplines.performance.ports import SegmentPort
 from amad.disciplines.performance.tools import MissionCallback
+from amad.disciplines.performance.tools.speedSchedule import SegmentSpeedSchedule
 
 speedsclass = atmos.AtmosphereAMAD()  # Instantiate function to use in compute method.
 
@@ -55,9 +56,19 @@ class Climb_segment(System):
     2) SUAVE
     """
 
-    def setup(self):
+    def setup(self, engine_model=None, speed_schedule=False):
         """
         Setup method defines system structure.
+
+        Parameters
+        ----------
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            used instead of the `enginePerfo` child system. Defaults to None.
+        speed_schedule : bool, optional
+            If True, the TAS, Mach and CAS are read from a precomputed CAS/Mach schedule
+            (see `amad.disciplines.performance.tools.speedSchedule`), switching law at the
+            exact crossover altitude instead of the IsoMach mode. Defaults to False.
         """
 
         # ------------------------------------------------------------------------------
@@ -141,11 +152,19 @@ class Climb_segment(System):
         # ------------------------------------------------------------------------------
         # Syub-systems definition (Diciplines' Modules and Bricks integration)
         # Here the only explicit sub-system comes from the propulsion module using the Mettingly method.
-        self.add_child(
-            eP.EnginePerfoMattingly(
-                name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+        # An engine performance backend, when given, replaces this sub-system; its delta ISA
+        # temperature is then the `temp_delta_ISA` inward of the segment.
+        if engine_model is None:
+            self.add_child(
+                eP.EnginePerfoMattingly(
+                    name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+                )
             )
-        )
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+        self.add_property("engine_model", engine_model)
 
         # ------------------------------------------------------------------------------
         #   Transient variables
@@ -207,6 +226,18 @@ class Climb_segment(System):
         mc = MissionCallback()
         self.add_property("mission_callback", mc)
 
+        #   Speed schedule, selected at the first evaluation of each run
+        self.add_property(
+            "speed_schedule", SegmentSpeedSchedule() if speed_schedule else None
+        )
+
+    def setup_run(self):
+        """
+        Release the speed schedule of the previous run, if any.
+        """
+        if self.speed_schedule is not None:
+            self.speed_schedule.reset()
+
     def compute(self):
         """
         Compute method defines what the system does.
@@ -222,7 +253,12 @@ class Climb_segment(System):
 
         """ IsoMach guard verification  """
 
-        if self.IsoMach is False:
+        if self.speed_schedule is not None:
+            # Speed law indexed by altitude, the CAS being updated above the crossover altitude.
+            self.TAS, self.Mach, self.CAS = self.speed_schedule(
+                self.CAS, self.Iso_Mach, self.in_p.position[2]
+            )
+        elif self.IsoMach is False:
             self.TAS = speedsclass.cas2tas(
                 uc.kt2ms(self.CAS), self.in_p.position[2]
             )  # convertion from CAS to TAS.
@@ -239,17 +275,23 @@ class Climb_segment(System):
             )  # convertion from Mach to TAS
 
         """ Thrust computation  """
-        self.enginePerfo.z_altitude = self.in_p.position[
-            2
-        ]  # Input altitude for Mattingly Module
-        self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
-        self.enginePerfo.rating_eng = (
-            "MCLB"  # Input rating for Mattingly Module (It can be either MCT or MCLB)
-        )
-        self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
-        self.THR = (
-            self.n_eng * self.enginePerfo.THR_Mattingly
-        )  # Output Thrust from Mattingly Module, input from geometry module.
+        if self.engine_model is None:
+            self.enginePerfo.z_altitude = self.in_p.position[
+                2
+            ]  # Input altitude for Mattingly Module
+            self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
+            self.enginePerfo.rating_eng = (
+                "MCLB"  # Input rating for Mattingly Module (It can be either MCT or MCLB)
+            )
+            self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+            self.THR = (
+                self.n_eng * self.enginePerfo.THR_Mattingly
+            )  # Output Thrust from Mattingly Module, input from geometry module.
+        else:
+            THR_Mattingly, self.SFC = self.engine_model.evaluate(
+                self.in_p.position[2], self.Mach, "MCLB", self.temp_delta_ISA
+            )
+            self.THR = self.n_eng * THR_Mattingly
 
         """ Fuel consumption computation """
         self.CS = np.array(
@@ -299,7 +341,9 @@ class Climb_segment(System):
         self.Altitude = uc.m2ft(self.out_p.position[2])
         self.RC = uc.ms2ftm(Vz)
 
-        self.mission_callback.callback({"segment": "Climb", "data": self.out_p})
+        self.mission_callback.callback(
+            {"segment": "Climb", "time": self.time, "data": self.out_p}
+        )
 
     def transition(self):
         """
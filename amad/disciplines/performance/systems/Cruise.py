@@ -43,9 +43,15 @@ class Cruise_segment(System):
     Source: Airbus Getting to grips and SUAVE.
     """
 
-    def setup(self):
+    def setup(self, engine_model=None):
         """
         `setup` method defines system structure.
+
+        Parameters
+        ----------
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            used instead of the `enginePerfo` child system. Defaults to None.
         """
 
         # ------------------------------------------------------------------------------
@@ -141,11 +147,19 @@ class Cruise_segment(System):
         # ------------------------------------------------------------------------------
         # Syub-systems definition (Diciplines' Modules and Bricks integration)
         # Here the only explicit sub-system comes from the propulsion module using the Mettingly method.
-        self.add_child(
-            eP.EnginePerfoMattingly(
-                name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+        # An engine performance backend, when given, replaces this sub-system; its delta ISA
+        # temperature is then the `temp_delta_ISA` inward of the segment.
+        if engine_model is None:
+            self.add_child(
+                eP.EnginePerfoMattingly(
+                    name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+                )
             )
-        )
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+        self.add_property("engine_model", engine_model)
 
         # ------------------------------------------------------------------------------
         #   Transient variables
@@ -241,11 +255,16 @@ class Cruise_segment(System):
         self.theta = self.alpha
 
         """Fuel consumption computation"""
-        self.enginePerfo.z_altitude = self.in_p.position[
-            2
-        ]  # Input altitude for Mattingly Module
-        self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
-        self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+        if self.engine_model is None:
+            self.enginePerfo.z_altitude = self.in_p.position[
+                2
+            ]  # Input altitude for Mattingly Module
+            self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
+            self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+        else:
+            _, self.SFC = self.engine_model.evaluate(
+                self.in_p.position[2], self.Mach, "MCRZ", self.temp_delta_ISA
+            )
         self.CS = (
             self.SFC * self.THR
         )  # Output Thrust from Mattingly Module, taking into consideration 2 engines producing the required thrust.
@@ -270,7 +289,9 @@ class Cruise_segment(System):
         )  # Obtaining the norm from speed vector
         self.CAS = uc.ms2kt(speedsclass.tas2cas(self.TAS, self.out_p.position[2]))
 
-        self.mission_callback.callback({"segment": "Cruise", "data": self.out_p})
+        self.mission_callback.callback(
+            {"segment": "Cruise", "time": self.time, "data": self.out_p}
+        )
 
 
 if __name__ == "__main__":
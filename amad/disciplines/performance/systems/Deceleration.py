@@ -51,9 +51,15 @@ class Decelerate(System):
     None
     """
 
-    def setup(self):
+    def setup(self, engine_model=None):
         """
         `setup` method defines system structure.
+
+        Parameters
+        ----------
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            used instead of the `enginePerfo` child system. Defaults to None.
         """
 
         # ------------------------------------------------------------------------------
@@ -122,11 +128,19 @@ class Decelerate(System):
         # ------------------------------------------------------------------------------
         # Syub-systems definition (Diciplines' Modules and Bricks integration)
         # Here the only explicit sub-system comes from the propulsion module using the Mettingly method.
-        self.add_child(
-            eP.EnginePerfoMattingly(
-                name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+        # An engine performance backend, when given, replaces this sub-system; its delta ISA
+        # temperature is then the `temp_delta_ISA` inward of the segment.
+        if engine_model is None:
+            self.add_child(
+                eP.EnginePerfoMattingly(
+                    name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+                )
             )
-        )
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+        self.add_property("engine_model", engine_model)
 
         # ------------------------------------------------------------------------------
         #   Transient variables
@@ -228,15 +242,21 @@ class Decelerate(System):
         self.Drag = 0.5 * self.rho * self.S * self.TAS**2 * self.CD
 
         """ Thrust computation  """
-        self.enginePerfo.z_altitude = self.in_p.position[
-            2
-        ]  # Input altitude for Mattingly Module
-        self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
-        self.enginePerfo.rating_eng = "IDLE"  # Input rating for Mattingly Module
-        self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
-        self.THR = (
-            self.n_eng * self.enginePerfo.THR_Mattingly
-        )  # Output Thrust from Mattingly Module, taking into consideration 2 engines.
+        if self.engine_model is None:
+            self.enginePerfo.z_altitude = self.in_p.position[
+                2
+            ]  # Input altitude for Mattingly Module
+            self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
+            self.enginePerfo.rating_eng = "IDLE"  # Input rating for Mattingly Module
+            self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+            self.THR = (
+                self.n_eng * self.enginePerfo.THR_Mattingly
+            )  # Output Thrust from Mattingly Module, taking into consideration 2 engines.
+        else:
+            THR_Mattingly, self.SFC = self.engine_model.evaluate(
+                self.in_p.position[2], self.Mach, "IDLE", self.temp_delta_ISA
+            )
+            self.THR = self.n_eng * THR_Mattingly
 
         """Fuel consumption computation"""
         self.CS = np.array(
@@ -263,7 +283,9 @@ class Decelerate(System):
         self.RC = uc.ms2ftm(self.out_p.TAS_speed[2])
         self.CAS = uc.ms2kt(speedsclass.tas2cas(self.TAS, self.in_p.position[2]))
 
-        self.mission_callback.callback({"segment": "Deceleration", "data": self.out_p})
+        self.mission_callback.callback(
+            {"segment": "Deceleration", "time": self.time, "data": self.out_p}
+        )
 
 
 if __name__ == "__main__":
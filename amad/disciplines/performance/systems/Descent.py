@@ -15,7 +15,6 @@ ________________________________________________________________________________
 # Generic
 import numpy as np
 import math
-from ambiance import Atmosphere
 
 # CosApp
 from cosapp.base import System
@@ -25,12 +24,12 @@ from cosapp.base import System
 # Modules and tools
 import amad.disciplines.powerplant.systems.enginePerfoMattingly as eP
 import amad.tools.unit_conversion as uc
-import amad.tools.atmosBADA
+import amad.tools.atmosBADA as atmos
 from amad.disciplines.performance.ports import SegmentPort
 from amad.disciplines.performance.tools import MissionCallback
-speedsclass = (
-    amad.tools.atmosBADA.AtmosphereAMAD()
-)  # Instantiate function to use in compute method.
+from amad.disciplines.performance.tools.speedSchedule import SegmentSpeedSchedule
+
+speedsclass = atmos.AtmosphereAMAD()  # Instantiate function to use in compute method.
 
 
 class Descent_segment(System):
@@ -50,9 +49,19 @@ class Descent_segment(System):
     Source: Airbus Getting to grips and SUAVE.
     """
 
-    def setup(self):
+    def setup(self, engine_model=None, speed_schedule=False):
         """
         `setup` method defines system structure
+
+        Parameters
+        ----------
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            used instead of the `enginePerfo` child system. Defaults to None.
+        speed_schedule : bool, optional
+            If True, the TAS, Mach and CAS are read from a precomputed CAS/Mach schedule
+            (see `amad.disciplines.performance.tools.speedSchedule`), switching law at the
+            exact crossover altitude instead of the IsoMach mode. Defaults to False.
         """
 
         # ------------------------------------------------------------------------------
@@ -137,11 +146,19 @@ class Descent_segment(System):
         # ------------------------------------------------------------------------------
         # Syub-systems definition (Diciplines' Modules and Bricks integration)
         # Here the only explicit sub-system comes from the propulsion module using the Mettingly method.
-        self.add_child(
-            eP.EnginePerfoMattingly(
-                name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+        # An engine performance backend, when given, replaces this sub-system; its delta ISA
+        # temperature is then the `temp_delta_ISA` inward of the segment.
+        if engine_model is None:
+            self.add_child(
+                eP.EnginePerfoMattingly(
+                    name="enginePerfo", altitude=self.in_p.position[2], dISA=0
+                )
             )
-        )
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+        self.add_property("engine_model", engine_model)
         # self.enginePerfo.rating_eng = 'MCRZ' # Input rating for Mattingly Module
 
         # ------------------------------------------------------------------------------
@@ -201,18 +218,37 @@ class Descent_segment(System):
         mc = MissionCallback()
         self.add_property("mission_callback", mc)
 
+        #   Speed schedule, selected at the first evaluation of each run
+        self.add_property(
+            "speed_schedule", SegmentSpeedSchedule() if speed_schedule else None
+        )
+
+    def setup_run(self):
+        """
+        Release the speed schedule of the previous run, if any.
+        """
+        if self.speed_schedule is not None:
+            self.speed_schedule.reset()
+
     def compute(self):
         """
         `compute` method defines what the system does
         """
-        atm = Atmosphere(
+        # Same ISA model as the speed conversions below, so that the descent
+        # starts from the exact state handed over by the previous segment.
+        self.rho = speedsclass.airdens_kgpm3(
             self.in_p.position[2]
-        )  # Input of Aircraft z-position (altitude) for  Atmosphere tool.
-        self.rho = atm.density  # Air density at Aircraft position [kg/m^3].
+        )  # Air density at Aircraft position [kg/m^3].
 
         """ IsoMach guard verification  """
 
-        if self.IsoMach is True:
+        if self.speed_schedule is not None:
+            # Speed law indexed by altitude, the CAS being updated above the crossover altitude.
+            self.TAS, self.Mach, self.CAS = self.speed_schedule(
+                self.CAS, self.Iso_Mach, self.in_p.position[2]
+            )
+            self.CAS_CrossOver = uc.kt2ms(self.CAS)
+        elif self.IsoMach is True:
             self.Mach = self.Iso_Mach
             self.TAS = speedsclass.mach2tas(
                 self.Mach, self.in_p.position[2]
@@ -232,15 +268,27 @@ class Descent_segment(System):
             # self.enginePerfo.rating_eng = 'IDLE' # Input rating for Mattingly Module
 
         """ Thrust computation  """
-        self.enginePerfo.z_altitude = self.in_p.position[
-            2
-        ]  # Input altitude for Mattingly Module
-        self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
-        self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
-        # self.THR = self.n_eng*self.enginePerfo.THR_Mattingly # Output Thrust from Mattingly Module, input from geometry module.
-        self.THR = (
-            self.n_eng * self.enginePerfo.THR_Mattingly_max * self.Throttle
-        )  # Output Thrust from Mattingly Module, input from geometry module.
+        if self.engine_model is None:
+            self.enginePerfo.z_altitude = self.in_p.position[
+                2
+            ]  # Input altitude for Mattingly Module
+            self.enginePerfo.mach_current = self.Mach  # Input Mach for Mattingly Module
+            self.SFC = self.enginePerfo.SFC  # Output SFC from Mattingly Module.
+            # self.THR = self.n_eng*self.enginePerfo.THR_Mattingly # Output Thrust from Mattingly Module, input from geometry module.
+            self.THR = (
+                self.n_eng * self.enginePerfo.THR_Mattingly_max * self.Throttle
+            )  # Output Thrust from Mattingly Module, input from geometry module.
+        else:
+            _, self.SFC = self.engine_model.evaluate(
+                self.in_p.position[2], self.Mach, "IDLE", self.temp_delta_ISA
+            )
+            self.THR = (
+                self.n_eng
+                * self.engine_model.max_thrust(
+                    self.in_p.position[2], self.Mach, self.temp_delta_ISA
+                )
+                * self.Throttle
+            )
 
         """Fuel consumption computation"""
         self.CS = np.array([self.SFC * self.THR])  # Consumtion in [kg/s]
@@ -292,7 +340,9 @@ class Descent_segment(System):
         self.Altitude = uc.m2ft(self.out_p.position[2])
         self.RC = uc.ms2ftm(float(Vz))
 
-        self.mission_callback.callback({"segment": "Descent", "data": self.out_p})
+        self.mission_callback.callback(
+            {"segment": "Descent", "time": self.time, "data": self.out_p}
+        )
 
     def transition(self):
         """
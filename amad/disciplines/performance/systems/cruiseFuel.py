@@ -1,7 +1,13 @@
+import numpy as np
+import scipy.constants
 from cosapp.base import System
 from amad.disciplines.mass.ports import MassPort
 from amad.disciplines.powerplant.systems import EnginePerfoMattingly
 from amad.disciplines.flight_dynamics.systems import CrzEquiPoint
+from amad.disciplines.performance.tools.breguetCruise import (
+    breguet_cruise,
+    check_cruise_mode,
+)
 
 
 class CruiseFuel(System):
@@ -16,6 +22,10 @@ class CruiseFuel(System):
         The function used to calculate the equilibrium point. Default is CrzEquiPoint.
     ff_calculator : Callable, optional
         The function used to calculate the fuel flow. Default is EnginePerfoMattingly.
+    engine_model : EngineBackend, optional
+        Engine performance backend used instead of the ff_calculator child. Default is None.
+    cruise_mode : str, optional
+        Cruise fuel model, 'reference' or 'breguet' (see `CRUISE_MODES`). Default is 'reference'.
     **kwargs : dict, optional
         Additional keyword arguments to pass to the ff_calculator.
 
@@ -26,13 +36,17 @@ class CruiseFuel(System):
     equi : EquiPoint
         The equilibrium point calculator.
     ff : EnginePerfoMattingly
-        The fuel flow calculator.
+        The fuel flow calculator (absent when an engine backend is used).
     x_range : float
         The design range in meters.
+    rtol : float
+        The relative tolerance on the cruise fuel (Breguet mode only).
+    fuel_error : float
+        The estimated error on the cruise fuel in kg (Breguet mode only).
 
     Methods
     -------
-    setup(asb_aircraft_geometry, equi_calculator, ff_calculator, **kwargs)
+    setup(asb_aircraft_geometry, equi_calculator, ff_calculator, engine_model, cruise_mode, **kwargs)
         Sets up the cruise fuel system.
     compute()
         Computes the fuel consumption during cruise.
@@ -42,6 +56,8 @@ class CruiseFuel(System):
         asb_aircraft_geometry,
         equi_calculator=CrzEquiPoint,
         ff_calculator=EnginePerfoMattingly,
+        engine_model=None,
+        cruise_mode="reference",
         **kwargs,
     ):
         # self.add_outward('m_fuel_cruise_out', unit='kg')
@@ -56,6 +72,15 @@ class CruiseFuel(System):
             An object representing the equipment calculator. Default is CrzEquiPoint.
         ff_calculator : object, optional
             An object representing the fuel flow calculator. Default is EnginePerfoMattingly.
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `amad.disciplines.powerplant.tools.engineBackend`)
+            replacing the fuel flow calculator. Default is None.
+        cruise_mode : str, optional
+            The cruise fuel model. With 'reference', the fuel is the product of the fuel flow
+            at the equilibrium point and the cruise time. With 'breguet', the cruise is integrated
+            from the 'm_mto' mass with analytic Breguet sub-steps (see `breguet_cruise`), the
+            equilibrium thrust being re-evaluated on the polars of the equilibrium calculator at
+            each sub-step. Default is 'reference'.
         **kwargs : dict
             Additional keyword arguments for the ff_calculator.
 
@@ -69,18 +94,28 @@ class CruiseFuel(System):
 
         The following children are added:
         - An instance of the equi_calculator class, named 'equi', with the specified parameters.
-        - An instance of the ff_calculator class, named 'ff', with the specified parameters.
+        - An instance of the ff_calculator class, named 'ff', with the specified parameters,
+          unless an engine backend is given. The SFC is then evaluated by the backend
+          from the 'temp_delta_ISA' and 'rating_eng' inwards.
 
         The following outputs are added:
         - An instance of the MassPort class, named 'm_fuel_cruise'.
 
         The following inwards are added:
         - An inward named 'x_range', with a default value of 0.0 meters and a unit of 'm'. This represents the design range.
+        - In Breguet mode, an inward named 'rtol', the relative tolerance on the cruise fuel, and
+          an outward named 'fuel_error', the estimated error on the cruise fuel.
+
+        Raises
+        ------
+        ValueError
+            If the cruise mode is unknown.
 
         Examples
         --------
         >>> obj = setup(asb_aircraft_geometry, equi_calculator=CrzEquiPoint, ff_calculator=EnginePerfoMattingly)
         """
+        check_cruise_mode(cruise_mode)
         self.add_output(MassPort, "m_fuel_cruise")
 
         pulling_equi = [
@@ -103,8 +138,22 @@ class CruiseFuel(System):
             pulling=pulling_equi,
         )
 
-        self.add_child(ff_calculator("ff", **kwargs), pulling=["SFC", "inwards"])
+        if engine_model is None:
+            self.add_child(ff_calculator("ff", **kwargs), pulling=["SFC", "inwards"])
+        else:
+            self.add_inward(
+                "temp_delta_ISA", 0.0, unit="K", desc="delta ISA temperature"
+            )
+            self.add_inward("rating_eng", "MCT", desc="Current Engine Rating")
+            self.add_outward("SFC", unit="kg/(s*N)", desc="Specific Fuel Consumption")
+        self.add_property("engine_model", engine_model)
         self.add_inward("x_range", 0.0, unit="m", desc="Design range")
+        self.add_property("cruise_mode", cruise_mode)
+        if cruise_mode == "breguet":
+            self.add_inward("rtol", 1e-4, desc="Relative tolerance on the cruise fuel")
+            self.add_outward(
+                "fuel_error", 0.0, unit="kg", desc="Estimated error on the cruise fuel"
+            )
 
     def compute(self):
         # time taken to complete cruise segment (assumes zero wind speed)
@@ -121,10 +170,41 @@ class CruiseFuel(System):
         """
         time_crz = self.x_range / self.equi.v_tas
 
+        if self.engine_model is not None:
+            _, self.SFC = self.engine_model.evaluate(
+                self.z_altitude, self.mach_current, self.rating_eng, self.temp_delta_ISA
+            )
+
         # fuel for cruise segment
-        self.m_fuel_cruise.mass = max(
-            1, self.ff.SFC * self.equi.thrust_required * time_crz
-        )
+        if self.cruise_mode == "breguet":
+            trajectory = breguet_cruise(
+                self._fuel_flow, self.m_mto, time_crz, rtol=self.rtol
+            )
+            self.fuel_error = trajectory["error"].iloc[-1]
+            self.m_fuel_cruise.mass = max(1, self.m_mto - trajectory["mass"].iloc[-1])
+        else:
+            self.m_fuel_cruise.mass = max(
+                1, self.SFC * self.equi.thrust_required * time_crz
+            )
+
+    def _fuel_flow(self, t, mass):
+        """
+        Compute the fuel flow at the equilibrium for a given aircraft mass.
+
+        Parameters
+        ----------
+        t : float
+            Time since the start of the cruise in seconds (unused, the flight condition is constant).
+        mass : float
+            The aircraft mass in kg.
+
+        Returns
+        -------
+        float
+            The fuel flow in kg/s.
+        """
+        thrust = self.equi.required_thrust(mass * scipy.constants.g)
+        return float(np.ravel(self.SFC)[0]) * thrust
 
 
 if __name__ == "__main__":
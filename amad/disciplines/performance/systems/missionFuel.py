@@ -0,0 +1,226 @@
+import logging
+import numpy as np
+from cosapp.base import System
+from amad.disciplines.mass.ports import MassPort
+from amad.disciplines.design.ports import AsbGeomPort
+
+logger = logging.getLogger(__name__)
+
+# Inwards shared with `CruiseFuel`, and their units
+FLIGHT_CONDITIONS = {
+    "m_mto": "kg",
+    "x_range": "m",
+    "z_altitude": "m",
+    "mach_current": "",
+}
+
+# Outputs of the surrogate other than the cruise fuel, set on outwards
+PHASE_OUTPUTS = ("m_fuel_climb", "m_fuel_descent")
+
+
+class MissionFuel(System):
+    """
+    A class representing the mission fuel, predicted by a surrogate of the mission simulation.
+
+    The system has the interface of `CruiseFuel` (`m_mto`, `x_range`, `z_altitude` and
+    `mach_current` inwards, `geom_in` geometry port and `m_fuel_cruise` mass port), so that
+    it may replace it in the mass loops, and also gives the climb and descent fuel of the
+    mission instead of constant estimates.
+
+    The computation only predicts: the surrogate is fitted, and extended to the points
+    outside its domain, between the runs of the sizing loops (see `update_surrogate` and
+    `run_with_mission_fuel`), so that the fuel is the same function of the inputs for
+    all the evaluations of a run. Points outside the domain are extrapolated, with a
+    warning, and flagged by the `extrapolated` outward.
+
+    Parameters
+    ----------
+    surrogate : MissionFuelSurrogate
+        Mission fuel surrogate, fitted by `update_surrogate` if not already fitted.
+    geometry_features : dict, optional
+        Functions of the geometry definition of `geom_in`, by surrogate feature name.
+        Default is None.
+
+    Attributes
+    ----------
+    m_fuel_cruise : MassPort
+        The mass port representing the cruise fuel mass.
+    m_fuel_climb : float
+        The fuel mass from take-off to the cruise in kg.
+    m_fuel_descent : float
+        The fuel mass from the end of the cruise to the landing in kg.
+    fuel_error : float
+        The estimated error on the mission fuel in kg.
+    extrapolated : bool
+        Whether the last prediction was outside the domain of the surrogate.
+    x_range : float
+        The cruise distance in meters.
+
+    Methods
+    -------
+    setup(surrogate, geometry_features)
+        Sets up the mission fuel system.
+    compute()
+        Predicts the fuel consumption of the mission.
+    update_surrogate()
+        Fits the surrogate, or extends it to the current point, between runs.
+    """
+
+    def setup(self, surrogate, geometry_features=None):
+        """
+        Set up the mission fuel system.
+
+        Parameters
+        ----------
+        surrogate : MissionFuelSurrogate
+            Mission fuel surrogate, fitted by `update_surrogate` if not already fitted.
+        geometry_features : dict, optional
+            Functions of the geometry definition of `geom_in`, by surrogate feature name.
+            Default is None.
+
+        Returns
+        -------
+        None
+
+        Notes
+        -----
+        The following inwards are added:
+        - 'm_mto', 'x_range', 'z_altitude' and 'mach_current', as in `CruiseFuel`.
+        - An inward for each other surrogate feature which is not a geometry feature,
+          initialised at the middle of the surrogate domain.
+
+        The following outputs are added:
+        - An instance of the MassPort class, named 'm_fuel_cruise'.
+        - Outwards named 'm_fuel_climb', 'm_fuel_descent' and 'fuel_error', the standard
+          error of the mission fuel, from the errors of the fuel outputs.
+        - An outward named 'extrapolated', True if the last prediction was outside the
+          domain of the surrogate.
+        """
+        self.add_input(AsbGeomPort, "geom_in")
+        self.add_output(MassPort, "m_fuel_cruise")
+
+        self.add_property("surrogate", surrogate)
+        self.add_property("geometry_features", dict(geometry_features or {}))
+
+        for name, unit in FLIGHT_CONDITIONS.items():
+            self.add_inward(name, 0.0, unit=unit)
+        for name, (low, high) in surrogate.bounds.items():
+            if name not in FLIGHT_CONDITIONS and name not in self.geometry_features:
+                self.add_inward(
+                    name, 0.5 * (low + high), desc="Mission fuel surrogate feature"
+                )
+
+        self.add_outward("m_fuel_climb", 0.0, unit="kg", desc="Climb fuel mass")
+        self.add_outward("m_fuel_descent", 0.0, unit="kg", desc="Descent fuel mass")
+        self.add_outward(
+            "fuel_error", 0.0, unit="kg", desc="Estimated error on the mission fuel"
+        )
+        self.add_outward(
+            "extrapolated", False, desc="Prediction outside the surrogate domain"
+        )
+
+    def feature_point(self):
+        """
+        Return the surrogate features of the current inputs.
+
+        Returns
+        -------
+        dict
+            Feature values by name.
+        """
+        geometry = self.geom_in.asb_aircraft_geometry
+        point = {}
+        for name in self.surrogate.features:
+            if name in self.geometry_features:
+                point[name] = float(self.geometry_features[name](geometry))
+            else:
+                point[name] = float(np.ravel(self[name])[0])
+        return point
+
+    def update_surrogate(self):
+        """
+        Fit the surrogate if needed, or extend it to the current point if outside its domain.
+
+        The surrogate samples missions: this is to be called between the runs of the
+        sizing loops, e.g. before the first run or between optimizer iterations, not
+        within them.
+
+        Returns
+        -------
+        bool
+            True if the surrogate was fitted or refitted.
+        """
+        surrogate = self.surrogate
+        if surrogate.samples is None:
+            surrogate.fit()
+            return True
+        point = self.feature_point()
+        if surrogate.contains(point):
+            return False
+        surrogate.extend(point)
+        return True
+
+    def compute(self):
+        """
+        Predict the fuel consumption of the mission.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            If the surrogate is not fitted.
+        """
+        surrogate = self.surrogate
+        point = self.feature_point()
+        self.extrapolated = not surrogate.contains(point)
+        if self.extrapolated:
+            logger.warning(
+                f"{self.full_name()}: mission fuel surrogate extrapolated at {point}"
+            )
+
+        prediction = surrogate.predict(point).iloc[0]
+        self.m_fuel_cruise.mass = max(1, prediction["m_fuel_cruise"])
+        for name in PHASE_OUTPUTS:
+            if name in surrogate.outputs:
+                self[name] = prediction[name]
+        self.fuel_error = float(
+            np.sqrt(sum(prediction[f"{name}_error"] ** 2 for name in surrogate.outputs))
+        )
+
+
+def run_with_mission_fuel(system, fuel, max_refits=5):
+    """
+    Run the drivers of a system until its mission fuel is predicted within the surrogate domain.
+
+    The surrogate is fitted before the first run if needed. After each run, if the
+    converged point is outside the domain, the surrogate is extended to it and the
+    system run again, from the converged state.
+
+    Parameters
+    ----------
+    system : cosapp.base.System
+        System with drivers, e.g. an `OptimizeAircraftMass` with a fuel surrogate.
+    fuel : MissionFuel
+        Mission fuel system of the system.
+    max_refits : int, optional
+        Maximum number of extensions of the surrogate. Default is 5.
+
+    Returns
+    -------
+    int
+        Number of runs.
+    """
+    if fuel.surrogate.samples is None:
+        fuel.surrogate.fit()
+    for run in range(1, max_refits + 2):
+        system.run_drivers()
+        if run > max_refits or not fuel.update_surrogate():
+            break
+    if fuel.extrapolated:
+        logger.warning(
+            f"{fuel.full_name()}: mission fuel still extrapolated after {max_refits} refits"
+        )
+    return run
@@ -2,6 +2,7 @@
 
                                    MISSION PROFILE MODULE
 ___________________________________________________________________________________"""
+
 # This module takes in charge of the system architecture definition, in this case it is
 #  the mission to follow.
 #  The climb and descent profiles exposed at the book "Airbus: Getting to grips into
@@ -17,6 +18,7 @@ ________________________________________________________________________________
 
 # Generic
 import numpy as np
+import pandas as pd
 
 # from operator import attrgetter
 # from ambiance import Atmosphere
@@ -24,7 +26,6 @@ import numpy as np
 # CosApp
 from cosapp.base import System
 from cosapp.drivers import RungeKutta
-from cosapp.recorders import DataFrameRecorder
 
 # Important to define a path directory for other modules either in the enviroment or with 'sys' method.
 
@@ -34,8 +35,6 @@ import amad.tools.unit_conversion as uc
 
 # import amad.disciplines.aerodynamics.tools.createAeroInterpolationCSV as aeroInterp
 # from amad.disciplines.powerplant.systems import enginePerfoMattingly as eP
-from amad.disciplines.aerodynamics.tools.createFlightVehicle import CreateAirplane
-from amad.disciplines.systems.fuel.systems.fuelVolume import FuelVolume_Weight
 from amad.disciplines.performance.systems import (
     Acceleration as Acc,
     Climb as Clb,
@@ -46,6 +45,22 @@ from amad.disciplines.performance.systems import (
 
 # Import Ports from AMAD.
 from amad.disciplines.performance.tools.missionCallback import empty_callback
+from amad.disciplines.performance.tools.adaptiveRungeKutta import AdaptiveRungeKutta
+from amad.disciplines.performance.tools.breguetCruise import (
+    BreguetCruise,
+    check_cruise_mode,
+)
+from amad.disciplines.performance.tools.equilibriumPredictor import (
+    PredictorAdaptiveRungeKutta,
+    PredictorRungeKutta,
+)
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+from amad.disciplines.performance.tools.denseTrajectory import (
+    RATE_VARIABLES,
+    DenseTrajectory,
+)
+from amad.disciplines.performance.tools.streamingRecorder import StreamingRecorder
+from amad.disciplines.performance.tools.vehicleSummary import VehicleSummary
 
 speedsclass = atmos.AtmosphereAMAD()
 
@@ -126,7 +141,19 @@ class mission_profile(System):
             *args, **kwargs
         )  # Calls all arguments in init from the superior class 'system'.
 
-    def setup(self, asb_aircraft_geometry: dict, mission_callback=empty_callback):
+    def setup(
+        self,
+        asb_aircraft_geometry: dict = None,
+        mission_callback=empty_callback,
+        engine_model=None,
+        adaptive_step=False,
+        telemetry=None,
+        warm_start=False,
+        cruise_mode="reference",
+        speed_schedule=False,
+        dense_output=False,
+        geometry_summary=None,
+    ):
         # ----------------------------------------------------------------------
         # Flight_vehicle generation
         # ----------------------------------------------------------------------
@@ -137,10 +164,38 @@ class mission_profile(System):
 
         Parameters
         ----------
-        asb_aircraft_geometry : dict
-            A dictionary containing the geometrical properties of the aircraft.
+        asb_aircraft_geometry : dict, optional
+            A dictionary containing the geometrical properties of the aircraft. Its flight vehicle
+            and fuel capacity are generated once per geometry and shared by the missions (see `VehicleSummary`).
         mission_callback : function, optional
-            A callback function to be executed during the mission.
+            A callback function to be executed during the mission, at each segment `compute`.
+            A `CallbackDispatcher` may be given to throttle, batch or run it in a background thread.
+        engine_model : EngineBackend, optional
+            Engine performance backend (e.g. a tabulated `EngineDeck`) shared by all segments instead of their `enginePerfo` child systems.
+        adaptive_step : bool, optional
+            If True, segments are integrated with error-controlled adaptive steps (`AdaptiveRungeKutta`)
+            and every accepted step is recorded; otherwise with fixed 1 s steps recorded every 10 s. Defaults to False.
+        telemetry : TelemetryWriter, optional
+            If given, segment records are streamed in chunks to this telemetry file, in groups named
+            '<mission name>/<segment name>', instead of being kept in memory. Defaults to None.
+        warm_start : bool, optional
+            If True, segment drivers extrapolate the equilibrium unknowns (alpha, Throttle) of their solvers
+            from the last two accepted steps before each resolution, and count the solver evaluations of each
+            step (see `EquilibriumPredictor`). Defaults to False.
+        cruise_mode : str, optional
+            'reference' to integrate the cruise segment with the time driver of the other segments, or 'breguet'
+            to fly it with analytic Breguet sub-steps (`BreguetCruise`), recorded at each sub-step
+            (see `CRUISE_MODES`). Defaults to 'reference'.
+        speed_schedule : bool, optional
+            If True, climb and descent segments read their speeds from precomputed CAS/Mach schedules
+            and switch law at the exact crossover altitude (see `SpeedSchedule`). Defaults to False.
+        dense_output : bool, optional
+            If True, segment drivers also record the positions, speeds and their derivatives, so that
+            the trajectories are interpolated by cubic Hermite polynomials between the recorded steps
+            (see `dense_trajectory`). Defaults to False.
+        geometry_summary : VehicleSummary or dict, optional
+            Precomputed flight vehicle quantities (or the keyword arguments of a `VehicleSummary`), used
+            instead of the aircraft geometry, which is then not needed. Defaults to None.
 
         Returns
         -------
@@ -148,7 +203,8 @@ class mission_profile(System):
 
         Raises
         ------
-        None
+        ValueError
+            If the cruise mode is unknown, or if neither a geometry nor its summary is given.
 
         Notes
         -----
@@ -160,11 +216,14 @@ class mission_profile(System):
         [2] Reference 2
         ...
         """
-        generated_airplane = CreateAirplane(
-            aero_geom=asb_aircraft_geometry, generate_airfoil_polars=False
-        )
-        generated_airplane.generate()
-        self.add_property("flight_vehicle", generated_airplane)
+        check_cruise_mode(cruise_mode)
+        if geometry_summary is None:
+            if asb_aircraft_geometry is None:
+                raise ValueError("An aircraft geometry or its summary is required")
+            geometry_summary = VehicleSummary.from_geometry(asb_aircraft_geometry)
+        elif isinstance(geometry_summary, dict):
+            geometry_summary = VehicleSummary(**geometry_summary)
+        self.add_property("vehicle_summary", geometry_summary)
 
         # Inwards
         self.add_inward(
@@ -184,7 +243,11 @@ class mission_profile(System):
 
         # The computation of the mission follows the order of the segments definition.
         self.add_child(
-            Clb.Climb_segment(name="Climb_segment_1"),
+            Clb.Climb_segment(
+                name="Climb_segment_1",
+                engine_model=engine_model,
+                speed_schedule=speed_schedule,
+            ),
             pulling={
                 "RC_ceiling": "RC_ceiling",
                 "acceleration_altitude": "acceleration_altitude",
@@ -199,7 +262,7 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Acc.Accelerate(name="Accelerate"),
+            Acc.Accelerate(name="Accelerate", engine_model=engine_model),
             pulling={
                 "g": "g",
                 "CD": "CD",
@@ -212,7 +275,11 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Clb.Climb_segment(name="Climb_segment_2"),
+            Clb.Climb_segment(
+                name="Climb_segment_2",
+                engine_model=engine_model,
+                speed_schedule=speed_schedule,
+            ),
             pulling={
                 "RC_ceiling": "RC_ceiling",
                 "minimum_gamma": "minimum_gamma",
@@ -228,7 +295,7 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Acc.Accelerate(name="Acc_Mach"),
+            Acc.Accelerate(name="Acc_Mach", engine_model=engine_model),
             pulling={
                 "g": "g",
                 "S": "S",
@@ -241,7 +308,7 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Cru.Cruise_segment(name="Cruise_segment"),
+            Cru.Cruise_segment(name="Cruise_segment", engine_model=engine_model),
             pulling={
                 "S": "S",
                 "g": "g",
@@ -252,7 +319,7 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Dec.Decelerate(name="Dec_Mach"),
+            Dec.Decelerate(name="Dec_Mach", engine_model=engine_model),
             pulling={
                 "g": "g",
                 "S": "S",
@@ -265,7 +332,11 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Des.Descent_segment(name="Descent_segment_1"),
+            Des.Descent_segment(
+                name="Descent_segment_1",
+                engine_model=engine_model,
+                speed_schedule=speed_schedule,
+            ),
             pulling={
                 "S": "S",
                 "deceleration_altitude": "deceleration_altitude",
@@ -279,7 +350,7 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Dec.Decelerate(name="Decelerate"),
+            Dec.Decelerate(name="Decelerate", engine_model=engine_model),
             pulling={
                 "g": "g",
                 "S": "S",
@@ -291,7 +362,11 @@ class mission_profile(System):
             },
         )
         self.add_child(
-            Des.Descent_segment(name="Descent_segment_2"),
+            Des.Descent_segment(
+                name="Descent_segment_2",
+                engine_model=engine_model,
+                speed_schedule=speed_schedule,
+            ),
             pulling={
                 "S": "S",
                 "g": "g",
@@ -320,31 +395,15 @@ class mission_profile(System):
         # Pulled variables shared between segments
         #         self.S = 124
         self.S = (
-            self.flight_vehicle.airplane.s_ref
+            self.vehicle_summary.s_ref
         )  # Wing surface from the AC, to connect with geometry module.
 
         self.Thau = 0.0  # Value in degrees to maintain coherence with the aero results (alpha in degrees). Results using this variable are computed in radians.
-        self.n_eng = self.flight_vehicle.ag["n_eng"]
-        print(self.S, self.n_eng)
+        self.n_eng = self.vehicle_summary.n_eng
 
         """Fuel capacity computation"""
-        # Usage of the fuel volume module.
-        th_ch_Ratio = max(
-            airfoils.max_thickness() for airfoils in self.flight_vehicle.wing_airfoils
-        )
-        flight_vehicle_Fuel_VW = FuelVolume_Weight("Fuel_VW")
-        flight_vehicle_Fuel_VW.tau = th_ch_Ratio
-        flight_vehicle_Fuel_VW.S = self.S
-        flight_vehicle_Fuel_VW.AR = self.flight_vehicle.airplane.wings[0].aspect_ratio()
-        flight_vehicle_Fuel_VW.V_fuselage = self.flight_vehicle.airplane.fuselages[
-            0
-        ].volume()
-        flight_vehicle_Fuel_VW.rho_f = 817  # density of fuel, unit='kg/m^3'
-        flight_vehicle_Fuel_VW.V_f_fuse_ratio = (
-            0.05  # 5% of the fuselage volume is considered to be for fuel storage.
-        )
-        flight_vehicle_Fuel_VW.run_once()
-        self.W_f = flight_vehicle_Fuel_VW.W_f
+        # Computed once per geometry by the fuel volume module (see `VehicleSummary.fuel_capacity`).
+        self.W_f = self.vehicle_summary.W_f
 
         """Segments Profile values (pulled inwards)"""
         # First Climb Segment
@@ -360,13 +419,15 @@ class mission_profile(System):
         self.Climb_segment_1.m0 = (
             68000.0  # Initial mass for the first segment (and simulation) in kg.
         )
-        self.Climb_segment_1.enginePerfo.rating_eng = "MCRZ"
+        if engine_model is None:
+            self.Climb_segment_1.enginePerfo.rating_eng = "MCRZ"
         self.Climb_segment_1.CS = np.array([0.0])
 
         # Acceleration Segment
         self.acceleration_altitude = round(uc.ft2m(10000), 2)  # unit in ft.
         self.Accelerate.CAS_target = 300.0  # Target speed, unit in kts.
-        self.Accelerate.enginePerfo.rating_eng = "MCT"
+        if engine_model is None:
+            self.Accelerate.enginePerfo.rating_eng = "MCT"
 
         # Second Climb Segment
         self.Climb_segment_2.CAS = (
@@ -377,7 +438,8 @@ class mission_profile(System):
         self.RC_ceiling = (
             uc.ft2m(300) / 60
         )  # units in ft/min [300ft/min conversion to m/s].
-        self.Climb_segment_2.enginePerfo.rating_eng = "MCT"
+        if engine_model is None:
+            self.Climb_segment_2.enginePerfo.rating_eng = "MCT"
 
         # Acceleration Segment (If needed).
         # This segment is taken into account only if the Mach at the end of climb (either CAS or IsoMach) is greater to the Cruise Mach.
@@ -386,12 +448,14 @@ class mission_profile(System):
         # Cruise Segment
         self.cruise_altitude = uc.ft2m(32000)  # unit in ft.
         self.Mach_cruise = 0.8  # Desired Mach for cruise segment.
-        self.Cruise_segment.enginePerfo.rating_eng = "MCRZ"
+        if engine_model is None:
+            self.Cruise_segment.enginePerfo.rating_eng = "MCRZ"
 
         # Deceleration Segment (If needed).
         # This segment is taken into account only if the Mach at the end of the cruise segment (either CAS or IsoMach) is greater to the  Descent Mach.
         # In a new profile it is possible to define if an acceleration or deceleration phase is wanted by adding a segment, in this example for simplicity the connections between segments drives the condition to accelerate or not in a standard mission profile.
-        self.Dec_Mach.enginePerfo.rating_eng = "IDLE"
+        if engine_model is None:
+            self.Dec_Mach.enginePerfo.rating_eng = "IDLE"
 
         # Descent Segment 1
         self.Descent_segment_1.CAS = (
@@ -404,7 +468,8 @@ class mission_profile(System):
         # Deceleration Segment
         self.deceleration_altitude = uc.ft2m(10000)  # unit in ft.
         self.Decelerate.CAS_target = 250.0  # Target speed, unit in kts.
-        self.Decelerate.enginePerfo.rating_eng = "IDLE"
+        if engine_model is None:
+            self.Decelerate.enginePerfo.rating_eng = "IDLE"
 
         # Descent Segment2
         self.Descent_segment_2.CAS = (
@@ -587,22 +652,145 @@ class mission_profile(System):
         # Drivers definition for each segment
         # -----------------------------------------------------------------------
         # dt attribute is key for convergence, specially for those segments of small duration (accelerate/deccelerate)
+        # With adaptive steps, dt is only the initial step and the tolerances of the drivers may be tuned afterwards.
         for segment in self.flightSegments:
-            segment_driver = segment.add_driver(
-                RungeKutta(
-                    name="driver_" + segment.name, time_interval=(0, 100000), dt=1
+            if cruise_mode == "breguet" and segment is self.Cruise_segment:
+                segment_driver = segment.add_driver(
+                    BreguetCruise(name="driver_" + segment.name)
+                )
+            else:
+                if adaptive_step:
+                    driver_class = (
+                        PredictorAdaptiveRungeKutta
+                        if warm_start
+                        else AdaptiveRungeKutta
+                    )
+                else:
+                    driver_class = PredictorRungeKutta if warm_start else RungeKutta
+                segment_driver = segment.add_driver(
+                    driver_class(
+                        name="driver_" + segment.name, time_interval=(0, 100000), dt=1
+                    )
                 )
-            )
 
-            segment_driver.add_recorder(
-                DataFrameRecorder(
-                    includes=self.Data_to_record,
+            includes = self.Data_to_record + (RATE_VARIABLES if dense_output else [])
+            if telemetry is None:
+                recorder = ColumnarRecorder(
+                    includes=includes,
+                    raw_output=False,
+                )
+            else:
+                recorder = StreamingRecorder(
+                    telemetry,
+                    group=f"{self.name}/{segment.name}",
+                    includes=includes,
                     raw_output=False,
-                ),
-                period=10,
+                )
+            segment_driver.add_recorder(
+                recorder,
+                period=None if adaptive_step else 10,
             )
             self.drx[segment.name] = segment_driver  # Drivers dicctionary definition
-        print("ITERATION")
+
+    @property
+    def flight_vehicle(self):
+        """
+        CreateAirplane or None : Flight vehicle of the aircraft geometry, shared by the missions
+        and generated on first access; None if the mission is set up from a summary only.
+        """
+        return self.vehicle_summary.flight_vehicle
+
+    def dense_trajectory(self, segment=None):
+        """
+        Return the dense output of the last run of a segment or of the whole mission.
+
+        Parameters
+        ----------
+        segment : str, optional
+            Segment name. Defaults to None, for all the flight segments chained in time.
+
+        Returns
+        -------
+        DenseTrajectory
+            Trajectory interpolated between the recorded steps, to be evaluated at any time
+            or resampled (times of the mission start at 0 at the first segment).
+
+        Raises
+        ------
+        ValueError
+            If the segment records are streamed to a telemetry file.
+        """
+        names = (
+            [segment.name for segment in self.flightSegments]
+            if segment is None
+            else [segment]
+        )
+        trajectories = []
+        for name in names:
+            recorder = self.drx[name].recorder
+            if isinstance(recorder, StreamingRecorder):
+                raise ValueError(
+                    f"Records of segment {name!r} are streamed to telemetry; read them from the telemetry file"
+                )
+            trajectories.append(DenseTrajectory.from_records(recorder, name=name))
+        if segment is not None:
+            return trajectories[0]
+        return DenseTrajectory.concatenate(trajectories)
+
+    def mission_history(self, units=None):
+        """
+        Return the records of the last run of all the flight segments in one table.
+
+        Variables recorded as one-element arrays (e.g. mass, CL) are flattened to
+        floats. Columns are converted in one vectorised pass each with
+        `unit_conversion.convert_columns`, and their headers renamed accordingly.
+
+        Parameters
+        ----------
+        units : dict, optional
+            Target unit by recorded variable name, e.g. `{"Altitude": "m", "TAS": "kt"}`.
+            Defaults to None (recorded units).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Records of the segments in flight order, with a 'Segment' column.
+
+        Raises
+        ------
+        ValueError
+            If the segment records are streamed to a telemetry file.
+        KeyError
+            If a variable is not recorded or a conversion is not registered.
+        """
+        tables = []
+        for segment in self.flightSegments:
+            recorder = self.drx[segment.name].recorder
+            if isinstance(recorder, StreamingRecorder):
+                raise ValueError(
+                    f"Records of segment {segment.name!r} are streamed to telemetry; read them from the telemetry file"
+                )
+            records = recorder.export_data()
+            records["Segment"] = segment.name
+            tables.append(records)
+        history = pd.concat(tables, ignore_index=True)
+
+        for header in history.columns:
+            if history[header].dtype == object and header.endswith("]"):
+                values = [np.ravel(value) for value in history[header]]
+                if all(value.size == 1 for value in values):
+                    history[header] = np.concatenate(values).astype(float)
+
+        headers = {header.split(" [")[0]: header for header in history.columns}
+        conversions = {}
+        renamed = {}
+        for name, to_unit in (units or {}).items():
+            header = headers[name]
+            from_unit = header[len(name) + 2 : -1]
+            conversions[header] = (from_unit, to_unit)
+            renamed[header] = f"{name} [{to_unit}]"
+        uc.convert_columns(history, conversions)
+        return history.rename(columns=renamed)
 
 
 if __name__ == "__main__":
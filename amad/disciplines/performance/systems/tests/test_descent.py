@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+from amad.disciplines.performance.systems.Climb import Climb_segment
+from amad.disciplines.performance.systems.Descent import Descent_segment
+from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+from amad.disciplines.powerplant.tools.engineDeck import EngineDeck
+from amad.tools.atmosBADA import AtmosphereAMAD
+
+
+@pytest.fixture
+def factory():
+    """
+    Create a flight segment with constant aerodynamic coefficients.
+
+    Returns
+    -------
+    function
+        Factory building and initialising a segment of the given class at a given altitude.
+    """
+
+    def factory_impl(segment_class, altitude, **kwargs):
+        """
+        Create a segment instance ready for a single `run_once`.
+
+        Parameters
+        ----------
+        segment_class : type
+            Segment system class (e.g. `Climb_segment`, `Descent_segment`).
+        altitude : float
+            Altitude of the aircraft [m].
+        **kwargs
+            Segment setup arguments (e.g. `engine_model`).
+
+        Returns
+        -------
+        System
+            The initialised segment.
+        """
+        syst = segment_class(name="segment", **kwargs)
+        syst.CLAeroIt = lambda pt: 0.5
+        syst.CDAeroIt = lambda pt: 0.03
+        syst.DAeroIt = lambda pt: 30000.0
+        syst.in_p.position = np.array([0.0, 0.0, altitude])
+        syst.m0 = np.array([68000.0])
+        syst.g = 9.81
+        syst.S = 124.0
+        syst.n_eng = 2
+        syst.CAS = 300.0
+        syst.Iso_Mach = 0.78
+
+        return syst
+
+    return factory_impl
+
+
+@pytest.mark.parametrize("altitude", [457.2, 3048.0, 9000.0, 10668.0, 12000.0])
+def test_descent_density_matches_amad_atmosphere(factory, altitude):
+    """
+    Test that the descent air density comes from the AMAD ISA model.
+
+    Parameters
+    ----------
+    factory : function
+        Segment factory fixture.
+    altitude : float
+        Altitude of the aircraft [m].
+
+    Raises
+    ------
+    AssertionError
+        If the descent density differs from `AtmosphereAMAD`.
+    """
+    descent = factory(Descent_segment, altitude)
+    descent.run_once()
+
+    assert descent.rho == pytest.approx(
+        AtmosphereAMAD().airdens_kgpm3(altitude), rel=1e-12
+    )
+
+
+@pytest.mark.parametrize("altitude", [3048.0, 10668.0])
+def test_climb_descent_density_consistency(factory, altitude):
+    """
+    Test that climb and descent segments see the same atmosphere at a given altitude.
+
+    Parameters
+    ----------
+    factory : function
+        Segment factory fixture.
+    altitude : float
+        Altitude of the aircraft [m].
+
+    Raises
+    ------
+    AssertionError
+        If the climb and descent densities differ.
+    """
+    climb = factory(Climb_segment, altitude)
+    descent = factory(Descent_segment, altitude)
+    climb.run_once()
+    descent.run_once()
+
+    assert descent.rho == pytest.approx(climb.rho, rel=1e-12)
+
+
+@pytest.mark.parametrize("backend_class", [MattinglyBackend, EngineDeck])
+@pytest.mark.parametrize("segment_class", [Climb_segment, Descent_segment])
+@pytest.mark.parametrize("altitude", [3048.0, 10668.0])
+def test_segment_engine_backend(factory, backend_class, segment_class, altitude):
+    """
+    Test that a segment using an engine backend matches the engine sub-system.
+
+    Parameters
+    ----------
+    factory : function
+        Segment factory fixture.
+    backend_class : type
+        Engine backend class, built from an engine system.
+    segment_class : type
+        Segment system class.
+    altitude : float
+        Altitude of the aircraft [m].
+
+    Raises
+    ------
+    AssertionError
+        If the backend thrust and SFC differ from the engine sub-system ones.
+    """
+    backend = backend_class.from_engine(EnginePerfoMattingly("engine"))
+    with_system = factory(segment_class, altitude)
+    with_backend = factory(segment_class, altitude, engine_model=backend)
+    # The engine sub-system runs before its parent, a second pass updates its inputs
+    with_system.run_once()
+    with_system.run_once()
+    with_backend.run_once()
+
+    assert "enginePerfo" not in with_backend.children
+    assert with_backend.THR == pytest.approx(with_system.THR, rel=1e-3)
+    assert with_backend.SFC == pytest.approx(with_system.SFC, rel=1e-3)
@@ -0,0 +1,295 @@
+import logging
+import numpy as np
+from cosapp.drivers.time.interfaces import ExplicitTimeDriver
+
+logger = logging.getLogger(__name__)
+
+# Bogacki-Shampine 3(2) embedded pair, with First Same As Last (FSAL) property
+BS32_FRACS = np.array([0.5, 0.75, 1.0])
+BS32_A = (
+    np.array([0.5]),
+    np.array([0.0, 0.75]),
+    np.array([2.0 / 9.0, 1.0 / 3.0, 4.0 / 9.0]),
+)
+BS32_ERROR = np.array(
+    [2.0 / 9.0 - 7.0 / 24.0, 1.0 / 3.0 - 0.25, 4.0 / 9.0 - 1.0 / 3.0, -0.125]
+)
+
+# Step size controller
+SAFETY_FACTOR = 0.9
+MIN_STEP_FACTOR = 0.2
+MAX_STEP_FACTOR = 5.0
+
+
+def _as_value(value):
+    """
+    Return a transient value as float for scalars, as a float array otherwise.
+
+    Parameters
+    ----------
+    value : float or array_like
+        Transient value.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Copy of the value.
+    """
+    value = np.array(value, dtype=float)
+    if value.ndim == 0:
+        return float(value)
+    return value
+
+
+class AdaptiveRungeKutta(ExplicitTimeDriver):
+    """
+    Error-controlled adaptive-step time driver for the mission segments.
+
+    Transients are integrated with the Bogacki-Shampine 3(2) embedded pair:
+    the difference between the third- and second-order solutions estimates
+    the local error, which is kept below `atol + rtol * |x|` for each transient
+    component. Each step is tried before it is taken: trials failing the
+    tolerance are rejected and retried with a smaller step, so that every
+    accepted step is a step of the CoSApp time driver, recorded and checked
+    for events. The next step grows or shrinks with the error estimate,
+    within `[min_dt, max_dt]`.
+
+    Events are detected and localised by the CoSApp time driver on the cubic
+    interpolation of the transients over the accepted step, so altitude,
+    speed and distance targets are met precisely with large steps as well.
+
+    Attributes
+    ----------
+    rtol : float
+        Relative tolerance on the local error.
+    atol : float
+        Absolute tolerance on the local error.
+    min_dt : float
+        Minimum time step [s]; steps are accepted at `min_dt` whatever their error.
+    max_dt : float
+        Maximum time step [s].
+    n_accepted : int
+        Number of accepted steps in the last run.
+    n_rejected : int
+        Number of rejected steps in the last run.
+    """
+
+    __slots__ = (
+        "rtol",
+        "atol",
+        "min_dt",
+        "max_dt",
+        "n_accepted",
+        "n_rejected",
+        "_array_refs",
+        "_proposal",
+    )
+
+    def __init__(
+        self,
+        name="AdaptiveRK",
+        owner=None,
+        rtol=1e-6,
+        atol=1e-3,
+        min_dt=0.01,
+        max_dt=600.0,
+        **options,
+    ):
+        """
+        Initialise the driver.
+
+        Parameters
+        ----------
+        name : str, optional
+            Driver name. Defaults to 'AdaptiveRK'.
+        owner : System, optional
+            System to which the driver belongs. Defaults to None.
+        rtol : float, optional
+            Relative tolerance on the local error. Defaults to 1e-6.
+        atol : float, optional
+            Absolute tolerance on the local error. Defaults to 1e-3.
+        min_dt : float, optional
+            Minimum time step [s]. Defaults to 0.01.
+        max_dt : float, optional
+            Maximum time step [s]. Defaults to 600.
+        **options
+            Time driver options, e.g. `time_interval` and the initial step `dt`.
+        """
+        options.setdefault("max_dt_growth_rate", MAX_STEP_FACTOR)
+        super().__init__(name, owner, **options)
+        self.rtol = rtol
+        self.atol = atol
+        self.min_dt = min_dt
+        self.max_dt = max_dt
+        self.n_accepted = 0
+        self.n_rejected = 0
+        self._array_refs = []
+        self._proposal = None
+
+    def setup_run(self):
+        """
+        Collect the array transient variables of the owner system before a run.
+        """
+        super().setup_run()
+        self._array_refs = [
+            unknown.ref
+            for unknown in self.owner.get_unsolved_problem().transients.values()
+            if isinstance(unknown.value, np.ndarray)
+        ]
+
+    def _precompute(self):
+        """
+        Reset the step counters before a run.
+        """
+        super()._precompute()
+        self.n_accepted = 0
+        self.n_rejected = 0
+
+    def _step(self, t, h, x0, k1):
+        """
+        Compute one embedded Runge-Kutta step from the state `x0` at time `t`.
+
+        The owner system is left at time `t + h` with the new transient values.
+
+        Parameters
+        ----------
+        t : float
+            Step start time [s].
+        h : float
+            Step size [s].
+        x0 : dict
+            Transient values at `t`.
+        k1 : dict
+            Transient derivatives at `t`.
+
+        Returns
+        -------
+        tuple
+            Transient derivatives at `t + h` and normalised error estimate.
+        """
+        transients = self._transients
+        stages = [k1]
+        for fraction, coefs in zip(BS32_FRACS, BS32_A):
+            for name, x in transients.items():
+                x.value = x0[name] + h * sum(
+                    c * k[name] for c, k in zip(coefs, stages) if c != 0.0
+                )
+            self._set_time(t + fraction * h)
+            stages.append({name: _as_value(x.d_dt) for name, x in transients.items()})
+
+        error = 0.0
+        for name, x in transients.items():
+            x1 = _as_value(x.value)
+            local_error = h * sum(e * k[name] for e, k in zip(BS32_ERROR, stages))
+            scale = self.atol + self.rtol * np.maximum(np.abs(x0[name]), np.abs(x1))
+            error = max(error, float(np.max(np.abs(local_error) / scale)))
+
+        return stages[-1], error
+
+    def _step_factor(self, error):
+        """
+        Return the step size factor following an error estimate.
+
+        Parameters
+        ----------
+        error : float
+            Normalised error estimate of the last step.
+
+        Returns
+        -------
+        float
+            Factor of the next step size, within `[MIN_STEP_FACTOR, MAX_STEP_FACTOR]`.
+        """
+        factor = SAFETY_FACTOR * (error + 1e-12) ** (-1.0 / 3.0)
+        return min(MAX_STEP_FACTOR, max(MIN_STEP_FACTOR, factor))
+
+    def _propose_step(self, t, h, x0, k1):
+        """
+        Find the next step from time `t` meeting the tolerance and set it as `dt`.
+
+        Trial steps failing the tolerance are rejected and retried with a smaller
+        size before the step is taken. The accepted trial is kept for the next
+        `_update_transients` call, and the transients are restored to `x0`.
+
+        Parameters
+        ----------
+        t : float
+            Step start time [s].
+        h : float
+            First trial step size [s].
+        x0 : dict
+            Transient values at `t`.
+        k1 : dict
+            Transient derivatives at `t`.
+        """
+        transients = self._transients
+        while True:
+            k_end, error = self._step(t, h, x0, k1)
+            if error <= 1.0 or h <= self.min_dt:
+                break
+            self.n_rejected += 1
+            for name, x in transients.items():
+                x.value = x0[name]
+            h = max(self.min_dt, h * self._step_factor(error))
+
+        x1 = {name: _as_value(x.value) for name, x in transients.items()}
+        self._proposal = (t, h, x1, k_end, error)
+        for name, x in transients.items():
+            x.value = x0[name]
+        self.dt = h
+
+    def _initialize(self):
+        """
+        Initialise the run and check the initial step against the tolerance.
+        """
+        super()._initialize()
+        self._proposal = None
+        if len(self._transients) == 0 or self.dt is None:
+            return
+        t = self.time
+        self._set_time(t)
+        x0 = {name: _as_value(x.value) for name, x in self._transients.items()}
+        k1 = {name: _as_value(x.d_dt) for name, x in self._transients.items()}
+        self._propose_step(t, self.dt, x0, k1)
+
+    def _update_transients(self, dt):
+        """
+        Integrate transients over `dt`, then propose the next step.
+
+        A step of the size proposed by the driver was already accepted by
+        `_propose_step` and is taken as computed. Other steps, shortened by the
+        time driver to reach the end of the time interval or a recording time,
+        or restarting from an event, are taken as they come. The error estimate
+        of the step then sets the first trial of the next step.
+
+        Parameters
+        ----------
+        dt : float
+            Time step imposed by the time driver [s].
+        """
+        transients = self._transients
+        if len(transients) == 0:
+            return
+
+        # Array transients are updated in place by CoSApp, which would also alter
+        # the start-of-step values kept by reference for event localisation.
+        for ref in self._array_refs:
+            ref.value = np.array(ref.value, dtype=float)
+
+        t = self.time
+        proposal, self._proposal = self._proposal, None
+        if proposal is not None and proposal[:2] == (t, dt):
+            _, _, x1, k_end, error = proposal
+            for name, x in transients.items():
+                x.value = x1[name]
+        else:
+            x0 = {name: _as_value(x.value) for name, x in transients.items()}
+            k1 = {name: _as_value(x.d_dt) for name, x in transients.items()}
+            k_end, error = self._step(t, dt, x0, k1)
+        if error > 1.0:
+            logger.debug(f"{self.name}: step of {dt:.3g}s taken with error {error:.3g}")
+        self.n_accepted += 1
+
+        x1 = {name: _as_value(x.value) for name, x in transients.items()}
+        h = min(self.max_dt, max(self.min_dt, dt * self._step_factor(error)))
+        self._propose_step(t + dt, h, x1, k_end)
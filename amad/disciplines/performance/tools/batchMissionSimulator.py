@@ -0,0 +1,699 @@
+"""________________________________________________________________________________
+
+                           BATCH MISSION SIMULATOR MODULE
+___________________________________________________________________________________"""
+
+# Batched version of the NumPy mission simulator: N missions (lanes) are flown in
+# lockstep as structure-of-arrays states, each lane with its own take-off mass and
+# segment settings (cruise altitude, Mach, distance...). Aerodynamic tables and the
+# engine model are evaluated once per evaluation for all the active lanes.
+# batchMissionSimulator.py
+
+import logging
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+
+import amad.tools.atmosBADA as atmos
+import amad.tools.unit_conversion as uc
+from amad.disciplines.performance.tools.missionSimulator import (
+    RECORDED,
+    RK_SCHEMES,
+    MissionSimulator,
+)
+
+logger = logging.getLogger(__name__)
+
+speedsclass = atmos.AtmosphereAMAD()
+
+# Event names of each segment kind, mode-switching events being named 'Crossover_altitude'.
+SEGMENT_EVENTS = {
+    "climb": (
+        "acceleration_altitude_reached",
+        "Cruise_altitude_reached",
+        "Maximum_ceiling_reached",
+        "Crossover_altitude",
+    ),
+    "accelerate": ("speed_arrived",),
+    "cruise": ("Cruise_distance_reached",),
+    "decelerate": ("speed_arrived",),
+    "descent": (
+        "Final_approach_altitude_reached",
+        "Deceleration_altitude_reached",
+        "Crossover_altitude",
+    ),
+}
+
+
+def _brackets(grid, values, dimension):
+    """
+    Find the grid intervals containing an array of values and their interpolation weights.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        Sorted grid points.
+    values : numpy.ndarray
+        Interpolated coordinates.
+    dimension : int
+        Index of the grid dimension, for the error message.
+
+    Returns
+    -------
+    tuple
+        Lower indices of the intervals and weights of the upper points.
+
+    Raises
+    ------
+    ValueError
+        If a value is out of the grid bounds, as for `RegularGridInterpolator`.
+    """
+    if np.any((values < grid[0]) | (values > grid[-1])):
+        raise ValueError(
+            f"One of the requested xi is out of bounds in dimension {dimension}"
+        )
+    i = np.minimum(np.searchsorted(grid, values, side="right") - 1, len(grid) - 2)
+    return i, (values - grid[i]) / (grid[i + 1] - grid[i])
+
+
+def alpha_slices(table, machs, altitudes):
+    """
+    Reduce an aerodynamic table to functions of the angle of attack, one per lane.
+
+    Vectorised version of `missionSimulator.alpha_slice`: a linear
+    `RegularGridInterpolator` is interpolated once in Mach and altitude for
+    all the lanes, other functions are called on all the points at once.
+
+    Parameters
+    ----------
+    table : callable
+        Aerodynamic interpolation function of `(alpha, Mach, altitude)` points.
+    machs : numpy.ndarray
+        Mach numbers of the lanes [-].
+    altitudes : numpy.ndarray
+        Altitudes of the lanes [m].
+
+    Returns
+    -------
+    callable
+        Function of angles of attack [deg] of shape `(n,)` or `(n, k)` for `n`
+        lanes returning the table values with the same shape.
+    """
+    if (
+        isinstance(table, RegularGridInterpolator)
+        and table.method == "linear"
+        and len(table.grid) == 3
+    ):
+        alphas, mach_grid, altitude_grid = table.grid
+        i, wi = _brackets(mach_grid, machs, 1)
+        j, wj = _brackets(altitude_grid, altitudes, 2)
+        v = table.values
+        values = (
+            (1.0 - wi) * ((1.0 - wj) * v[:, i, j] + wj * v[:, i, j + 1])
+            + wi * ((1.0 - wj) * v[:, i + 1, j] + wj * v[:, i + 1, j + 1])
+        ).T
+        lanes = np.arange(len(values))
+
+        def evaluate(a):
+            # Clipped as `numpy.interp` in the scalar simulator
+            a = np.minimum(np.maximum(a, alphas[0]), alphas[-1])
+            k = np.minimum(
+                np.searchsorted(alphas, a, side="right") - 1, len(alphas) - 2
+            )
+            w = (a - alphas[k]) / (alphas[k + 1] - alphas[k])
+            rows = lanes if a.ndim == 1 else lanes[:, None]
+            return (1.0 - w) * values[rows, k] + w * values[rows, k + 1]
+
+        return evaluate
+
+    def evaluate(a):
+        pts = np.empty(a.shape + (3,))
+        pts[..., 0] = a
+        pts[..., 1] = machs if a.ndim == 1 else machs[:, None]
+        pts[..., 2] = altitudes if a.ndim == 1 else altitudes[:, None]
+        values = table(pts.reshape(-1, 3))
+        return np.asarray(values, dtype=float).reshape(a.shape)
+
+    return evaluate
+
+
+class BatchMissionSimulator(MissionSimulator):
+    """
+    Mission simulator flying many missions in lockstep.
+
+    The lanes fly the same sequence of segments; segment settings and the
+    initial mass or position may be given per lane as arrays. At each
+    step all the active lanes of a segment are advanced together, the state
+    being an `(n, 4)` array of `[x, z, V, mass]`; lanes reaching a final event
+    of the segment are masked until all lanes have finished it. Events are
+    localised per lane by Illinois root finding on the step size.
+
+    Attributes
+    ----------
+    xtol : float
+        Tolerance on the event times [s].
+    """
+
+    def __init__(self, *args, xtol=1e-10, **kwargs):
+        """
+        Initialise the simulator.
+
+        Parameters
+        ----------
+        *args
+            `MissionSimulator` arguments.
+        xtol : float, optional
+            Tolerance on the event times [s]. Defaults to 1e-10.
+        **kwargs
+            `MissionSimulator` keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.xtol = xtol
+
+    def _solve_alpha(self, residual, alpha):
+        """
+        Solve `residual(alpha) == 0` for all the lanes by Newton iterations.
+
+        Parameters
+        ----------
+        residual : callable
+            Residual function of angles of attack of shape `(n, 2)`.
+        alpha : numpy.ndarray
+            Initial guesses [deg].
+
+        Returns
+        -------
+        numpy.ndarray
+            Angles of attack at equilibrium [deg].
+        """
+        delta = 1e-4
+        for _ in range(self.max_iter):
+            r = residual(np.column_stack([alpha, alpha + delta]))
+            step = r[:, 0] * delta / (r[:, 1] - r[:, 0])
+            alpha = alpha - step
+            if np.all(np.abs(step) < self.alpha_tol):
+                return alpha
+        logger.warning(
+            f"Angle of attack not converged after {self.max_iter} iterations on {np.sum(np.abs(step) >= self.alpha_tol)} lanes"
+        )
+        return alpha
+
+    def _speeds(self, segment, mode, z, V):
+        """
+        Compute the true airspeeds and Mach numbers of the lanes.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition, with settings per lane.
+        mode : numpy.ndarray
+            IsoMach modes of climb and descent segments.
+        z : numpy.ndarray
+            Altitudes [m].
+        V : numpy.ndarray
+            Horizontal speed states [m/s].
+
+        Returns
+        -------
+        tuple
+            True airspeeds [m/s] and Mach numbers [-].
+        """
+        if segment["kind"] in ("climb", "descent"):
+            Mach = np.where(
+                mode,
+                segment["Iso_Mach"],
+                speedsclass.tas2mach_array(
+                    speedsclass.cas2tas_array(uc.kt2ms(segment["CAS"]), z), z
+                ),
+            )
+            return speedsclass.mach2tas_array(Mach, z), Mach
+        return V, speedsclass.tas2mach_array(V, z)
+
+    def _rates(self, segment, mode, y, alpha):
+        """
+        Evaluate the lanes of a segment: equilibrium, outputs and state derivatives.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition, with settings per lane.
+        mode : numpy.ndarray
+            IsoMach modes of climb and descent segments.
+        y : numpy.ndarray
+            States `[x, z, V, mass]` of shape `(n, 4)`.
+        alpha : numpy.ndarray
+            Initial guesses of the angle of attack [deg].
+
+        Returns
+        -------
+        tuple
+            State derivatives (`(n, 4)` array) and segment outputs (dict of arrays).
+        """
+        kind = segment["kind"]
+        z, V, mass = y[:, 1], y[:, 2], y[:, 3]
+        tau = np.radians(self.Thau)
+        weight = (mass * self.g)[:, None]
+        rho = speedsclass.airdens_kgpm3_array(z)
+        TAS, Mach = self._speeds(segment, mode, z, V)
+        q_S = (0.5 * rho * self.S * TAS**2)[:, None]
+        CL_of = alpha_slices(self.CLAeroIt, Mach, z)
+        gamma = np.zeros_like(z)
+        dV = np.zeros_like(z)
+        outputs = {}
+
+        if kind == "climb":
+            D_of = alpha_slices(self.DAeroIt, Mach, z)
+            THR, SFC = self.engine_model.evaluate(z, Mach, "MCLB", segment["dISA"])
+            THR = self.n_eng * np.asarray(THR)[:, None]
+
+            def residual(alphas):
+                CL, Drag = CL_of(alphas), D_of(alphas)
+                a = np.radians(alphas) + tau
+                gam = np.arcsin((THR * np.cos(a) - Drag) / weight)
+                return (
+                    q_S * CL
+                    - (weight + Drag * np.sin(gam) - THR * np.sin(a + gam))
+                    / np.cos(gam)
+                ) / weight
+
+            alpha = self._solve_alpha(residual, alpha)
+            THR = THR[:, 0]
+            gamma = np.arcsin(
+                (THR * np.cos(np.radians(alpha) + tau) - D_of(alpha)) / weight[:, 0]
+            )
+
+        elif kind == "descent":
+            D_of = alpha_slices(self.DAeroIt, Mach, z)
+            THR_max = self.n_eng * np.asarray(
+                self.engine_model.max_thrust(z, Mach, segment["dISA"])
+            )
+            _, SFC = self.engine_model.evaluate(z, Mach, "MCT", segment["dISA"])
+            gamma = np.arcsin(segment["CRD"] / TAS)
+            sin_gamma = np.sin(gamma)[:, None]
+            cos_gamma = np.cos(gamma)[:, None]
+
+            def thrust(alphas, Drag):
+                return (Drag + weight * sin_gamma) / np.cos(np.radians(alphas) + tau)
+
+            def residual(alphas):
+                CL, Drag = CL_of(alphas), D_of(alphas)
+                return (
+                    q_S * CL
+                    - weight * cos_gamma
+                    + thrust(alphas, Drag) * np.sin(np.radians(alphas) + tau)
+                ) / weight
+
+            alpha = self._solve_alpha(residual, alpha)
+            THR = thrust(alpha[:, None], D_of(alpha[:, None]))[:, 0]
+            # Thrust is set by the throttle to hold the rate of descent
+            outputs["Throttle"] = THR / THR_max
+
+        elif kind == "cruise":
+            CD_of = alpha_slices(self.CDAeroIt, Mach, z)
+            _, SFC = self.engine_model.evaluate(z, Mach, "MCRZ", segment["dISA"])
+
+            def residual(alphas):
+                CL, CD = CL_of(alphas), CD_of(alphas)
+                a = np.radians(alphas) + tau
+                return (q_S * CL - weight + q_S * CD * np.tan(a)) / weight
+
+            alpha = self._solve_alpha(residual, alpha)
+            THR = q_S[:, 0] * CD_of(alpha) / np.cos(np.radians(alpha) + tau)
+
+        else:
+            if kind == "accelerate":
+                rating, D_of = "MCT", alpha_slices(self.DAeroIt, Mach, z)
+            else:
+                rating, CD_of = "IDLE", alpha_slices(self.CDAeroIt, Mach, z)
+            THR, SFC = self.engine_model.evaluate(z, Mach, rating, segment["dISA"])
+            THR = self.n_eng * np.asarray(THR)[:, None]
+
+            def residual(alphas):
+                a = np.radians(alphas) + tau
+                return (q_S * CL_of(alphas) - weight + THR * np.sin(a)) / weight
+
+            alpha = self._solve_alpha(residual, alpha)
+            THR = THR[:, 0]
+            if kind == "accelerate":
+                dV = (THR * np.cos(np.radians(alpha) + tau) - D_of(alpha)) / mass
+            else:
+                dV = (THR - q_S[:, 0] * CD_of(alpha)) / mass
+
+        dy = np.column_stack([TAS * np.cos(gamma), TAS * np.sin(gamma), dV, -SFC * THR])
+        outputs.update(
+            {
+                "TAS": TAS,
+                "Mach": Mach,
+                "alpha": alpha,
+                "gamma": gamma,
+                "THR": THR,
+                "SFC": np.broadcast_to(SFC, z.shape),
+            }
+        )
+        return dy, outputs
+
+    def _step(self, segment, mode, y, k1, alpha, h):
+        """
+        Advance the lanes of a segment by one Runge-Kutta step each.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition, with settings per lane.
+        mode : numpy.ndarray
+            IsoMach modes of climb and descent segments.
+        y : numpy.ndarray
+            States at the beginning of the step, shape `(n, 4)`.
+        k1 : numpy.ndarray
+            State derivatives at the beginning of the step.
+        alpha : numpy.ndarray
+            Angles of attack at the beginning of the step [deg].
+        h : numpy.ndarray
+            Step sizes of the lanes [s].
+
+        Returns
+        -------
+        tuple
+            New states, their derivatives and segment outputs.
+        """
+        fracs, coefs = RK_SCHEMES[self.order]
+        h = h[:, None]
+        stages = [k1]
+        for frac in fracs:
+            k, outputs = self._rates(segment, mode, y + frac * h * stages[-1], alpha)
+            alpha = outputs["alpha"]
+            stages.append(k)
+        y_new = y + h * sum(c * k for c, k in zip(coefs, stages))
+        k_new, outputs = self._rates(segment, mode, y_new, alpha)
+        return y_new, k_new, outputs
+
+    def _events(self, segment, mode, y, outputs, x0):
+        """
+        Evaluate the event functions of the lanes, which change sign when the events occur.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition, with settings per lane.
+        mode : numpy.ndarray
+            IsoMach modes of climb and descent segments.
+        y : numpy.ndarray
+            States `[x, z, V, mass]` of shape `(n, 4)`.
+        outputs : dict
+            Segment outputs at these states.
+        x0 : numpy.ndarray
+            Distances at the beginning of the segment [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Event values of shape `(n, n_events)` in the order of `SEGMENT_EVENTS`,
+            NaN for the crossover of lanes in the other mode.
+        """
+        kind = segment["kind"]
+        x, z, V = y[:, 0], y[:, 1], y[:, 2]
+        if kind == "climb":
+            events = [
+                z - segment["acceleration_altitude"],
+                z - segment["cruise_altitude"],
+                outputs["TAS"] * np.sin(outputs["gamma"]) - segment["RC_ceiling"],
+                np.where(mode, np.nan, outputs["Mach"] - segment["Iso_Mach"]),
+            ]
+        elif kind == "descent":
+            CAS = speedsclass.tas2cas_array(outputs["TAS"], z)
+            events = [
+                z - segment["Fin_appr_altitude"],
+                z - segment["deceleration_altitude"],
+                np.where(mode, CAS - 154.3, np.nan),
+            ]
+        elif kind == "cruise":
+            events = [x - x0 - segment["Cruise_distance_target"]]
+        else:
+            target = segment["Mach_cruise" if kind == "accelerate" else "Iso_Mach"]
+            vf = np.where(
+                target != 0.0,
+                speedsclass.mach2tas_array(target, z),
+                speedsclass.cas2tas_array(uc.kt2ms(segment["CAS_target"]), z),
+            )
+            events = [V - vf]
+        return np.column_stack(events)
+
+    def _localise(self, segment, mode, y, k, alpha, x0, h, g0, g1, column):
+        """
+        Find the step sizes at which an event occurs, by the Illinois method.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition, restricted to the triggered lanes.
+        mode : numpy.ndarray
+            IsoMach modes of the lanes.
+        y, k, alpha : numpy.ndarray
+            States, derivatives and angles of attack at the beginning of the step.
+        x0 : numpy.ndarray
+            Distances at the beginning of the segment [m].
+        h : numpy.ndarray
+            Full step sizes [s].
+        g0, g1 : numpy.ndarray
+            Event values at the beginning and at the end of the full step.
+        column : int
+            Index of the event.
+
+        Returns
+        -------
+        numpy.ndarray
+            Step sizes to the event [s].
+        """
+        a, b = np.zeros_like(h), h.copy()
+        ga, gb = g0.copy(), g1.copy()
+        active = np.ones(len(h), dtype=bool)
+        for _ in range(100):
+            idx = np.flatnonzero(active)
+            if idx.size == 0:
+                break
+            c = b[idx] - gb[idx] * (b[idx] - a[idx]) / (gb[idx] - ga[idx])
+            c = np.where(np.isfinite(c), c, 0.5 * (a[idx] + b[idx]))
+            sub = {
+                key: value[idx] if isinstance(value, np.ndarray) else value
+                for key, value in segment.items()
+            }
+            y_c, _, outputs_c = self._step(
+                sub, mode[idx], y[idx], k[idx], alpha[idx], c
+            )
+            gc = self._events(sub, mode[idx], y_c, outputs_c, x0[idx])[:, column]
+
+            # Illinois update: keep the bracket, halving the retained end value
+            opposite = gc * gb[idx] < 0.0
+            a[idx] = np.where(opposite, b[idx], a[idx])
+            ga[idx] = np.where(opposite, gb[idx], 0.5 * ga[idx])
+            b[idx], gb[idx] = c, gc
+            active[idx] = (np.abs(b[idx] - a[idx]) > self.xtol) & (gc != 0.0)
+        return b
+
+    def run_segment(self, segment, y0, alpha0=0.0, t_max=100000.0):
+        """
+        Fly a segment for all the lanes until one of its final events.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition; settings may be arrays with one value per lane.
+        y0 : array_like
+            Initial states `[x, z, V, mass]` of shape `(n, 4)`.
+        alpha0 : float or array_like, optional
+            Initial guesses of the angle of attack [deg]. Defaults to 0.
+        t_max : float, optional
+            Maximum segment duration [s]. Defaults to 100000, as the mission drivers.
+
+        Returns
+        -------
+        dict
+            Time histories of the lanes (see `RECORDED`) as `(n, n_steps)` arrays,
+            NaN once a lane has finished, plus the final `state`, the `event`
+            ending each lane and their `fuel_mass` [kg].
+        """
+        y = np.array(y0, dtype=float)
+        n = len(y)
+        segment = {
+            key: (
+                np.array(np.broadcast_to(value, (n,)), dtype=float)
+                if key not in ("kind", "name", "IsoMach")
+                else value
+            )
+            for key, value in segment.items()
+        }
+        mode = np.array(
+            np.broadcast_to(segment.get("IsoMach", False), (n,)), dtype=bool
+        )
+        names = SEGMENT_EVENTS[segment["kind"]]
+        x0, m0 = y[:, 0].copy(), y[:, 3].copy()
+        alpha = np.array(np.broadcast_to(alpha0, (n,)), dtype=float)
+
+        k, outputs = self._rates(segment, mode, y, alpha)
+        outputs = {key: np.array(value) for key, value in outputs.items()}
+        events = self._events(segment, mode, y, outputs, x0)
+        t = np.zeros(n)
+        active = np.ones(n, dtype=bool)
+        final_event = np.full(n, None, dtype=object)
+        history = {name: [] for name in RECORDED}
+
+        def record(lanes):
+            row = np.full(n, np.nan)
+            for name, values in zip(
+                ("time", "x", "z", "mass"), (t, y[:, 0], y[:, 1], y[:, 3])
+            ):
+                row[lanes] = values[lanes]
+                history[name].append(row.copy())
+            for name in RECORDED[3:-1]:
+                row[lanes] = outputs[name][lanes]
+                history[name].append(row.copy())
+
+        record(active)
+        while np.any(active):
+            idx = np.flatnonzero(active)
+            sub = {
+                key: value[idx] if isinstance(value, np.ndarray) else value
+                for key, value in segment.items()
+            }
+            h = np.minimum(self.dt, t_max - t[idx])
+            y_new, k_new, outputs_new = self._step(
+                sub, mode[idx], y[idx], k[idx], alpha[idx], h
+            )
+            events_new = self._events(sub, mode[idx], y_new, outputs_new, x0[idx])
+            triggered = (events[idx] != 0.0) & (events[idx] * events_new <= 0.0)
+
+            rows = np.flatnonzero(triggered.any(axis=1))
+            if rows.size:
+                # Localise the earliest event of each triggered lane
+                h_events = np.full((rows.size, len(names)), np.inf)
+                for column in range(len(names)):
+                    lanes = np.flatnonzero(triggered[rows, column])
+                    if lanes.size == 0:
+                        continue
+                    r = rows[lanes]
+                    h_events[lanes, column] = self._localise(
+                        {
+                            key: value[r] if isinstance(value, np.ndarray) else value
+                            for key, value in sub.items()
+                        },
+                        mode[idx][r],
+                        y[idx][r],
+                        k[idx][r],
+                        alpha[idx][r],
+                        x0[idx][r],
+                        h[r],
+                        events[idx][r, column],
+                        events_new[r, column],
+                        column,
+                    )
+                first = np.argmin(h_events, axis=1)
+                h[rows] = h_events[np.arange(rows.size), first]
+                sub_rows = {
+                    key: value[rows] if isinstance(value, np.ndarray) else value
+                    for key, value in sub.items()
+                }
+                y_rows, k_rows, outputs_rows = self._step(
+                    sub_rows,
+                    mode[idx][rows],
+                    y[idx][rows],
+                    k[idx][rows],
+                    alpha[idx][rows],
+                    h[rows],
+                )
+
+                crossover = np.array([names[e] == "Crossover_altitude" for e in first])
+                if np.any(crossover):
+                    lanes = idx[rows[crossover]]
+                    mode[lanes] = ~mode[lanes]
+                    if segment["kind"] == "descent":
+                        # The IsoMach descent overwrites its CAS, kept after the crossover
+                        segment["CAS"][lanes] = uc.ms2kt(
+                            speedsclass.tas2cas_array(
+                                outputs_rows["TAS"][crossover], y_rows[crossover, 1]
+                            )
+                        )
+                    sub_rows = {
+                        key: (
+                            value[idx[rows]] if isinstance(value, np.ndarray) else value
+                        )
+                        for key, value in segment.items()
+                    }
+                    k_rows, outputs_rows = self._rates(
+                        sub_rows, mode[idx[rows]], y_rows, outputs_rows["alpha"]
+                    )
+                for lane, e, is_crossover in zip(idx[rows], first, crossover):
+                    if not is_crossover:
+                        final_event[lane] = names[e]
+                        active[lane] = False
+
+                y_new[rows], k_new[rows] = y_rows, k_rows
+                for key in outputs_new:
+                    outputs_new[key] = np.array(outputs_new[key])
+                    outputs_new[key][rows] = outputs_rows[key]
+                events_new[rows] = self._events(
+                    sub_rows, mode[idx[rows]], y_rows, outputs_rows, x0[idx[rows]]
+                )
+
+            t[idx] += h
+            y[idx], k[idx], events[idx] = y_new, k_new, events_new
+            alpha[idx] = outputs_new["alpha"]
+            for key, value in outputs_new.items():
+                outputs[key][idx] = value
+            record(idx)
+            active &= t < t_max
+
+        result = {name: np.array(values).T for name, values in history.items()}
+        result["state"] = y
+        result["event"] = final_event
+        result["fuel_mass"] = m0 - y[:, 3]
+        # Speed vectors handed over to the next segment, as `out_p.TAS_speed`
+        result["TAS_speed"] = np.column_stack([k[:, 0], np.zeros(n), k[:, 1]])
+        return result
+
+    def run(self, m0, position=(0.0, 0.0, 457.2), TAS_speed=(0.0, 0.0, 0.0)):
+        """
+        Fly the mission for all the lanes.
+
+        The number of lanes is given by the broadcast of the initial masses,
+        positions and of the segment settings given as arrays.
+
+        Parameters
+        ----------
+        m0 : float or array_like
+            Initial aircraft masses [kg].
+        position : array_like, optional
+            Initial position `[x, y, z]` [m], shape `(3,)` or `(n, 3)`. Defaults to 1500 ft altitude.
+        TAS_speed : array_like, optional
+            Initial speed vector [m/s], shape `(3,)` or `(n, 3)`, only used if the
+            first segment is not a climb or descent.
+
+        Returns
+        -------
+        dict
+            Segment results by segment name (see `run_segment`).
+        """
+        position = np.asarray(position, dtype=float)
+        TAS_speed = np.asarray(TAS_speed, dtype=float)
+        shapes = [np.shape(m0), position.shape[:-1], TAS_speed.shape[:-1]]
+        for segment in self.segments:
+            shapes.extend(np.shape(value) for value in segment.values())
+        n = int(np.prod(np.broadcast_shapes(*shapes, (1,))))
+
+        y = np.column_stack(
+            [
+                np.broadcast_to(position[..., 0], (n,)),
+                np.broadcast_to(position[..., 2], (n,)),
+                np.broadcast_to(TAS_speed[..., 0], (n,)),
+                np.broadcast_to(m0, (n,)),
+            ]
+        ).astype(float)
+        alpha = np.zeros(n)
+        results = {}
+        for segment in self.segments:
+            result = self.run_segment(segment, y, alpha)
+            results[segment["name"]] = result
+            y = result["state"].copy()
+            y[:, 2] = result["TAS_speed"][:, 0]
+            alpha = result["alpha"][
+                np.arange(n), np.sum(~np.isnan(result["alpha"]), axis=1) - 1
+            ]
+        return results
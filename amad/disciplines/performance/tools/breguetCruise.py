@@ -0,0 +1,284 @@
+"""________________________________________________________________________________
+
+                              BREGUET CRUISE MODULE
+___________________________________________________________________________________"""
+
+# Analytic Breguet integration of the constant Mach, constant altitude cruise.
+# Over a sub-step where the fuel flow per unit mass k = SFC * THR / m is constant
+# (constant L/D and SFC), the mass decays exponentially: m(t + h) = m(t) exp(-k h),
+# which is the Breguet range equation at constant speed. k is re-evaluated at the
+# sub-step boundaries and midpoints, from the aerodynamics and engine models.
+# breguetCruise.py
+
+import logging
+
+import numpy as np
+import pandas
+from cosapp.core.time import UniversalClock
+from cosapp.drivers import Driver
+
+logger = logging.getLogger(__name__)
+
+# Step size controller
+SAFETY_FACTOR = 0.9
+MIN_STEP_FACTOR = 0.2
+MAX_STEP_FACTOR = 5.0
+
+# Cruise models of the `cruise_mode` option of the mission and fuel systems: the
+# reference model of the system, or the analytic Breguet sub-steps of this module
+CRUISE_MODES = ("reference", "breguet")
+
+
+def check_cruise_mode(cruise_mode):
+    """
+    Check that a cruise model is one of `CRUISE_MODES`.
+
+    Parameters
+    ----------
+    cruise_mode : str
+        Cruise model.
+
+    Raises
+    ------
+    ValueError
+        If the cruise model is unknown.
+    """
+    if cruise_mode not in CRUISE_MODES:
+        raise ValueError(
+            f"Unknown cruise mode {cruise_mode!r}; expected one of {CRUISE_MODES}"
+        )
+
+
+def breguet_cruise(
+    fuel_flow, m0, duration, rtol=1e-4, max_dt=np.inf, callback=None, max_steps=10000
+):
+    """
+    Integrate the cruise mass with analytic Breguet sub-steps.
+
+    Over a sub-step of length `h`, the mass decays as `m exp(-k h)`, with the fuel
+    flow per unit mass `k = fuel_flow / m` evaluated at the Breguet midpoint
+    (second order, kept). The trapezoidal mean of `k` at both ends of the
+    sub-step gives another second-order solution, and their difference
+    estimates the local error; sub-steps are accepted when it is below `rtol`
+    times the fuel burnt over the sub-step, so that the accumulated estimate
+    is below `rtol` times the cruise fuel. The end-of-step evaluation is the
+    start of the next sub-step, so each sub-step costs two evaluations.
+
+    Parameters
+    ----------
+    fuel_flow : callable
+        Function `fuel_flow(t, m)` returning the fuel flow [kg/s] at time `t` [s]
+        and mass `m` [kg], once the equilibrium is solved.
+    m0 : float
+        Mass at the start of the cruise [kg].
+    duration : float
+        Cruise duration [s].
+    rtol : float, optional
+        Relative tolerance on the fuel burnt. Defaults to 1e-4.
+    max_dt : float, optional
+        Maximum sub-step [s]. Defaults to no limit.
+    callback : callable, optional
+        Function `callback(t, m)` called at each accepted sub-step boundary,
+        after the evaluation of the fuel flow at this point. Defaults to None.
+    max_steps : int, optional
+        Maximum number of sub-steps, accepted or rejected. Defaults to 10000.
+
+    Returns
+    -------
+    pandas.DataFrame
+        `time` [s], `mass` [kg], `fuel_flow` [kg/s] and accumulated `error`
+        estimate [kg] at the accepted sub-step boundaries; the number of
+        rejected sub-steps and of fuel flow evaluations are stored in `attrs`.
+
+    Raises
+    ------
+    ValueError
+        If the duration is negative.
+    RuntimeError
+        If the integration needs more than `max_steps` sub-steps.
+    """
+    if duration < 0.0:
+        raise ValueError(f"The cruise duration must be positive; got {duration} s")
+
+    n_evaluations = 1
+    t, m = 0.0, float(m0)
+    flow = float(fuel_flow(t, m))
+    if callback is not None:
+        callback(t, m)
+    rows = [(t, m, flow, 0.0)]
+    error = 0.0
+    n_rejected = 0
+    h = min(duration, max_dt)
+
+    for _ in range(max_steps):
+        if duration - t <= 1e-12 * max(1.0, duration):
+            break
+        h = min(h, duration - t, max_dt)
+        k0 = flow / m
+        m_mid = m * np.exp(-0.5 * k0 * h)
+        k_mid = float(fuel_flow(t + 0.5 * h, m_mid)) / m_mid
+        m1 = m * np.exp(-k_mid * h)
+        flow1 = float(fuel_flow(t + h, m1))
+        n_evaluations += 2
+        local_error = abs(m * np.exp(-0.5 * (k0 + flow1 / m1) * h) - m1)
+        ratio = local_error / max(rtol * (m - m1), 1e-300)
+        # The local error is of third order in h and the allowed error of first order
+        factor = SAFETY_FACTOR * max(ratio, 1e-12) ** -0.5
+        factor = min(MAX_STEP_FACTOR, max(MIN_STEP_FACTOR, factor))
+
+        if ratio <= 1.0:
+            t += h
+            m, flow = m1, flow1
+            error += local_error
+            if callback is not None:
+                callback(t, m)
+            rows.append((t, m, flow, error))
+        else:
+            n_rejected += 1
+        h *= factor
+    else:
+        raise RuntimeError(
+            f"Breguet cruise not completed in {max_steps} sub-steps (t={t:.1f} s of {duration:.1f} s)"
+        )
+
+    trajectory = pandas.DataFrame(rows, columns=["time", "mass", "fuel_flow", "error"])
+    trajectory.attrs["n_rejected"] = n_rejected
+    trajectory.attrs["n_evaluations"] = n_evaluations
+    return trajectory
+
+
+class BreguetCruise(Driver):
+    """
+    Driver flying a `Cruise_segment` to its target distance with analytic Breguet sub-steps.
+
+    The segment is flown at its initial speed and altitude; the state of the
+    segment (position and `mass_variation`) is set at each sub-step boundary
+    and midpoint, where the equilibrium is solved by the child drivers (e.g. a
+    `NonLinearSolver` on `alpha`) to update the fuel flow. The time step is
+    controlled by the error estimate of `breguet_cruise`, so a cruise of
+    several hours is flown in a few sub-steps instead of thousands of
+    Runge-Kutta steps.
+
+    Records are written at each accepted sub-step boundary.
+
+    Attributes
+    ----------
+    rtol : float
+        Relative tolerance on the cruise fuel.
+    max_dt : float
+        Maximum sub-step [s].
+    trajectory : pandas.DataFrame
+        Accepted sub-step boundaries of the last run (see `breguet_cruise`).
+    """
+
+    __slots__ = ("rtol", "max_dt", "trajectory", "__clock")
+
+    def __init__(self, name="Breguet", owner=None, rtol=1e-4, max_dt=3600.0, **options):
+        """
+        Initialise the driver.
+
+        Parameters
+        ----------
+        name : str, optional
+            Driver name. Defaults to 'Breguet'.
+        owner : System, optional
+            Cruise segment to which the driver belongs. Defaults to None.
+        rtol : float, optional
+            Relative tolerance on the cruise fuel. Defaults to 1e-4.
+        max_dt : float, optional
+            Maximum sub-step [s]. Defaults to 3600.
+        **options
+            Driver options.
+        """
+        super().__init__(name, owner, **options)
+        self.rtol = rtol
+        self.max_dt = max_dt
+        self.trajectory = None
+        self.__clock = UniversalClock()
+
+    @property
+    def time(self):
+        """
+        float : Current simulation time [s].
+        """
+        return self.__clock.time
+
+    @property
+    def fuel_error(self):
+        """
+        float : Estimated error on the cruise fuel of the last run [kg].
+        """
+        return np.nan if self.trajectory is None else self.trajectory["error"].iloc[-1]
+
+    def add_recorder(self, recorder, period=None):
+        """
+        Add a recorder, written at each accepted sub-step boundary.
+
+        Parameters
+        ----------
+        recorder : BaseRecorder
+            Recorder; `time` is added to its variables.
+        period : float, optional
+            Ignored; accepted for compatibility with the time drivers.
+
+        Returns
+        -------
+        BaseRecorder
+            The recorder.
+        """
+        if "time" not in recorder:
+            recorder = type(recorder).extend(recorder, includes="time")
+        return super().add_recorder(recorder)
+
+    def _solve(self):
+        """
+        Solve the equilibrium of the segment with the child drivers, or compute it once without.
+        """
+        if self.children:
+            for child in self.children.values():
+                child.run_once()
+        else:
+            self.owner.run_once()
+
+    def compute(self):
+        """
+        Fly the cruise segment from its current state to the target distance.
+        """
+        segment = self.owner
+        clock = self.__clock
+        clock.reset(0.0)
+
+        position = np.array(segment.in_p.position, dtype=float)
+        speed = float(segment.in_p.TAS_speed[0])
+        mass_variation = np.array(segment.mass_variation, dtype=float)
+        m0 = float(np.ravel(segment.m0 - mass_variation)[0])
+        distance = segment.Cruise_distance_target - (
+            position[0] - segment.Cruise_pos_init[0]
+        )
+        duration = max(0.0, distance / speed)
+
+        def fuel_flow(t, m):
+            clock.time = t
+            segment.in_p.position = position + np.array([speed * t, 0.0, 0.0])
+            segment.mass_variation = mass_variation + (m0 - m)
+            self._solve()
+            return float(np.ravel(segment.CS)[0])
+
+        recorder = self._recorder
+
+        def record(t, m):
+            if recorder is not None:
+                recorder.record_state(f"t={t:.14}", self.status, self.error_code)
+
+        self.trajectory = breguet_cruise(
+            fuel_flow,
+            m0,
+            duration,
+            rtol=self.rtol,
+            max_dt=self.max_dt,
+            callback=record,
+        )
+        logger.debug(
+            f"{self.name}: {len(self.trajectory) - 1} Breguet sub-steps, "
+            f"estimated fuel error {self.fuel_error:.3g} kg"
+        )
@@ -0,0 +1,388 @@
+import os
+import copy
+import tempfile
+import numpy as np
+import pandas
+from cosapp.recorders.recorder import BaseRecorder
+
+
+class ColumnarRecorder(BaseRecorder):
+    """
+    Record data into preallocated NumPy columns.
+
+    Each recorded variable has its own column buffer, allocated on the first
+    record with the type and shape of the variable and grown geometrically when
+    full. Records are written in place in the columns, so that long simulations
+    do not build a list of rows; data are only converted to a `pandas.DataFrame`
+    or to a structured array by `export_data` and `export_array`.
+
+    Columns may be spilled to memory-mapped files, either from the start or once
+    they exceed a number of records, for very long missions.
+
+    Parameters
+    ----------
+    includes : str or list of str, optional
+        Variables matching these patterns will be included; default `'*'` (i.e. all variables).
+    excludes : str or list of str or None, optional
+        Variables matching these patterns will be excluded; default `None` (i.e. nothing is excluded).
+    numerical_only : bool, optional
+        Keep only numerical variables (i.e. number or numerical vector); default False.
+    section : str, optional
+        Current section name; default `''`.
+    precision : int, optional
+        Precision digits when writing floating point number; default 9.
+    hold : bool, optional
+        Append the new data or not; default `False`.
+    raw_output : bool, optional
+        Raw output, without units in column headers; default `True`.
+    capacity : int, optional
+        Initial number of records of the columns; default 1024.
+    growth : float, optional
+        Growth factor of the columns when full; default 2.
+    spill_records : int or None, optional
+        Number of records above which numerical columns are memory-mapped;
+        0 to memory-map them from the start, `None` to keep them in memory (default).
+    spill_dir : str or None, optional
+        Directory of the memory-mapped files; a temporary directory by default.
+    """
+
+    def __init__(
+        self,
+        includes="*",
+        excludes=None,
+        numerical_only=False,
+        section="",
+        precision=9,
+        hold=False,
+        raw_output=True,
+        capacity=1024,
+        growth=2.0,
+        spill_records=None,
+        spill_dir=None,
+    ):
+        super().__init__(
+            includes, excludes, numerical_only, section, precision, hold, raw_output
+        )
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive; got {capacity}")
+        if growth <= 1.0:
+            raise ValueError(f"growth must be greater than 1; got {growth}")
+        self.capacity = int(capacity)
+        self.growth = growth
+        self.spill_records = spill_records
+        self.spill_dir = spill_dir
+        self._size = 0
+        self._columns = None
+        self._files = {}
+        self._tmpdir = None
+        self._counter = 0
+
+    @classmethod
+    def extend(cls, recorder, includes=[], excludes=[]):
+        """
+        Return a new recorder with extended `includes` and `excludes` fields.
+
+        Parameters
+        ----------
+        recorder : ColumnarRecorder
+            Recorder to extend, whose buffer settings are kept.
+        includes : str or list of str, optional
+            Variables patterns extending the inclusion patterns.
+        excludes : str or list of str, optional
+            Variables patterns extending the exclusion patterns.
+
+        Returns
+        -------
+        ColumnarRecorder
+            The new recorder.
+        """
+        new = super().extend(recorder, includes, excludes)
+        new.capacity = recorder.capacity
+        new.growth = recorder.growth
+        new.spill_records = recorder.spill_records
+        new.spill_dir = recorder.spill_dir
+        return new
+
+    def __len__(self):
+        """
+        Return the number of records.
+
+        Returns
+        -------
+        int
+            Number of records.
+        """
+        return self._size
+
+    @property
+    def spilled(self):
+        """
+        bool : Whether the numerical columns are memory-mapped.
+        """
+        return bool(self._files)
+
+    @property
+    def _headers(self):
+        """
+        list : Names of the special columns followed by the variables.
+        """
+        return [
+            self.SPECIALS.section,
+            self.SPECIALS.status,
+            self.SPECIALS.code,
+            self.SPECIALS.reference,
+        ] + self.field_names()
+
+    def _allocate(self, values, capacity):
+        """
+        Create the column buffers from the first record.
+
+        Parameters
+        ----------
+        values : list
+            First record values of the special columns and of the variables.
+        capacity : int
+            Number of records of the columns.
+        """
+        columns = []
+        for value in values:
+            array = np.asarray(value)
+            if array.dtype.kind in "biuf":
+                column = np.empty((capacity,) + array.shape, dtype=array.dtype)
+            else:
+                column = np.empty(capacity, dtype=object)
+            columns.append(column)
+        if self.spill_records == 0:
+            columns = [
+                (
+                    column
+                    if column.dtype == object
+                    else self._mapped_copy(i, column, capacity)
+                )
+                for i, column in enumerate(columns)
+            ]
+        self._columns = columns
+
+    @property
+    def _directory(self):
+        """
+        str : Directory of the memory-mapped files, a temporary one being created if needed.
+        """
+        if self.spill_dir is not None:
+            return self.spill_dir
+        if self._tmpdir is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="amad_recorder_")
+        return self._tmpdir.name
+
+    def _mapped_copy(self, index, column, capacity):
+        """
+        Copy a column into a new memory-mapped file.
+
+        Parameters
+        ----------
+        index : int
+            Column index.
+        column : numpy.ndarray
+            Column to copy.
+        capacity : int
+            Number of records of the new column.
+
+        Returns
+        -------
+        numpy.memmap
+            Memory-mapped column.
+        """
+        self._counter += 1
+        path = os.path.join(
+            self._directory, f"recorder_{id(self)}_{index}_{self._counter}.npy"
+        )
+        mapped = np.lib.format.open_memmap(
+            path, mode="w+", dtype=column.dtype, shape=(capacity,) + column.shape[1:]
+        )
+        mapped[: self._size] = column[: self._size]
+        old_path = self._files.get(index)
+        self._files[index] = path
+        if old_path is not None:
+            os.remove(old_path)
+        return mapped
+
+    def _grow(self):
+        """
+        Grow the column buffers geometrically.
+        """
+        capacity = len(self._columns[0])
+        capacity = max(capacity + 1, int(np.ceil(capacity * self.growth)))
+        spill = self.spill_records is not None and capacity > self.spill_records
+        for i, column in enumerate(self._columns):
+            if i in self._files or (spill and column.dtype != object):
+                self._columns[i] = self._mapped_copy(i, column, capacity)
+            else:
+                new = np.empty((capacity,) + column.shape[1:], dtype=column.dtype)
+                new[: self._size] = column[: self._size]
+                self._columns[i] = new
+
+    def _promote(self, index, column, dtype):
+        """
+        Convert a column to a wider numerical type, keeping it memory-mapped if it is.
+
+        Parameters
+        ----------
+        index : int
+            Column index.
+        column : numpy.ndarray
+            Column typed from its first value.
+        dtype : numpy.dtype
+            Type holding both the recorded values and the new one.
+
+        Returns
+        -------
+        numpy.ndarray
+            Converted column.
+        """
+        promoted = column.astype(dtype)
+        if index in self._files:
+            promoted = self._mapped_copy(index, promoted, len(promoted))
+        return promoted
+
+    def formatted_data(self):
+        """
+        Collect recorded data from watched object into a list.
+
+        Values are not copied here: numerical values are copied into the
+        columns by `_record`, other objects are deep-copied.
+
+        Returns
+        -------
+        list
+            Recorded values.
+        """
+        return self.collected_data()
+
+    def _record(self, line):
+        """
+        Write a record in the columns.
+
+        Parameters
+        ----------
+        line : list
+            Values of the special columns followed by the variable values.
+        """
+        if self._columns is None:
+            self._allocate(line, self.capacity)
+        elif self._size == len(self._columns[0]):
+            self._grow()
+        n = self._size
+        for i, (column, value) in enumerate(zip(self._columns, line)):
+            if column.dtype != object:
+                dtype = np.asarray(value).dtype
+                if dtype.kind in "biuf" and not np.can_cast(dtype, column.dtype):
+                    # Column typed from an integer or boolean first value, such as
+                    # the start time of a driver or an initial `mass_variation` of 0
+                    column = self._columns[i] = self._promote(
+                        i, column, np.result_type(column.dtype, dtype)
+                    )
+            column[n] = copy.deepcopy(value) if column.dtype == object else value
+        self._size = n + 1
+
+    @property
+    def _raw_data(self):
+        """
+        Return a raw/unformatted version of records.
+
+        Returns
+        -------
+        list of list
+            Records of `watched_object` for variables given by method `field_names()`.
+        """
+        return [list(row) for row in zip(*self.columns().values())]
+
+    def columns(self):
+        """
+        Return views of the recorded columns by name.
+
+        Returns
+        -------
+        dict
+            Column arrays by special column or variable name, without copy.
+        """
+        if self._columns is None:
+            return {name: np.empty(0) for name in self._headers}
+        return {
+            name: column[: self._size]
+            for name, column in zip(self._headers, self._columns)
+        }
+
+    def export_array(self):
+        """
+        Export recorded results into a contiguous structured array.
+
+        Array variables are stored as sub-array fields.
+
+        Returns
+        -------
+        numpy.ndarray
+            Structured array with one field per column.
+        """
+        columns = self.columns()
+        dtype = [
+            (name, column.dtype, column.shape[1:]) for name, column in columns.items()
+        ]
+        array = np.empty(len(columns[self.SPECIALS.reference]), dtype=dtype)
+        for name, column in columns.items():
+            array[name] = column
+        return array
+
+    def export_data(self):
+        """
+        Export recorded results into a pandas.DataFrame object.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Records with the same columns as `DataFrameRecorder`.
+        """
+        headers = self._headers
+        if not self._raw_output:
+            varlist = self.field_names()
+            headers = headers[:4] + [
+                f"{name} [{unit}]"
+                for name, unit in zip(varlist, self._get_units(varlist))
+            ]
+        data = {}
+        for header, column in zip(headers, self.columns().values()):
+            data[header] = list(column) if column.ndim > 1 else np.array(column)
+        return pandas.DataFrame(data, columns=headers)
+
+    def start(self):
+        """
+        Initialize recording support.
+        """
+        super().start()
+        if not self.hold:
+            self.clear_buffers()
+
+    def clear_buffers(self):
+        """
+        Release the column buffers and their memory-mapped files.
+        """
+        self._columns = None
+        self._size = 0
+        for path in self._files.values():
+            if os.path.exists(path):
+                os.remove(path)
+        self._files = {}
+
+    def exit(self):
+        """
+        Close recording session, flushing the memory-mapped columns.
+        """
+        if self._columns is not None:
+            for i in self._files:
+                self._columns[i].flush()
+
+    def clear(self):
+        """
+        Clear all previously stored data.
+        """
+        self.clear_buffers()
+        super().clear()
@@ -0,0 +1,358 @@
+"""________________________________________________________________________________
+
+                              DENSE TRAJECTORY MODULE
+___________________________________________________________________________________"""
+
+# Dense output of segment and mission trajectories. Only the recorded step nodes are
+# stored; the variables are interpolated between them by piecewise cubic Hermite
+# polynomials, with the exact state derivatives of the nodes when they are recorded
+# (position, speed and mass of the segments), and with monotonic slopes otherwise.
+# The trajectories can then be evaluated at any time, or resampled at any resolution
+# with the segment boundaries and events, without running the mission again.
+# denseTrajectory.py
+
+import numpy as np
+import pandas
+from scipy.interpolate import CubicHermiteSpline, PchipInterpolator
+
+import amad.tools.unit_conversion as uc
+
+# Variables recorded by the segment drivers for the dense output: transients and derivatives
+RATE_VARIABLES = ["in_p.position", "in_p.TAS_speed", "CS", "a"]
+
+# Time derivatives of the segment variables, as the name of the derivative column or as a
+# function of the columns. The derivatives of the plotted outputs are in ft/s and NM/s.
+SEGMENT_RATES = {
+    "in_p.position": "in_p.TAS_speed",
+    "in_p.TAS_speed": "a",
+    "mass_variation": "CS",
+    "out_p.fuel_mass": "CS",
+    "mass": lambda columns: -columns["CS"],
+    "Altitude": lambda columns: uc.m2ft(columns["in_p.TAS_speed"][:, 2]),
+    "Distance": lambda columns: uc.m2nm(columns["in_p.TAS_speed"][:, 0]),
+}
+
+# Special columns of the CoSApp recorders, not interpolated
+SPECIAL_COLUMNS = ("Section", "Status", "Error code", "Reference")
+
+
+class DenseTrajectory:
+    """
+    Dense output of a trajectory over its step nodes.
+
+    Floating-point variables are interpolated by cubic Hermite polynomials between
+    the nodes, using their derivatives when known and monotonic (PCHIP) slopes
+    otherwise; the other variables (labels, flags...) keep the value of the last node.
+    A trajectory may be made of several pieces (the segments of a mission), each
+    one being interpolated separately: a time at the boundary of two pieces is
+    evaluated on the following one.
+
+    Interpolants are built on the first evaluation of each variable.
+
+    Attributes
+    ----------
+    time : numpy.ndarray
+        Node times [s], increasing.
+    values : dict
+        Node values of the variables, by name, with the nodes along the first axis.
+    rates : dict
+        Node time derivatives of some variables, by variable name.
+    starts : numpy.ndarray
+        Index of the first node of each piece.
+    names : list of str
+        Piece names, e.g. the segment names.
+    """
+
+    def __init__(self, time, values, rates=None, starts=None, names=None):
+        """
+        Initialise a trajectory from its nodes.
+
+        Records at the same time (e.g. the event and final records of a segment) are
+        merged into the last one.
+
+        Parameters
+        ----------
+        time : array_like
+            Node times [s], non-decreasing.
+        values : dict
+            Node values of the variables, by name.
+        rates : dict, optional
+            Node time derivatives of some variables, by variable name. Defaults to None.
+        starts : array_like of int, optional
+            Index of the first node of each piece. Defaults to a single piece.
+        names : list of str, optional
+            Piece names. Defaults to None.
+
+        Raises
+        ------
+        ValueError
+            If the times decrease, or if a piece has no node.
+        """
+        time = np.asarray(time, dtype=float)
+        starts = np.zeros(1, dtype=int) if starts is None else np.asarray(starts)
+        pieces = np.zeros(len(time), dtype=int)
+        pieces[starts[1:]] = 1
+        pieces = np.cumsum(pieces)
+        if np.any(np.diff(time) < 0.0):
+            raise ValueError("The node times must be non-decreasing")
+        keep = np.ones(len(time), dtype=bool)
+        keep[:-1] = (np.diff(time) > 0.0) | (np.diff(pieces) > 0)
+        if np.any(np.bincount(pieces[keep], minlength=len(starts)) == 0):
+            raise ValueError("Each piece of a trajectory must have a node")
+
+        self.time = time[keep]
+        self.values = {name: np.asarray(value)[keep] for name, value in values.items()}
+        self.rates = {
+            name: np.asarray(rate, dtype=float)[keep]
+            for name, rate in (rates or {}).items()
+            if name in self.values
+        }
+        self.starts = np.flatnonzero(np.diff(pieces[keep], prepend=-1))
+        self.names = list(names) if names is not None else [None] * len(self.starts)
+        self._interpolants = {}
+
+    @classmethod
+    def from_records(cls, records, rates=SEGMENT_RATES, name=None):
+        """
+        Create a trajectory from the records of a segment driver.
+
+        Parameters
+        ----------
+        records : ColumnarRecorder, BaseRecorder or pandas.DataFrame
+            Recorder, or exported records, with a `time` column; units in the
+            column headers are dropped from the variable names.
+        rates : dict, optional
+            Time derivatives of the variables, as the name of their column or as a function
+            of the columns; derivatives of missing columns are ignored. Defaults to `SEGMENT_RATES`.
+        name : str, optional
+            Name of the trajectory piece, e.g. the segment name. Defaults to None.
+
+        Returns
+        -------
+        DenseTrajectory
+            Trajectory over the recorded nodes.
+
+        Raises
+        ------
+        ValueError
+            If the records have no time column.
+        """
+        if hasattr(records, "columns") and callable(records.columns):
+            columns = records.columns()
+        else:
+            if not isinstance(records, pandas.DataFrame):
+                records = records.export_data()
+            columns = {
+                header: np.array(list(records[header])) for header in records.columns
+            }
+        columns = {
+            header.split(" [")[0]: column
+            for header, column in columns.items()
+            if header not in SPECIAL_COLUMNS
+        }
+        if "time" not in columns:
+            raise ValueError("The records have no time column")
+
+        derivatives = {}
+        for variable, rate in rates.items():
+            if variable not in columns:
+                continue
+            try:
+                derivative = columns[rate] if isinstance(rate, str) else rate(columns)
+            except KeyError:
+                continue
+            derivatives[variable] = np.reshape(derivative, np.shape(columns[variable]))
+        time = columns.pop("time")
+        return cls(time, columns, derivatives, names=[name])
+
+    @classmethod
+    def concatenate(cls, trajectories):
+        """
+        Chain trajectories, each one starting at the end time of the previous one.
+
+        Parameters
+        ----------
+        trajectories : list of DenseTrajectory
+            Trajectories to chain, e.g. the segments of a mission whose times start at 0.
+
+        Returns
+        -------
+        DenseTrajectory
+            Trajectory with one piece per piece of the chained trajectories,
+            over the variables common to all of them.
+        """
+        offset = 0.0
+        times, starts, names = [], [], []
+        size = 0
+        for trajectory in trajectories:
+            time = trajectory.time - trajectory.time[0] + offset
+            times.append(time)
+            starts.extend(trajectory.starts + size)
+            names.extend(trajectory.names)
+            size += len(time)
+            offset = time[-1]
+        common = [
+            name
+            for name in trajectories[0].values
+            if all(name in trajectory.values for trajectory in trajectories)
+        ]
+        # Pieces without the derivatives of a variable get NaN ones, to be interpolated by PCHIP
+        rated = [
+            name
+            for name in common
+            if any(name in trajectory.rates for trajectory in trajectories)
+        ]
+        return cls(
+            np.concatenate(times),
+            {
+                name: np.concatenate([t.values[name] for t in trajectories])
+                for name in common
+            },
+            {
+                name: np.concatenate(
+                    [
+                        t.rates.get(name, np.full(t.values[name].shape, np.nan))
+                        for t in trajectories
+                    ]
+                )
+                for name in rated
+            },
+            starts=starts,
+            names=names,
+        )
+
+    @property
+    def nbytes(self):
+        """
+        int : Memory size of the node arrays [bytes].
+        """
+        arrays = [self.time, *self.values.values(), *self.rates.values()]
+        return sum(array.nbytes for array in arrays)
+
+    @property
+    def bounds(self):
+        """
+        tuple : Start and end times of the trajectory [s].
+        """
+        return self.time[0], self.time[-1]
+
+    @property
+    def event_times(self):
+        """
+        numpy.ndarray : Start times of the pieces and end time of the trajectory [s].
+        """
+        return np.append(self.time[self.starts], self.time[-1])
+
+    def _interpolant(self, name, piece):
+        """
+        Return the interpolation function of a variable over a piece.
+
+        Parameters
+        ----------
+        name : str
+            Variable name.
+        piece : int
+            Piece index.
+
+        Returns
+        -------
+        callable
+            Function of the times of the piece, returning the variable values.
+        """
+        key = (name, piece)
+        if key not in self._interpolants:
+            end = self.starts[piece + 1] if piece + 1 < len(self.starts) else None
+            nodes = slice(self.starts[piece], end)
+            time, value = self.time[nodes], self.values[name][nodes]
+            if value.dtype.kind != "f" or len(time) == 1:
+
+                def interpolant(t, time=time, value=value):
+                    index = np.searchsorted(time, t, side="right") - 1
+                    return value[np.clip(index, 0, len(time) - 1)]
+
+            elif name in self.rates and np.all(np.isfinite(self.rates[name][nodes])):
+                interpolant = CubicHermiteSpline(
+                    time, value, self.rates[name][nodes], axis=0
+                )
+            else:
+                interpolant = PchipInterpolator(time, value, axis=0)
+            self._interpolants[key] = interpolant
+        return self._interpolants[key]
+
+    def __call__(self, times, names=None):
+        """
+        Evaluate the variables at given times.
+
+        Parameters
+        ----------
+        times : float or array_like
+            Evaluation times [s], within the trajectory bounds.
+        names : list of str, optional
+            Names of the variables to evaluate. Defaults to all variables.
+
+        Returns
+        -------
+        dict
+            Variable values by name, with the times along the first axis
+            (without this axis for a single time).
+
+        Raises
+        ------
+        ValueError
+            If a time is out of the trajectory bounds.
+        """
+        scalar = np.ndim(times) == 0
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        start, end = self.bounds
+        if np.any((times < start) | (times > end)):
+            raise ValueError(
+                f"Evaluation times must be within the trajectory bounds [{start}, {end}]"
+            )
+        pieces = np.searchsorted(self.time[self.starts], times, side="right") - 1
+        results = {}
+        for name in self.values if names is None else names:
+            node = self.values[name]
+            value = np.empty((len(times),) + node.shape[1:], dtype=node.dtype)
+            for piece in np.unique(pieces):
+                mask = pieces == piece
+                value[mask] = self._interpolant(name, piece)(times[mask])
+            results[name] = value[0] if scalar else value
+        return results
+
+    def resample(self, dt=None, n=None, times=None, names=None):
+        """
+        Resample the trajectory, at the piece boundaries and end time among others.
+
+        Parameters
+        ----------
+        dt : float, optional
+            Time step of a uniform resampling [s].
+        n : int, optional
+            Number of points of a uniform resampling, if `dt` is not given.
+        times : array_like, optional
+            Resampling times [s], if neither `dt` nor `n` are given. Defaults to the nodes.
+        names : list of str, optional
+            Names of the variables to resample. Defaults to all variables.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Values at the resampling times, with a `time` column and a `Segment_name`
+            column for named pieces; array values are stored as arrays in the cells.
+        """
+        start, end = self.bounds
+        if dt is not None:
+            times = np.arange(start, end, dt)
+        elif n is not None:
+            times = np.linspace(start, end, n)
+        elif times is None:
+            times = self.time
+        times = np.union1d(np.clip(times, start, end), self.event_times)
+        results = self(times, names)
+        data = {"time": times}
+        if any(name is not None for name in self.names):
+            pieces = np.searchsorted(self.time[self.starts], times, side="right") - 1
+            data["Segment_name"] = np.asarray(self.names, dtype=object)[pieces]
+        for name, value in results.items():
+            data[name] = list(value) if value.ndim > 1 else value
+        return pandas.DataFrame(data)
@@ -0,0 +1,205 @@
+"""________________________________________________________________________________
+
+                              ENERGY CLIMB MODULE
+___________________________________________________________________________________"""
+
+# Energy-state method of the climb performance. The specific excess power
+# SEP = (T cos(alpha + Thau) - D) V / W of the climb equilibrium of `Climb_segment`
+# is evaluated at once on a grid of masses and altitudes along a CAS/Mach schedule,
+# and the time, fuel and distance to climb are the integrals of 1 / SEP, of the fuel
+# flow / SEP and of the horizontal speed / SEP over the energy height h + V^2 / 2g.
+# energyClimb.py
+
+import numpy as np
+import pandas
+from scipy.integrate import cumulative_trapezoid
+
+import amad.tools.atmosBADA as atmos
+import amad.tools.unit_conversion as uc
+from amad.disciplines.performance.tools.batchMissionSimulator import (
+    BatchMissionSimulator,
+)
+from amad.disciplines.performance.tools.speedSchedule import speed_schedule
+
+speedsclass = atmos.AtmosphereAMAD()
+
+
+class EnergyClimb(BatchMissionSimulator):
+    """
+    Climb performance tables by the energy-state method.
+
+    The climb equilibrium (angle of attack and flight path angle at climb
+    rating) of the batch simulator is solved for all the points of a
+    mass-altitude grid in one evaluation, the speeds following the CAS/Mach
+    schedule of the climb. The time, fuel and distance to climb from the lowest
+    altitude of the grid are then integrated along the altitude for all the
+    masses at once; the mass variation along the climb is accounted for by
+    re-evaluating the grid with the masses of the previous pass.
+
+    With the acceleration along the schedule, the energy height
+    `h + V**2 / (2 g)` is integrated, i.e. part of the excess power accelerates
+    the aircraft; without it, the integrals are those of the quasi-steady climb
+    of `Climb_segment`, whose rate of climb is the specific excess power.
+
+    The tables give fast initial sizing estimates of the climb, and initial
+    masses, times or distances of detailed missions.
+    """
+
+    def point_performance(self, masses, altitudes, CAS, Mach=0.0, alpha=None):
+        """
+        Evaluate the climb equilibrium on a grid of masses and altitudes.
+
+        Parameters
+        ----------
+        masses : array_like
+            Aircraft masses [kg], of shape `(n_masses,)` or `(n_masses, n_altitudes)`.
+        altitudes : array_like
+            Altitudes [m], of shape `(n_altitudes,)`.
+        CAS : float
+            Calibrated airspeed of the climb schedule [kt].
+        Mach : float, optional
+            Mach number of the climb schedule above the crossover altitude [-].
+            Defaults to 0, for a climb at constant CAS.
+        alpha : numpy.ndarray, optional
+            Initial guesses of the angle of attack [deg], of shape `(n_masses, n_altitudes)`.
+            Defaults to 0.
+
+        Returns
+        -------
+        dict
+            Arrays of shape `(n_masses, n_altitudes)`: `TAS` [m/s], `Mach`,
+            `alpha` [deg], `gamma` [rad], `THR` [N], `fuel_flow` [kg/s] and
+            specific excess power `SEP` [m/s].
+        """
+        altitudes = np.asarray(altitudes, dtype=float)
+        masses = np.asarray(masses, dtype=float)
+        if masses.ndim < 2:
+            masses = np.repeat(np.atleast_1d(masses)[:, None], len(altitudes), axis=1)
+        shape = masses.shape
+        z = np.broadcast_to(altitudes, shape).ravel()
+        mode = z >= speed_schedule(CAS, Mach).crossover_altitude
+        segment = {"kind": "climb", "CAS": CAS, "Iso_Mach": Mach, "dISA": 0.0}
+        y = np.column_stack([np.zeros_like(z), z, np.zeros_like(z), masses.ravel()])
+        alpha = np.zeros(z.size) if alpha is None else np.ravel(alpha)
+
+        dy, outputs = self._rates(segment, mode, y, alpha)
+        performance = {
+            name: np.reshape(outputs[name], shape)
+            for name in ("TAS", "Mach", "alpha", "gamma", "THR")
+        }
+        performance["fuel_flow"] = np.reshape(-dy[:, 3], shape)
+        performance["SEP"] = performance["TAS"] * np.sin(performance["gamma"])
+        return performance
+
+    def climb_tables(
+        self, masses, altitudes, CAS, Mach=0.0, acceleration=True, passes=2
+    ):
+        """
+        Compute the time, fuel and distance to climb for a range of initial masses.
+
+        Parameters
+        ----------
+        masses : array_like
+            Aircraft masses at the lowest altitude [kg].
+        altitudes : array_like
+            Increasing altitudes [m], from the start of the climb; the crossover
+            altitude of the schedule is added if within the grid.
+        CAS : float
+            Calibrated airspeed of the climb schedule [kt].
+        Mach : float, optional
+            Mach number of the climb schedule above the crossover altitude [-].
+            Defaults to 0, for a climb at constant CAS.
+        acceleration : bool, optional
+            Whether the acceleration along the schedule is accounted for. Defaults to True.
+        passes : int, optional
+            Number of evaluations of the grid, the first one at constant mass. Defaults to 2.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `time` [s], `fuel` [kg] and `distance` [m] to climb, `mass` [kg],
+            `TAS` [m/s], `Mach`, `CAS` [kt], `SEP` and rate of climb `RC` [m/s],
+            indexed by initial mass `m0` and `altitude`. Values above the
+            ceiling (null specific excess power) are NaN.
+
+        Raises
+        ------
+        ValueError
+            If the altitudes are not increasing.
+        """
+        masses = np.atleast_1d(np.asarray(masses, dtype=float))
+        altitudes = np.asarray(altitudes, dtype=float)
+        if len(altitudes) < 2 or np.any(np.diff(altitudes) <= 0.0):
+            raise ValueError(
+                "The climb altitudes must be at least two increasing values"
+            )
+        crossover = speed_schedule(CAS, Mach).crossover_altitude
+        if altitudes[0] < crossover < altitudes[-1]:
+            altitudes = np.union1d(altitudes, [crossover])
+
+        mass = np.repeat(masses[:, None], len(altitudes), axis=1)
+        alpha = None
+        for _ in range(max(1, passes)):
+            performance = self.point_performance(mass, altitudes, CAS, Mach, alpha)
+            alpha = performance["alpha"]
+            TAS, SEP = performance["TAS"], performance["SEP"]
+            height = altitudes + acceleration * TAS**2 / (2.0 * self.g)
+            with np.errstate(divide="ignore"):
+                inverse = np.where(SEP > 0.0, 1.0 / SEP, np.nan)
+            integrals = {
+                name: cumulative_trapezoid(rate * inverse, height, axis=1, initial=0.0)
+                for name, rate in (
+                    ("time", 1.0),
+                    ("fuel", performance["fuel_flow"]),
+                    ("distance", TAS * np.cos(performance["gamma"])),
+                )
+            }
+            # Mass of the next pass, kept at its last value above the ceiling
+            mass = masses[:, None] - np.fmax.accumulate(integrals["fuel"], axis=1)
+
+        integrals["mass"] = masses[:, None] - integrals["fuel"]
+        integrals["TAS"] = TAS
+        integrals["Mach"] = performance["Mach"]
+        integrals["CAS"] = uc.ms2kt(speedsclass.tas2cas_array(TAS, altitudes))
+        integrals["SEP"] = SEP
+        integrals["RC"] = SEP / (
+            1.0
+            + acceleration * TAS * self._speed_gradient(altitudes, CAS, Mach) / self.g
+        )
+        index = pandas.MultiIndex.from_product(
+            [masses, altitudes], names=["m0", "altitude"]
+        )
+        return pandas.DataFrame(
+            {name: np.ravel(values) for name, values in integrals.items()}, index=index
+        )
+
+    @staticmethod
+    def _speed_gradient(altitudes, CAS, Mach, step=1.0):
+        """
+        Compute the derivative of the true airspeed of a CAS/Mach schedule with the altitude.
+
+        Parameters
+        ----------
+        altitudes : numpy.ndarray
+            Altitudes [m].
+        CAS : float
+            Calibrated airspeed of the schedule [kt].
+        Mach : float
+            Mach number of the schedule above the crossover altitude [-].
+        step : float, optional
+            Altitude step of the centered differences [m]. Defaults to 1.
+
+        Returns
+        -------
+        numpy.ndarray
+            Derivative of the true airspeed [1/s], on the law of each altitude
+            (the Mach law at the crossover altitude).
+        """
+        z = np.stack([altitudes - step, altitudes + step])
+        mode = altitudes >= speed_schedule(CAS, Mach).crossover_altitude
+        TAS = np.where(
+            mode,
+            speedsclass.mach2tas_array(Mach, z),
+            speedsclass.cas2tas_array(uc.kt2ms(CAS), z),
+        )
+        return (TAS[1] - TAS[0]) / (2.0 * step)
@@ -0,0 +1,238 @@
+"""________________________________________________________________________________
+
+                              EQUILIBRIUM PREDICTOR MODULE
+___________________________________________________________________________________"""
+
+# Warm start of the equilibrium unknowns (alpha, and Throttle in descent) of the
+# segment solvers between time steps, and per-step solver counters.
+# The CoSApp `NonLinearSolver` starts each resolution from the initial values
+# read at the beginning of the run; the predictor replaces them before each
+# resolution by the extrapolation of the unknowns from the last two accepted steps.
+# equilibriumPredictor.py
+
+import numpy as np
+import pandas
+from cosapp.drivers import NonLinearSolver, RungeKutta
+
+from amad.disciplines.performance.tools.adaptiveRungeKutta import AdaptiveRungeKutta
+
+# Attributes of the time drivers with predictor
+PREDICTOR_SLOTS = (
+    "predictor",
+    "_history",
+    "_counts",
+    "_step_start",
+    "_solves",
+    "step_statistics",
+)
+
+
+def _unknown_vector(solver):
+    """
+    Return the current values of the unknowns of a solver, as its iteratives vector.
+
+    Parameters
+    ----------
+    solver : NonLinearSolver
+        Solver, after its setup.
+
+    Returns
+    -------
+    numpy.ndarray
+        Unknown values, masked as in `set_iteratives`.
+    """
+    values = []
+    for unknown in solver.problem.unknowns.values():
+        value = np.asarray(unknown.value, dtype=float)
+        if unknown.mask is not None:
+            value = value[unknown.mask]
+        values.append(np.ravel(value))
+    return np.concatenate(values) if values else np.empty(0)
+
+
+class EquilibriumPredictor:
+    """
+    Time driver mixin predicting the unknowns of the child solvers before each resolution.
+
+    The unknown values of the `NonLinearSolver` children are stored at each
+    accepted time step; before each resolution, at a Runge-Kutta stage or at
+    the end of a step, the initial values of the solvers are set to the linear
+    extrapolation of the last two accepted values (the last value after the
+    first step). The history is cleared at each event transition, as the
+    unknowns may jump with the mode of the segment (e.g. IsoMach).
+
+    The number of resolutions, residual and Jacobian evaluations of the solvers
+    are counted for each accepted step, from the start of the step to the
+    start of the next one (i.e. including the resolution at the end of the step).
+
+    Attributes
+    ----------
+    predictor : bool
+        Whether the unknowns are extrapolated; if False, only the counters are updated.
+    step_statistics : list of tuple
+        Start time [s], number of resolutions, residual and Jacobian evaluations of each step.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *args, predictor=True, **kwargs):
+        """
+        Initialise the driver.
+
+        Parameters
+        ----------
+        *args
+            Positional arguments of the time driver.
+        predictor : bool, optional
+            Whether the unknowns are extrapolated. Defaults to True.
+        **kwargs
+            Keyword arguments of the time driver.
+        """
+        super().__init__(*args, **kwargs)
+        self.predictor = predictor
+        self._history = []
+        self._counts = np.zeros(3, dtype=int)
+        self._step_start = None
+        self._solves = {}
+        self.step_statistics = []
+
+    @property
+    def _solvers(self):
+        """
+        list : Child non-linear solvers.
+        """
+        return [
+            child
+            for child in self.children.values()
+            if isinstance(child, NonLinearSolver)
+        ]
+
+    def _precompute(self):
+        """
+        Reset the history and the counters before a run.
+        """
+        super()._precompute()
+        self._history = []
+        self._counts[:] = 0
+        self._step_start = None
+        self._solves = {}
+        self.step_statistics = []
+
+    def _predict(self, t):
+        """
+        Set the initial values of the solvers to the extrapolated unknowns at time `t`.
+
+        Parameters
+        ----------
+        t : float
+            Time of the next resolution [s].
+        """
+        if not self.predictor or not self._history:
+            return
+        t1, values1 = self._history[-1]
+        if len(self._history) > 1:
+            t0, values0 = self._history[0]
+            ratio = (t - t1) / (t1 - t0)
+            predicted = [x1 + ratio * (x1 - x0) for x0, x1 in zip(values0, values1)]
+        else:
+            predicted = values1
+        for solver, x in zip(self._solvers, predicted):
+            if x.shape == solver.initial_values.shape:
+                solver.initial_values[:] = x
+
+    def _count(self):
+        """
+        Add the evaluations of the last resolutions of the solvers to the step counters.
+        """
+        for solver in self._solvers:
+            calls = solver.compute_calls
+            if calls != self._solves.get(solver.name, 0):
+                self._solves[solver.name] = calls
+                results = solver.results
+                self._counts += (1, results.fres_calls, results.jac_calls)
+
+    def _close_step(self):
+        """
+        Store the counters of the current step, if any, and reset them.
+        """
+        if self._step_start is not None:
+            self.step_statistics.append((self._step_start, *self._counts.tolist()))
+        self._counts[:] = 0
+
+    def _set_time(self, t):
+        """
+        Predict the unknowns, then set the time and solve the system.
+
+        Parameters
+        ----------
+        t : float
+            New time [s].
+        """
+        self._predict(t)
+        super()._set_time(t)
+        self._count()
+
+    def _update_transients(self, dt):
+        """
+        Store the accepted unknowns at the start of the step, then integrate the transients.
+
+        Parameters
+        ----------
+        dt : float
+            Time step [s].
+        """
+        self._close_step()
+        t = self.time
+        self._step_start = t
+        values = [_unknown_vector(solver) for solver in self._solvers]
+        if self._history and t <= self._history[-1][0]:
+            # Time set back, e.g. to an event: older values are not on the trajectory
+            self._history = []
+        self._history = self._history[-1:] + [(t, values)]
+        super()._update_transients(dt)
+
+    def transition(self):
+        """
+        Execute the owner system transition and clear the history of the unknowns.
+        """
+        super().transition()
+        self._history = []
+
+    def compute(self):
+        """
+        Run the time simulation, then store the counters of the last step.
+        """
+        super().compute()
+        self._close_step()
+        self._step_start = None
+
+    def solver_statistics(self):
+        """
+        Return the solver counters of the accepted steps of the last run.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Step start `time` [s], number of `resolutions`, `residual_calls`
+            and `jacobian_calls` of each step.
+        """
+        return pandas.DataFrame(
+            self.step_statistics,
+            columns=["time", "resolutions", "residual_calls", "jacobian_calls"],
+        )
+
+
+class PredictorRungeKutta(EquilibriumPredictor, RungeKutta):
+    """
+    Runge-Kutta time driver with predicted equilibrium unknowns (see `EquilibriumPredictor`).
+    """
+
+    __slots__ = PREDICTOR_SLOTS
+
+
+class PredictorAdaptiveRungeKutta(EquilibriumPredictor, AdaptiveRungeKutta):
+    """
+    Adaptive-step time driver with predicted equilibrium unknowns (see `EquilibriumPredictor`).
+    """
+
+    __slots__ = PREDICTOR_SLOTS
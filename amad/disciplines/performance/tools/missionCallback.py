@@ -1,3 +1,9 @@
+import copy
+import queue
+import threading
+import time
+
+
 def empty_callback(*kwargs):
     """
     Does nothing. This is an empty callback function.
@@ -29,6 +35,7 @@ class MissionCallback:
     callback_method : function
         The function to be called when the callback is triggered.
     """
+
     def __init__(self):
         """
         Initialize the object.
@@ -62,6 +69,221 @@ class MissionCallback:
         self.callback_method(callback_data)
 
 
+def snapshot(callback_data):
+    """
+    Copy callback data, ports being copied as dictionaries of their variables.
+
+    Parameters
+    ----------
+    callback_data : dict
+        Callback data of a segment, with the live `out_p` port as `data`.
+
+    Returns
+    -------
+    dict
+        Callback data with copied values, independent of the simulation.
+    """
+    copied = {}
+    for key, value in callback_data.items():
+        if hasattr(value, "items"):
+            copied[key] = {name: copy.deepcopy(item) for name, item in value.items()}
+        else:
+            copied[key] = copy.deepcopy(value)
+    return copied
+
+
+class CallbackDispatcher:
+    """
+    Throttle, batch and optionally move to a background thread the mission callbacks.
+
+    A dispatcher is used as the callback method of the segments (e.g. as the
+    `mission_callback` of `mission_profile`). Segments call it at each
+    `compute`; it only forwards the calls selected by the dispatch options, as
+    copied snapshots, to the user callback. If several options are given, all
+    of them must be met.
+
+    The simulation time throttles only consider the first call at each time of
+    a segment: the solver iterations at a time count once, whatever the solver.
+    The intermediate stages of the Runge-Kutta schemes are evaluated at their
+    own times, and count as steps.
+
+    Attributes
+    ----------
+    callback_method : function
+        User callback, called with a snapshot, or a list of snapshots if `batch_size` > 1.
+    every_n : int or None
+        Forward one simulation time out of `every_n` of a segment.
+    every_time : float or None
+        Minimum simulation time between forwarded calls of a segment [s].
+    min_interval : float or None
+        Minimum wall-clock time between forwarded calls [s].
+    batch_size : int
+        Number of snapshots per user callback call.
+    background : bool
+        Whether the user callback runs in a background thread.
+    n_calls : int
+        Number of calls received.
+    n_dispatched : int
+        Number of snapshots forwarded.
+    """
+
+    def __init__(
+        self,
+        callback_method,
+        every_n=None,
+        every_time=None,
+        min_interval=None,
+        batch_size=1,
+        background=False,
+        max_queue=0,
+    ):
+        """
+        Initialize the dispatcher.
+
+        Parameters
+        ----------
+        callback_method : function
+            User callback.
+        every_n : int or None, optional
+            Forward one simulation time out of `every_n` of a segment. Defaults to None.
+        every_time : float or None, optional
+            Minimum simulation time between forwarded calls of a segment [s]. Defaults to None.
+        min_interval : float or None, optional
+            Minimum wall-clock time between forwarded calls [s]. Defaults to None.
+        batch_size : int, optional
+            Number of snapshots per user callback call. Defaults to 1.
+        background : bool, optional
+            Whether the user callback runs in a background thread. Defaults to False.
+        max_queue : int, optional
+            Maximum number of batches waiting for the background thread, the
+            simulation being blocked when reached; 0 for no limit. Defaults to 0.
+
+        Raises
+        ------
+        ValueError
+            If `every_n` or `batch_size` is not positive.
+        """
+        if every_n is not None and every_n < 1:
+            raise ValueError(f"every_n must be positive; got {every_n}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive; got {batch_size}")
+        self.callback_method = callback_method
+        self.every_n = every_n
+        self.every_time = every_time
+        self.min_interval = min_interval
+        self.batch_size = batch_size
+        self.background = background
+        self.n_calls = 0
+        self.n_dispatched = 0
+        self._batch = []
+        self._steps = {}
+        self._last_time = {}
+        self._last_wall = None
+        self._queue = queue.Queue(max_queue) if background else None
+        self._thread = None
+        self._error = None
+
+    def __call__(self, callback_data):
+        """
+        Receive the callback data of a segment and forward it if selected.
+
+        Parameters
+        ----------
+        callback_data : dict
+            Callback data of a segment (`segment`, `time` and `data`).
+        """
+        self.n_calls += 1
+        segment = callback_data.get("segment")
+        t = callback_data.get("time", 0.0)
+        if self.every_n is not None:
+            previous, count = self._steps.get(segment, (None, 0))
+            if t == previous:
+                return
+            self._steps[segment] = (t, count + 1)
+            if count % self.every_n:
+                return
+        if self.every_time is not None:
+            last = self._last_time.get(segment)
+            # A new run of the segment restarts from an earlier time
+            if last is not None and last <= t < last + self.every_time:
+                return
+            self._last_time[segment] = t
+        if self.min_interval is not None:
+            now = time.perf_counter()
+            if (
+                self._last_wall is not None
+                and now - self._last_wall < self.min_interval
+            ):
+                return
+            self._last_wall = now
+
+        self._batch.append(snapshot(callback_data))
+        self.n_dispatched += 1
+        if len(self._batch) >= self.batch_size:
+            self._deliver()
+
+    def _deliver(self):
+        """
+        Pass the pending snapshots to the user callback or to the background thread.
+        """
+        payload = self._batch if self.batch_size > 1 else self._batch[0]
+        self._batch = []
+        if self.background:
+            if self._error is not None:
+                raise self._error
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._consume, daemon=True)
+                self._thread.start()
+            self._queue.put(payload)
+        else:
+            self.callback_method(payload)
+
+    def _consume(self):
+        """
+        Call the user callback with the queued payloads, until the stop sentinel.
+        """
+        while True:
+            payload = self._queue.get()
+            try:
+                if payload is None:
+                    return
+                if self._error is None:
+                    self.callback_method(payload)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Deliver the pending snapshots and wait for the background thread to process them.
+
+        Raises
+        ------
+        Exception
+            The first exception raised by the user callback in the background thread.
+        """
+        if self._batch:
+            self._deliver()
+        if self._thread is not None:
+            self._queue.join()
+            if self._error is not None:
+                error, self._error = self._error, None
+                raise error
+
+    def close(self):
+        """
+        Flush the snapshots and stop the background thread.
+        """
+        try:
+            self.flush()
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+
+
 if __name__ == "__main__":
 
     def print_callback(callback_data):
@@ -0,0 +1,532 @@
+"""________________________________________________________________________________
+
+                              MISSION CHECKPOINT MODULE
+___________________________________________________________________________________"""
+
+# Checkpoint and restart of a mission at segment boundaries.
+# The end state of each segment is saved in a checkpoint store, keyed by a fingerprint
+# of the segment inputs chained with the fingerprint of the previous segment, so that
+# a rerun only computes the segments downstream of a change (or of a failure).
+# missionCheckpoint.py
+
+import os
+import copy
+import pickle
+import hashlib
+import logging
+import tempfile
+from numbers import Number
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from cosapp.base import System
+
+logger = logging.getLogger(__name__)
+
+
+def _systems(system, path=""):
+    """
+    Iterate over a system and its children, with their paths relative to the system.
+
+    Parameters
+    ----------
+    system : cosapp.base.System
+        Root system.
+    path : str, optional
+        Path of the root system.
+
+    Yields
+    ------
+    tuple
+        Relative path and system.
+    """
+    yield path, system
+    for name, child in system.children.items():
+        yield from _systems(child, f"{path}.{name}" if path else name)
+
+
+def _state_ports(system):
+    """
+    Return the ports holding the state of a system: its inputs and output mode variables.
+
+    Parameters
+    ----------
+    system : cosapp.base.System
+        System.
+
+    Returns
+    -------
+    list
+        Input ports, followed by the port of output mode variables.
+    """
+    return [*system.inputs.values(), system.outputs[System.MODEVARS_OUT]]
+
+
+def _is_value(value):
+    """
+    Return whether a variable value is saved in the checkpoints.
+
+    Parameters
+    ----------
+    value : object
+        Variable value.
+
+    Returns
+    -------
+    bool
+        True for numbers, booleans, strings and arrays.
+    """
+    return isinstance(value, (Number, str, np.ndarray))
+
+
+def _equal(a, b):
+    """
+    Compare two variable values.
+
+    Parameters
+    ----------
+    a, b : object
+        Variable values.
+
+    Returns
+    -------
+    bool
+        Whether the values are identical.
+    """
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    return type(a) is type(b) and a == b
+
+
+def _update(digest, value):
+    """
+    Update a hash with a value.
+
+    Numbers, strings and arrays are hashed by value, interpolation tables by grid
+    and values, other objects by their pickled bytes if any; objects that cannot
+    be pickled (e.g. callbacks) are left out.
+
+    Parameters
+    ----------
+    digest : hashlib._Hash
+        Hash object.
+    value : object
+        Value to hash.
+    """
+    if isinstance(value, RegularGridInterpolator):
+        digest.update(value.method.encode())
+        for axis in value.grid:
+            _update(digest, np.asarray(axis))
+        _update(digest, np.asarray(value.values))
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (Number, str)) or value is None:
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
+    else:
+        try:
+            digest.update(pickle.dumps(value))
+        except Exception:
+            digest.update(type(value).__name__.encode())
+
+
+class CheckpointStore:
+    """
+    Directory of segment checkpoints, one pickle file per fingerprint.
+
+    Attributes
+    ----------
+    directory : str
+        Checkpoint directory.
+    """
+
+    def __init__(self, directory):
+        """
+        Initialise the store, creating its directory if needed.
+
+        Parameters
+        ----------
+        directory : str or os.PathLike
+            Checkpoint directory.
+        """
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        """
+        Return the file of a checkpoint.
+
+        Parameters
+        ----------
+        key : str
+            Segment fingerprint.
+
+        Returns
+        -------
+        str
+            Checkpoint file path.
+        """
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def __contains__(self, key):
+        return os.path.exists(self._path(key))
+
+    def __len__(self):
+        return sum(name.endswith(".pkl") for name in os.listdir(self.directory))
+
+    def load(self, key):
+        """
+        Load a checkpoint.
+
+        Parameters
+        ----------
+        key : str
+            Segment fingerprint.
+
+        Returns
+        -------
+        dict
+            Segment snapshot.
+        """
+        with open(self._path(key), "rb") as file:
+            return pickle.load(file)
+
+    def save(self, key, snapshot):
+        """
+        Save a checkpoint, atomically so that an interrupted run leaves no partial file.
+
+        Parameters
+        ----------
+        key : str
+            Segment fingerprint.
+        snapshot : dict
+            Segment snapshot.
+        """
+        descriptor, path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "wb") as file:
+            pickle.dump(snapshot, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path, self._path(key))
+
+    def clear(self):
+        """
+        Remove all the checkpoints.
+        """
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
+
+
+class MissionCheckpoint:
+    """
+    Run a mission segment by segment, with checkpoints at the segment boundaries.
+
+    Before a segment is flown, its fingerprint is computed from the fingerprint
+    of the previous segment and from the segment inputs: values transferred from
+    the mission and from the previous segment, inputs and output mode variables
+    of the segment and of its children, aerodynamic tables, engine model and
+    driver settings. If the store holds a checkpoint of this fingerprint, the
+    segment end state (inputs, outputs, mode variables such as IsoMach, and
+    records) is restored instead of flying the segment; otherwise the segment
+    is flown and its checkpoint saved. A rerun after a failure, or after a change
+    of the downstream segments only, thus resumes from the last valid segment.
+
+    Variables overwritten by the run of a segment (e.g. initial position of the
+    first segment, angle of attack, IsoMach mode) are reset to their value before
+    the run, unless modified in between, so that repeated runs in the same
+    process start from the same state.
+
+    Attributes
+    ----------
+    mission : cosapp.base.System
+        Mission system, e.g. a `mission_profile`, whose children are the flight segments.
+    store : CheckpointStore
+        Checkpoint store.
+    segments : list
+        Flight segments, in flight order.
+    restored : list of str
+        Names of the segments restored from checkpoints by the last run.
+    computed : list of str
+        Names of the segments flown by the last run.
+    keys : dict
+        Fingerprints of the segments of the last run, by segment name.
+    """
+
+    def __init__(self, mission, store, segments=None):
+        """
+        Initialise the runner.
+
+        Parameters
+        ----------
+        mission : cosapp.base.System
+            Mission system.
+        store : CheckpointStore or str
+            Checkpoint store, or its directory.
+        segments : list, optional
+            Flight segments, in flight order. Defaults to the `flightSegments` of
+            the mission if any, to its children otherwise.
+        """
+        if not isinstance(store, CheckpointStore):
+            store = CheckpointStore(store)
+        if segments is None:
+            segments = getattr(mission, "flightSegments", None) or list(
+                mission.children.values()
+            )
+        self.mission = mission
+        self.store = store
+        self.segments = list(segments)
+        self.restored = []
+        self.computed = []
+        self.keys = {}
+        self._records = {}
+        # Values before and after the last run of the variables it changed, by segment name
+        self._run_changes = {}
+
+    def _connectors(self, segment):
+        """
+        Return the connectors feeding a segment.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment.
+
+        Returns
+        -------
+        list
+            Connectors whose sink belongs to the segment.
+        """
+        return [
+            connector
+            for connector in self.mission.all_connectors()
+            if connector.sink.owner is segment
+        ]
+
+    def _values(self, segment):
+        """
+        Copy the state values of a segment.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment.
+
+        Returns
+        -------
+        dict
+            Copied values by `(system path, port name, variable name)`.
+        """
+        return {
+            (path, port.name, name): copy.deepcopy(value)
+            for path, system in _systems(segment)
+            for port in _state_ports(system)
+            for name, value in port.items()
+            if _is_value(value)
+        }
+
+    def _set_values(self, segment, values):
+        """
+        Set state values of a segment.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment.
+        values : dict
+            Values by `(system path, port name, variable name)`.
+        """
+        for (path, port, name), value in values.items():
+            system = segment[path] if path else segment
+            system[port][name] = copy.deepcopy(value)
+
+    def _reset(self, segment):
+        """
+        Reset the variables changed by the last run of a segment, if not modified since.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment.
+        """
+        changes = self._run_changes.get(segment.name, {})
+        current = self._values(segment)
+        self._set_values(
+            segment,
+            {
+                variable: before
+                for variable, (before, after) in changes.items()
+                if variable in current and _equal(current[variable], after)
+            },
+        )
+
+    def fingerprint(self, segment, previous=""):
+        """
+        Compute the fingerprint of a segment, from its current inputs.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment, whose connectors have been transferred.
+        previous : str, optional
+            Fingerprint of the previous segment.
+
+        Returns
+        -------
+        str
+            Hexadecimal fingerprint.
+        """
+        digest = hashlib.sha256(previous.encode())
+        digest.update(f"{type(segment).__name__}:{segment.name}".encode())
+        for path, system in _systems(segment):
+            for port in system.inputs.values():
+                for name, value in port.items():
+                    digest.update(f"{path}.{port.name}.{name}".encode())
+                    _update(digest, value)
+            for name, value in system.outputs[System.MODEVARS_OUT].items():
+                digest.update(f"{path}.modevars_out.{name}".encode())
+                _update(digest, value)
+        _update(digest, getattr(segment, "engine_model", None))
+        drivers = list(segment.drivers.values())
+        while drivers:
+            driver = drivers.pop(0)
+            digest.update(f"{type(driver).__name__}:{driver.name}".encode())
+            for name in ("dt", "time_interval", "order"):
+                _update(digest, repr(getattr(driver, name, None)))
+            # Array options (e.g. solver bounds) are only filled in by the runs
+            for name in driver.options:
+                value = driver.options[name]
+                if isinstance(value, (Number, str)):
+                    _update(digest, f"{name}={value!r}")
+            drivers.extend(driver.children.values())
+        return digest.hexdigest()
+
+    def _snapshot(self, segment, key, before):
+        """
+        Take the snapshot of a flown segment.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment, after its run.
+        key : str
+            Segment fingerprint.
+        before : dict
+            Segment state values before the run.
+
+        Returns
+        -------
+        dict
+            Segment snapshot: state values, output values, changes of the run,
+            final time and records.
+        """
+        after = self._values(segment)
+        changes = {
+            variable: (value, after[variable])
+            for variable, value in before.items()
+            if not _equal(value, after[variable])
+        }
+        outputs = {
+            (path, port.name, name): copy.deepcopy(value)
+            for path, system in _systems(segment)
+            for port in system.outputs.values()
+            for name, value in port.items()
+            if _is_value(value)
+        }
+        driver = next(iter(segment.drivers.values()), None)
+        recorder = getattr(driver, "recorder", None)
+        return {
+            "key": key,
+            "segment": segment.name,
+            "values": after,
+            "outputs": outputs,
+            "changes": changes,
+            "time": getattr(driver, "time", None),
+            "records": recorder.export_data() if recorder is not None else None,
+        }
+
+    def _restore(self, segment, snapshot):
+        """
+        Restore the end state of a segment from its snapshot.
+
+        Parameters
+        ----------
+        segment : cosapp.base.System
+            Flight segment.
+        snapshot : dict
+            Segment snapshot.
+        """
+        self._set_values(segment, snapshot["values"])
+        self._set_values(segment, snapshot["outputs"])
+        self._run_changes[segment.name] = snapshot["changes"]
+        self._records[segment.name] = snapshot["records"]
+
+    def run(self):
+        """
+        Run the mission, restoring the segments with a valid checkpoint.
+
+        Returns
+        -------
+        list of str
+            Names of the segments flown.
+
+        Raises
+        ------
+        Exception
+            Any error of a segment run, the checkpoints of the previous segments being saved.
+        """
+        self.restored, self.computed, self.keys = [], [], {}
+        key = ""
+        for segment in self.segments:
+            for connector in self._connectors(segment):
+                connector.transfer()
+            self._reset(segment)
+            key = self.fingerprint(segment, key)
+            self.keys[segment.name] = key
+            if key in self.store:
+                self._restore(segment, self.store.load(key))
+                self.restored.append(segment.name)
+                continue
+
+            before = self._values(segment)
+            try:
+                segment.run_drivers()
+            except Exception:
+                # The failed segment is left as before its run, for the next attempt
+                self._set_values(segment, before)
+                raise
+            snapshot = self._snapshot(segment, key, before)
+            self.store.save(key, snapshot)
+            self._run_changes[segment.name] = snapshot["changes"]
+            self._records.pop(segment.name, None)
+            self.computed.append(segment.name)
+
+        # Values pulled from the segments up to the mission
+        for connector in self.mission.all_connectors():
+            if connector.sink.owner is self.mission:
+                connector.transfer()
+        if self.restored:
+            logger.info(
+                f"{self.mission.name}: segments {self.restored} restored from checkpoints"
+            )
+        return self.computed
+
+    def records(self):
+        """
+        Return the records of the segments of the last run.
+
+        Returns
+        -------
+        dict
+            Records (`pandas.DataFrame`) by segment name: exported by the
+            recorders of the flown segments, read from the checkpoints of the
+            restored ones.
+        """
+        records = {}
+        for segment in self.segments:
+            if segment.name in self._records:
+                records[segment.name] = self._records[segment.name]
+            else:
+                driver = next(iter(segment.drivers.values()), None)
+                recorder = getattr(driver, "recorder", None)
+                records[segment.name] = (
+                    recorder.export_data() if recorder is not None else None
+                )
+        return records
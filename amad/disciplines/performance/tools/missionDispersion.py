@@ -0,0 +1,614 @@
+"""________________________________________________________________________________
+
+                              MISSION DISPERSION MODULE
+___________________________________________________________________________________"""
+
+# Monte Carlo dispersion of the mission outputs (fuel, range...) over the
+# temperature deviation from ISA and the take-off mass. Samples are drawn by
+# batches and run either as the lanes of a `BatchMissionSimulator` or as the
+# points of a `MissionSweep`; the statistics of the outputs (mean, standard
+# deviation, quantiles) are updated in streaming, without keeping the samples,
+# and the sampling stops once the confidence intervals of the means converge.
+# missionDispersion.py
+
+import logging
+import numpy as np
+import pandas
+from scipy.stats import norm
+
+logger = logging.getLogger(__name__)
+
+# Segments of a `mission_profile`, whose engines get the delta ISA temperature: that of
+# their engine systems, or that of the segments flown with an engine backend
+MISSION_SEGMENTS = (
+    "Climb_segment_1",
+    "Accelerate",
+    "Climb_segment_2",
+    "Acc_Mach",
+    "Cruise_segment",
+    "Dec_Mach",
+    "Descent_segment_1",
+    "Decelerate",
+    "Descent_segment_2",
+)
+MISSION_TEMPERATURES = tuple(
+    f"{segment}.enginePerfo.temp_delta_ISA" for segment in MISSION_SEGMENTS
+)
+BACKEND_TEMPERATURES = tuple(
+    f"{segment}.temp_delta_ISA" for segment in MISSION_SEGMENTS
+)
+
+
+class P2Quantile:
+    """
+    Streaming estimate of a quantile by the P-square algorithm.
+
+    The quantile is tracked by five markers whose heights are adjusted by
+    piecewise-parabolic interpolation at each observation (Jain & Chlamtac,
+    1985), in constant memory. The quantile is exact up to five observations.
+
+    Attributes
+    ----------
+    p : float
+        Probability of the quantile, in ]0, 1[.
+    count : int
+        Number of observations.
+    """
+
+    def __init__(self, p):
+        """
+        Initialise the estimator.
+
+        Parameters
+        ----------
+        p : float
+            Probability of the quantile, in ]0, 1[.
+
+        Raises
+        ------
+        ValueError
+            If the probability is not in ]0, 1[.
+        """
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"The quantile probability must be in ]0, 1[, got {p}")
+        self.p = p
+        self.count = 0
+        self._heights = []
+        self._positions = np.arange(1.0, 6.0)
+        self._desired = np.array(
+            [1.0, 1.0 + 2.0 * p, 1.0 + 4.0 * p, 3.0 + 2.0 * p, 5.0]
+        )
+        self._increments = np.array([0.0, p / 2.0, p, (1.0 + p) / 2.0, 1.0])
+
+    def update(self, value):
+        """
+        Add an observation.
+
+        Parameters
+        ----------
+        value : float
+            Observed value.
+        """
+        self.count += 1
+        if self.count <= 5:
+            self._heights.append(float(value))
+            self._heights.sort()
+            if self.count == 5:
+                self._heights = np.array(self._heights)
+            return
+
+        q, n = self._heights, self._positions
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = int(np.searchsorted(q, value, side="right")) - 1
+        n[np.arange(5) > k] += 1.0
+        self._desired += self._increments
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1.0 and n[i + 1] - n[i] > 1.0) or (
+                d <= -1.0 and n[i - 1] - n[i] < -1.0
+            ):
+                d = np.sign(d)
+                height = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < height < q[i + 1]:
+                    # Linear prediction if the parabolic one is not monotonic
+                    j = i + int(d)
+                    height = q[i] + d * (q[j] - q[i]) / (n[j] - n[i])
+                q[i] = height
+                n[i] += d
+
+    @property
+    def value(self):
+        """
+        float: Estimate of the quantile, NaN without observation.
+        """
+        if self.count == 0:
+            return np.nan
+        if self.count < 5:
+            return float(np.quantile(self._heights, self.p))
+        return float(self._heights[2])
+
+
+class StreamingStatistics:
+    """
+    Streaming statistics of an output: count, mean, variance, extrema and quantiles.
+
+    The mean and variance are updated by batches with the pairwise formulas of
+    Chan et al. (Welford's algorithm for batches of one value), the quantiles
+    with `P2Quantile` estimators. NaN values are counted as failures and
+    excluded from the statistics.
+
+    Attributes
+    ----------
+    count : int
+        Number of valid values.
+    failures : int
+        Number of NaN values.
+    mean : float
+        Mean of the values.
+    minimum, maximum : float
+        Extrema of the values.
+    quantiles : dict
+        Quantile estimators by probability.
+    """
+
+    def __init__(self, quantiles=(0.05, 0.5, 0.95)):
+        """
+        Initialise empty statistics.
+
+        Parameters
+        ----------
+        quantiles : sequence of float, optional
+            Probabilities of the quantiles to estimate. Defaults to the 5 %, 50 % and 95 % quantiles.
+        """
+        self.count = 0
+        self.failures = 0
+        self.mean = np.nan
+        self._m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def update(self, values):
+        """
+        Add a batch of values.
+
+        Parameters
+        ----------
+        values : array_like
+            Values of the batch.
+        """
+        values = np.ravel(np.asarray(values, dtype=float))
+        valid = values[~np.isnan(values)]
+        self.failures += len(values) - len(valid)
+        if len(valid) == 0:
+            return
+
+        n = len(valid)
+        mean = valid.mean()
+        m2 = np.sum((valid - mean) ** 2)
+        total = self.count + n
+        if self.count == 0:
+            self.mean, self._m2 = mean, m2
+        else:
+            delta = mean - self.mean
+            self.mean += delta * n / total
+            self._m2 += m2 + delta**2 * self.count * n / total
+        self.count = total
+        self.minimum = min(self.minimum, valid.min())
+        self.maximum = max(self.maximum, valid.max())
+        for value in valid:
+            for estimator in self.quantiles.values():
+                estimator.update(value)
+
+    @property
+    def variance(self):
+        """
+        float: Unbiased variance of the values, NaN with less than two values.
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        """
+        float: Standard deviation of the values.
+        """
+        return np.sqrt(self.variance)
+
+    def half_width(self, confidence=0.95):
+        """
+        Return the half-width of the confidence interval of the mean.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            Confidence level of the interval. Defaults to 0.95.
+
+        Returns
+        -------
+        float
+            Half-width of the normal confidence interval, NaN with less than two values.
+        """
+        if self.count < 2:
+            return np.nan
+        return norm.ppf(0.5 + confidence / 2.0) * self.std / np.sqrt(self.count)
+
+    def summary(self, confidence=0.95):
+        """
+        Return the statistics as a dictionary.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            Confidence level of the interval of the mean. Defaults to 0.95.
+
+        Returns
+        -------
+        dict
+            `count`, `failures`, `mean`, `std`, `half_width`, `min`, `max` and
+            the quantiles, named `q<percent>`.
+        """
+        summary = {
+            "count": self.count,
+            "failures": self.failures,
+            "mean": self.mean,
+            "std": self.std,
+            "half_width": self.half_width(confidence),
+            "min": self.minimum if self.count else np.nan,
+            "max": self.maximum if self.count else np.nan,
+        }
+        for p, estimator in self.quantiles.items():
+            summary[f"q{100.0 * p:g}"] = estimator.value
+        return summary
+
+
+class BatchDispersionRunner:
+    """
+    Run the samples of a dispersion as the lanes of a `BatchMissionSimulator`.
+
+    The delta ISA temperature of the samples is set on all the segments of the
+    simulator for the run, the initial masses being those of the lanes.
+
+    Attributes
+    ----------
+    simulator : BatchMissionSimulator
+        Simulator with its mission segments defined.
+    """
+
+    def __init__(self, simulator, **kwargs):
+        """
+        Initialise the runner.
+
+        Parameters
+        ----------
+        simulator : BatchMissionSimulator
+            Simulator with its mission segments defined.
+        **kwargs
+            Other arguments of `BatchMissionSimulator.run` (initial position and speed).
+        """
+        self.simulator = simulator
+        self.kwargs = kwargs
+
+    def __call__(self, samples):
+        """
+        Fly the mission for the samples.
+
+        Parameters
+        ----------
+        samples : pandas.DataFrame
+            Take-off mass `m0` [kg] and delta ISA temperature `dISA` [K] of the samples.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Mission `fuel_mass` [kg], `range` [m] and `time` [s] of the samples,
+            NaN for the lanes of which a segment did not end on its event.
+        """
+        segments = self.simulator.segments
+        dISA = [segment["dISA"] for segment in segments]
+        for segment in segments:
+            segment["dISA"] = samples["dISA"].to_numpy(dtype=float)
+        try:
+            results = self.simulator.run(
+                samples["m0"].to_numpy(dtype=float), **self.kwargs
+            )
+        finally:
+            for segment, value in zip(segments, dISA):
+                segment["dISA"] = value
+
+        # The time of each segment starts at 0, its last valid value is its duration
+        durations = [np.nanmax(result["time"], axis=1) for result in results.values()]
+        outputs = pandas.DataFrame(
+            {
+                "fuel_mass": sum(result["fuel_mass"] for result in results.values()),
+                "range": results[segments[-1]["name"]]["state"][:, 0],
+                "time": sum(durations),
+            }
+        )
+        failed = np.any(
+            [result["event"] == None for result in results.values()],  # noqa: E711
+            axis=0,
+        )
+        outputs[failed] = np.nan
+        return outputs
+
+
+class SweepDispersionRunner:
+    """
+    Run the samples of a dispersion as the points of a `MissionSweep`.
+
+    Attributes
+    ----------
+    sweep : MissionSweep
+        Parallel mission runner, whose outputs are those of the dispersion.
+    mass : str
+        Path of the take-off mass variable of the mission.
+    temperatures : tuple of str
+        Paths of the delta ISA temperature variables of the mission.
+    """
+
+    def __init__(self, sweep, mass="Climb_segment_1.m0", temperatures=None):
+        """
+        Initialise the runner.
+
+        Parameters
+        ----------
+        sweep : MissionSweep
+            Parallel mission runner.
+        mass : str, optional
+            Path of the take-off mass variable, stored as an array of one value.
+            Defaults to that of a `mission_profile`.
+        temperatures : sequence of str, optional
+            Paths of the delta ISA temperature variables, all set to the sampled value.
+            Defaults to those of a `mission_profile`: the `temp_delta_ISA` of the segments
+            if the sweep has an engine model, of their engine systems otherwise.
+        """
+        if temperatures is None:
+            temperatures = (
+                MISSION_TEMPERATURES
+                if sweep.engine_model is None
+                else BACKEND_TEMPERATURES
+            )
+        self.sweep = sweep
+        self.mass = mass
+        self.temperatures = tuple(temperatures)
+
+    def __call__(self, samples):
+        """
+        Run the mission for the samples.
+
+        Parameters
+        ----------
+        samples : pandas.DataFrame
+            Take-off mass `m0` [kg] and delta ISA temperature `dISA` [K] of the samples.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Outputs of the sweep for the samples, NaN for the failed runs.
+
+        Raises
+        ------
+        RuntimeError
+            If the mission failed for all the samples.
+        """
+        table = {self.mass: [np.array([value]) for value in samples["m0"]]}
+        for path in self.temperatures:
+            table[path] = samples["dISA"].to_numpy(dtype=float)
+        results = self.sweep.run(table)
+        failed = results[results["error"].notna()]
+        if len(failed) == len(results):
+            raise RuntimeError(
+                f"Mission failed for all the {len(failed)} samples; first error:\n{failed['error'].iloc[0]}"
+            )
+        if len(failed):
+            logger.warning(
+                f"Mission failed for {len(failed)} samples; first error:\n{failed['error'].iloc[0]}"
+            )
+        outputs = results[list(self.sweep.outputs)].astype(float)
+        outputs[results["error"].notna()] = np.nan
+        return outputs
+
+
+class MissionDispersion:
+    """
+    Monte Carlo dispersion of a mission over the delta ISA temperature and the take-off mass.
+
+    Samples are drawn and run by batches; after each batch, the streaming
+    statistics of the outputs are updated, and the sampling stops when the
+    half-width of the confidence interval of the mean of all the outputs is
+    below a relative tolerance, or at the maximum number of samples.
+
+    Attributes
+    ----------
+    runner : callable
+        Function of a DataFrame of `m0` and `dISA` samples returning a DataFrame of
+        mission outputs (e.g. `BatchDispersionRunner` or `SweepDispersionRunner`).
+    distributions : dict
+        Sampling functions of a random generator and a size, by parameter name.
+    statistics : dict
+        Streaming statistics by output name, after the run.
+    """
+
+    def __init__(
+        self,
+        runner,
+        m0,
+        dISA=(0.0, 10.0),
+        quantiles=(0.05, 0.5, 0.95),
+        batch_size=64,
+        min_samples=128,
+        max_samples=10000,
+        rtol=1e-3,
+        confidence=0.95,
+        seed=None,
+    ):
+        """
+        Initialise the dispersion.
+
+        Parameters
+        ----------
+        runner : callable
+            Function of a DataFrame of `m0` [kg] and `dISA` [K] samples returning a
+            DataFrame of mission outputs, NaN for failed runs.
+        m0 : tuple or callable
+            Mean and standard deviation [kg] of the normal distribution of the
+            take-off mass, or function of a `numpy.random.Generator` and a size
+            returning samples.
+        dISA : tuple or callable, optional
+            Distribution of the delta ISA temperature [K], as for `m0`.
+            Defaults to a normal distribution of 10 K standard deviation around ISA.
+        quantiles : sequence of float, optional
+            Probabilities of the quantiles of the outputs. Defaults to 5 %, 50 % and 95 %.
+        batch_size : int, optional
+            Number of samples run at once. Defaults to 64.
+        min_samples : int, optional
+            Number of samples before the convergence is checked. Defaults to 128.
+        max_samples : int, optional
+            Maximum number of samples. Defaults to 10000.
+        rtol : float, optional
+            Tolerance on the half-width of the confidence interval of the means,
+            relative to the means. Defaults to 1e-3.
+        confidence : float, optional
+            Confidence level of the intervals. Defaults to 0.95.
+        seed : int, optional
+            Seed of the random generator.
+
+        Raises
+        ------
+        ValueError
+            If the numbers of samples are not consistent.
+        """
+        if batch_size < 1 or min_samples < 2 or max_samples < min_samples:
+            raise ValueError(
+                f"Inconsistent numbers of samples: batch {batch_size}, min {min_samples}, max {max_samples}"
+            )
+        self.runner = runner
+        self.distributions = {
+            name: self._distribution(value)
+            for name, value in (("m0", m0), ("dISA", dISA))
+        }
+        self.quantiles = tuple(quantiles)
+        self.batch_size = batch_size
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.rtol = rtol
+        self.confidence = confidence
+        self.rng = np.random.default_rng(seed)
+        self.statistics = {}
+
+    @staticmethod
+    def _distribution(value):
+        """
+        Return the sampling function of a parameter.
+
+        Parameters
+        ----------
+        value : tuple or callable
+            Mean and standard deviation of a normal distribution, or sampling function.
+
+        Returns
+        -------
+        callable
+            Function of a random generator and a size returning samples.
+        """
+        if callable(value):
+            return value
+        mean, std = value
+        return lambda rng, size: rng.normal(mean, std, size)
+
+    def sample(self, size):
+        """
+        Draw samples of the parameters.
+
+        Parameters
+        ----------
+        size : int
+            Number of samples.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `m0` [kg] and `dISA` [K] samples.
+        """
+        return pandas.DataFrame(
+            {
+                name: np.asarray(distribution(self.rng, size), dtype=float)
+                for name, distribution in self.distributions.items()
+            }
+        )
+
+    def converged(self):
+        """
+        Check whether the confidence intervals of the output means are within tolerance.
+
+        Returns
+        -------
+        bool
+            True if all the outputs have converged.
+        """
+        return bool(self.statistics) and all(
+            statistics.count >= self.min_samples
+            and statistics.half_width(self.confidence)
+            <= self.rtol * abs(statistics.mean)
+            for statistics in self.statistics.values()
+        )
+
+    def run(self):
+        """
+        Run the Monte Carlo dispersion.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Statistics of the outputs (see `StreamingStatistics.summary`), by output
+            name, with the number of samples run, whether the dispersion
+            converged and the confidence level in its `attrs`.
+
+        Raises
+        ------
+        RuntimeError
+            If all the samples of a batch failed, as the following batches would fail as well.
+        """
+        self.statistics = {}
+        n_samples = 0
+        while n_samples < self.max_samples:
+            samples = self.sample(min(self.batch_size, self.max_samples - n_samples))
+            outputs = self.runner(samples)
+            if outputs.isna().all(axis=None):
+                raise RuntimeError(
+                    f"All the {len(samples)} samples of the batch failed after {n_samples} samples"
+                )
+            n_samples += len(samples)
+            for name in outputs:
+                if name not in self.statistics:
+                    self.statistics[name] = StreamingStatistics(self.quantiles)
+                self.statistics[name].update(outputs[name])
+            if self.converged():
+                break
+            logger.debug(f"Mission dispersion: {n_samples} samples")
+
+        converged = self.converged()
+        if not converged:
+            logger.warning(
+                f"Mission dispersion not converged after {n_samples} samples"
+            )
+        summary = pandas.DataFrame(
+            {
+                name: statistics.summary(self.confidence)
+                for name, statistics in self.statistics.items()
+            }
+        ).T
+        summary.attrs.update(
+            n_samples=n_samples, converged=converged, confidence=self.confidence
+        )
+        return summary
@@ -0,0 +1,624 @@
+"""________________________________________________________________________________
+
+                              MISSION FUEL SURROGATE MODULE
+___________________________________________________________________________________"""
+
+# Regression model of the mission fuel, to couple the mission simulation into the
+# sizing loops. The mission is sampled over a Latin hypercube of its parameters
+# (take-off mass, range, cruise altitude, Mach, geometry parameters), e.g. in
+# parallel with a `MissionSweep`, and each fuel output is fitted by a quadratic
+# response surface with a prediction error estimate. The domain is extended and the
+# model refitted on demand, between the runs of the sizing loops, when queried outside
+# the sampled domain; geometry parameters are sampled by building the mission of each
+# sampled geometry.
+# missionFuelSurrogate.py
+
+import copy
+import functools
+import logging
+import numpy as np
+import pandas
+from scipy.stats import qmc
+from amad.disciplines.performance.tools.missionSweep import MissionSweep
+
+logger = logging.getLogger(__name__)
+
+# Mission variables of the default surrogate features
+MISSION_PARAMETERS = {
+    "m_mto": "Climb_segment_1.m0",
+    "x_range": "Cruise_segment.Cruise_distance_target",
+    "z_altitude": "cruise_altitude",
+    "mach_current": "Mach_cruise",
+}
+
+# Mission variables stored as arrays of one value (initial masses of the segments)
+ARRAY_VARIABLES = ("m0",)
+
+
+def _phase_segments(mission, phase):
+    """
+    Return the segments of a `mission_profile` flown before, during or after the cruise.
+
+    Parameters
+    ----------
+    mission : mission_profile
+        Mission system.
+    phase : str
+        'climb', 'cruise' or 'descent'.
+
+    Returns
+    -------
+    list
+        Segment systems of the phase.
+    """
+    segments = list(mission.flightSegments)
+    index = segments.index(mission.Cruise_segment)
+    return {
+        "climb": segments[:index],
+        "cruise": [segments[index]],
+        "descent": segments[slice(index + 1, None)],
+    }[phase]
+
+
+def _phase_fuel(mission, phase):
+    """
+    Return the fuel burnt over a phase of a `mission_profile`.
+
+    Parameters
+    ----------
+    mission : mission_profile
+        Mission system, after the run.
+    phase : str
+        'climb', 'cruise' or 'descent'.
+
+    Returns
+    -------
+    float
+        Fuel mass [kg].
+    """
+    return float(
+        sum(
+            np.ravel(segment.out_p.fuel_mass)[0]
+            for segment in _phase_segments(mission, phase)
+        )
+    )
+
+
+def climb_fuel(mission):
+    """
+    Return the fuel burnt from take-off to the cruise of a `mission_profile` [kg].
+    """
+    return _phase_fuel(mission, "climb")
+
+
+def cruise_fuel(mission):
+    """
+    Return the fuel burnt over the cruise segment of a `mission_profile` [kg].
+    """
+    return _phase_fuel(mission, "cruise")
+
+
+def descent_fuel(mission):
+    """
+    Return the fuel burnt from the end of the cruise to the landing of a `mission_profile` [kg].
+    """
+    return _phase_fuel(mission, "descent")
+
+
+# Fuel outputs of the default sampler, named as the inwards of the mass models
+PHASE_FUEL = {
+    "m_fuel_climb": climb_fuel,
+    "m_fuel_cruise": cruise_fuel,
+    "m_fuel_descent": descent_fuel,
+}
+
+
+def _mission_table(points, parameters):
+    """
+    Convert feature values into mission variable values.
+
+    Parameters
+    ----------
+    points : pandas.DataFrame
+        Feature values, one row per sample.
+    parameters : dict
+        Mission variable path by feature name; other features keep their name.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Mission variable values, one row per sample.
+    """
+    table = points.rename(columns=parameters)
+    for path in table:
+        if path.split(".")[-1] in ARRAY_VARIABLES:
+            table[path] = [np.array([value]) for value in table[path]]
+    return table
+
+
+def _check_results(results):
+    """
+    Raise the first error of the points of a mission sweep.
+
+    Parameters
+    ----------
+    results : pandas.DataFrame
+        Point records of the sweep.
+
+    Raises
+    ------
+    RuntimeError
+        If a mission run failed.
+    """
+    failed = results[results["error"].notna()]
+    if len(failed):
+        raise RuntimeError(
+            f"Mission failed at {len(failed)} sample points; first error:\n{failed['error'].iloc[0]}"
+        )
+
+
+class MissionSweepSampler:
+    """
+    Sample a mission with a `MissionSweep`, the surrogate features being set on mission variables.
+
+    Features not listed in `parameters` are set on the mission variable of the
+    same name; geometry parameters, which change the aerodynamic tables, require
+    a sampler building the mission of each geometry instead.
+
+    Attributes
+    ----------
+    sweep : MissionSweep
+        Parallel mission runner.
+    parameters : dict
+        Mission variable path by feature name.
+    outputs : dict
+        Output functions of the mission system, by name.
+    """
+
+    def __init__(self, sweep, parameters=None, outputs=None):
+        """
+        Initialise the sampler.
+
+        Parameters
+        ----------
+        sweep : MissionSweep
+            Parallel mission runner.
+        parameters : dict, optional
+            Mission variable path by feature name. Defaults to `MISSION_PARAMETERS`.
+        outputs : dict, optional
+            Output variable paths or functions of the mission system, by name.
+            Defaults to the climb, cruise and descent fuel of a `mission_profile`.
+        """
+        self.sweep = sweep
+        self.parameters = dict(MISSION_PARAMETERS if parameters is None else parameters)
+        self.outputs = dict(PHASE_FUEL if outputs is None else outputs)
+
+    def __call__(self, points):
+        """
+        Run the mission at the sample points.
+
+        Parameters
+        ----------
+        points : pandas.DataFrame
+            Feature values, one row per sample.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Output values, one row per sample.
+
+        Raises
+        ------
+        RuntimeError
+            If a mission run fails.
+        """
+        self.sweep.outputs = self.outputs
+        results = self.sweep.run(_mission_table(points, self.parameters))
+        _check_results(results)
+        return results[list(self.outputs)].reset_index(drop=True)
+
+
+class GeometrySweepSampler:
+    """
+    Sample a mission over geometry parameters and mission variables.
+
+    The geometry of each sample is a copy of the base geometry modified by the
+    setters of the geometry features; the samples of each geometry are run by a
+    `MissionSweep` of the missions built by `factory(geometry)` (e.g. a
+    `mission_profile`, whose flight vehicle is cached by geometry), with the
+    aerodynamic tables of the geometry. The other features are set on mission
+    variables, as with `MissionSweepSampler`.
+
+    Attributes
+    ----------
+    factory : callable
+        Picklable function of a geometry returning a new mission system; it is also
+        given the `engine_model` keyword argument when an engine model is set.
+    geometry : dict
+        Base aircraft geometry.
+    geometry_setters : dict
+        Functions `setter(geometry, value)` modifying a geometry, by feature name.
+    aero_tables : callable or None
+        Function of a geometry returning its CL, CD and Drag tables, if not set by the factory.
+    parameters : dict
+        Mission variable path by feature name.
+    outputs : dict
+        Output functions of the mission system, by name.
+    n_workers : int
+        Number of worker processes of the sweeps of each geometry.
+    engine_model : EngineBackend or None
+        Engine model of the missions.
+    """
+
+    def __init__(
+        self,
+        factory,
+        geometry,
+        geometry_setters,
+        aero_tables=None,
+        parameters=None,
+        outputs=None,
+        n_workers=0,
+        engine_model=None,
+    ):
+        """
+        Initialise the sampler.
+
+        Parameters
+        ----------
+        factory : callable
+            Picklable function of a geometry returning a new mission system.
+        geometry : dict
+            Base aircraft geometry.
+        geometry_setters : dict
+            Functions `setter(geometry, value)` modifying a geometry in place, by feature name.
+        aero_tables : callable, optional
+            Function of a geometry returning its CL, CD and Drag tables. Defaults to None,
+            for tables set by the factory.
+        parameters : dict, optional
+            Mission variable path by feature name. Defaults to `MISSION_PARAMETERS`.
+        outputs : dict, optional
+            Output variable paths or functions of the mission system, by name.
+            Defaults to the climb, cruise and descent fuel of a `mission_profile`.
+        n_workers : int, optional
+            Number of worker processes of the sweeps of each geometry. Defaults to 0.
+        engine_model : EngineBackend, optional
+            Engine model given to the factory. Defaults to None.
+        """
+        self.factory = factory
+        self.geometry = geometry
+        self.geometry_setters = dict(geometry_setters)
+        self.aero_tables = aero_tables
+        self.parameters = dict(MISSION_PARAMETERS if parameters is None else parameters)
+        self.outputs = dict(PHASE_FUEL if outputs is None else outputs)
+        self.n_workers = n_workers
+        self.engine_model = engine_model
+
+    def build_geometry(self, values):
+        """
+        Return the geometry of given geometry feature values.
+
+        Parameters
+        ----------
+        values : dict
+            Geometry feature values by name.
+
+        Returns
+        -------
+        dict
+            Modified copy of the base geometry.
+        """
+        geometry = copy.deepcopy(self.geometry)
+        for name, value in values.items():
+            self.geometry_setters[name](geometry, value)
+        return geometry
+
+    def __call__(self, points):
+        """
+        Run the missions of the geometries at the sample points.
+
+        Parameters
+        ----------
+        points : pandas.DataFrame
+            Feature values, one row per sample.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Output values, one row per sample.
+
+        Raises
+        ------
+        RuntimeError
+            If a mission run fails.
+        """
+        points = points.reset_index(drop=True)
+        shape = [name for name in points if name in self.geometry_setters]
+        others = [name for name in points if name not in self.geometry_setters]
+        groups = (
+            points.groupby(shape, sort=False).indices
+            if shape
+            else {(): np.arange(len(points))}
+        )
+        results = pandas.DataFrame(index=points.index, columns=list(self.outputs))
+        for key, rows in groups.items():
+            key = key if isinstance(key, tuple) else (key,)
+            geometry = self.build_geometry(dict(zip(shape, map(float, key))))
+            tables = () if self.aero_tables is None else self.aero_tables(geometry)
+            sweep = MissionSweep(
+                functools.partial(self.factory, geometry),
+                *tables,
+                outputs=self.outputs,
+                n_workers=self.n_workers,
+                engine_model=self.engine_model,
+            )
+            records = sweep.run(
+                _mission_table(points.loc[rows, others], self.parameters)
+            )
+            _check_results(records)
+            results.loc[rows, list(self.outputs)] = records[
+                list(self.outputs)
+            ].to_numpy()
+        return results.astype(float)
+
+
+def quadratic_terms(x):
+    """
+    Return the terms of a complete quadratic polynomial.
+
+    Parameters
+    ----------
+    x : numpy.ndarray
+        Normalised features, of shape (n_points, n_features).
+
+    Returns
+    -------
+    numpy.ndarray
+        Constant, linear, and quadratic (squares and cross products) terms,
+        of shape (n_points, (n_features + 1) * (n_features + 2) / 2).
+    """
+    n_points, n_features = x.shape
+    columns = [np.ones(n_points)]
+    columns.extend(x[:, i] for i in range(n_features))
+    columns.extend(
+        x[:, i] * x[:, j] for i in range(n_features) for j in range(i, n_features)
+    )
+    return np.column_stack(columns)
+
+
+class MissionFuelSurrogate:
+    """
+    Quadratic response surface of the mission fuel, with error estimates.
+
+    The features are normalised on the domain, and each output is fitted by least
+    squares on the complete quadratic polynomial of the features. The prediction
+    error is the standard deviation of a new observation, from the residual variance
+    of the fit and the leverage of the query point; the leave-one-out root mean
+    square error of each output is also given as a measure of the model quality.
+
+    When the surrogate is queried outside its domain, `extend` widens the domain to
+    include the point, with a margin, samples it again and refits the model with
+    all the samples.
+
+    Attributes
+    ----------
+    sampler : callable
+        Function returning the output values at sample points, given as a
+        `pandas.DataFrame` of features (e.g. a `MissionSweepSampler`).
+    bounds : dict
+        Lower and upper bounds of the domain, by feature name.
+    n_samples : int
+        Number of samples of each sampling of the domain.
+    margin : float
+        Relative margin added to the domain when extended.
+    samples : pandas.DataFrame
+        Feature and output values of all the samples.
+    outputs : list of str
+        Output names.
+    cv_error : dict
+        Leave-one-out root mean square error, by output.
+    n_fits : int
+        Number of fits of the model.
+    """
+
+    def __init__(self, sampler, bounds, n_samples=None, margin=0.25, seed=None):
+        """
+        Initialise the surrogate; the model is fitted by `fit`.
+
+        Parameters
+        ----------
+        sampler : callable
+            Function returning the output values at sample points.
+        bounds : dict
+            Lower and upper bounds of the domain, by feature name.
+        n_samples : int, optional
+            Number of samples of each sampling. Defaults to twice the number of polynomial terms.
+        margin : float, optional
+            Relative margin added to the domain when extended. Defaults to 0.25.
+        seed : int, optional
+            Seed of the Latin hypercube sampling. Defaults to None.
+
+        Raises
+        ------
+        ValueError
+            If a bound is empty, or if there are not more samples than polynomial terms.
+        """
+        self.sampler = sampler
+        self.bounds = {
+            name: (float(low), float(high)) for name, (low, high) in bounds.items()
+        }
+        for name, (low, high) in self.bounds.items():
+            if not high > low:
+                raise ValueError(
+                    f"Empty domain for {name!r}: lower bound {low} >= upper bound {high}"
+                )
+        n_features = len(self.bounds)
+        n_terms = (n_features + 1) * (n_features + 2) // 2
+        self.n_samples = 2 * n_terms if n_samples is None else int(n_samples)
+        if self.n_samples <= n_terms:
+            raise ValueError(
+                f"{self.n_samples} samples are not enough to fit {n_terms} polynomial terms"
+            )
+        self.margin = margin
+        self.samples = None
+        self.outputs = []
+        self.cv_error = {}
+        self.n_fits = 0
+        self._rng = np.random.default_rng(seed)
+        self._fit_bounds = None
+        self._coefficients = None
+        self._covariance = None
+        self._variance = None
+
+    @property
+    def features(self):
+        """
+        list of str : Feature names.
+        """
+        return list(self.bounds)
+
+    def _sample(self):
+        """
+        Sample the domain on a Latin hypercube and evaluate the outputs.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Feature and output values of the new samples.
+        """
+        low, high = np.array(list(self.bounds.values())).T
+        unit = qmc.LatinHypercube(d=len(low), seed=self._rng).random(self.n_samples)
+        points = pandas.DataFrame(qmc.scale(unit, low, high), columns=self.features)
+        values = pandas.DataFrame(self.sampler(points)).reset_index(drop=True)
+        return pandas.concat([points, values], axis=1)
+
+    def _normalise(self, points):
+        """
+        Normalise feature values on the domain of the last fit.
+
+        Parameters
+        ----------
+        points : pandas.DataFrame or dict
+            Feature values, one row (or value) per point.
+
+        Returns
+        -------
+        numpy.ndarray
+            Features in [-1, 1] on the domain, of shape (n_points, n_features).
+        """
+        low, high = np.array(list(self._fit_bounds.values())).T
+        x = np.column_stack(
+            [
+                np.atleast_1d(np.asarray(points[name], dtype=float))
+                for name in self.features
+            ]
+        )
+        return (2.0 * x - (low + high)) / (high - low)
+
+    def _fit(self):
+        """
+        Fit the response surfaces on all the samples.
+        """
+        self._fit_bounds = dict(self.bounds)
+        X = quadratic_terms(self._normalise(self.samples))
+        Y = self.samples[self.outputs].to_numpy(dtype=float)
+        n_points, n_terms = X.shape
+        self._coefficients, *_ = np.linalg.lstsq(X, Y, rcond=None)
+        self._covariance = np.linalg.pinv(X.T @ X)
+
+        residuals = Y - X @ self._coefficients
+        self._variance = (residuals**2).sum(axis=0) / (n_points - n_terms)
+        leverage = np.einsum("ij,jk,ik->i", X, self._covariance, X)
+        loo = residuals / (1.0 - np.minimum(leverage, 1.0 - 1e-12))[:, None]
+        self.cv_error = dict(zip(self.outputs, np.sqrt((loo**2).mean(axis=0))))
+        self.n_fits += 1
+        logger.info(
+            f"Mission fuel surrogate fitted on {n_points} samples, leave-one-out errors: "
+            + ", ".join(f"{name}={error:.3g}" for name, error in self.cv_error.items())
+        )
+
+    def fit(self):
+        """
+        Sample the domain and fit the model.
+
+        Returns
+        -------
+        MissionFuelSurrogate
+            The surrogate.
+        """
+        self.samples = self._sample()
+        self.outputs = [name for name in self.samples if name not in self.bounds]
+        self._fit()
+        return self
+
+    def contains(self, point):
+        """
+        Check whether a point is inside the domain of the model.
+
+        Parameters
+        ----------
+        point : dict
+            Feature values by name.
+
+        Returns
+        -------
+        bool
+            True if all the features are within their bounds.
+        """
+        return all(
+            low <= point[name] <= high for name, (low, high) in self.bounds.items()
+        )
+
+    def extend(self, point):
+        """
+        Extend the domain to a point, sample it again and refit the model.
+
+        Each bound exceeded by the point is moved beyond it by `margin` times the
+        width of the domain; the previous samples are kept in the fit.
+
+        Parameters
+        ----------
+        point : dict
+            Feature values by name.
+        """
+        for name, (low, high) in self.bounds.items():
+            width = self.margin * (high - low)
+            value = float(point[name])
+            self.bounds[name] = (
+                min(low, value - width) if value < low else low,
+                max(high, value + width) if value > high else high,
+            )
+        logger.info(f"Mission fuel surrogate domain extended to {self.bounds}")
+        self.samples = pandas.concat([self.samples, self._sample()], ignore_index=True)
+        self._fit()
+
+    def predict(self, points):
+        """
+        Predict the outputs and their errors.
+
+        Parameters
+        ----------
+        points : pandas.DataFrame or dict
+            Feature values, one row (or value) per point.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Predicted value of each output, and its standard error in the column
+            `<output>_error`, one row per point.
+
+        Raises
+        ------
+        RuntimeError
+            If the model is not fitted.
+        """
+        if self._coefficients is None:
+            raise RuntimeError("The mission fuel surrogate must be fitted first")
+        X = quadratic_terms(self._normalise(points))
+        values = X @ self._coefficients
+        leverage = np.einsum("ij,jk,ik->i", X, self._covariance, X)
+        errors = np.sqrt(np.outer(1.0 + leverage, self._variance))
+        return pandas.DataFrame(
+            np.column_stack([values, errors]),
+            columns=self.outputs + [f"{name}_error" for name in self.outputs],
+        )
@@ -0,0 +1,605 @@
+"""________________________________________________________________________________
+
+                              MISSION PROFILER MODULE
+___________________________________________________________________________________"""
+
+# Performance profile of the runs of a mission, or of any system with time drivers.
+# While the profiler is enabled, the `run_once` methods of the systems and drivers of
+# the profiled tree, the aerodynamic tables, the engine models and the recorders are
+# wrapped to count their calls and measure their wall time, with the resolutions and
+# residual evaluations of the solvers and the steps of the time drivers. Nothing is
+# wrapped when it is disabled, so that runs without profiler have no overhead.
+# The `run_once` methods are wrapped on their classes, i.e. for the whole process:
+# while enabled, systems outside of the profiled tree go through the wrapper too.
+# The report is a table by component or by segment, and a Chrome trace
+# (chrome://tracing or https://ui.perfetto.dev) of the nested calls.
+# missionProfiler.py
+
+import json
+import logging
+import time
+import pandas
+from cosapp.base import System
+from cosapp.drivers import NonLinearSolver
+from cosapp.drivers.time.interfaces import ExplicitTimeDriver
+
+from amad.disciplines.performance.tools.breguetCruise import BreguetCruise
+
+logger = logging.getLogger(__name__)
+
+# Aerodynamic interpolation functions of the segments
+AERO_TABLES = ("CLAeroIt", "CDAeroIt", "DAeroIt")
+
+# Counters of the components
+COUNTERS = (
+    "calls",
+    "compute_calls",
+    "resolutions",
+    "residual_calls",
+    "jacobian_calls",
+    "steps",
+    "rejected_steps",
+)
+
+# Profiler currently enabled, as methods are wrapped at class level
+_enabled = None
+
+
+def _defining_class(cls, name):
+    """
+    Return the class of the method resolution order of a class defining an attribute.
+
+    Parameters
+    ----------
+    cls : type
+        Class.
+    name : str
+        Attribute name.
+
+    Returns
+    -------
+    type
+        First class of the method resolution order whose namespace holds the attribute.
+    """
+    return next(base for base in cls.__mro__ if name in base.__dict__)
+
+
+class _TimedFunction:
+    """
+    Callable wrapper timing the calls of a function (aerodynamic table, engine model method).
+
+    The calls are attributed to the system being run when they occur.
+
+    Attributes
+    ----------
+    function : callable
+        Wrapped function.
+    profiler : MissionProfiler
+        Profiler of the calls.
+    name : str
+        Component name, appended to the path of the calling system.
+    kind : str
+        Component kind.
+    """
+
+    def __init__(self, function, profiler, name, kind):
+        self.function = function
+        self.profiler = profiler
+        self.name = name
+        self.kind = kind
+
+    def __call__(self, *args, **kwargs):
+        profiler = self.profiler
+        path = f"{profiler._caller()}.{self.name}"
+        profiler._enter(path, self.kind)
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            profiler._exit()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.function, name)
+
+    def __deepcopy__(self, memo):
+        # Tables are shared, e.g. by the copies of the system values of the drivers
+        return self
+
+
+class MissionProfiler:
+    """
+    Profiler of the runs of a system, by component.
+
+    The components are the systems and drivers of the profiled tree, named by their
+    path from the profiled system (e.g. `mission.Cruise_segment.driver_Cruise_segment.nls`),
+    and the aerodynamic tables, engine model evaluations and recorders, named by the
+    path of the system or driver using them. For each component are counted:
+
+    - `calls`: calls of `run_once` (systems, drivers) or of the function;
+    - `compute_calls`: calls of `compute`, skipped by CoSApp for clean inputs;
+    - `resolutions`, `residual_calls` and `jacobian_calls`: resolutions, residual
+      and Jacobian evaluations of the non-linear solvers;
+    - `steps` and `rejected_steps`: accepted and rejected steps of the time drivers;
+    - `time` and `self_time`: wall time [s] of the calls, with and without the
+      nested components.
+
+    The profiler is enabled as a context manager, or with `enable` and `disable`;
+    its statistics are accumulated over the runs until `reset`.
+
+    Attributes
+    ----------
+    system : cosapp.base.System
+        Profiled system, e.g. a `mission_profile`.
+    trace : bool
+        Whether the calls are stored as Chrome trace events.
+    max_events : int
+        Maximum number of trace events stored, further events being dropped.
+    statistics : dict
+        Counters and times of the components, by path.
+    events : list of tuple
+        Trace events: path, kind, start time and duration [s].
+    dropped_events : int
+        Number of trace events dropped beyond `max_events`.
+    """
+
+    def __init__(self, system, trace=True, max_events=1000000, clock=time.perf_counter):
+        """
+        Initialise a disabled profiler.
+
+        Parameters
+        ----------
+        system : cosapp.base.System
+            Profiled system.
+        trace : bool, optional
+            Whether the calls are stored as Chrome trace events. Defaults to True.
+        max_events : int, optional
+            Maximum number of trace events stored. Defaults to 1000000.
+        clock : callable, optional
+            Clock of the wall time [s]. Defaults to `time.perf_counter`.
+        """
+        self.system = system
+        self.trace = trace
+        self.max_events = max_events
+        self.clock = clock
+        self._paths = {}
+        self._kinds = {}
+        self._stack = []
+        self._active = set()
+        self._patches = []
+        self._values = []
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the statistics and trace events.
+        """
+        self.statistics = {}
+        self.events = []
+        self.dropped_events = 0
+        self._origin = self.clock()
+
+    @property
+    def enabled(self):
+        """
+        bool : Whether the profiler is enabled.
+        """
+        return _enabled is self
+
+    def _walk(self, system, path):
+        """
+        Register the paths of a system, of its drivers and of its children, recursively.
+
+        Parameters
+        ----------
+        system : cosapp.base.System
+            System.
+        path : str
+            Path of the system.
+        """
+        self._paths[id(system)] = path
+        self._kinds[id(system)] = "system"
+        drivers = [
+            (driver, f"{path}.{driver.name}") for driver in system.drivers.values()
+        ]
+        while drivers:
+            driver, driver_path = drivers.pop()
+            self._paths[id(driver)] = driver_path
+            if isinstance(driver, (ExplicitTimeDriver, BreguetCruise)):
+                self._kinds[id(driver)] = "time driver"
+            elif isinstance(driver, NonLinearSolver):
+                self._kinds[id(driver)] = "solver"
+            else:
+                self._kinds[id(driver)] = "driver"
+            drivers.extend(
+                (child, f"{driver_path}.{child.name}")
+                for child in driver.children.values()
+            )
+        for child in system.children.values():
+            self._walk(child, f"{path}.{child.name}")
+
+    def _statistics(self, path, kind):
+        """
+        Return the statistics of a component, created on its first call.
+
+        Parameters
+        ----------
+        path : str
+            Component path.
+        kind : str
+            Component kind.
+
+        Returns
+        -------
+        dict
+            Counters and times of the component.
+        """
+        statistics = self.statistics.get(path)
+        if statistics is None:
+            statistics = dict.fromkeys(COUNTERS, 0)
+            statistics.update(kind=kind, time=0.0, self_time=0.0)
+            self.statistics[path] = statistics
+        return statistics
+
+    def _enter(self, path, kind):
+        """
+        Start a call of a component.
+
+        Parameters
+        ----------
+        path : str
+            Component path.
+        kind : str
+            Component kind.
+
+        Returns
+        -------
+        dict
+            Statistics of the component.
+        """
+        statistics = self._statistics(path, kind)
+        statistics["calls"] += 1
+        self._stack.append([path, kind, self.clock(), 0.0])
+        return statistics
+
+    def _exit(self):
+        """
+        End the last call started, adding its time to its component and to its caller.
+        """
+        path, kind, start, nested = self._stack.pop()
+        elapsed = self.clock() - start
+        statistics = self.statistics[path]
+        statistics["time"] += elapsed
+        statistics["self_time"] += elapsed - nested
+        if self._stack:
+            self._stack[-1][3] += elapsed
+        if self.trace:
+            if len(self.events) < self.max_events:
+                self.events.append((path, kind, start - self._origin, elapsed))
+            else:
+                self.dropped_events += 1
+
+    def _caller(self):
+        """
+        Return the path of the system or driver being run.
+
+        Returns
+        -------
+        str
+            Path of the last component called among the systems and drivers.
+        """
+        for path, kind, _, _ in reversed(self._stack):
+            if kind not in ("aero", "engine", "recorder"):
+                return path
+        return self.system.name
+
+    def _patch(self, cls, name, wrapper):
+        """
+        Replace a method of a class, to be restored when the profiler is disabled.
+
+        Parameters
+        ----------
+        cls : type
+            Class defining the method.
+        name : str
+            Method name.
+        wrapper : callable
+            Function of the original method, returning the replacement.
+        """
+        if any(
+            patched is cls and method == name for patched, method, _ in self._patches
+        ):
+            return
+        original = cls.__dict__[name]
+        self._patches.append((cls, name, original))
+        setattr(cls, name, wrapper(original))
+
+    def _set_value(self, obj, name, value):
+        """
+        Replace an attribute of an object, to be restored when the profiler is disabled.
+
+        Parameters
+        ----------
+        obj : object
+            Object, e.g. a system or a recorder.
+        name : str
+            Attribute name.
+        value : object
+            Replacement value.
+        """
+        self._values.append((obj, name, getattr(obj, name), name in vars(obj)))
+        setattr(obj, name, value)
+
+    def _wrap_run_once(self, original):
+        """
+        Wrap the `run_once` method of systems and drivers, or `run_children_drivers` of systems.
+
+        Parameters
+        ----------
+        original : callable
+            Original method.
+
+        Returns
+        -------
+        callable
+            Method counting and timing the calls of the profiled components.
+        """
+        profiler = self
+
+        def run_once(obj):
+            key = id(obj)
+            path = profiler._paths.get(key)
+            if path is None or key in profiler._active:
+                return original(obj)
+            profiler._active.add(key)
+            compute_calls = obj._compute_calls
+            statistics = profiler._enter(path, profiler._kinds[key])
+            try:
+                original(obj)
+            finally:
+                profiler._exit()
+                profiler._active.discard(key)
+                calls = obj._compute_calls - compute_calls
+                statistics["compute_calls"] += calls
+                if (
+                    calls
+                    and isinstance(obj, NonLinearSolver)
+                    and obj.results is not None
+                ):
+                    statistics["resolutions"] += calls
+                    statistics["residual_calls"] += obj.results.fres_calls
+                    statistics["jacobian_calls"] += obj.results.jac_calls
+                if hasattr(obj, "n_rejected"):
+                    statistics["steps"] += getattr(obj, "n_accepted", 0)
+                    statistics["rejected_steps"] += obj.n_rejected
+
+        return run_once
+
+    def _wrap_update_transients(self, original):
+        """
+        Wrap the `_update_transients` method of fixed-step time drivers.
+
+        Parameters
+        ----------
+        original : callable
+            Original method.
+
+        Returns
+        -------
+        callable
+            Method counting the steps of the profiled drivers.
+        """
+        profiler = self
+
+        def _update_transients(obj, dt):
+            key = id(obj)
+            path = profiler._paths.get(key)
+            if path is not None and not hasattr(obj, "n_rejected"):
+                profiler.statistics[path]["steps"] += 1
+            return original(obj, dt)
+
+        return _update_transients
+
+    def enable(self):
+        """
+        Wrap the components of the profiled system.
+
+        The `run_once` methods of `System`, of the driver classes and the
+        `_update_transients` methods of the time drivers are patched on their
+        classes, for the whole process until `disable`: other systems and drivers
+        run meanwhile, e.g. in other threads, go through the wrappers, which only
+        count the calls of the profiled tree and run the others unchanged.
+        Tables, engine models and recorders are wrapped on their instances.
+
+        Raises
+        ------
+        RuntimeError
+            If a profiler is already enabled.
+        """
+        global _enabled
+        if _enabled is not None:
+            raise RuntimeError("A mission profiler is already enabled")
+        _enabled = self
+        self._paths.clear()
+        self._kinds.clear()
+        self._walk(self.system, self.system.name)
+
+        # Systems are run by their parent (`run_once`) or by a driver (`run_children_drivers`)
+        self._patch(System, "run_once", self._wrap_run_once)
+        self._patch(System, "run_children_drivers", self._wrap_run_once)
+        tables, wrapped = {}, set()
+        systems = [self.system]
+        while systems:
+            system = systems.pop()
+            systems.extend(system.children.values())
+            for name in AERO_TABLES:
+                if name in system and callable(system[name]):
+                    table = system[name]
+                    if id(table) not in tables:
+                        tables[id(table)] = _TimedFunction(table, self, name, "aero")
+                    self._set_value(system, name, tables[id(table)])
+            engine_model = getattr(system, "engine_model", None)
+            if engine_model is not None and id(engine_model) not in wrapped:
+                wrapped.add(id(engine_model))
+                self._set_value(
+                    engine_model,
+                    "evaluate",
+                    _TimedFunction(
+                        engine_model.evaluate, self, "engine_model", "engine"
+                    ),
+                )
+
+            drivers = list(system.drivers.values())
+            while drivers:
+                driver = drivers.pop()
+                drivers.extend(driver.children.values())
+                self._patch(
+                    _defining_class(type(driver), "run_once"),
+                    "run_once",
+                    self._wrap_run_once,
+                )
+                if isinstance(driver, ExplicitTimeDriver):
+                    self._patch(
+                        _defining_class(type(driver), "_update_transients"),
+                        "_update_transients",
+                        self._wrap_update_transients,
+                    )
+                recorder = getattr(driver, "_recorder", None)
+                if recorder is not None and id(recorder) not in wrapped:
+                    wrapped.add(id(recorder))
+                    self._set_value(
+                        recorder,
+                        "record_state",
+                        _TimedFunction(
+                            recorder.record_state, self, "recorder", "recorder"
+                        ),
+                    )
+
+    def disable(self):
+        """
+        Restore the components of the profiled system.
+        """
+        global _enabled
+        for cls, name, original in reversed(self._patches):
+            setattr(cls, name, original)
+        for obj, name, value, own in reversed(self._values):
+            if own or isinstance(obj, System):
+                setattr(obj, name, value)
+            else:
+                delattr(obj, name)
+        self._patches.clear()
+        self._values.clear()
+        self._stack.clear()
+        self._active.clear()
+        if _enabled is self:
+            _enabled = None
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    def _segment(self, path):
+        """
+        Return the segment of a component: the child of the profiled system it belongs to.
+
+        Parameters
+        ----------
+        path : str
+            Component path.
+
+        Returns
+        -------
+        str
+            Segment name, or the profiled system name for its own components.
+        """
+        names = path.split(".")
+        if len(names) > 1 and names[1] in self.system.children:
+            return names[1]
+        return names[0]
+
+    def report(self):
+        """
+        Return the statistics of the components.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Statistics by component path (see `MissionProfiler`), with the `segment`
+            and `kind` of the components, in the order of their first call.
+        """
+        columns = ["segment", "kind", *COUNTERS, "time", "self_time"]
+        report = pandas.DataFrame.from_dict(
+            self.statistics, orient="index", columns=columns[1:]
+        )
+        report.insert(0, "segment", [self._segment(path) for path in report.index])
+        report.index.name = "component"
+        return report
+
+    def segment_report(self):
+        """
+        Return the statistics summed by segment, with the self time of each kind of component.
+
+        Returns
+        -------
+        pandas.DataFrame
+            By segment: steps and rejected steps of the time drivers, resolutions and
+            residual calls of the solvers, compute calls of the systems, total wall time
+            [s] and self time of the systems, solvers, aerodynamic tables, engine
+            models, recorders... (`<kind>_time`).
+        """
+        report = self.report()
+        counters = report.groupby("segment", sort=False)[list(COUNTERS[1:])].sum()
+        times = report.pivot_table(
+            index="segment",
+            columns="kind",
+            values="self_time",
+            aggfunc="sum",
+            sort=False,
+        ).fillna(0.0)
+        times.columns = [f"{kind.replace(' ', '_')}_time" for kind in times.columns]
+        summary = counters.join(times)
+        summary.insert(len(counters.columns), "time", times.sum(axis=1))
+        return summary
+
+    def chrome_trace(self, path=None):
+        """
+        Return the trace events in the Chrome trace event format, and save them.
+
+        Parameters
+        ----------
+        path : str or pathlib.Path, optional
+            JSON file to save. Defaults to None, not to save the trace.
+
+        Returns
+        -------
+        dict
+            Trace, with the calls as complete events (times in microseconds).
+        """
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": kind,
+                    "ph": "X",
+                    "ts": start * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                }
+                for name, kind, start, duration in sorted(
+                    self.events, key=lambda event: (event[2], -event[3])
+                )
+            ],
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "system": self.system.name,
+                "dropped_events": self.dropped_events,
+            },
+        }
+        if path is not None:
+            with open(path, "w") as f:
+                json.dump(trace, f)
+        return trace
@@ -0,0 +1,791 @@
+"""________________________________________________________________________________
+
+                              MISSION SIMULATOR MODULE
+___________________________________________________________________________________"""
+
+# Lean NumPy re-implementation of the mission segments, without CoSApp drivers.
+# The climb, acceleration, cruise, deceleration and descent equations are those of
+# Climb.py, Acceleration.py, Cruise.py, Deceleration.py and Descent.py; the alpha
+# (and throttle) equilibrium is solved inline by Newton iterations at each evaluation.
+# missionSimulator.py
+
+import logging
+import math
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from scipy.optimize import brentq
+
+import amad.tools.atmosBADA as atmos
+import amad.tools.unit_conversion as uc
+from amad.disciplines.performance.tools.denseTrajectory import DenseTrajectory
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+
+logger = logging.getLogger(__name__)
+
+speedsclass = atmos.AtmosphereAMAD()
+
+# Explicit Runge-Kutta schemes of the CoSApp `RungeKutta` driver: stage time fractions and weights.
+RK_SCHEMES = {
+    2: (np.array([2.0 / 3.0]), np.array([0.25, 0.75])),
+    3: (np.array([1.0, 2.0]) / 3.0, np.array([0.25, 0.0, 0.75])),
+    4: (np.array([0.5, 0.5, 1.0]), np.array([1.0, 2.0, 2.0, 1.0]) / 6.0),
+}
+
+# Segment settings and their default values (those of the segment systems inwards).
+# The delta ISA temperature [K] is that of the engine model, as the `temp_delta_ISA`
+# of the segment engine systems, or of the segments flown with an engine backend.
+SEGMENT_DEFAULTS = {
+    "climb": {
+        "CAS": 0.0,
+        "Iso_Mach": 0.0,
+        "IsoMach": False,
+        "acceleration_altitude": 0.0,
+        "cruise_altitude": 0.0,
+        "RC_ceiling": 0.0,
+        "dISA": 0.0,
+    },
+    "accelerate": {"CAS_target": 0.0, "Mach_cruise": 0.0, "dISA": 0.0},
+    "cruise": {"Cruise_distance_target": 1000.0, "dISA": 0.0},
+    "decelerate": {"CAS_target": 0.0, "Iso_Mach": 0.0, "dISA": 0.0},
+    "descent": {
+        "CAS": 0.0,
+        "Iso_Mach": 0.0,
+        "IsoMach": True,
+        "CRD": 0.0,
+        "deceleration_altitude": 0.0,
+        "Fin_appr_altitude": 100.0,
+        "dISA": 0.0,
+    },
+}
+
+# Segment system classes of `mission_profile` and the corresponding segment kinds.
+SEGMENT_KINDS = {
+    "Climb_segment": "climb",
+    "Accelerate": "accelerate",
+    "Cruise_segment": "cruise",
+    "Decelerate": "decelerate",
+    "Descent_segment": "descent",
+}
+
+# Variables recorded at each time step of a segment.
+RECORDED = ("time", "x", "z", "TAS", "Mach", "alpha", "gamma", "THR", "SFC", "mass")
+
+
+def _bracket(grid, value, dimension):
+    """
+    Find the grid interval containing a value and its linear interpolation weight.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        Sorted grid points.
+    value : float
+        Interpolated coordinate.
+    dimension : int
+        Index of the grid dimension, for the error message.
+
+    Returns
+    -------
+    tuple
+        Lower index of the interval and weight of the upper point.
+
+    Raises
+    ------
+    ValueError
+        If the value is out of the grid bounds, as for `RegularGridInterpolator`.
+    """
+    if not grid[0] <= value <= grid[-1]:
+        raise ValueError(
+            f"One of the requested xi is out of bounds in dimension {dimension}"
+        )
+    i = min(max(int(np.searchsorted(grid, value, side="right")) - 1, 0), len(grid) - 2)
+    return i, (value - grid[i]) / (grid[i + 1] - grid[i])
+
+
+def alpha_slice(table, mach, altitude):
+    """
+    Reduce an aerodynamic table to a function of the angle of attack at given Mach and altitude.
+
+    For a linear `RegularGridInterpolator` over `(alpha, Mach, altitude)`,
+    as built by `createAeroInterpolationCSV`, the table is interpolated once
+    in Mach and altitude and then linearly in alpha, which gives the same
+    values as the trilinear interpolation for a fraction of its cost. Other
+    functions are called on `(alpha, Mach, altitude)` points.
+
+    Parameters
+    ----------
+    table : callable
+        Aerodynamic interpolation function.
+    mach : float
+        Mach number [-].
+    altitude : float
+        Altitude [m].
+
+    Returns
+    -------
+    callable
+        Function of an array of angles of attack [deg] returning the table values.
+    """
+    if (
+        isinstance(table, RegularGridInterpolator)
+        and table.method == "linear"
+        and len(table.grid) == 3
+    ):
+        alphas, machs, altitudes = table.grid
+        i, wi = _bracket(machs, mach, 1)
+        j, wj = _bracket(altitudes, altitude, 2)
+        v = table.values
+        values = (1.0 - wi) * ((1.0 - wj) * v[:, i, j] + wj * v[:, i, j + 1]) + wi * (
+            (1.0 - wj) * v[:, i + 1, j] + wj * v[:, i + 1, j + 1]
+        )
+        return lambda a: np.interp(a, alphas, values)
+
+    def evaluate(a):
+        pts = np.empty((len(a), 3))
+        pts[:, 0] = a
+        pts[:, 1] = mach
+        pts[:, 2] = altitude
+        return np.asarray(table(pts), dtype=float).reshape(-1)
+
+    return evaluate
+
+
+class MissionSimulator:
+    """
+    Fast-path mission simulator using plain NumPy state updates.
+
+    The segments of a mission are integrated one after the other with the
+    explicit Runge-Kutta schemes of CoSApp, from the state vector
+    `[x, z, V, mass]` (distance [m], altitude [m], horizontal speed [m/s]
+    and aircraft mass [kg]). At each evaluation the angle of attack is found
+    by Newton iterations on the lift equilibrium of the segment, warm started
+    from the previous evaluation. Segment end conditions and the IsoMach
+    switches are localised by root finding on the step size.
+
+    Attributes
+    ----------
+    CLAeroIt, CDAeroIt, DAeroIt : callable
+        Aerodynamic interpolation functions of `(alpha [deg], Mach, altitude [m])` points.
+    S : float
+        Wing reference surface [m**2].
+    n_eng : int
+        Number of engines.
+    engine_model : EngineBackend
+        Engine performance backend.
+    g : float
+        Gravity acceleration [m/s**2].
+    Thau : float
+        Angle between wing chord and aircraft longitudinal axis [deg].
+    dt : float
+        Time step [s].
+    order : int
+        Order of the Runge-Kutta scheme (2 to 4).
+    alpha_tol : float
+        Convergence tolerance of the angle of attack [deg].
+    max_iter : int
+        Maximum number of Newton iterations.
+    segments : list of dict
+        Segment definitions, see `add_segment`.
+    """
+
+    def __init__(
+        self,
+        CLAeroIt,
+        CDAeroIt,
+        DAeroIt,
+        S,
+        n_eng,
+        engine_model=None,
+        g=9.81,
+        Thau=0.0,
+        dt=1.0,
+        order=2,
+        alpha_tol=1e-9,
+        max_iter=30,
+    ):
+        """
+        Initialise the simulator.
+
+        Parameters
+        ----------
+        CLAeroIt, CDAeroIt, DAeroIt : callable
+            Aerodynamic interpolation functions, evaluated on arrays of points.
+        S : float
+            Wing reference surface [m**2].
+        n_eng : int
+            Number of engines.
+        engine_model : EngineBackend, optional
+            Engine performance backend. Defaults to the Mattingly model with default settings.
+        g : float, optional
+            Gravity acceleration [m/s**2]. Defaults to 9.81.
+        Thau : float, optional
+            Angle between wing chord and aircraft longitudinal axis [deg]. Defaults to 0.
+        dt : float, optional
+            Time step [s]. Defaults to 1.
+        order : int, optional
+            Order of the Runge-Kutta scheme (2 to 4). Defaults to 2, as the CoSApp driver.
+        alpha_tol : float, optional
+            Convergence tolerance of the angle of attack [deg]. Defaults to 1e-9.
+        max_iter : int, optional
+            Maximum number of Newton iterations. Defaults to 30.
+
+        Raises
+        ------
+        ValueError
+            If the Runge-Kutta order is not supported.
+        """
+        if order not in RK_SCHEMES:
+            raise ValueError(f"Runge-Kutta order must be 2, 3 or 4, got {order}")
+        self.CLAeroIt = CLAeroIt
+        self.CDAeroIt = CDAeroIt
+        self.DAeroIt = DAeroIt
+        self.S = S
+        self.n_eng = n_eng
+        self.engine_model = MattinglyBackend() if engine_model is None else engine_model
+        self.g = g
+        self.Thau = Thau
+        self.dt = dt
+        self.order = order
+        self.alpha_tol = alpha_tol
+        self.max_iter = max_iter
+        self.segments = []
+
+    @classmethod
+    def from_mission_profile(cls, mission, engine_model=None, **options):
+        """
+        Create a simulator flying the segments of a `mission_profile` system.
+
+        Parameters
+        ----------
+        mission : mission_profile
+            Mission system, with its aerodynamic interpolation functions set.
+        engine_model : EngineBackend, optional
+            Engine performance backend. Defaults to the backend of the mission
+            segments or, without one, to the Mattingly model with the settings
+            of their engine sub-systems.
+        **options
+            Other simulator options (`dt`, `order`, ...).
+
+        Returns
+        -------
+        MissionSimulator
+            The simulator, with one segment per flight segment of the mission.
+        """
+        first = mission.flightSegments[0]
+        if engine_model is None:
+            engine_model = first.engine_model
+        if engine_model is None:
+            engine_model = MattinglyBackend.from_engine(first.enginePerfo)
+
+        simulator = cls(
+            mission.CLAeroIt,
+            mission.CDAeroIt,
+            mission.DAeroIt,
+            S=float(mission.S),
+            n_eng=int(mission.n_eng),
+            engine_model=engine_model,
+            g=float(mission.g),
+            Thau=float(mission.Thau),
+            **options,
+        )
+        for segment in mission.flightSegments:
+            kind = SEGMENT_KINDS[type(segment).__name__]
+            # Values pulled from the mission are only transferred to the segments at run time
+            pulled = {}
+            for connector in mission.all_connectors():
+                if (
+                    connector.sink.owner is segment
+                    and connector.source.owner is mission
+                ):
+                    pulled.update(
+                        {
+                            sink: connector.source[source]
+                            for sink, source in connector.mapping.items()
+                        }
+                    )
+            settings = {
+                name: pulled.get(name, segment[name])
+                for name in SEGMENT_DEFAULTS[kind]
+                if name in segment
+            }
+            if "temp_delta_ISA" in segment:
+                settings["dISA"] = pulled.get("temp_delta_ISA", segment.temp_delta_ISA)
+            simulator.add_segment(kind, name=segment.name, **settings)
+        return simulator
+
+    def add_segment(self, kind, name=None, **settings):
+        """
+        Append a flight segment to the mission.
+
+        Parameters
+        ----------
+        kind : str
+            Segment kind: 'climb', 'accelerate', 'cruise', 'decelerate' or 'descent'.
+        name : str, optional
+            Segment name. Defaults to the kind followed by the segment index.
+        **settings
+            Segment settings, named as the inwards of the segment systems
+            (e.g. `CAS` [kt], `Iso_Mach`, `cruise_altitude` [m] for a climb),
+            and delta ISA temperature `dISA` [K] of the engine model.
+
+        Returns
+        -------
+        dict
+            The segment definition.
+
+        Raises
+        ------
+        ValueError
+            If the segment kind or a setting is unknown.
+        """
+        if kind not in SEGMENT_DEFAULTS:
+            raise ValueError(
+                f"Unknown segment kind {kind!r}, expected one of {list(SEGMENT_DEFAULTS)}"
+            )
+        unknown = set(settings) - set(SEGMENT_DEFAULTS[kind])
+        if unknown:
+            raise ValueError(f"Unknown settings {sorted(unknown)} for a {kind} segment")
+
+        segment = dict(SEGMENT_DEFAULTS[kind])
+        segment.update({key: value for key, value in settings.items()})
+        segment["kind"] = kind
+        segment["name"] = name or f"{kind}_{len(self.segments)}"
+        self.segments.append(segment)
+        return segment
+
+    def _solve_alpha(self, residual, alpha):
+        """
+        Solve `residual(alpha) == 0` by Newton iterations with finite-difference slopes.
+
+        The residual is evaluated on the pair `[alpha, alpha + delta]` at once,
+        so that each iteration makes a single call to the aerodynamic tables.
+
+        Parameters
+        ----------
+        residual : callable
+            Vectorised residual function of the angle of attack [deg].
+        alpha : float
+            Initial guess [deg].
+
+        Returns
+        -------
+        float
+            Angle of attack at equilibrium [deg].
+        """
+        delta = 1e-4
+        for _ in range(self.max_iter):
+            r, r_delta = residual(np.array([alpha, alpha + delta]))
+            step = r * delta / (r_delta - r)
+            alpha -= step
+            if abs(step) < self.alpha_tol:
+                return alpha
+        logger.warning(
+            f"Angle of attack not converged after {self.max_iter} iterations (alpha={alpha:.6g} deg)"
+        )
+        return alpha
+
+    def _speeds(self, segment, mode, z, V):
+        """
+        Compute the true airspeed and Mach number of a segment.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition.
+        mode : bool
+            IsoMach mode of climb and descent segments.
+        z : float
+            Altitude [m].
+        V : float
+            Horizontal speed state [m/s].
+
+        Returns
+        -------
+        tuple
+            True airspeed [m/s] and Mach number [-].
+        """
+        if segment["kind"] in ("climb", "descent"):
+            if mode:
+                Mach = segment["Iso_Mach"]
+                return speedsclass.mach2tas(Mach, z), Mach
+            TAS = speedsclass.cas2tas(uc.kt2ms(segment["CAS"]), z)
+        else:
+            TAS = V
+        return TAS, speedsclass.tas2mach(TAS, z)
+
+    def _rates(self, segment, mode, y, alpha):
+        """
+        Evaluate a segment at a given state: equilibrium, outputs and state derivatives.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition.
+        mode : bool
+            IsoMach mode of climb and descent segments.
+        y : numpy.ndarray
+            State `[x, z, V, mass]`.
+        alpha : float
+            Initial guess of the angle of attack [deg].
+
+        Returns
+        -------
+        tuple
+            State derivatives (numpy.ndarray) and segment outputs (dict).
+        """
+        kind = segment["kind"]
+        _, z, V, mass = y
+        g, S, tau = self.g, self.S, math.radians(self.Thau)
+        rho = speedsclass.airdens_kgpm3(z)
+        TAS, Mach = self._speeds(segment, mode, z, V)
+        q_S = 0.5 * rho * S * TAS**2
+        CL_of = alpha_slice(self.CLAeroIt, Mach, z)
+        gamma = 0.0
+        dV = 0.0
+
+        if kind == "climb":
+            D_of = alpha_slice(self.DAeroIt, Mach, z)
+            THR, SFC = self.engine_model.evaluate(z, Mach, "MCLB", segment["dISA"])
+            THR *= self.n_eng
+
+            def residual(alphas):
+                CL, Drag = CL_of(alphas), D_of(alphas)
+                a = np.radians(alphas) + tau
+                gam = np.arcsin((THR * np.cos(a) - Drag) / (mass * g))
+                return (
+                    q_S * CL
+                    - (mass * g + Drag * np.sin(gam) - THR * np.sin(a + gam))
+                    / np.cos(gam)
+                ) / (mass * g)
+
+            alpha = self._solve_alpha(residual, alpha)
+            Drag = D_of(np.array([alpha]))[0]
+            gamma = math.asin(
+                (THR * math.cos(math.radians(alpha) + tau) - Drag) / (mass * g)
+            )
+
+        elif kind == "descent":
+            D_of = alpha_slice(self.DAeroIt, Mach, z)
+            THR_max = self.n_eng * self.engine_model.max_thrust(
+                z, Mach, segment["dISA"]
+            )
+            _, SFC = self.engine_model.evaluate(z, Mach, "MCT", segment["dISA"])
+            gamma = math.asin(segment["CRD"] / TAS)
+
+            def thrust(alphas, Drag):
+                return (Drag + mass * g * math.sin(gamma)) / np.cos(
+                    np.radians(alphas) + tau
+                )
+
+            def residual(alphas):
+                CL, Drag = CL_of(alphas), D_of(alphas)
+                return (
+                    q_S * CL
+                    - mass * g * math.cos(gamma)
+                    + thrust(alphas, Drag) * np.sin(np.radians(alphas) + tau)
+                ) / (mass * g)
+
+            alpha = self._solve_alpha(residual, alpha)
+            THR = float(thrust(alpha, D_of(np.array([alpha]))[0]))
+            # Thrust is set by the throttle to hold the rate of descent
+            throttle = THR / THR_max
+
+        elif kind == "cruise":
+            CD_of = alpha_slice(self.CDAeroIt, Mach, z)
+            _, SFC = self.engine_model.evaluate(z, Mach, "MCRZ", segment["dISA"])
+
+            def residual(alphas):
+                CL, CD = CL_of(alphas), CD_of(alphas)
+                a = np.radians(alphas) + tau
+                return (q_S * CL - mass * g + q_S * CD * np.tan(a)) / (mass * g)
+
+            alpha = self._solve_alpha(residual, alpha)
+            CD = CD_of(np.array([alpha]))[0]
+            THR = q_S * CD / math.cos(math.radians(alpha) + tau)
+
+        else:
+            if kind == "accelerate":
+                rating, D_of = "MCT", alpha_slice(self.DAeroIt, Mach, z)
+            else:
+                rating, CD_of = "IDLE", alpha_slice(self.CDAeroIt, Mach, z)
+            THR, SFC = self.engine_model.evaluate(z, Mach, rating, segment["dISA"])
+            THR *= self.n_eng
+
+            def residual(alphas):
+                CL = CL_of(alphas)
+                a = np.radians(alphas) + tau
+                return (q_S * CL - mass * g + THR * np.sin(a)) / (mass * g)
+
+            alpha = self._solve_alpha(residual, alpha)
+            if kind == "accelerate":
+                Drag = D_of(np.array([alpha]))[0]
+                dV = (THR * math.cos(math.radians(alpha) + tau) - Drag) / mass
+            else:
+                Drag = q_S * CD_of(np.array([alpha]))[0]
+                dV = (THR - Drag) / mass
+
+        dy = np.array(
+            [TAS * math.cos(gamma), TAS * math.sin(gamma), dV, -SFC * THR], dtype=float
+        )
+        outputs = {
+            "TAS": TAS,
+            "Mach": Mach,
+            "alpha": alpha,
+            "gamma": gamma,
+            "THR": THR,
+            "SFC": SFC,
+        }
+        if kind == "descent":
+            outputs["Throttle"] = throttle
+        return dy, outputs
+
+    def _step(self, segment, mode, y, k1, alpha, h):
+        """
+        Advance a segment state by one Runge-Kutta step.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition.
+        mode : bool
+            IsoMach mode of climb and descent segments.
+        y : numpy.ndarray
+            State at the beginning of the step.
+        k1 : numpy.ndarray
+            State derivatives at the beginning of the step.
+        alpha : float
+            Angle of attack at the beginning of the step [deg].
+        h : float
+            Step size [s].
+
+        Returns
+        -------
+        tuple
+            New state, its derivatives and segment outputs.
+        """
+        fracs, coefs = RK_SCHEMES[self.order]
+        stages = [k1]
+        for frac in fracs:
+            k, outputs = self._rates(segment, mode, y + frac * h * stages[-1], alpha)
+            alpha = outputs["alpha"]
+            stages.append(k)
+        y_new = y + h * sum(c * k for c, k in zip(coefs, stages))
+        k_new, outputs = self._rates(segment, mode, y_new, alpha)
+        return y_new, k_new, outputs
+
+    def _events(self, segment, mode, y, outputs, x0):
+        """
+        Evaluate the event functions of a segment, which change sign when the event occurs.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition.
+        mode : bool
+            IsoMach mode of climb and descent segments.
+        y : numpy.ndarray
+            State `[x, z, V, mass]`.
+        outputs : dict
+            Segment outputs at this state.
+        x0 : float
+            Distance at the beginning of the segment [m].
+
+        Returns
+        -------
+        dict
+            Event values by name; mode-switching events are named 'Crossover_altitude'.
+        """
+        kind = segment["kind"]
+        x, z, V, _ = y
+        if kind == "climb":
+            events = {
+                "acceleration_altitude_reached": z - segment["acceleration_altitude"],
+                "Cruise_altitude_reached": z - segment["cruise_altitude"],
+                "Maximum_ceiling_reached": outputs["TAS"] * math.sin(outputs["gamma"])
+                - segment["RC_ceiling"],
+            }
+            if not mode:
+                events["Crossover_altitude"] = outputs["Mach"] - segment["Iso_Mach"]
+        elif kind == "descent":
+            events = {
+                "Final_approach_altitude_reached": z - segment["Fin_appr_altitude"],
+                "Deceleration_altitude_reached": z - segment["deceleration_altitude"],
+            }
+            if mode:
+                CAS = speedsclass.tas2cas(outputs["TAS"], z)
+                events["Crossover_altitude"] = CAS - 154.3
+        elif kind == "cruise":
+            events = {
+                "Cruise_distance_reached": x - x0 - segment["Cruise_distance_target"]
+            }
+        else:
+            if kind == "accelerate" and segment["Mach_cruise"] != 0.0:
+                vf = speedsclass.mach2tas(segment["Mach_cruise"], z)
+            elif kind == "decelerate" and segment["Iso_Mach"] != 0.0:
+                vf = speedsclass.mach2tas(segment["Iso_Mach"], z)
+            else:
+                vf = speedsclass.cas2tas(uc.kt2ms(segment["CAS_target"]), z)
+            events = {"speed_arrived": V - vf}
+        return events
+
+    def run_segment(self, segment, y0, alpha0=0.0, t_max=100000.0):
+        """
+        Fly a segment from an initial state until one of its final events.
+
+        Parameters
+        ----------
+        segment : dict
+            Segment definition.
+        y0 : array_like
+            Initial state `[x, z, V, mass]`.
+        alpha0 : float, optional
+            Initial guess of the angle of attack [deg]. Defaults to 0.
+        t_max : float, optional
+            Maximum segment duration [s]. Defaults to 100000, as the mission drivers.
+
+        Returns
+        -------
+        dict
+            Time histories of the segment (see `RECORDED`) as arrays, plus the
+            final `state`, the `event` ending the segment, its `fuel_mass` [kg]
+            and its `dense` output (`DenseTrajectory` of the histories, with the
+            state derivatives at the steps).
+        """
+        segment = dict(segment)
+        mode = bool(segment.get("IsoMach", False))
+        y = np.array(y0, dtype=float)
+        x0 = y[0]
+        k, outputs = self._rates(segment, mode, y, alpha0)
+        events = self._events(segment, mode, y, outputs, x0)
+        t = 0.0
+        history = {name: [] for name in RECORDED}
+        rates = []
+
+        def record():
+            rates.append(k)
+            for name, value in zip(("time", "x", "z"), (t, y[0], y[1])):
+                history[name].append(value)
+            history["mass"].append(y[3])
+            for name in RECORDED[3:-1]:
+                history[name].append(outputs[name])
+
+        record()
+        final_event = None
+        while final_event is None and t < t_max:
+            h = min(self.dt, t_max - t)
+            y_new, k_new, outputs_new = self._step(
+                segment, mode, y, k, outputs["alpha"], h
+            )
+            events_new = self._events(segment, mode, y_new, outputs_new, x0)
+            triggered = [
+                name
+                for name, value in events_new.items()
+                if events[name] != 0.0 and events[name] * value <= 0.0
+            ]
+            if triggered:
+                # Localise the earliest event by root finding on the step size
+                def event_value(s, name):
+                    y_s, _, outputs_s = self._step(
+                        segment, mode, y, k, outputs["alpha"], s
+                    )
+                    return self._events(segment, mode, y_s, outputs_s, x0)[name]
+
+                times = {
+                    name: brentq(
+                        event_value, 0.0, h, args=(name,), xtol=1e-10, rtol=1e-12
+                    )
+                    for name in triggered
+                }
+                name = min(times, key=times.get)
+                h = times[name]
+                y_new, k_new, outputs_new = self._step(
+                    segment, mode, y, k, outputs["alpha"], h
+                )
+                if name == "Crossover_altitude":
+                    mode = not mode
+                    if segment["kind"] == "descent":
+                        # The IsoMach descent overwrites its CAS, kept after the crossover
+                        segment["CAS"] = uc.ms2kt(
+                            speedsclass.tas2cas(outputs_new["TAS"], y_new[1])
+                        )
+                    k_new, outputs_new = self._rates(
+                        segment, mode, y_new, outputs_new["alpha"]
+                    )
+                else:
+                    final_event = name
+                events_new = self._events(segment, mode, y_new, outputs_new, x0)
+
+            t += h
+            y, k, outputs, events = y_new, k_new, outputs_new, events_new
+            record()
+
+        result = {name: np.array(values) for name, values in history.items()}
+        result["state"] = y
+        result["event"] = final_event
+        result["fuel_mass"] = result["mass"][0] - y[3]
+        rates = np.array(rates)
+        result["dense"] = DenseTrajectory(
+            result["time"],
+            {name: result[name] for name in RECORDED[1:]},
+            {"x": rates[:, 0], "z": rates[:, 1], "mass": rates[:, 3]},
+            names=[segment.get("name")],
+        )
+        # Speed vector handed over to the next segment, as `out_p.TAS_speed`
+        result["TAS_speed"] = np.array([k[0], 0.0, k[1]])
+        return result
+
+    def run(self, m0, position=(0.0, 0.0, 457.2), TAS_speed=(0.0, 0.0, 0.0)):
+        """
+        Fly the whole mission.
+
+        Each segment starts from the final state of the previous one; as with the
+        segment systems, the horizontal speed component is handed over to
+        the acceleration, cruise and deceleration segments.
+
+        Parameters
+        ----------
+        m0 : float
+            Initial aircraft mass [kg].
+        position : array_like, optional
+            Initial position `[x, y, z]` [m]. Defaults to 1500 ft altitude.
+        TAS_speed : array_like, optional
+            Initial speed vector [m/s], only used if the first segment is not a climb or descent.
+
+        Returns
+        -------
+        dict
+            Segment results by segment name (see `run_segment`).
+        """
+        y = np.array([position[0], position[2], TAS_speed[0], m0], dtype=float)
+        results, _, _ = self.run_segments(self.segments, y)
+        return results
+
+    def run_segments(self, segments, y0, alpha0=0.0):
+        """
+        Fly a sequence of segments, each one starting from the final state of the previous one.
+
+        Parameters
+        ----------
+        segments : list of dict
+            Segment definitions.
+        y0 : array_like
+            Initial state `[x, z, V, mass]`.
+        alpha0 : float, optional
+            Initial guess of the angle of attack [deg]. Defaults to 0.
+
+        Returns
+        -------
+        tuple
+            Segment results by segment name (see `run_segment`), initial state
+            and angle of attack guess of a following segment.
+        """
+        y = np.array(y0, dtype=float)
+        alpha = alpha0
+        results = {}
+        for segment in segments:
+            result = self.run_segment(segment, y, alpha)
+            results[segment["name"]] = result
+            y = result["state"].copy()
+            y[2] = result["TAS_speed"][0]
+            alpha = result["alpha"][-1]
+        return results, y, alpha
@@ -0,0 +1,384 @@
+"""________________________________________________________________________________
+
+                              MISSION SWEEP MODULE
+___________________________________________________________________________________"""
+
+# Parallel runs of a mission over a table of parameters (take-off mass, cruise
+# distance or altitude...), one mission system being built per worker process.
+# The aerodynamic tables and engine deck are shared with the workers as
+# memory-mapped files of a `TableRegistry`.
+# missionSweep.py
+
+import os
+import copy
+import time
+import logging
+import traceback
+import multiprocessing
+from numbers import Number
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas
+from cosapp.base import System
+from amad.disciplines.performance.tools.tableRegistry import (  # noqa: F401
+    TableRegistry,
+    attach_table,
+    detach_table,
+    share_table,
+)
+
+logger = logging.getLogger(__name__)
+
+AERO_TABLES = ("CLAeroIt", "CDAeroIt", "DAeroIt")
+
+# Mission system and tables of the current worker process
+_worker = {}
+
+
+def input_state(system):
+    """
+    Copy the numerical input values and output mode variables of a system and of its children.
+
+    Output mode variables without initial value (e.g. `IsoMach` of the climb
+    segment) keep their value from one run to the next, so they are part of the
+    state of a mission.
+
+    Parameters
+    ----------
+    system : cosapp.base.System
+        System, e.g. a mission before its first run.
+
+    Returns
+    -------
+    dict
+        Copied values by port, by variable name.
+    """
+    state = {}
+    for child in system.tree():
+        for port in [*child.inputs.values(), child.outputs[System.MODEVARS_OUT]]:
+            values = {
+                name: copy.deepcopy(value)
+                for name, value in port.items()
+                if isinstance(value, (Number, str, np.ndarray))
+            }
+            if values:
+                state[port] = values
+    return state
+
+
+def restore_state(state):
+    """
+    Restore the input values copied by `input_state`.
+
+    Parameters
+    ----------
+    state : dict
+        Copied values by port, by variable name.
+    """
+    for port, values in state.items():
+        for name, value in values.items():
+            port[name] = copy.deepcopy(value)
+
+
+def _build_mission():
+    """
+    Build the mission system of the worker process from its settings.
+    """
+    factory, tables, engine_model = _worker["settings"]
+    if engine_model is None:
+        mission = factory()
+    else:
+        mission = factory(engine_model=attach_table(engine_model))
+    for name, shared in tables.items():
+        mission[name] = attach_table(shared)
+    _worker["mission"] = mission
+    # Each point starts from the initial inputs, not from the end of the previous run
+    _worker["state"] = input_state(mission)
+
+
+def _init_worker(factory, tables, engine_model=None):
+    """
+    Build the mission system of a worker process.
+
+    An exception raised by the initializer of a process would break the whole pool:
+    errors are kept instead, and the mission is built again by the next point, which
+    reports the error if it fails again (e.g. on concurrent accesses of the workers
+    to the CoSApp configuration file).
+
+    Parameters
+    ----------
+    factory : callable
+        Function returning a new mission system.
+    tables : dict
+        Shared aerodynamic tables by inward name.
+    engine_model : dict or EngineBackend, optional
+        Shared engine model, passed to the factory as `engine_model`.
+    """
+    _worker.clear()
+    _worker["settings"] = (factory, tables, engine_model)
+    try:
+        _build_mission()
+    except Exception:
+        _worker["error"] = traceback.format_exc(limit=3)
+
+
+def _run_point(index, parameters, outputs):
+    """
+    Run the mission of the worker for one point of the sweep.
+
+    Parameters
+    ----------
+    index : int
+        Point index in the parameter table.
+    parameters : dict
+        Mission variable values by path.
+    outputs : dict
+        Output variable paths or functions of the mission, by name.
+
+    Returns
+    -------
+    dict
+        Point record: index, parameters, outputs, error message and run time [s].
+    """
+    start = time.perf_counter()
+    record = {"index": index, **parameters}
+    try:
+        if "mission" not in _worker:
+            try:
+                _build_mission()
+            except Exception:
+                _worker["error"] = traceback.format_exc(limit=3)
+                raise RuntimeError(
+                    f"The mission of the worker cannot be built:\n{_worker['error']}"
+                )
+            _worker.pop("error", None)
+        mission = _worker["mission"]
+        restore_state(_worker["state"])
+        for name, value in parameters.items():
+            mission[name] = value
+        mission.run_drivers()
+        for name, output in outputs.items():
+            value = output(mission) if callable(output) else mission[output]
+            value = np.asarray(value)
+            record[name] = value.item() if value.size == 1 else value.copy()
+        record["error"] = None
+    except Exception:
+        record["error"] = traceback.format_exc(limit=3)
+    record["wall_time"] = time.perf_counter() - start
+    return record
+
+
+def total_fuel(mission):
+    """
+    Return the fuel burnt over all the segments of a `mission_profile`.
+
+    Parameters
+    ----------
+    mission : mission_profile
+        Mission system, after the run.
+
+    Returns
+    -------
+    float
+        Mission fuel mass [kg].
+    """
+    return float(
+        sum(np.ravel(segment.out_p.fuel_mass)[0] for segment in mission.flightSegments)
+    )
+
+
+def mission_range(mission):
+    """
+    Return the distance flown at the end of a `mission_profile`.
+
+    Parameters
+    ----------
+    mission : mission_profile
+        Mission system, after the run.
+
+    Returns
+    -------
+    float
+        Mission distance [m].
+    """
+    return float(mission.flightSegments[-1].out_p.position[0])
+
+
+class MissionSweep:
+    """
+    Run a mission over a table of parameters in a pool of processes.
+
+    Each worker process builds its own mission system once, with the factory,
+    and maps the aerodynamic tables and engine deck published by the sweep
+    instead of receiving a copy; points are then sent to the workers and their
+    results streamed back in completion order.
+
+    Attributes
+    ----------
+    factory : callable
+        Picklable function returning a new, ready to run, mission system
+        (e.g. a `functools.partial` of `mission_profile`).
+    tables : dict
+        Aerodynamic tables by mission inward name.
+    engine_model : EngineBackend
+        Engine model passed to the factory, if any.
+    outputs : dict
+        Output variable paths, or functions of the mission system, by name.
+    n_workers : int
+        Number of worker processes; 0 to run the points in the calling process.
+    """
+
+    def __init__(
+        self,
+        factory,
+        CLAeroIt=None,
+        CDAeroIt=None,
+        DAeroIt=None,
+        outputs=None,
+        n_workers=None,
+        mp_context=None,
+        engine_model=None,
+    ):
+        """
+        Initialise the sweep.
+
+        Parameters
+        ----------
+        factory : callable
+            Picklable function returning a new mission system.
+        CLAeroIt, CDAeroIt, DAeroIt : callable, optional
+            Aerodynamic tables set on the mission systems, if not already set by the factory.
+        outputs : dict, optional
+            Output variable paths or functions of the mission system, by name.
+            Defaults to the total fuel and range of a `mission_profile`.
+        n_workers : int, optional
+            Number of worker processes. Defaults to the number of CPUs.
+        mp_context : str, optional
+            Multiprocessing start method ('fork', 'spawn'...). Defaults to the platform default.
+        engine_model : EngineBackend, optional
+            Engine model (e.g. an `EngineDeck`, whose tables are shared) given to the
+            factory as its `engine_model` keyword argument. Defaults to None.
+        """
+        self.factory = factory
+        self.tables = {
+            name: table
+            for name, table in zip(AERO_TABLES, (CLAeroIt, CDAeroIt, DAeroIt))
+            if table is not None
+        }
+        self.outputs = (
+            outputs
+            if outputs is not None
+            else {"fuel_mass": total_fuel, "range": mission_range}
+        )
+        self.n_workers = os.cpu_count() if n_workers is None else n_workers
+        self.mp_context = mp_context
+        self.engine_model = engine_model
+
+    @staticmethod
+    def _points(table):
+        """
+        Return the points of a parameter table.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame or dict or list of dict
+            Parameter values by mission variable path, one row per point.
+
+        Returns
+        -------
+        list of dict
+            Parameters of each point.
+        """
+        if isinstance(table, dict):
+            table = pandas.DataFrame(table)
+        if isinstance(table, pandas.DataFrame):
+            return table.to_dict("records")
+        return [dict(point) for point in table]
+
+    def iter_run(self, table, progress=None):
+        """
+        Run the sweep, yielding the point records in completion order.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame or dict or list of dict
+            Parameter values by mission variable path, one row per point.
+        progress : callable, optional
+            Function called after each point with the number of completed points,
+            the number of points and the point record. Progress is logged by default.
+
+        Yields
+        ------
+        dict
+            Point record, with its `index` in the table, its parameters, outputs,
+            `error` (formatted traceback or None) and `wall_time` [s].
+        """
+        points = self._points(table)
+        total = len(points)
+        if progress is None:
+
+            def progress(done, total, record):
+                logger.info(
+                    f"Mission sweep: {done}/{total} points ({record['wall_time']:.1f} s for point {record['index']})"
+                )
+
+        with TableRegistry() as registry:
+            tables = {
+                name: registry.publish(name, table)
+                for name, table in self.tables.items()
+            }
+            engine_model = (
+                None
+                if self.engine_model is None
+                else registry.publish("engine_model", self.engine_model)
+            )
+            if self.n_workers == 0:
+                _init_worker(self.factory, tables, engine_model)
+                try:
+                    for done, (index, parameters) in enumerate(enumerate(points), 1):
+                        record = _run_point(index, parameters, self.outputs)
+                        progress(done, total, record)
+                        yield record
+                finally:
+                    for shared in [*tables.values(), engine_model]:
+                        detach_table(shared)
+                return
+
+            context = multiprocessing.get_context(self.mp_context)
+            with ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.factory, tables, engine_model),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_point, index, parameters, self.outputs)
+                    for index, parameters in enumerate(points)
+                ]
+                try:
+                    for done, future in enumerate(as_completed(futures), 1):
+                        record = future.result()
+                        progress(done, total, record)
+                        yield record
+                finally:
+                    for future in futures:
+                        future.cancel()
+
+    def run(self, table, progress=None):
+        """
+        Run the sweep and gather the results.
+
+        Parameters
+        ----------
+        table : pandas.DataFrame or dict or list of dict
+            Parameter values by mission variable path, one row per point.
+        progress : callable, optional
+            Progress function (see `iter_run`).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Point records, in the order of the parameter table.
+        """
+        records = list(self.iter_run(table, progress))
+        return pandas.DataFrame(records).sort_values("index").reset_index(drop=True)
@@ -0,0 +1,567 @@
+"""________________________________________________________________________________
+
+                              PAYLOAD-RANGE MODULE
+___________________________________________________________________________________"""
+
+# Payload-range diagram of a mission flown by the fast-path `MissionSimulator`.
+# The corner points (maximum payload at MTOW, full fuel at MTOW and ferry) are found
+# by solving the fuel balance of the mission: the cruise distance at a fixed take-off
+# mass for the corners, the take-off mass at a given range between them.
+# payloadRange.py
+
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas
+
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+
+logger = logging.getLogger(__name__)
+
+# Corner points of the payload-range diagram, by increasing range
+CORNERS = ("max_payload", "max_fuel", "ferry")
+
+
+def _secant(func, x0, f0, x1, tol, max_iter):
+    """
+    Find a root of a function by secant iterations, from a first evaluated guess.
+
+    Parameters
+    ----------
+    func : callable
+        Function of a float.
+    x0 : float
+        First guess.
+    f0 : float
+        Function value at the first guess.
+    x1 : float
+        Second guess.
+    tol : float
+        Absolute tolerance on the root.
+    max_iter : int
+        Maximum number of function evaluations.
+
+    Returns
+    -------
+    tuple
+        Root, number of function evaluations and convergence flag.
+    """
+    for n in range(1, max_iter + 1):
+        f1 = func(x1)
+        if f1 == f0:
+            return x1, n, f1 == 0.0
+        x2 = x1 - f1 * (x1 - x0) / (f1 - f0)
+        if abs(x2 - x1) < tol:
+            return x2, n, True
+        x0, f0, x1 = x1, f1, x2
+    return x1, max_iter, False
+
+
+class PayloadRange:
+    """
+    Payload-range diagram engine.
+
+    The mission fuel balance is solved with the fast-path simulator, by secant
+    iterations warm started from the previous solution:
+
+    - for the corner points, the take-off mass is fixed and the cruise distance
+      is found such that the block fuel (trip fuel and reserves) equals the
+      available fuel; the segments flown before the cruise only depend on the
+      take-off mass and are cached, so that each iteration only flies the cruise
+      and the following segments;
+    - between the corner points, the range is fixed and the take-off mass is
+      found, with either the maximum payload or the full fuel capacity on board.
+
+    The three corners are independent and may be computed in parallel processes.
+
+    Attributes
+    ----------
+    simulator : MissionSimulator
+        Mission simulator, with one cruise segment.
+    OEW : float
+        Operating empty weight [kg].
+    MTOW : float
+        Maximum take-off weight [kg].
+    max_payload : float
+        Maximum payload [kg].
+    fuel_capacity : float
+        Maximum fuel mass [kg].
+    reserve_fraction : float
+        Reserve fuel, as a fraction of the trip fuel [-].
+    reserve_fuel : float
+        Fixed reserve fuel [kg].
+    position : numpy.ndarray
+        Initial position `[x, y, z]` of the mission [m].
+    xtol : float
+        Absolute tolerance on the cruise distance and on the range [m].
+    mass_tol : float
+        Absolute tolerance on the take-off mass [kg].
+    max_iter : int
+        Maximum number of iterations of each solve.
+    n_workers : int
+        Number of processes computing the corners; 0 to compute them in the calling process.
+    n_prefix_runs : int
+        Number of flights of the segments before the cruise.
+    n_prefix_reused : int
+        Number of reuses of cached segments before the cruise.
+    """
+
+    def __init__(
+        self,
+        simulator,
+        OEW,
+        MTOW,
+        max_payload,
+        fuel_capacity,
+        reserve_fraction=0.0,
+        reserve_fuel=0.0,
+        position=(0.0, 0.0, 457.2),
+        xtol=10.0,
+        mass_tol=0.5,
+        max_iter=20,
+        n_workers=0,
+        mp_context=None,
+    ):
+        """
+        Initialise the engine.
+
+        Parameters
+        ----------
+        simulator : MissionSimulator
+            Mission simulator, with one cruise segment.
+        OEW : float
+            Operating empty weight [kg].
+        MTOW : float
+            Maximum take-off weight [kg].
+        max_payload : float
+            Maximum payload [kg].
+        fuel_capacity : float
+            Maximum fuel mass [kg].
+        reserve_fraction : float, optional
+            Reserve fuel, as a fraction of the trip fuel [-]. Defaults to 0.
+        reserve_fuel : float, optional
+            Fixed reserve fuel [kg]. Defaults to 0.
+        position : array_like, optional
+            Initial position `[x, y, z]` [m]. Defaults to 1500 ft altitude.
+        xtol : float, optional
+            Absolute tolerance on the cruise distance and on the range [m]. Defaults to 10.
+        mass_tol : float, optional
+            Absolute tolerance on the take-off mass [kg]. Defaults to 0.5.
+        max_iter : int, optional
+            Maximum number of iterations of each solve. Defaults to 20.
+        n_workers : int, optional
+            Number of processes computing the corners. Defaults to 0 (calling process).
+        mp_context : str, optional
+            Multiprocessing start method ('fork', 'spawn'...). Defaults to the platform default.
+
+        Raises
+        ------
+        ValueError
+            If the simulator has no cruise segment, or if the masses are inconsistent.
+        """
+        kinds = [segment["kind"] for segment in simulator.segments]
+        if kinds.count("cruise") != 1:
+            raise ValueError(
+                f"The mission must have exactly one cruise segment; got {kinds}"
+            )
+        if min(OEW, max_payload, fuel_capacity) <= 0.0 or MTOW <= OEW:
+            raise ValueError(
+                f"Inconsistent masses: OEW={OEW}, MTOW={MTOW}, max_payload={max_payload}, fuel_capacity={fuel_capacity}"
+            )
+        self.simulator = simulator
+        self.OEW = OEW
+        self.MTOW = MTOW
+        self.max_payload = max_payload
+        self.fuel_capacity = fuel_capacity
+        self.reserve_fraction = reserve_fraction
+        self.reserve_fuel = reserve_fuel
+        self.position = np.asarray(position, dtype=float)
+        self.xtol = xtol
+        self.mass_tol = mass_tol
+        self.max_iter = max_iter
+        self.n_workers = n_workers
+        self.mp_context = mp_context
+        self.n_prefix_runs = 0
+        self.n_prefix_reused = 0
+        i = kinds.index("cruise")
+        self._prefix_segments = simulator.segments[:i]
+        self._cruise = simulator.segments[i]
+        self._suffix_segments = simulator.segments[i:][1:]
+        self._prefix_cache = {}
+        # Last solution, used as the initial guess of the next solve
+        self._hint = {"cruise_distance": self._cruise["Cruise_distance_target"]}
+        self._corners = None
+
+    @classmethod
+    def from_mission_profile(
+        cls,
+        mission,
+        OEW,
+        MTOW,
+        max_payload,
+        fuel_capacity=None,
+        engine_model=None,
+        simulator_options=None,
+        **options,
+    ):
+        """
+        Create the engine of a `mission_profile` system.
+
+        Parameters
+        ----------
+        mission : mission_profile
+            Mission system, with its aerodynamic interpolation functions set.
+        OEW : float
+            Operating empty weight [kg].
+        MTOW : float
+            Maximum take-off weight [kg].
+        max_payload : float
+            Maximum payload [kg].
+        fuel_capacity : float, optional
+            Maximum fuel mass [kg]. Defaults to the fuel capacity `W_f` of the mission.
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `MissionSimulator.from_mission_profile`).
+        simulator_options : dict, optional
+            Options of the simulator (`dt`, `order`, ...).
+        **options
+            Other options of the engine (see `PayloadRange`).
+
+        Returns
+        -------
+        PayloadRange
+            The payload-range engine.
+        """
+        simulator = MissionSimulator.from_mission_profile(
+            mission, engine_model, **(simulator_options or {})
+        )
+        if fuel_capacity is None:
+            fuel_capacity = float(mission.W_f)
+        options.setdefault("position", mission.flightSegments[0].in_p.position)
+        return cls(simulator, OEW, MTOW, max_payload, fuel_capacity, **options)
+
+    def block_fuel(self, trip_fuel):
+        """
+        Return the block fuel of a mission: trip fuel and reserves.
+
+        Parameters
+        ----------
+        trip_fuel : float
+            Fuel burnt over the mission [kg].
+
+        Returns
+        -------
+        float
+            Block fuel [kg].
+        """
+        return trip_fuel * (1.0 + self.reserve_fraction) + self.reserve_fuel
+
+    def _prefix(self, TOW):
+        """
+        Fly the segments before the cruise, or reuse them for a known take-off mass.
+
+        Parameters
+        ----------
+        TOW : float
+            Take-off mass [kg].
+
+        Returns
+        -------
+        tuple
+            Initial state and angle of attack guess of the cruise.
+        """
+        key = float(TOW)
+        if key in self._prefix_cache:
+            self.n_prefix_reused += 1
+            return self._prefix_cache[key]
+        y0 = np.array([self.position[0], self.position[2], 0.0, key])
+        _, y, alpha = self.simulator.run_segments(self._prefix_segments, y0)
+        self.n_prefix_runs += 1
+        self._prefix_cache[key] = (y, alpha)
+        return y, alpha
+
+    def fly(self, TOW, cruise_distance):
+        """
+        Fly the mission for a take-off mass and a cruise distance.
+
+        Parameters
+        ----------
+        TOW : float
+            Take-off mass [kg].
+        cruise_distance : float
+            Cruise distance [m].
+
+        Returns
+        -------
+        dict
+            Take-off mass, cruise distance, `range` [m], `trip_fuel`, `block_fuel`
+            and `cruise_fuel` [kg] of the mission.
+
+        Raises
+        ------
+        ValueError
+            If the cruise distance is not positive.
+        """
+        if cruise_distance <= 0.0:
+            raise ValueError(
+                f"The cruise distance must be positive; got {cruise_distance:.0f} m"
+            )
+        y, alpha = self._prefix(TOW)
+        cruise = dict(self._cruise, Cruise_distance_target=cruise_distance)
+        results, y_end, _ = self.simulator.run_segments(
+            [cruise] + self._suffix_segments, y, alpha
+        )
+        trip_fuel = TOW - y_end[3]
+        return {
+            "TOW": TOW,
+            "cruise_distance": cruise_distance,
+            "range": y_end[0] - self.position[0],
+            "trip_fuel": trip_fuel,
+            "block_fuel": self.block_fuel(trip_fuel),
+            "cruise_fuel": results[cruise["name"]]["fuel_mass"],
+        }
+
+    def _fuel_balance(self, TOW, fuel):
+        """
+        Find the cruise distance whose block fuel equals the fuel on board, at a fixed take-off mass.
+
+        Parameters
+        ----------
+        TOW : float
+            Take-off mass [kg].
+        fuel : float
+            Fuel mass on board [kg].
+
+        Returns
+        -------
+        tuple
+            Mission flown (see `fly`) and number of flights.
+        """
+        flights = {}
+
+        def residual(distance):
+            flights[distance] = self.fly(TOW, distance)
+            return flights[distance]["block_fuel"] - fuel
+
+        d0 = self._hint["cruise_distance"]
+        f0 = residual(d0)
+        # Newton-like second guess from the specific fuel consumption of the cruise
+        slope = self.block_fuel(flights[d0]["cruise_fuel"]) / d0
+        d1 = max(d0 - f0 / slope, 0.5 * d0)
+        distance, _, converged = _secant(residual, d0, f0, d1, self.xtol, self.max_iter)
+        if not converged:
+            logger.warning(
+                f"Payload-range: fuel balance not converged for TOW={TOW:.1f} kg and fuel={fuel:.1f} kg"
+            )
+        if distance not in flights:
+            residual(distance)
+        self._hint["cruise_distance"] = distance
+        return flights[distance], len(flights)
+
+    def _cruise_distance(self, TOW, range_):
+        """
+        Find the cruise distance of a mission range, at a fixed take-off mass.
+
+        Parameters
+        ----------
+        TOW : float
+            Take-off mass [kg].
+        range_ : float
+            Mission range [m].
+
+        Returns
+        -------
+        dict
+            Mission flown (see `fly`).
+        """
+        distance = self._hint.get("cruise_distance", range_)
+        distance = range_ - self._hint.get("other_distance", range_ - distance)
+        for _ in range(self.max_iter):
+            flight = self.fly(TOW, distance)
+            error = range_ - flight["range"]
+            if abs(error) < self.xtol:
+                break
+            # The range of the other segments barely depends on the cruise distance
+            distance += error
+        self._hint["cruise_distance"] = flight["cruise_distance"]
+        self._hint["other_distance"] = flight["range"] - flight["cruise_distance"]
+        return flight
+
+    def corner(self, name):
+        """
+        Compute a corner point of the diagram.
+
+        Parameters
+        ----------
+        name : str
+            Corner name: 'max_payload' (maximum payload at MTOW), 'max_fuel'
+            (full fuel capacity at MTOW) or 'ferry' (full fuel, no payload).
+
+        Returns
+        -------
+        dict
+            Corner record: name, `payload`, `fuel`, `TOW` [kg], `range` [m],
+            `trip_fuel` [kg], `cruise_distance` [m], number of `flights`,
+            `converged` flag and `wall_time` [s].
+
+        Raises
+        ------
+        ValueError
+            If the corner name is unknown.
+        """
+        start = time.perf_counter()
+        max_fuel = min(self.fuel_capacity, self.MTOW - self.OEW)
+        if name == "max_payload":
+            payload = self.max_payload
+            fuel = min(self.fuel_capacity, self.MTOW - self.OEW - payload)
+        elif name == "max_fuel":
+            fuel = max_fuel
+            payload = min(self.max_payload, self.MTOW - self.OEW - fuel)
+        elif name == "ferry":
+            payload, fuel = 0.0, max_fuel
+        else:
+            raise ValueError(f"Unknown corner {name!r}, expected one of {CORNERS}")
+        TOW = self.OEW + payload + fuel
+        flight, n = self._fuel_balance(TOW, fuel)
+        return {
+            "name": name,
+            "payload": payload,
+            "fuel": fuel,
+            "TOW": TOW,
+            "range": flight["range"],
+            "trip_fuel": flight["trip_fuel"],
+            "cruise_distance": flight["cruise_distance"],
+            "flights": n,
+            "converged": abs(flight["block_fuel"] - fuel) < self.mass_tol,
+            "wall_time": time.perf_counter() - start,
+        }
+
+    def corners(self):
+        """
+        Compute the three corner points of the diagram.
+
+        In the calling process, the corners are computed one after the other,
+        the first two sharing their climb at MTOW.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Corner records (see `corner`), indexed by corner name by increasing range.
+        """
+        if self.n_workers == 0:
+            records = [self.corner(name) for name in CORNERS]
+        else:
+            context = multiprocessing.get_context(self.mp_context)
+            with ProcessPoolExecutor(
+                max_workers=min(self.n_workers, len(CORNERS)), mp_context=context
+            ) as executor:
+                records = list(executor.map(self.corner, CORNERS))
+        self._corners = pandas.DataFrame(records).set_index("name")
+        return self._corners
+
+    def point(self, range_):
+        """
+        Compute the maximum payload of a range, on the envelope of the diagram.
+
+        Up to the maximum payload corner, the take-off mass is solved with the
+        maximum payload on board; up to the maximum fuel corner, the take-off
+        mass is the MTOW; beyond, the take-off mass is solved with the full fuel
+        on board. Each solve is warm started from the previous point.
+
+        Parameters
+        ----------
+        range_ : float
+            Mission range [m].
+
+        Returns
+        -------
+        dict
+            Point record: `range` [m], `payload`, `fuel`, `TOW`, `trip_fuel` [kg],
+            number of `flights` and `converged` flag. The payload is NaN beyond the ferry range.
+        """
+        corners = self._corners if self._corners is not None else self.corners()
+        record = {"range": range_}
+        if range_ > corners.loc["ferry", "range"]:
+            return {**record, "payload": np.nan, "fuel": np.nan, "TOW": np.nan}
+
+        flights = {}
+
+        def fly(TOW):
+            flights[TOW] = self._cruise_distance(TOW, range_)
+            return flights[TOW]
+
+        if range_ <= corners.loc["max_fuel", "range"] and (
+            range_ > corners.loc["max_payload", "range"]
+        ):
+            flight = fly(self.MTOW)
+            fuel = flight["block_fuel"]
+            TOW, n, converged = self.MTOW, 1, True
+        else:
+            if range_ <= corners.loc["max_payload", "range"]:
+                corner = corners.loc["max_payload"]
+                payload = self.max_payload
+
+                def residual(TOW):
+                    return self.OEW + payload + fly(TOW)["block_fuel"] - TOW
+
+            else:
+                corner = corners.loc["ferry"]
+                fuel = corner["fuel"]
+
+                def residual(TOW):
+                    return fly(TOW)["block_fuel"] - fuel
+
+            TOW0 = self._hint.get("TOW", corner["TOW"])
+            f0 = residual(TOW0)
+            # Second guess from the block fuel proportional to the take-off mass
+            if range_ <= corners.loc["max_payload", "range"]:
+                TOW1 = TOW0 + f0
+            else:
+                TOW1 = TOW0 * fuel / flights[TOW0]["block_fuel"]
+            TOW, _, converged = _secant(
+                residual, TOW0, f0, TOW1, self.mass_tol, self.max_iter
+            )
+            flight = flights[TOW] if TOW in flights else fly(TOW)
+            fuel = flight["block_fuel"]
+            n = len(flights)
+        self._hint["TOW"] = TOW
+        return {
+            **record,
+            "payload": TOW - self.OEW - fuel,
+            "fuel": fuel,
+            "TOW": TOW,
+            "trip_fuel": flight["trip_fuel"],
+            "flights": n,
+            "converged": converged,
+        }
+
+    def diagram(self, ranges=()):
+        """
+        Compute the payload-range diagram.
+
+        Parameters
+        ----------
+        ranges : array_like, optional
+            Ranges [m] of additional points on the envelope.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Points by increasing range, from the zero range point at maximum payload
+            through the corners; `name` is empty for the additional points.
+        """
+        corners = self.corners().reset_index()
+        zero = {"name": "zero_range", "range": 0.0, "payload": self.max_payload}
+        points = [self.point(range_) for range_ in sorted(ranges)]
+        diagram = pandas.concat(
+            [pandas.DataFrame([zero]), corners, pandas.DataFrame(points)],
+            ignore_index=True,
+        )
+        diagram["name"] = diagram["name"].fillna("")
+        columns = ["name", "range", "payload", "fuel", "TOW"]
+        return (
+            diagram.sort_values("range", kind="stable")
+            .reset_index(drop=True)
+            .loc[:, columns + [c for c in diagram.columns if c not in columns]]
+        )
@@ -0,0 +1,233 @@
+"""________________________________________________________________________________
+
+                              SPEED SCHEDULE MODULE
+___________________________________________________________________________________"""
+
+# Precomputed CAS/Mach speed schedules of the climb and descent segments.
+# For a CAS/Mach law and a delta ISA, the TAS, Mach and CAS are tabulated versus
+# altitude on both sides of the crossover altitude, so that the segments index the
+# schedule instead of converting the speeds at each evaluation, and switch law at
+# the exact crossover altitude.
+# speedSchedule.py
+
+from functools import lru_cache
+
+import numpy as np
+import pandas
+
+import amad.tools.unit_conversion as uc
+from amad.tools.atmosBADA import AtmosphereAMAD
+
+# Altitude grid of the schedules [m]
+ALTITUDE_STEP = 10.0
+ALTITUDE_RANGE = (-1000.0, 16000.0)
+
+
+class SpeedSchedule:
+    """
+    Tabulated CAS/Mach speed law versus altitude.
+
+    Below the crossover altitude the aircraft flies at constant CAS, above it
+    at constant Mach number. The crossover altitude is given by
+    `AtmosphereAMAD.crossoveralt`; the TAS, Mach and CAS of each law are
+    tabulated on a uniform altitude grid and linearly interpolated.
+
+    Attributes
+    ----------
+    CAS : float
+        Calibrated airspeed of the CAS law [kt].
+    Mach : float
+        Mach number of the Mach law [-].
+    dISA : float
+        Delta ISA temperature [K].
+    crossover_altitude : float
+        Altitude at which the CAS and Mach laws give the same TAS [m];
+        infinite without Mach law (null Mach number), and minus infinite
+        without CAS law (null CAS).
+    altitudes : numpy.ndarray
+        Altitude grid [m].
+    """
+
+    def __init__(
+        self,
+        CAS,
+        Mach,
+        dISA=0.0,
+        altitude_step=ALTITUDE_STEP,
+        altitude_range=ALTITUDE_RANGE,
+    ):
+        """
+        Tabulate the speed law.
+
+        Parameters
+        ----------
+        CAS : float
+            Calibrated airspeed of the CAS law [kt].
+        Mach : float
+            Mach number of the Mach law [-].
+        dISA : float, optional
+            Delta ISA temperature [K]. Defaults to 0.
+        altitude_step : float, optional
+            Step of the altitude grid [m]. Defaults to 10.
+        altitude_range : tuple of float, optional
+            Lowest and highest altitudes of the grid [m]; the schedule is
+            linearly extrapolated outside. Defaults to (-1000, 16000).
+        """
+        atmosphere = AtmosphereAMAD(offset_deg=dISA)
+        self.CAS = CAS
+        self.Mach = Mach
+        self.dISA = dISA
+        if Mach <= 0.0:
+            # CAS law only, e.g. low altitude segments without Mach limit
+            self.crossover_altitude = np.inf
+        elif CAS <= 0.0:
+            self.crossover_altitude = -np.inf
+        else:
+            self.crossover_altitude = atmosphere.crossoveralt(uc.kt2ms(CAS), Mach)
+
+        bottom, top = altitude_range
+        n_points = int(round((top - bottom) / altitude_step)) + 1
+        self.altitudes = bottom + altitude_step * np.arange(n_points)
+        self._bottom = bottom
+        self._step = altitude_step
+        self._last = n_points - 2
+
+        # TAS, Mach and CAS [kt] of the CAS law (below the crossover) and of the Mach law (above)
+        cas_tas = atmosphere.cas2tas_array(uc.kt2ms(CAS), self.altitudes)
+        mach_tas = atmosphere.mach2tas_array(Mach, self.altitudes)
+        self._laws = (
+            (
+                cas_tas.tolist(),
+                atmosphere.tas2mach_array(cas_tas, self.altitudes).tolist(),
+                [float(CAS)] * n_points,
+            ),
+            (
+                mach_tas.tolist(),
+                [float(Mach)] * n_points,
+                uc.ms2kt(atmosphere.tas2cas_array(mach_tas, self.altitudes)).tolist(),
+            ),
+        )
+
+    def __call__(self, altitude):
+        """
+        Return the scheduled speeds at an altitude.
+
+        Parameters
+        ----------
+        altitude : float
+            Altitude [m].
+
+        Returns
+        -------
+        tuple of float
+            TAS [m/s], Mach number [-] and CAS [kt].
+        """
+        altitude = float(altitude)
+        law = self._laws[altitude >= self.crossover_altitude]
+        x = (altitude - self._bottom) / self._step
+        i = min(max(int(x), 0), self._last)
+        w = x - i
+        return tuple(values[i] + w * (values[i + 1] - values[i]) for values in law)
+
+    def profile(self):
+        """
+        Return the scheduled speeds on the altitude grid.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `TAS` [m/s], `Mach` [-] and `CAS` [kt] indexed by `altitude` [m].
+        """
+        below = self.altitudes < self.crossover_altitude
+        data = {
+            name: np.where(below, cas_law, mach_law)
+            for name, cas_law, mach_law in zip(("TAS", "Mach", "CAS"), *self._laws)
+        }
+        return pandas.DataFrame(
+            data, index=pandas.Index(self.altitudes, name="altitude")
+        )
+
+
+@lru_cache(maxsize=64)
+def _cached_schedule(CAS, Mach, dISA):
+    return SpeedSchedule(CAS, Mach, dISA)
+
+
+def speed_schedule(CAS, Mach, dISA=0.0):
+    """
+    Return the cached speed schedule of a CAS/Mach law.
+
+    Parameters
+    ----------
+    CAS : float
+        Calibrated airspeed of the CAS law [kt].
+    Mach : float
+        Mach number of the Mach law [-].
+    dISA : float, optional
+        Delta ISA temperature [K]. Defaults to 0.
+
+    Returns
+    -------
+    SpeedSchedule
+        The schedule, shared by all the segments flying the same law.
+    """
+    return _cached_schedule(float(CAS), float(Mach), float(dISA))
+
+
+class SegmentSpeedSchedule:
+    """
+    Speed schedule of a segment, selected at its first evaluation in each run.
+
+    The CAS and Mach number of the law are read when the segment is first
+    evaluated, once the values pulled from the mission are transferred;
+    the schedule is then kept until `reset` is called at the next run set-up,
+    as the segments overwrite their `CAS` with the current CAS above the
+    crossover altitude.
+
+    Attributes
+    ----------
+    dISA : float
+        Delta ISA temperature [K].
+    schedule : SpeedSchedule or None
+        Schedule of the current run.
+    """
+
+    def __init__(self, dISA=0.0):
+        """
+        Initialise the segment schedule.
+
+        Parameters
+        ----------
+        dISA : float, optional
+            Delta ISA temperature [K]. Defaults to 0.
+        """
+        self.dISA = dISA
+        self.schedule = None
+
+    def reset(self):
+        """
+        Release the schedule, so that the next evaluation selects it again.
+        """
+        self.schedule = None
+
+    def __call__(self, CAS, Mach, altitude):
+        """
+        Return the scheduled speeds at an altitude.
+
+        Parameters
+        ----------
+        CAS : float
+            Calibrated airspeed of the CAS law [kt], used at the first evaluation of a run.
+        Mach : float
+            Mach number of the Mach law [-], used at the first evaluation of a run.
+        altitude : float
+            Altitude [m].
+
+        Returns
+        -------
+        tuple of float
+            TAS [m/s], Mach number [-] and CAS [kt].
+        """
+        if self.schedule is None:
+            self.schedule = speed_schedule(CAS, Mach, self.dISA)
+        return self.schedule(altitude)
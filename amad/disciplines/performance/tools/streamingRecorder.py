@@ -0,0 +1,189 @@
+import numpy as np
+from cosapp.utils.find_variables import make_wishlist
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+from amad.disciplines.performance.tools.telemetryWriter import (
+    TelemetryReader,
+    TelemetryWriter,
+)
+
+
+class StreamingRecorder(ColumnarRecorder):
+    """
+    Record data into fixed-size columns streamed to a telemetry file.
+
+    The columns hold one chunk of records; when full, they are written to the
+    telemetry file and reused, so that memory does not grow with the simulation
+    length. The remaining records are written when the driver exits. Exports read
+    the records back from the file. Records of successive runs are appended to
+    the same group of the file; unless `hold` is True, only the chunks of the last
+    run are exported.
+
+    Parameters
+    ----------
+    sink : TelemetryWriter or str
+        Telemetry writer, or path of a new telemetry file.
+    group : str or None, optional
+        Group of the records in the file; name of the watched system by default.
+    includes : str or list of str, optional
+        Variables matching these patterns will be included; default `'*'` (i.e. all variables).
+    excludes : str or list of str or None, optional
+        Variables matching these patterns will be excluded; default `None` (i.e. nothing is excluded).
+    numerical_only : bool, optional
+        Keep only numerical variables (i.e. number or numerical vector); default False.
+    section : str, optional
+        Current section name; default `''`.
+    precision : int, optional
+        Precision digits when writing floating point number; default 9.
+    hold : bool, optional
+        Append the new data or not; default `False`.
+    raw_output : bool, optional
+        Raw output, without units in exported column headers; default `True`.
+    chunk_size : int or None, optional
+        Number of records per chunk; the chunk size of the sink by default.
+    """
+
+    def __init__(
+        self,
+        sink,
+        group=None,
+        includes="*",
+        excludes=None,
+        numerical_only=False,
+        section="",
+        precision=9,
+        hold=False,
+        raw_output=True,
+        chunk_size=None,
+    ):
+        if not isinstance(sink, TelemetryWriter):
+            sink = TelemetryWriter(sink)
+        super().__init__(
+            includes,
+            excludes,
+            numerical_only,
+            section,
+            precision,
+            hold,
+            raw_output,
+            capacity=chunk_size or sink.chunk_size,
+        )
+        self.sink = sink
+        self.group = group
+        self._written = 0
+        self._first_chunk = None
+
+    def __len__(self):
+        """
+        Return the number of exported records: of the last run, or of all held runs.
+
+        Returns
+        -------
+        int
+            Number of records, written or not.
+        """
+        return self._written + self._size
+
+    @classmethod
+    def extend(cls, recorder, includes=[], excludes=[]):
+        """
+        Return a new recorder with extended `includes` and `excludes` fields.
+
+        Parameters
+        ----------
+        recorder : StreamingRecorder
+            Recorder to extend, whose sink and group are kept.
+        includes : str or list of str, optional
+            Variables patterns extending the inclusion patterns.
+        excludes : str or list of str, optional
+            Variables patterns extending the exclusion patterns.
+
+        Returns
+        -------
+        StreamingRecorder
+            The new recorder.
+        """
+        new = cls(
+            recorder.sink,
+            recorder.group,
+            recorder.includes + make_wishlist(includes, "includes"),
+            recorder.excludes + make_wishlist(excludes, "excludes"),
+            recorder._numerical_only,
+            recorder.section,
+            recorder.precision,
+            recorder.hold,
+            recorder._raw_output,
+            recorder.capacity,
+        )
+        new.watched_object = recorder.watched_object
+        return new
+
+    @property
+    def group_name(self):
+        """
+        str : Group of the records in the telemetry file.
+        """
+        if self.group is not None:
+            return self.group
+        return self.watched_object.name
+
+    def _grow(self):
+        """
+        Write the full chunk to the telemetry file and reuse the columns.
+        """
+        self.flush()
+
+    def flush(self):
+        """
+        Write the recorded chunk to the telemetry file.
+        """
+        if self._columns is not None and self._size > 0:
+            self.sink.write_chunk(
+                self.group_name,
+                {
+                    name: column[: self._size]
+                    for name, column in zip(self._headers, self._columns)
+                },
+            )
+            self._written += self._size
+            self._size = 0
+
+    def clear_buffers(self):
+        """
+        Release the column buffers and reset the number of records.
+        """
+        super().clear_buffers()
+        self._written = 0
+        self._first_chunk = None
+
+    def start(self):
+        """
+        Initialize recording support, exporting the chunks written from now on.
+        """
+        super().start()
+        if self._first_chunk is None:
+            self._first_chunk = self.sink.n_chunks(self.group_name)
+
+    def columns(self):
+        """
+        Read the recorded columns back from the telemetry file.
+
+        Returns
+        -------
+        dict
+            Column arrays by special column or variable name.
+        """
+        self.flush()
+        reader = TelemetryReader(self.sink.path)
+        # Chunks written before the start of the exported runs are skipped
+        data = {}
+        if self._first_chunk is not None and self.group_name in reader.groups:
+            data = reader.read(self.group_name, self._headers, self._first_chunk)
+        if not data:
+            return {name: np.empty(0) for name in self._headers}
+        return data
+
+    def exit(self):
+        """
+        Close recording session, writing the remaining records.
+        """
+        self.flush()
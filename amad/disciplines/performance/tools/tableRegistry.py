@@ -0,0 +1,292 @@
+"""________________________________________________________________________________
+
+                              TABLE REGISTRY MODULE
+___________________________________________________________________________________"""
+
+# Aerodynamic and engine tables shared by the worker processes of parallel runs
+# (mission sweeps, DOE...). The publishing process saves the table arrays once as
+# `.npy` files, and the workers rebuild the interpolation functions on memory-mapped
+# views of these files: the pages are shared by all the processes through the page
+# cache instead of being copied into each worker, and a worker starts without
+# reading or pickling the tables. Publications and attachments are reference
+# counted, the files being removed with the last publication.
+# tableRegistry.py
+
+import os
+import shutil
+import logging
+import tempfile
+import numpy as np
+from scipy.interpolate import RegularGridInterpolator
+from amad.disciplines.powerplant.tools.engineDeck import EngineDeck
+
+logger = logging.getLogger(__name__)
+
+# Arrays of an engine deck shared by the registry, the grid is sent with the handle
+DECK_TABLES = ("thrust", "sfc", "thrust_max")
+
+# Tables attached by the current process, with their reference count, by handle key
+_attached = {}
+
+
+def _save_array(directory, name, array):
+    """
+    Save an array as a `.npy` file to be memory-mapped.
+
+    Parameters
+    ----------
+    directory : str
+        Directory of the table files.
+    name : str
+        File name, without extension.
+    array : array_like
+        Array to save, as contiguous float64 values so that it is mapped without conversion.
+
+    Returns
+    -------
+    str
+        File path.
+    """
+    path = os.path.join(directory, f"{name}.npy")
+    np.save(path, np.ascontiguousarray(array, dtype=float))
+    return path
+
+
+def share_table(table, directory, name):
+    """
+    Save a table so that processes can map it without copy.
+
+    Parameters
+    ----------
+    table : RegularGridInterpolator, EngineDeck, numpy.ndarray or callable
+        Interpolation function, engine deck or array.
+    directory : str
+        Directory of the table files.
+    name : str
+        Table name, used for the file names.
+
+    Returns
+    -------
+    dict or object
+        Handle of the memory-mapped table (see `attach_table`) for a
+        `RegularGridInterpolator`, an `EngineDeck` or an array, the table itself
+        otherwise (sent to the workers by pickling).
+    """
+    key = os.path.join(directory, name)
+    if isinstance(table, RegularGridInterpolator):
+        return {
+            "kind": "grid",
+            "key": key,
+            "path": _save_array(directory, name, table.values),
+            "grid": tuple(np.asarray(axis) for axis in table.grid),
+            "method": table.method,
+            "bounds_error": table.bounds_error,
+            "fill_value": table.fill_value,
+        }
+    if isinstance(table, EngineDeck):
+        return {
+            "kind": "deck",
+            "key": key,
+            "paths": {
+                array: _save_array(directory, f"{name}_{array}", getattr(table, array))
+                for array in DECK_TABLES
+            },
+            "altitudes": table.altitudes,
+            "machs": table.machs,
+            "disas": table.disas,
+            "ratings": table.ratings,
+            "settings": table.settings,
+        }
+    if isinstance(table, np.ndarray):
+        return {
+            "kind": "array",
+            "key": key,
+            "path": _save_array(directory, name, table),
+        }
+    return table
+
+
+def _map_table(handle):
+    """
+    Build a table on memory-mapped views of its files.
+
+    Parameters
+    ----------
+    handle : dict
+        Handle of the table (see `share_table`).
+
+    Returns
+    -------
+    RegularGridInterpolator, EngineDeck or numpy.memmap
+        Table mapped from its files.
+    """
+    kind = handle.get("kind", "grid")
+    if kind == "deck":
+        arrays = {
+            array: np.load(path, mmap_mode="r")
+            for array, path in handle["paths"].items()
+        }
+        return EngineDeck(
+            handle["altitudes"],
+            handle["machs"],
+            handle["disas"],
+            handle["ratings"],
+            settings=handle["settings"],
+            **arrays,
+        )
+    values = np.load(handle["path"], mmap_mode="r")
+    if kind == "array":
+        return values
+    return RegularGridInterpolator(
+        handle["grid"],
+        values,
+        method=handle["method"],
+        bounds_error=handle["bounds_error"],
+        fill_value=handle["fill_value"],
+    )
+
+
+def attach_table(shared):
+    """
+    Attach a shared table in the current process.
+
+    A table attached several times by a process is built once, and counted
+    until `detach_table`.
+
+    Parameters
+    ----------
+    shared : dict or object
+        Handle returned by `share_table` or `TableRegistry.publish`, or table not shared.
+
+    Returns
+    -------
+    RegularGridInterpolator, EngineDeck, numpy.memmap or object
+        Table whose values are mapped from the table files, or the table not shared.
+    """
+    if not isinstance(shared, dict):
+        return shared
+    key = shared.get("key", shared.get("path"))
+    if key not in _attached:
+        _attached[key] = [_map_table(shared), 0]
+    _attached[key][1] += 1
+    return _attached[key][0]
+
+
+def detach_table(shared):
+    """
+    Release a table attached by the current process.
+
+    The mapping is closed once the table is detached as many times as it was
+    attached, and is no longer referenced.
+
+    Parameters
+    ----------
+    shared : dict or object
+        Handle of the table.
+    """
+    if not isinstance(shared, dict):
+        return
+    key = shared.get("key", shared.get("path"))
+    if key in _attached:
+        _attached[key][1] -= 1
+        if _attached[key][1] <= 0:
+            del _attached[key]
+
+
+class TableRegistry:
+    """
+    Registry of the tables published to worker processes.
+
+    Tables are published by name; the handles returned are small picklable
+    descriptions, sent to the workers in place of the tables and attached
+    there with `attach_table`. Publishing the same table again under the same
+    name increments its reference count, and the files of a table are removed
+    when it is released as many times as it was published.
+
+    The registry is a context manager, removing all its files on exit.
+
+    Attributes
+    ----------
+    directory : str
+        Directory of the table files, e.g. under `/dev/shm` to keep them in memory.
+    handles : dict
+        Handles of the published tables, by name.
+    """
+
+    def __init__(self, directory=None):
+        """
+        Initialise an empty registry.
+
+        Parameters
+        ----------
+        directory : str, optional
+            Parent directory of the table files. Defaults to the temporary directory.
+        """
+        self.directory = tempfile.mkdtemp(prefix="amad_tables_", dir=directory)
+        self.handles = {}
+        self._tables = {}
+        self._counts = {}
+
+    def publish(self, name, table):
+        """
+        Publish a table.
+
+        Parameters
+        ----------
+        name : str
+            Table name.
+        table : RegularGridInterpolator, EngineDeck, numpy.ndarray or callable
+            Table to share; other objects are published as is, to be pickled.
+
+        Returns
+        -------
+        dict or object
+            Handle of the table, to be attached by the workers.
+
+        Raises
+        ------
+        ValueError
+            If another table is already published under the name.
+        """
+        if name in self.handles:
+            if self._tables[name] is not table:
+                raise ValueError(f"Another table is already published as {name!r}")
+        else:
+            self.handles[name] = share_table(table, self.directory, name)
+            self._tables[name] = table
+            self._counts[name] = 0
+        self._counts[name] += 1
+        return self.handles[name]
+
+    def release(self, name):
+        """
+        Release a publication of a table, removing its files with the last one.
+
+        Parameters
+        ----------
+        name : str
+            Table name.
+        """
+        self._counts[name] -= 1
+        if self._counts[name] > 0:
+            return
+        handle = self.handles.pop(name)
+        del self._tables[name], self._counts[name]
+        if isinstance(handle, dict):
+            for path in handle.get("paths", {"path": handle.get("path")}).values():
+                os.remove(path)
+
+    def close(self):
+        """
+        Remove all the table files of the registry.
+        """
+        self.handles.clear()
+        self._tables.clear()
+        self._counts.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
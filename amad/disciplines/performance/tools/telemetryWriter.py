@@ -0,0 +1,364 @@
+"""________________________________________________________________________________
+
+                              TELEMETRY STREAM MODULE
+___________________________________________________________________________________"""
+
+# Streaming of segment time histories to disk in fixed-size chunks, and lazy reading.
+# The telemetry file is a zip archive of compressed `.npy` members (as `numpy.savez_compressed`),
+# one member per column and chunk, named '<group>/<chunk index>/<column>.npy'.
+# telemetryWriter.py
+
+import os
+import zipfile
+import numpy as np
+import pandas
+
+
+def _member(group, chunk, column):
+    """
+    Return the archive member name of a column chunk.
+
+    Parameters
+    ----------
+    group : str
+        Group name, e.g. a segment name.
+    chunk : int
+        Chunk index in the group.
+    column : str
+        Column name.
+
+    Returns
+    -------
+    str
+        Member name.
+    """
+    return f"{group}/{chunk:06d}/{column}.npy"
+
+
+def _as_storable(column):
+    """
+    Convert a column to an array saved without pickling.
+
+    Parameters
+    ----------
+    column : array_like
+        Column values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Numerical array, or array of strings for other values.
+    """
+    column = np.asarray(column)
+    if column.dtype == object:
+        return column.astype(str)
+    return column
+
+
+class TelemetryWriter:
+    """
+    Stream column chunks of time histories to a compressed telemetry file.
+
+    Rows appended to a group are kept in memory until `chunk_size` rows are
+    available, then written as one chunk; the archive is closed after each chunk,
+    so the file can be read while the simulation runs and memory stays bounded
+    by one chunk per group.
+
+    Attributes
+    ----------
+    path : str
+        Telemetry file path.
+    chunk_size : int
+        Number of rows per chunk.
+    compression : int
+        Zip compression of the members.
+    """
+
+    def __init__(self, path, chunk_size=4096, compress=True, overwrite=True):
+        """
+        Initialise the writer.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Telemetry file path.
+        chunk_size : int, optional
+            Number of rows per chunk. Defaults to 4096.
+        compress : bool, optional
+            Whether members are deflated. Defaults to True.
+        overwrite : bool, optional
+            Whether an existing file is replaced, or appended to. Defaults to True.
+
+        Raises
+        ------
+        ValueError
+            If the chunk size is not positive.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive; got {chunk_size}")
+        self.path = os.fspath(path)
+        self.chunk_size = int(chunk_size)
+        self.compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self._pending = {}
+        self._chunks = {}
+        if overwrite or not os.path.exists(self.path):
+            zipfile.ZipFile(self.path, "w").close()
+        else:
+            for group, chunk in TelemetryReader(self.path).chunk_keys():
+                self._chunks[group] = max(self._chunks.get(group, 0), chunk + 1)
+
+    def write_chunk(self, group, columns):
+        """
+        Write a chunk of columns of a group directly to the file.
+
+        Parameters
+        ----------
+        group : str
+            Group name, e.g. a segment name.
+        columns : dict
+            Column arrays of the same length by name.
+        """
+        chunk = self._chunks.get(group, 0)
+        with zipfile.ZipFile(self.path, "a", compression=self.compression) as archive:
+            for name, column in columns.items():
+                with archive.open(_member(group, chunk, name), "w") as member:
+                    np.lib.format.write_array(
+                        member, _as_storable(column), allow_pickle=False
+                    )
+        self._chunks[group] = chunk + 1
+
+    def n_chunks(self, group):
+        """
+        Return the number of chunks written to a group.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+
+        Returns
+        -------
+        int
+            Number of chunks, i.e. index of the next chunk of the group.
+        """
+        return self._chunks.get(group, 0)
+
+    def append(self, group, columns):
+        """
+        Append rows to a group, writing the full chunks.
+
+        Parameters
+        ----------
+        group : str
+            Group name, e.g. a segment name.
+        columns : dict
+            Column arrays of the same length by name.
+        """
+        pending = self._pending.setdefault(group, {name: [] for name in columns})
+        for name, column in columns.items():
+            pending[name].append(np.asarray(column))
+        n = sum(len(column) for column in pending[next(iter(pending))])
+        if n >= self.chunk_size:
+            merged = {name: np.concatenate(parts) for name, parts in pending.items()}
+            start = 0
+            while n - start >= self.chunk_size:
+                stop = start + self.chunk_size
+                self.write_chunk(
+                    group, {name: part[start:stop] for name, part in merged.items()}
+                )
+                start = stop
+            self._pending[group] = {
+                name: [part[start:]] for name, part in merged.items()
+            }
+
+    def flush(self, group=None):
+        """
+        Write the pending rows, as a last shorter chunk.
+
+        Parameters
+        ----------
+        group : str or None, optional
+            Group to flush; all groups by default.
+        """
+        groups = list(self._pending) if group is None else [group]
+        for name in groups:
+            pending = self._pending.pop(name, None)
+            if pending and any(len(part) for part in pending[next(iter(pending))]):
+                self.write_chunk(
+                    name, {key: np.concatenate(parts) for key, parts in pending.items()}
+                )
+
+    def close(self):
+        """
+        Flush all the groups.
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TelemetryReader:
+    """
+    Lazy reader of a telemetry file.
+
+    Chunks are only decompressed when iterated over, column by column.
+
+    Attributes
+    ----------
+    path : str
+        Telemetry file path.
+    """
+
+    def __init__(self, path):
+        """
+        Initialise the reader.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Telemetry file path.
+        """
+        self.path = os.fspath(path)
+
+    def _index(self):
+        """
+        Index the archive members.
+
+        Returns
+        -------
+        dict
+            Column names by chunk index, by group, in writing order.
+        """
+        index = {}
+        with zipfile.ZipFile(self.path) as archive:
+            for name in archive.namelist():
+                group, chunk, column = name.rsplit("/", 2)
+                columns = index.setdefault(group, {}).setdefault(int(chunk), [])
+                columns.append(column[: -len(".npy")])
+        return index
+
+    def chunk_keys(self):
+        """
+        Return the chunks of the file.
+
+        Returns
+        -------
+        list
+            `(group, chunk index)` pairs.
+        """
+        return [
+            (group, chunk)
+            for group, chunks in self._index().items()
+            for chunk in sorted(chunks)
+        ]
+
+    @property
+    def groups(self):
+        """
+        list : Group names, in writing order.
+        """
+        return list(self._index())
+
+    def columns(self, group):
+        """
+        Return the column names of a group.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+
+        Returns
+        -------
+        list
+            Column names.
+        """
+        chunks = self._index()[group]
+        return chunks[min(chunks)]
+
+    def iter_chunks(self, group=None, columns=None, first_chunk=0):
+        """
+        Iterate over the chunks lazily.
+
+        Parameters
+        ----------
+        group : str or None, optional
+            Group to read; all groups by default.
+        columns : list of str or None, optional
+            Columns to read; all columns by default.
+        first_chunk : int, optional
+            Index of the first chunk to read in each group; default 0.
+
+        Yields
+        ------
+        tuple
+            Group name and dictionary of column arrays of each chunk.
+        """
+        index = self._index()
+        groups = list(index) if group is None else [group]
+        with zipfile.ZipFile(self.path) as archive:
+            for name in groups:
+                for chunk in sorted(index[name]):
+                    if chunk < first_chunk:
+                        continue
+                    data = {}
+                    for column in columns or index[name][chunk]:
+                        with archive.open(_member(name, chunk, column)) as member:
+                            data[column] = np.lib.format.read_array(
+                                member, allow_pickle=False
+                            )
+                    yield name, data
+
+    def read(self, group, columns=None, first_chunk=0):
+        """
+        Read the chunks of a group.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+        columns : list of str or None, optional
+            Columns to read; all columns by default.
+        first_chunk : int, optional
+            Index of the first chunk to read; default 0.
+
+        Returns
+        -------
+        dict
+            Concatenated column arrays by name.
+        """
+        parts = {}
+        for _, data in self.iter_chunks(group, columns, first_chunk):
+            for name, column in data.items():
+                parts.setdefault(name, []).append(column)
+        return {name: np.concatenate(values) for name, values in parts.items()}
+
+    def to_dataframe(self, group, columns=None):
+        """
+        Read a group into a pandas.DataFrame.
+
+        Array columns are stored as arrays in the DataFrame cells.
+
+        Parameters
+        ----------
+        group : str
+            Group name.
+        columns : list of str or None, optional
+            Columns to read; all columns by default.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Group time histories.
+        """
+        data = self.read(group, columns)
+        return pandas.DataFrame(
+            {
+                name: list(column) if column.ndim > 1 else column
+                for name, column in data.items()
+            }
+        )
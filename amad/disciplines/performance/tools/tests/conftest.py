@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from scipy.interpolate import RegularGridInterpolator
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+
+# Wing reference surface [m**2] and number of engines of the test aircraft
+S = 124.0
+N_ENG = 2
+
+
+def create_aero_tables():
+    """
+    Create linear aerodynamic tables over `(alpha, Mach, altitude)`.
+
+    Returns
+    -------
+    tuple
+        CL, CD and Drag interpolation functions.
+    """
+    alphas = np.arange(-6.0, 10.0, 2.0)
+    machs = np.arange(0.0, 0.95, 0.1)
+    altitudes = np.arange(0.0, 13000.0, 1000.0)
+    alpha, mach, altitude = np.meshgrid(alphas, machs, altitudes, indexing="ij")
+    CL = 0.35 + 0.1 * alpha * (1.0 + 0.2 * mach) - 1e-6 * altitude
+    CD = 0.02 + 0.05 * CL**2 + 0.01 * mach**4
+    Drag = 20000.0 + 2000.0 * (alpha + 2.0) ** 2 + 10000.0 * mach
+    grid = (alphas, machs, altitudes)
+    return tuple(RegularGridInterpolator(grid, values) for values in (CL, CD, Drag))
+
+
+@pytest.fixture(scope="module")
+def aero_tables():
+    """
+    Linear aerodynamic tables shared by the tests of a module.
+
+    Returns
+    -------
+    tuple
+        CL, CD and Drag interpolation functions.
+    """
+    return create_aero_tables()
+
+
+def cruise_factory(engine_model=None):
+    """
+    Build a cruise segment with its time driver, as a small mission.
+
+    The segment has no aerodynamic tables: they are set by the caller, or shared
+    with the sweep workers.
+
+    Parameters
+    ----------
+    engine_model : EngineBackend, optional
+        Engine performance backend of the segment.
+
+    Returns
+    -------
+    Cruise_segment
+        Cruise system ready to run.
+    """
+    syst = Cruise_segment("cruise", engine_model=engine_model)
+    syst.in_p.position = np.array([0.0, 0.0, 10000.0])
+    syst.in_p.TAS_speed = np.array([236.0, 0.0, 0.0])
+    syst.Cruise_pos_init = np.array([0.0, 0.0, 10000.0])
+    syst.g = 9.81
+    syst.S = S
+    syst.n_eng = N_ENG
+    syst.Thau = 0.0
+    driver = syst.add_driver(RungeKutta(time_interval=(0, 1000), dt=5))
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    return syst
+
+
+def aero_cruise_factory():
+    """
+    Build a cruise segment with its time driver and the linear aerodynamic tables.
+
+    Returns
+    -------
+    Cruise_segment
+        Cruise system ready to run.
+    """
+    syst = cruise_factory()
+    syst.CLAeroIt, syst.CDAeroIt, syst.DAeroIt = create_aero_tables()
+    return syst
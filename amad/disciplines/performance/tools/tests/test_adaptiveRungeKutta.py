@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from cosapp.base import System
+from amad.disciplines.performance.tools.adaptiveRungeKutta import AdaptiveRungeKutta
+
+
+class Projectile(System):
+    """
+    Projectile in vacuum stopped when reaching a target altitude.
+    """
+
+    def setup(self):
+        """
+        Setup method defines system structure.
+        """
+        self.add_inward("position", np.zeros(2))
+        self.add_inward("speed", np.array([100.0, 50.0]))
+        self.add_inward("target_altitude", -20.0)
+        self.add_outward("acceleration", np.array([0.0, -9.81]))
+        self.add_transient("position", der="speed")
+        self.add_transient("speed", der="acceleration")
+        self.add_event(
+            "target_reached", trigger="position[1] == target_altitude", final=True
+        )
+
+
+class Decay(System):
+    """
+    Exponential decay, fast at the beginning and slow afterwards.
+    """
+
+    def setup(self):
+        """
+        Setup method defines system structure.
+        """
+        self.add_inward("x", 1.0)
+        self.add_outward("dx_dt", 0.0)
+        self.add_transient("x", der="dx_dt")
+
+    def compute(self):
+        """
+        Compute the decay rate.
+        """
+        self.dx_dt = -(0.1 + 5.0 * np.exp(-self.time)) * self.x
+
+
+def test_adaptive_event_localisation():
+    """
+    Test that a target event is localised precisely with large adaptive steps.
+
+    Raises
+    ------
+    AssertionError
+        If the event time or state differ from the analytic solution.
+    """
+    syst = Projectile("projectile")
+    driver = syst.add_driver(
+        AdaptiveRungeKutta(time_interval=(0.0, 100.0), dt=0.1, max_dt=5.0)
+    )
+    syst.run_drivers()
+
+    # y(t) = 50 t - 9.81 t^2 / 2 = -20
+    t_target = (50.0 + np.sqrt(50.0**2 + 2.0 * 9.81 * 20.0)) / 9.81
+    assert driver.time == pytest.approx(t_target, rel=1e-9)
+    assert syst.position == pytest.approx([100.0 * t_target, -20.0], abs=1e-6)
+    assert driver.n_accepted < 10
+
+
+@pytest.mark.parametrize("rtol", [1e-4, 1e-6])
+def test_adaptive_error_control(rtol):
+    """
+    Test that the step size follows the error tolerance and step limits.
+
+    Parameters
+    ----------
+    rtol : float
+        Relative tolerance of the driver.
+
+    Raises
+    ------
+    AssertionError
+        If the solution error is not consistent with the tolerance, steps exceed
+        the limits or accepted steps are not taken by the time driver.
+    """
+    syst = Decay("decay")
+    driver = syst.add_driver(
+        AdaptiveRungeKutta(
+            time_interval=(0.0, 20.0),
+            dt=1.0,
+            rtol=rtol,
+            atol=1e-12,
+            min_dt=1e-5,
+            max_dt=2.0,
+            record_dt=True,
+        )
+    )
+    syst.run_drivers()
+
+    expected = np.exp(-(2.0 + 5.0 * (1.0 - np.exp(-20.0))))
+    assert syst.x == pytest.approx(expected, rel=20.0 * rtol)
+    assert driver.n_rejected > 0
+    # Every accepted step is a step of the time driver
+    assert len(driver.recorded_dt) == driver.n_accepted
+    assert np.max(driver.recorded_dt) <= 2.0 + 1e-12
+    assert driver.n_accepted < 2000
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+from amad.disciplines.performance.tools.batchMissionSimulator import (
+    BatchMissionSimulator,
+    alpha_slices,
+)
+from amad.disciplines.performance.tools.missionSimulator import (
+    RECORDED,
+    MissionSimulator,
+    alpha_slice,
+)
+from amad.disciplines.performance.tools.tests.conftest import N_ENG, S
+
+
+def add_segments(simulator, cruise_distance):
+    """
+    Define a short mission with both IsoMach crossovers.
+
+    Parameters
+    ----------
+    simulator : MissionSimulator
+        Simulator to define the segments of.
+    cruise_distance : float or numpy.ndarray
+        Cruise distances [m].
+    """
+    simulator.add_segment(
+        "climb", name="climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6
+    )
+    simulator.add_segment("accelerate", name="accelerate", Mach_cruise=0.78)
+    simulator.add_segment(
+        "cruise", name="cruise", Cruise_distance_target=cruise_distance
+    )
+    simulator.add_segment("decelerate", name="decelerate", Iso_Mach=0.75)
+    simulator.add_segment(
+        "descent",
+        name="descent",
+        CAS=300.0,
+        Iso_Mach=0.75,
+        CRD=-10.0,
+        Fin_appr_altitude=457.2,
+    )
+
+
+def test_alpha_slices(aero_tables):
+    """
+    Test that the per-lane reduced tables match the scalar reduction.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the reduced tables differ from the scalar ones.
+    """
+    machs = np.array([0.0, 0.45, 0.78])
+    altitudes = np.array([0.0, 3048.0, 10668.0])
+    alphas = np.array([[-6.0, -2.5], [0.3, 4.0], [6.1, 8.0]])
+    for table in aero_tables:
+        for function in (table, lambda pt: table(pt)):
+            values = alpha_slices(function, machs, altitudes)
+            expected = [
+                alpha_slice(table, mach, altitude)(alpha)
+                for mach, altitude, alpha in zip(machs, altitudes, alphas)
+            ]
+            assert values(alphas) == pytest.approx(np.array(expected), rel=1e-12)
+            assert values(alphas[:, 0]) == pytest.approx(
+                np.array(expected)[:, 0], rel=1e-12
+            )
+
+    with pytest.raises(ValueError):
+        alpha_slices(aero_tables[0], np.array([0.5, 0.95]), np.zeros(2))
+
+
+def test_batch_matches_scalar_runs(aero_tables):
+    """
+    Test that each lane of a batched mission matches a scalar simulation.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a lane differs from the corresponding scalar mission.
+    """
+    m0 = np.array([68000.0, 62000.0, 72000.0])
+    cruise_distance = np.array([200e3, 150e3, 120e3])
+    batch = BatchMissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+    add_segments(batch, cruise_distance)
+    results = batch.run(m0)
+
+    for lane, (mass, distance) in enumerate(zip(m0, cruise_distance)):
+        simulator = MissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+        add_segments(simulator, distance)
+        expected = simulator.run(mass)
+        for name, result in expected.items():
+            batch_result = results[name]
+            assert batch_result["event"][lane] == result["event"]
+            assert batch_result["state"][lane] == pytest.approx(
+                result["state"], rel=1e-9, abs=1e-6
+            )
+            assert batch_result["fuel_mass"][lane] == pytest.approx(
+                result["fuel_mass"], rel=1e-9
+            )
+            steps = ~np.isnan(batch_result["time"][lane])
+            assert np.sum(steps) == len(result["time"])
+            for key in RECORDED:
+                assert batch_result[key][lane, steps] == pytest.approx(
+                    result[key], rel=1e-9, abs=1e-9
+                )
+
+
+def test_batch_lanes_broadcast(aero_tables):
+    """
+    Test the number of lanes given by the broadcast of masses and settings.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the lanes are not broadcast or do not finish their segments.
+    """
+    batch = BatchMissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+    batch.add_segment(
+        "cruise", name="cruise", Cruise_distance_target=np.array([10e3, 20e3])
+    )
+    results = batch.run(
+        65000.0, position=(0.0, 0.0, 10000.0), TAS_speed=(236.0, 0.0, 0.0)
+    )
+
+    result = results["cruise"]
+    assert list(result["event"]) == ["Cruise_distance_reached"] * 2
+    assert result["state"][:, 0] == pytest.approx([10e3, 20e3])
+    assert result["time"].shape[0] == 2
+    # The shorter cruise is masked once finished
+    assert np.isnan(result["time"][0, -1])
+    assert result["fuel_mass"][1] > result["fuel_mass"][0]
@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from cosapp.recorders import DataFrameRecorder
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+from amad.disciplines.performance.systems.cruiseFuel import CruiseFuel
+from amad.disciplines.performance.systems.missionProfile import mission_profile
+from amad.disciplines.performance.tools.breguetCruise import (
+    CRUISE_MODES,
+    BreguetCruise,
+    breguet_cruise,
+    check_cruise_mode,
+)
+from amad.disciplines.performance.tools.tests.conftest import create_aero_tables
+
+
+def create_cruise(driver):
+    """
+    Create a cruise segment with linear aerodynamic tables, flown by a given driver.
+
+    Parameters
+    ----------
+    driver : Driver
+        Driver of the segment.
+
+    Returns
+    -------
+    Cruise_segment
+        The initialised segment.
+    """
+    cruise = Cruise_segment("cruise")
+    cruise.CLAeroIt, cruise.CDAeroIt, cruise.DAeroIt = create_aero_tables()
+    cruise.S = 124.0
+    cruise.g = 9.81
+    cruise.n_eng = 2
+    cruise.m0 = np.array([65000.0])
+    cruise.in_p.position = np.array([0.0, 0.0, 10000.0])
+    cruise.in_p.TAS_speed = np.array([236.0, 0.0, 0.0])
+    cruise.Cruise_pos_init = np.array([0.0, 0.0, 10000.0])
+    cruise.Cruise_distance_target = 100e3
+    cruise.add_driver(driver)
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    driver.add_recorder(DataFrameRecorder(includes=["mass"]), period=None)
+    return cruise
+
+
+@pytest.mark.parametrize("rtol", [1e-4, 1e-7])
+def test_breguet_error_estimate(rtol):
+    """
+    Test the Breguet integration against the analytic solution of a mass-dependent fuel flow.
+
+    Parameters
+    ----------
+    rtol : float
+        Relative tolerance on the fuel burnt.
+
+    Raises
+    ------
+    AssertionError
+        If the fuel error is above the tolerance or the error estimate.
+    """
+    # dm/dt = -(a + b m) m, i.e. a fuel flow per unit mass varying with the lift coefficient
+    a, b, m0, duration = 2e-5, 1e-9, 70000.0, 20000.0
+    exact = a * m0 / ((a + b * m0) * np.exp(a * duration) - b * m0)
+    trajectory = breguet_cruise(lambda t, m: (a + b * m) * m, m0, duration, rtol=rtol)
+
+    fuel = m0 - trajectory["mass"].iloc[-1]
+    error = abs(trajectory["mass"].iloc[-1] - exact)
+    assert trajectory["time"].iloc[-1] == pytest.approx(duration, rel=1e-12)
+    assert trajectory["time"].is_monotonic_increasing
+    assert error <= trajectory["error"].iloc[-1] <= rtol * fuel
+    assert trajectory.attrs["n_evaluations"] == 1 + 2 * (
+        len(trajectory) - 1 + trajectory.attrs["n_rejected"]
+    )
+
+    # A constant fuel flow per unit mass is integrated exactly in one sub-step
+    constant = breguet_cruise(lambda t, m: a * m, m0, duration, rtol=rtol)
+    assert len(constant) == 2
+    assert constant["mass"].iloc[-1] == pytest.approx(
+        m0 * np.exp(-a * duration), rel=1e-14
+    )
+
+    with pytest.raises(ValueError):
+        breguet_cruise(lambda t, m: a * m, m0, -1.0)
+
+
+def test_breguet_cruise_driver():
+    """
+    Test that the Breguet cruise matches the Runge-Kutta cruise within its error estimate.
+
+    Raises
+    ------
+    AssertionError
+        If the final state or the records differ.
+    """
+    reference = create_cruise(RungeKutta(time_interval=(0, 1000), dt=1.0))
+    reference.run_drivers()
+    driver = BreguetCruise(rtol=1e-5)
+    cruise = create_cruise(driver)
+    cruise.run_drivers()
+
+    fuel = 65000.0 - reference.mass[0]
+    assert cruise.out_p.position == pytest.approx(reference.out_p.position, abs=1e-6)
+    assert cruise.Cruise_distance == pytest.approx(100e3, abs=1e-6)
+    assert driver.time == pytest.approx(100e3 / 236.0, rel=1e-12)
+    assert abs(cruise.mass[0] - reference.mass[0]) <= driver.fuel_error + 1e-6 * fuel
+    assert driver.fuel_error <= 1e-5 * fuel
+    assert cruise.alpha == pytest.approx(reference.alpha, abs=1e-6)
+
+    records = driver.recorder.export_data()
+    assert len(records) == len(driver.trajectory) < 10
+    assert records["mass"].iloc[-1] == pytest.approx(cruise.mass[0], rel=1e-15)
+
+
+def test_cruise_modes():
+    """
+    Test that the mission profile and the cruise fuel system take the same cruise modes.
+
+    Raises
+    ------
+    AssertionError
+        If a cruise mode is accepted by one system and not by the other.
+    """
+    for cruise_mode in CRUISE_MODES:
+        check_cruise_mode(cruise_mode)
+    for cruise_mode in ("rk", "constant_thrust"):
+        with pytest.raises(ValueError, match="Unknown cruise mode"):
+            check_cruise_mode(cruise_mode)
+        with pytest.raises(ValueError, match="Unknown cruise mode"):
+            CruiseFuel("fuel", asb_aircraft_geometry=None, cruise_mode=cruise_mode)
+        with pytest.raises(ValueError, match="Unknown cruise mode"):
+            mission_profile("mission", cruise_mode=cruise_mode)
@@ -0,0 +1,201 @@
+import numpy as np
+import pandas
+import pytest
+from cosapp.base import System
+from cosapp.drivers import RungeKutta
+from cosapp.recorders import DataFrameRecorder
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+
+
+class Projectile(System):
+    """
+    Projectile in vacuum, with a vector position and a string label.
+    """
+
+    def setup(self):
+        """
+        Setup method defines system structure.
+        """
+        self.add_inward("position", np.zeros(2), unit="m")
+        self.add_inward("speed", np.array([100.0, 50.0]), unit="m/s")
+        self.add_inward("label", "projectile")
+        self.add_outward("altitude", 0.0, unit="m")
+        self.add_outward("acceleration", np.array([0.0, -9.81]))
+        self.add_transient("position", der="speed")
+        self.add_transient("speed", der="acceleration")
+
+    def compute(self):
+        """
+        Compute the altitude.
+        """
+        self.altitude = self.position[1]
+
+
+def run_projectile(recorder, duration=10.0):
+    """
+    Fly the projectile with a recorder.
+
+    Parameters
+    ----------
+    recorder : BaseRecorder
+        Recorder of the time driver.
+    duration : float, optional
+        Simulation duration [s].
+
+    Returns
+    -------
+    BaseRecorder
+        The recorder, after the run.
+    """
+    syst = Projectile("projectile")
+    driver = syst.add_driver(RungeKutta(time_interval=(0.0, duration), dt=0.1))
+    driver.add_recorder(recorder, period=0.5)
+    syst.run_drivers()
+    return driver.recorder
+
+
+@pytest.mark.parametrize("raw_output", [True, False])
+def test_columnar_matches_dataframe_recorder(raw_output):
+    """
+    Test that the exported data match those of `DataFrameRecorder`, with column growth.
+
+    Parameters
+    ----------
+    raw_output : bool
+        Whether units are left out of the headers.
+
+    Raises
+    ------
+    AssertionError
+        If the exported data differ.
+    """
+    includes = ["position", "altitude", "label", "time"]
+    expected = run_projectile(
+        DataFrameRecorder(includes=includes, raw_output=raw_output)
+    ).export_data()
+    recorder = run_projectile(
+        ColumnarRecorder(includes=includes, raw_output=raw_output, capacity=3)
+    )
+    data = recorder.export_data()
+
+    assert len(recorder) == len(expected) == 21
+    assert list(data.columns) == list(expected.columns)
+    for column in expected.columns:
+        if column.startswith("position"):
+            assert np.stack(data[column]) == pytest.approx(np.stack(expected[column]))
+        else:
+            pandas.testing.assert_series_equal(
+                data[column], expected[column], check_dtype=False
+            )
+
+
+def test_columnar_export_array():
+    """
+    Test the structured array export and the column views.
+
+    Raises
+    ------
+    AssertionError
+        If the structured array does not hold the recorded values.
+    """
+    recorder = run_projectile(
+        ColumnarRecorder(includes=["position", "altitude", "time"], capacity=1)
+    )
+    array = recorder.export_array()
+    columns = recorder.columns()
+
+    assert array.shape == (21,)
+    assert array.dtype["position"].shape == (2,)
+    assert array["time"] == pytest.approx(np.arange(0.0, 10.01, 0.5))
+    assert array["altitude"] == pytest.approx(array["position"][:, 1])
+    assert array["altitude"][-1] == pytest.approx(50.0 * 10.0 - 9.81 * 50.0)
+    assert columns["altitude"].base is not None
+    assert list(columns["Reference"][:2]) == ["t=0.0", "t=0.5"]
+
+
+@pytest.mark.parametrize("spill_records", [0, 4])
+def test_columnar_spill(tmp_path, spill_records):
+    """
+    Test that numerical columns are memory-mapped and still exported.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Directory of the memory-mapped files.
+    spill_records : int
+        Number of records above which columns are memory-mapped.
+
+    Raises
+    ------
+    AssertionError
+        If columns are not memory-mapped or records are lost.
+    """
+    includes = ["position", "altitude", "time"]
+    expected = run_projectile(ColumnarRecorder(includes=includes)).export_array()
+    recorder = run_projectile(
+        ColumnarRecorder(
+            includes=includes,
+            capacity=2,
+            spill_records=spill_records,
+            spill_dir=str(tmp_path),
+        )
+    )
+
+    assert recorder.spilled
+    assert isinstance(recorder.columns()["altitude"].base, np.memmap)
+    # One file per numerical column, replaced at each growth
+    assert len(list(tmp_path.iterdir())) == 3
+    array = recorder.export_array()
+    for name in includes:
+        assert array[name] == pytest.approx(expected[name])
+
+    recorder.clear()
+    assert len(recorder) == 0
+    assert not any(tmp_path.iterdir())
+
+
+def test_columnar_arguments():
+    """
+    Test the checks of the buffer arguments.
+
+    Raises
+    ------
+    AssertionError
+        If invalid arguments are accepted.
+    """
+    with pytest.raises(ValueError):
+        ColumnarRecorder(capacity=0)
+    with pytest.raises(ValueError):
+        ColumnarRecorder(growth=1.0)
+
+
+@pytest.mark.parametrize("spill_records", [None, 0])
+def test_columnar_integer_start(tmp_path, spill_records):
+    """
+    Test that a column allocated from an integer start time keeps the float times.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Directory of the memory-mapped files.
+    spill_records : int or None
+        Number of records above which columns are memory-mapped.
+
+    Raises
+    ------
+    AssertionError
+        If the recorded times are truncated.
+    """
+    syst = Projectile("projectile")
+    driver = syst.add_driver(RungeKutta(time_interval=(0, 1), dt=0.25))
+    driver.add_recorder(
+        ColumnarRecorder(
+            includes=["time"], spill_records=spill_records, spill_dir=str(tmp_path)
+        )
+    )
+    syst.run_drivers()
+    time = driver.recorder.columns()["time"]
+
+    assert time.dtype == float
+    assert time == pytest.approx([0.0, 0.25, 0.5, 0.75, 1.0])
+    assert driver.recorder.spilled == (spill_records == 0)
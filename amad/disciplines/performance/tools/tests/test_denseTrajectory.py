@@ -0,0 +1,216 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from amad.disciplines.performance.systems.Acceleration import Accelerate
+from amad.disciplines.performance.systems.Climb import Climb_segment
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+from amad.disciplines.performance.tools.denseTrajectory import (
+    RATE_VARIABLES,
+    DenseTrajectory,
+)
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+from amad.disciplines.performance.tools.tests.conftest import N_ENG, S
+
+
+def record_segment(segment_class, aero_tables, settings, state, period):
+    """
+    Fly a segment system with a recorder of the dense output variables.
+
+    Parameters
+    ----------
+    segment_class : type
+        Segment system class.
+    aero_tables : tuple
+        Aerodynamic tables.
+    settings : dict
+        Segment inwards.
+    state : tuple
+        Initial distance, altitude, horizontal speed and mass.
+    period : float or None
+        Recording period [s], None to record every step.
+
+    Returns
+    -------
+    ColumnarRecorder
+        Recorder of the segment driver, after the run.
+    """
+    x, z, V, mass = state
+    syst = segment_class(name="segment", engine_model=MattinglyBackend())
+    syst.CLAeroIt, syst.CDAeroIt, syst.DAeroIt = aero_tables
+    syst.in_p.position = np.array([x, 0.0, z])
+    syst.in_p.TAS_speed = np.array([V, 0.0, 0.0])
+    syst.m0 = np.array([mass])
+    syst.g = 9.81
+    syst.S = S
+    syst.n_eng = N_ENG
+    syst.Thau = 0.0
+    for name, value in settings.items():
+        syst[name] = value
+
+    driver = syst.add_driver(RungeKutta(time_interval=(0, 1000), dt=1))
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    includes = ["time", "Altitude", "Distance", "mass", "TAS", "alpha"]
+    driver.add_recorder(
+        ColumnarRecorder(includes=includes + RATE_VARIABLES, raw_output=False),
+        period=period,
+    )
+    syst.run_drivers()
+    return driver.recorder
+
+
+def test_dense_trajectory():
+    """
+    Test the interpolation, evaluation and resampling of an analytic trajectory.
+
+    Raises
+    ------
+    AssertionError
+        If the interpolated values are wrong, or if the pieces are mixed up.
+    """
+    time = np.array([0.0, 1.0, 2.5, 2.5, 4.0])
+    cubic = time**3 - 2.0 * time
+    trajectory = DenseTrajectory(
+        time,
+        {
+            "x": np.column_stack([cubic, 2.0 * cubic]),
+            "z": 3.0 * time,
+            "phase": np.array(["a", "a", "b", "b", "c"]),
+        },
+        {"x": np.column_stack([3.0 * time**2 - 2.0, 6.0 * time**2 - 4.0])},
+    )
+    # The two records at the same time are merged
+    assert len(trajectory.time) == 4
+    t = np.linspace(0.0, 4.0, 33)
+    values = trajectory(t)
+    assert values["x"][:, 0] == pytest.approx(t**3 - 2.0 * t, abs=1e-12)
+    assert values["x"][:, 1] == pytest.approx(2.0 * values["x"][:, 0], abs=1e-12)
+    assert values["z"] == pytest.approx(3.0 * t)
+    assert list(trajectory([0.5, 1.0, 3.0, 4.0])["phase"]) == ["a", "a", "b", "c"]
+    assert trajectory(2.0)["z"] == pytest.approx(6.0)
+    assert trajectory.nbytes == 4 * 8 * (1 + 2 + 1 + 2) + 4 * 4
+    with pytest.raises(ValueError):
+        trajectory(4.5)
+    with pytest.raises(ValueError):
+        DenseTrajectory([0.0, 2.0, 1.0], {})
+
+    # Chained pieces start at the end of the previous one, and are interpolated separately
+    second = DenseTrajectory(
+        [0.0, 2.0], {"x": np.zeros((2, 2)), "z": [100.0, 102.0]}, names=["second"]
+    )
+    first = DenseTrajectory(
+        trajectory.time, trajectory.values, trajectory.rates, names=["first"]
+    )
+    mission = DenseTrajectory.concatenate([first, second])
+    assert list(mission.values) == ["x", "z"]
+    assert mission.event_times == pytest.approx([0.0, 4.0, 6.0])
+    assert mission(4.0)["z"] == pytest.approx(100.0)
+    assert mission(3.5)["z"] == pytest.approx(10.5)
+
+    resampled = mission.resample(dt=1.5)
+    assert resampled["time"].to_numpy() == pytest.approx([0.0, 1.5, 3.0, 4.0, 4.5, 6.0])
+    assert list(resampled["Segment_name"]) == ["first"] * 3 + ["second"] * 3
+    assert resampled["x"][1] == pytest.approx([0.375, 0.75])
+    # The boundary of the pieces is added to the uniform times
+    assert len(mission.resample(n=101)) == 102
+
+
+@pytest.mark.parametrize(
+    "segment_class, settings, state",
+    [
+        (
+            Climb_segment,
+            {"CAS": 250.0, "acceleration_altitude": 3048.0},
+            (0.0, 2500.0, 0.0, 68000.0),
+        ),
+        (Accelerate, {"CAS_target": 300.0}, (1000.0, 3048.0, 160.0, 67000.0)),
+    ],
+)
+def test_segment_dense_output(aero_tables, segment_class, settings, state):
+    """
+    Test the dense output of segment records every 10 s against records at every step.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    segment_class : type
+        Segment system class.
+    settings : dict
+        Segment settings.
+    state : tuple
+        Initial distance, altitude, horizontal speed and mass.
+
+    Raises
+    ------
+    AssertionError
+        If the interpolated trajectory differs from the step records.
+    """
+    coarse = record_segment(segment_class, aero_tables, settings, state, 10)
+    fine = record_segment(segment_class, aero_tables, settings, state, None)
+    dense = DenseTrajectory.from_records(coarse, name="segment")
+    reference = DenseTrajectory.from_records(fine.export_data())
+
+    assert {"in_p.position", "mass", "Altitude", "Distance"} <= set(dense.rates)
+    assert dense.bounds == pytest.approx(reference.bounds)
+    values = dense(reference.time)
+    tolerances = {
+        "in_p.position": 0.1,
+        "Altitude": 1e-3,
+        "Distance": 1e-4,
+        "mass": 1e-4,
+        "TAS": 0.05,
+        "alpha": 5e-3,
+    }
+    for name, tolerance in tolerances.items():
+        assert values[name] == pytest.approx(reference.values[name], abs=tolerance)
+
+
+def test_simulator_dense_output(aero_tables):
+    """
+    Test the dense output of the simulated segments, chained over the mission.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the dense output does not match the segment histories.
+    """
+    simulator = MissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+    simulator.add_segment(
+        "climb", name="climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6
+    )
+    simulator.add_segment("accelerate", name="accelerate", Mach_cruise=0.78)
+    simulator.add_segment("cruise", name="cruise", Cruise_distance_target=100e3)
+    results = simulator.run(68000.0)
+    dense = DenseTrajectory.concatenate(
+        [result["dense"] for result in results.values()]
+    )
+
+    durations = [result["time"][-1] for result in results.values()]
+    assert dense.event_times == pytest.approx(np.cumsum([0.0] + durations))
+    assert dense.names == list(results)
+    cruise = results["cruise"]
+    start = sum(durations[:2])
+    values = dense(start + cruise["time"])
+    for name in ("x", "z", "mass", "Mach"):
+        assert values[name] == pytest.approx(cruise[name])
+
+    # The climb interpolated between every fifth step matches the other steps, but
+    # for the speed law change at the crossover altitude
+    climb = results["climb"]
+    nodes = np.arange(len(climb["time"])) % 5 == 0
+    nodes[-1] = True
+    sparse = DenseTrajectory(
+        climb["time"][nodes],
+        {name: climb[name][nodes] for name in ("x", "z", "mass")},
+        {name: climb["dense"].rates[name][nodes] for name in ("x", "z", "mass")},
+    )
+    values = sparse(climb["time"])
+    assert values["x"] == pytest.approx(climb["x"], abs=0.2)
+    assert values["z"] == pytest.approx(climb["z"], abs=0.05)
+    assert values["mass"] == pytest.approx(climb["mass"], abs=1e-3)
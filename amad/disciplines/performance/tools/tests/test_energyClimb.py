@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from amad.disciplines.performance.tools.energyClimb import EnergyClimb
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+from amad.disciplines.performance.tools.speedSchedule import speed_schedule
+from amad.disciplines.performance.tools.tests.conftest import N_ENG, S
+
+
+def test_quasi_steady_climb(aero_tables):
+    """
+    Test the quasi-steady climb tables against the simulated climb segments.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the time, fuel or distance to climb differ.
+    """
+    climb = EnergyClimb(*aero_tables, S=S, n_eng=N_ENG)
+    masses = [60000.0, 70000.0]
+    tables = climb.climb_tables(
+        masses, np.linspace(3048.0, 10000.0, 141), 300.0, 0.78, acceleration=False
+    )
+    crossover = speed_schedule(300.0, 0.78).crossover_altitude
+    assert crossover in tables.xs(60000.0).index
+    assert len(tables) == 2 * 142
+
+    simulator = MissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=1.0)
+    segment = simulator.add_segment(
+        "climb", CAS=300.0, Iso_Mach=0.78, cruise_altitude=10000.0
+    )
+    for m0 in masses:
+        result = simulator.run_segment(segment, [0.0, 3048.0, 0.0, m0])
+        top = tables.loc[(m0, 10000.0)]
+        assert result["event"] == "Cruise_altitude_reached"
+        assert top["time"] == pytest.approx(result["time"][-1], rel=1e-3)
+        assert top["fuel"] == pytest.approx(result["fuel_mass"], rel=1e-3)
+        assert top["distance"] == pytest.approx(result["state"][0], rel=1e-3)
+        assert top["mass"] == pytest.approx(result["state"][3], rel=1e-5)
+        assert top["Mach"] == pytest.approx(0.78, rel=1e-9)
+    assert tables["RC"].to_numpy() == pytest.approx(tables["SEP"].to_numpy(), rel=1e-15)
+
+
+def test_energy_climb(aero_tables):
+    """
+    Test the acceleration along the schedule and the ceiling of the energy climb tables.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the acceleration is not accounted for, or if the ceiling is not flagged.
+    """
+    climb = EnergyClimb(*aero_tables, S=S, n_eng=N_ENG)
+    altitudes = np.linspace(3048.0, 10000.0, 71)
+    steady = climb.climb_tables(70000.0, altitudes, 300.0, 0.78, acceleration=False)
+    tables = climb.climb_tables(70000.0, altitudes, 300.0, 0.78)
+    crossover = speed_schedule(300.0, 0.78).crossover_altitude
+
+    # Accelerating at constant CAS slows the climb, decelerating at constant Mach speeds it up
+    below = tables.index.get_level_values("altitude") < crossover
+    assert (tables["RC"][below] < tables["SEP"][below]).all()
+    assert (tables["RC"][~below] > tables["SEP"][~below]).all()
+    assert tables["time"].iloc[-1] > steady["time"].iloc[-1]
+
+    heavy = climb.climb_tables(
+        [70000.0, 120000.0], altitudes, 300.0, 0.78, acceleration=False
+    )
+    assert heavy.xs(70000.0)["time"].notna().all()
+    assert heavy.xs(120000.0)["time"].isna().iloc[-1]
+    assert heavy.xs(120000.0)["SEP"].iloc[-1] <= 0.0
+
+    with pytest.raises(ValueError):
+        climb.climb_tables(70000.0, altitudes[::-1], 300.0, 0.78)
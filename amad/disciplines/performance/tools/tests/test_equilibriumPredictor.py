@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+from amad.disciplines.performance.systems.Descent import Descent_segment
+from amad.disciplines.performance.tools.equilibriumPredictor import (
+    PredictorAdaptiveRungeKutta,
+    PredictorRungeKutta,
+)
+from amad.disciplines.performance.tools.tests.conftest import create_aero_tables
+
+
+def create_segment(segment_class):
+    """
+    Create a cruise or descent segment with linear aerodynamic tables.
+
+    Parameters
+    ----------
+    segment_class : type
+        `Cruise_segment` or `Descent_segment`.
+
+    Returns
+    -------
+    System
+        The initialised segment, without driver.
+    """
+    segment = segment_class("segment")
+    segment.CLAeroIt, segment.CDAeroIt, segment.DAeroIt = create_aero_tables()
+    segment.S = 124.0
+    segment.g = 9.81
+    segment.n_eng = 2
+    segment.m0 = np.array([65000.0])
+    if segment_class is Cruise_segment:
+        segment.in_p.position = np.array([0.0, 0.0, 10000.0])
+        segment.in_p.TAS_speed = np.array([236.0, 0.0, 0.0])
+        segment.Cruise_pos_init = np.array([0.0, 0.0, 10000.0])
+        segment.Cruise_distance_target = 40e3
+    else:
+        segment.in_p.position = np.array([0.0, 0.0, 3000.0])
+        segment.in_p.TAS_speed = np.array([170.0, 0.0, -10.0])
+        segment.CAS = 300.0
+        segment.Iso_Mach = 0.75
+        segment.CRD = -10.0
+        segment.Fin_appr_altitude = 457.2
+    return segment
+
+
+def run_segment(segment_class, driver_class, **options):
+    """
+    Fly a segment with a given time driver.
+
+    Parameters
+    ----------
+    segment_class : type
+        `Cruise_segment` or `Descent_segment`.
+    driver_class : type
+        Time driver class.
+    **options
+        Driver options.
+
+    Returns
+    -------
+    tuple
+        The segment and its driver, after the run.
+    """
+    segment = create_segment(segment_class)
+    driver = segment.add_driver(driver_class(time_interval=(0, 1000), **options))
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    segment.run_drivers()
+    return segment, driver
+
+
+@pytest.mark.parametrize("segment_class", [Cruise_segment, Descent_segment])
+def test_predictor_residual_calls(segment_class):
+    """
+    Test that the predicted unknowns give the same trajectory with fewer residual evaluations.
+
+    Parameters
+    ----------
+    segment_class : type
+        Segment system class.
+
+    Raises
+    ------
+    AssertionError
+        If the trajectory differs, or if the predictor does not save evaluations.
+    """
+    reference, _ = run_segment(segment_class, RungeKutta, dt=5.0)
+    cold, cold_driver = run_segment(
+        segment_class, PredictorRungeKutta, dt=5.0, predictor=False
+    )
+    warm, warm_driver = run_segment(segment_class, PredictorRungeKutta, dt=5.0)
+
+    assert cold.out_p.position == pytest.approx(reference.out_p.position, rel=1e-12)
+    assert warm.out_p.position == pytest.approx(reference.out_p.position, rel=1e-9)
+    assert warm.mass == pytest.approx(reference.mass, rel=1e-9)
+    assert warm.alpha == pytest.approx(reference.alpha, abs=1e-6)
+
+    cold_stats = cold_driver.solver_statistics()
+    warm_stats = warm_driver.solver_statistics()
+    assert list(warm_stats.columns) == [
+        "time",
+        "resolutions",
+        "residual_calls",
+        "jacobian_calls",
+    ]
+    assert len(warm_stats) == len(cold_stats) > 1
+    assert warm_stats["time"].is_monotonic_increasing
+    assert (warm_stats["resolutions"] > 0).all()
+    assert warm_stats["residual_calls"].sum() < 0.7 * cold_stats["residual_calls"].sum()
+
+
+def test_predictor_adaptive_step():
+    """
+    Test the predictor with the adaptive-step driver.
+
+    Raises
+    ------
+    AssertionError
+        If the trajectory differs from the fixed-step one.
+    """
+    reference, _ = run_segment(Descent_segment, RungeKutta, dt=1.0)
+    warm, driver = run_segment(
+        Descent_segment, PredictorAdaptiveRungeKutta, dt=1.0, max_dt=20.0
+    )
+
+    assert warm.in_p.position[2] == pytest.approx(457.2, abs=1e-6)
+    assert warm.mass == pytest.approx(reference.mass, rel=1e-5)
+    assert len(driver.step_statistics) == driver.n_accepted
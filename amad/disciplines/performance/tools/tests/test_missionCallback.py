@@ -0,0 +1,197 @@
+import threading
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+from amad.disciplines.performance.tools import missionCallback
+from amad.disciplines.performance.tools.missionCallback import CallbackDispatcher
+
+
+def calls(n, segment="Cruise", dt=1.0):
+    """
+    Create segment callback data with a shared mutable position, as a live port.
+
+    Parameters
+    ----------
+    n : int
+        Number of calls.
+    segment : str, optional
+        Segment name.
+    dt : float, optional
+        Simulation time between calls [s].
+
+    Yields
+    ------
+    dict
+        Callback data.
+    """
+    data = {"position": np.zeros(3)}
+    for i in range(n):
+        data["position"][0] = float(i)
+        yield {"segment": segment, "time": i * dt, "data": data}
+
+
+def test_dispatch_every_n_and_time():
+    """
+    Test the step count and simulation time throttles, with copied snapshots.
+
+    Raises
+    ------
+    AssertionError
+        If the forwarded calls are wrong or share the live data.
+    """
+    received = []
+    dispatcher = CallbackDispatcher(received.append, every_n=10)
+    for data in calls(35):
+        dispatcher(data)
+    assert [r["data"]["position"][0] for r in received] == [0.0, 10.0, 20.0, 30.0]
+    assert dispatcher.n_calls == 35 and dispatcher.n_dispatched == 4
+
+    # Calls at the same time (solver iterations) count as one step
+    received.clear()
+    dispatcher = CallbackDispatcher(received.append, every_n=2)
+    for data in calls(6):
+        for _ in range(3):
+            dispatcher(data)
+    assert [r["time"] for r in received] == [0.0, 2.0, 4.0]
+
+    received.clear()
+    dispatcher = CallbackDispatcher(received.append, every_time=5.0)
+    for data in calls(12, dt=2.0):
+        dispatcher(data)
+    # A new run of the segment starts again at t=0
+    for data in calls(2, dt=2.0):
+        dispatcher(data)
+    assert [r["time"] for r in received] == [0.0, 6.0, 12.0, 18.0, 0.0]
+
+
+def test_dispatch_wall_clock_and_batches(monkeypatch):
+    """
+    Test the wall-clock throttle and the batches of snapshots.
+
+    Parameters
+    ----------
+    monkeypatch : pytest.MonkeyPatch
+        Fixture replacing the wall clock.
+
+    Raises
+    ------
+    AssertionError
+        If the forwarded batches are wrong.
+    """
+    clock = iter(np.arange(0.0, 10.0, 0.3))
+    monkeypatch.setattr(missionCallback.time, "perf_counter", lambda: next(clock))
+    batches = []
+    dispatcher = CallbackDispatcher(batches.append, min_interval=1.0, batch_size=2)
+    for data in calls(10):
+        dispatcher(data)
+    dispatcher.flush()
+
+    # Calls at 0, 1.2 and 2.4 s wall time
+    assert [[r["data"]["position"][0] for r in batch] for batch in batches] == [
+        [0.0, 4.0],
+        [8.0],
+    ]
+
+
+def test_dispatch_background():
+    """
+    Test that the user callback runs in a background thread and its errors are raised on flush.
+
+    Raises
+    ------
+    AssertionError
+        If the callback runs in the integration thread or errors are lost.
+    """
+    threads = []
+    dispatcher = CallbackDispatcher(
+        lambda data: threads.append(threading.current_thread()), background=True
+    )
+    for data in calls(5):
+        dispatcher(data)
+    dispatcher.close()
+    assert len(threads) == 5
+    assert all(thread is not threading.main_thread() for thread in threads)
+
+    def failing(data):
+        raise RuntimeError("UI error")
+
+    dispatcher = CallbackDispatcher(failing, background=True, max_queue=1)
+    dispatcher(next(calls(1)))
+    with pytest.raises(RuntimeError):
+        dispatcher.close()
+
+    with pytest.raises(ValueError):
+        CallbackDispatcher(print, every_n=0)
+
+
+def test_dispatch_segment():
+    """
+    Test the dispatcher as callback of a cruise segment.
+
+    Raises
+    ------
+    AssertionError
+        If snapshots are not throttled in simulation time.
+    """
+    received = []
+    syst = Cruise_segment("cruise")
+    syst.mission_callback.callback_method = CallbackDispatcher(
+        received.append, every_time=100.0
+    )
+    syst.CLAeroIt = lambda pt: np.array([0.5])
+    syst.CDAeroIt = lambda pt: np.array([0.03])
+    syst.in_p.TAS_speed = np.array([230.0, 0.0, 0.0])
+    syst.in_p.position = np.array([0.0, 0.0, 10000.0])
+    syst.Cruise_distance_target = 1e9
+    syst.add_driver(RungeKutta(time_interval=(0, 500), dt=10))
+    syst.run_drivers()
+
+    times = [r["time"] for r in received]
+    assert syst.mission_callback.callback_method.n_calls > len(received) >= 5
+    assert np.all(np.diff(times) >= 100.0)
+    assert received[-1]["data"]["position"][0] > received[0]["data"]["position"][0]
+    assert received[0]["segment"] == "Cruise"
+
+
+@pytest.mark.parametrize("tol", [1e-3, 1e-9])
+def test_dispatch_every_n_solver(tol):
+    """
+    Test that the step throttle does not depend on the solver iterations of a segment.
+
+    Parameters
+    ----------
+    tol : float
+        Tolerance of the segment solver.
+
+    Raises
+    ------
+    AssertionError
+        If the forwarded calls are not one simulation time out of `every_n`.
+    """
+    received, times = [], []
+
+    def callback(data):
+        times.append(data["time"])
+        dispatcher(data)
+
+    dispatcher = CallbackDispatcher(received.append, every_n=3)
+    syst = Cruise_segment("cruise")
+    syst.mission_callback.callback_method = callback
+    syst.CLAeroIt = lambda pt: np.array([0.5])
+    syst.CDAeroIt = lambda pt: np.array([0.03])
+    syst.DAeroIt = lambda pt: np.array([30000.0])
+    syst.in_p.TAS_speed = np.array([230.0, 0.0, 0.0])
+    syst.in_p.position = np.array([0.0, 0.0, 10000.0])
+    syst.m0 = np.array([65000.0])
+    syst.g = 9.81
+    syst.S = 124.0
+    syst.n_eng = 2
+    syst.Cruise_distance_target = 1e9
+    driver = syst.add_driver(RungeKutta(time_interval=(0, 100), dt=10))
+    driver.add_child(NonLinearSolver("nls", tol=tol))
+    syst.run_drivers()
+
+    steps = list(dict.fromkeys(times))
+    assert dispatcher.n_calls == len(times) > len(steps)
+    assert [r["time"] for r in received] == steps[::3]
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from cosapp.base import System
+from cosapp.drivers import NonLinearSolver, RungeKutta
+from cosapp.recorders import DataFrameRecorder
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+from amad.disciplines.performance.tools.missionCallback import empty_callback
+from amad.disciplines.performance.tools.missionCheckpoint import (
+    CheckpointStore,
+    MissionCheckpoint,
+)
+from amad.disciplines.performance.tools.tests.conftest import create_aero_tables
+
+PULLED = ["S", "g", "CLAeroIt", "CDAeroIt", "DAeroIt", "Thau"]
+
+
+class TwoCruises(System):
+    """
+    Mission of two chained cruise segments.
+    """
+
+    def setup(self):
+        """
+        Setup method defines system structure.
+        """
+        self.add_child(Cruise_segment("cruise_1"), pulling=PULLED)
+        self.add_child(Cruise_segment("cruise_2"), pulling=PULLED)
+        self.connect(self.cruise_1.outwards, self.cruise_2.inwards, {"mass": "m0"})
+        self.connect(
+            self.cruise_1.out_p,
+            self.cruise_2.in_p,
+            {"position": "position", "TAS_speed": "TAS_speed"},
+        )
+        self.connect(
+            self.cruise_1.out_p, self.cruise_2.inwards, {"position": "Cruise_pos_init"}
+        )
+
+
+def create_mission():
+    """
+    Build a two-cruise mission with linear aerodynamic tables.
+
+    Returns
+    -------
+    TwoCruises
+        Mission ready to run.
+    """
+    mission = TwoCruises("mission")
+    mission.CLAeroIt, mission.CDAeroIt, mission.DAeroIt = create_aero_tables()
+    mission.S = 124.0
+    mission.g = 9.81
+    mission.Thau = 0.0
+    first = mission.cruise_1
+    first.in_p.position = np.array([0.0, 0.0, 10000.0])
+    first.in_p.TAS_speed = np.array([236.0, 0.0, 0.0])
+    first.Cruise_pos_init = np.array([0.0, 0.0, 10000.0])
+    first.m0 = np.array([65000.0])
+    for segment in (mission.cruise_1, mission.cruise_2):
+        segment.n_eng = 2
+        segment.Cruise_distance_target = 20e3
+        driver = segment.add_driver(RungeKutta(time_interval=(0, 1000), dt=5))
+        driver.add_child(NonLinearSolver("nls", tol=1e-9))
+        driver.add_recorder(DataFrameRecorder(includes=["mass"]), period=None)
+    return mission
+
+
+def test_checkpoint_resume(tmp_path):
+    """
+    Test that unchanged segments are restored, in the same and in a new mission.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Checkpoint directory.
+
+    Raises
+    ------
+    AssertionError
+        If a segment is recomputed, or if restored results differ.
+    """
+    mission = create_mission()
+    runner = MissionCheckpoint(mission, tmp_path)
+    assert runner.run() == ["cruise_1", "cruise_2"]
+    mass = mission.cruise_2.mass.copy()
+    position = mission.cruise_2.out_p.position.copy()
+    assert len(runner.store) == 2
+
+    # Same inputs: nothing is flown again
+    assert runner.run() == []
+    assert runner.restored == ["cruise_1", "cruise_2"]
+
+    # Only the second segment changes
+    mission.cruise_2.Cruise_distance_target = 30e3
+    assert runner.run() == ["cruise_2"]
+    assert mission.cruise_2.out_p.position[0] == pytest.approx(50e3, abs=1.0)
+
+    # New process: a new mission restores the checkpoints of the first run
+    new_mission = create_mission()
+    new_runner = MissionCheckpoint(new_mission, CheckpointStore(tmp_path))
+    assert new_runner.run() == []
+    assert new_mission.cruise_2.mass == pytest.approx(mass, rel=1e-15)
+    assert new_mission.cruise_2.out_p.position == pytest.approx(position, rel=1e-15)
+    records = new_runner.records()
+    assert records["cruise_2"]["mass"].iloc[-1] == pytest.approx(mass, rel=1e-15)
+
+    # An upstream change invalidates the downstream checkpoints
+    new_mission.cruise_1.m0 = np.array([64000.0])
+    assert new_runner.run() == ["cruise_1", "cruise_2"]
+
+
+def test_checkpoint_failure(tmp_path):
+    """
+    Test that a rerun after a failure resumes from the last valid segment.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Checkpoint directory.
+
+    Raises
+    ------
+    AssertionError
+        If the failed segment is not rerun alone, or its results differ.
+    """
+    expected = create_mission()
+    expected.run_drivers()
+
+    def fail(callback_data):
+        raise RuntimeError("segment failure")
+
+    mission = create_mission()
+    mission.cruise_2.mission_callback.callback_method = fail
+    runner = MissionCheckpoint(mission, tmp_path)
+    with pytest.raises(RuntimeError):
+        runner.run()
+    assert runner.computed == ["cruise_1"]
+
+    mission.cruise_2.mission_callback.callback_method = empty_callback
+    assert runner.run() == ["cruise_2"]
+    assert runner.restored == ["cruise_1"]
+    assert mission.cruise_2.out_p.position == pytest.approx(
+        expected.cruise_2.out_p.position, rel=1e-12
+    )
+    assert mission.cruise_2.mass == pytest.approx(expected.cruise_2.mass, rel=1e-12)
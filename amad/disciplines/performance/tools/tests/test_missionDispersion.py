@@ -0,0 +1,248 @@
+import numpy as np
+import pandas
+import pytest
+from scipy.stats import norm
+from amad.disciplines.performance.tools.batchMissionSimulator import (
+    BatchMissionSimulator,
+)
+from amad.disciplines.performance.tools.missionDispersion import (
+    BACKEND_TEMPERATURES,
+    MISSION_TEMPERATURES,
+    BatchDispersionRunner,
+    MissionDispersion,
+    P2Quantile,
+    StreamingStatistics,
+    SweepDispersionRunner,
+)
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+from amad.disciplines.performance.tools.missionSweep import MissionSweep
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+from amad.disciplines.performance.tools.tests.conftest import (
+    N_ENG,
+    S,
+    cruise_factory,
+)
+
+
+def linear_fuel(samples):
+    """
+    Return an analytic mission fuel, linear in the take-off mass and delta ISA temperature.
+
+    Parameters
+    ----------
+    samples : pandas.DataFrame
+        Take-off mass `m0` [kg] and delta ISA temperature `dISA` [K].
+
+    Returns
+    -------
+    pandas.DataFrame
+        Mission fuel [kg].
+    """
+    return pandas.DataFrame(
+        {
+            "fuel_mass": 5000.0
+            + 0.05 * (samples["m0"] - 65000.0)
+            + 20.0 * samples["dISA"]
+        }
+    )
+
+
+def short_cruise_factory(engine_model=None):
+    """
+    Build a 20 km cruise segment with its time driver, as a small mission.
+
+    Parameters
+    ----------
+    engine_model : EngineBackend, optional
+        Engine performance backend of the segment.
+
+    Returns
+    -------
+    Cruise_segment
+        Cruise system ready to run.
+    """
+    syst = cruise_factory(engine_model)
+    syst.Cruise_distance_target = 20e3
+    return syst
+
+
+def test_streaming_statistics():
+    """
+    Test the streaming statistics against those of the whole sample.
+
+    Raises
+    ------
+    AssertionError
+        If the statistics differ from the numpy ones.
+    """
+    rng = np.random.default_rng(0)
+    values = rng.gamma(2.0, 1000.0, 5000)
+    statistics = StreamingStatistics()
+    for batch in np.array_split(values, 37):
+        statistics.update(batch)
+    statistics.update([np.nan, np.nan])
+
+    assert statistics.count == 5000
+    assert statistics.failures == 2
+    assert statistics.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert statistics.std == pytest.approx(values.std(ddof=1), rel=1e-12)
+    assert (statistics.minimum, statistics.maximum) == (values.min(), values.max())
+    for p, estimator in statistics.quantiles.items():
+        assert estimator.value == pytest.approx(np.quantile(values, p), rel=3e-2)
+
+    few = P2Quantile(0.5)
+    for value in (3.0, 1.0, 2.0):
+        few.update(value)
+    assert few.value == 2.0
+    assert np.isnan(StreamingStatistics().half_width())
+    with pytest.raises(ValueError):
+        P2Quantile(1.0)
+
+
+def test_early_stopping():
+    """
+    Test the convergence of the dispersion of an analytic mission fuel.
+
+    Raises
+    ------
+    AssertionError
+        If the dispersion does not stop early, or if its statistics are wrong.
+    """
+    dispersion = MissionDispersion(
+        linear_fuel,
+        m0=(65000.0, 2000.0),
+        dISA=(0.0, 10.0),
+        batch_size=50,
+        min_samples=100,
+        max_samples=20000,
+        rtol=2e-3,
+        seed=1,
+    )
+    summary = dispersion.run()
+    fuel = summary.loc["fuel_mass"]
+    std = np.hypot(0.05 * 2000.0, 20.0 * 10.0)
+    assert summary.attrs["converged"]
+    assert summary.attrs["n_samples"] < 20000
+    assert fuel["count"] == summary.attrs["n_samples"]
+    assert fuel["half_width"] <= 2e-3 * fuel["mean"]
+    assert abs(fuel["mean"] - 5000.0) <= 2.0 * fuel["half_width"]
+    assert fuel["std"] == pytest.approx(std, rel=0.1)
+    assert fuel["q95"] - fuel["q5"] == pytest.approx(
+        2.0 * norm.ppf(0.95) * std, rel=0.1
+    )
+
+    capped = MissionDispersion(
+        linear_fuel, m0=(65000.0, 2000.0), max_samples=300, rtol=1e-6, seed=1
+    )
+    summary = capped.run()
+    assert not summary.attrs["converged"]
+    assert summary.attrs["n_samples"] == 300
+    with pytest.raises(ValueError):
+        MissionDispersion(linear_fuel, m0=(65000.0, 2000.0), max_samples=10)
+
+
+def test_batch_runner(aero_tables):
+    """
+    Test the batched mission runs against scalar simulations at the same temperatures.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a lane differs from the scalar mission, or if the temperature has no effect.
+    """
+    batch = BatchMissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+    batch.add_segment("climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6)
+    batch.add_segment("accelerate", Mach_cruise=0.78)
+    batch.add_segment("cruise", Cruise_distance_target=100e3)
+    samples = pandas.DataFrame(
+        {"m0": [68000.0, 68000.0, 62000.0], "dISA": [0.0, 20.0, -10.0]}
+    )
+    outputs = BatchDispersionRunner(batch)(samples)
+    assert all(segment["dISA"] == 0.0 for segment in batch.segments)
+    assert outputs["fuel_mass"][1] != pytest.approx(outputs["fuel_mass"][0], rel=1e-4)
+
+    for lane, sample in samples.iterrows():
+        simulator = MissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+        simulator.add_segment(
+            "climb",
+            CAS=300.0,
+            Iso_Mach=0.75,
+            cruise_altitude=9753.6,
+            dISA=sample["dISA"],
+        )
+        simulator.add_segment("accelerate", Mach_cruise=0.78, dISA=sample["dISA"])
+        simulator.add_segment(
+            "cruise", Cruise_distance_target=100e3, dISA=sample["dISA"]
+        )
+        results = simulator.run(sample["m0"])
+        fuel = sum(result["fuel_mass"] for result in results.values())
+        duration = sum(result["time"][-1] for result in results.values())
+        assert outputs["fuel_mass"][lane] == pytest.approx(fuel, rel=1e-6)
+        assert outputs["time"][lane] == pytest.approx(duration, rel=1e-9)
+        assert outputs["range"][lane] == pytest.approx(
+            list(results.values())[-1]["state"][0], rel=1e-9
+        )
+
+
+def test_sweep_runner(aero_tables):
+    """
+    Test the swept mission runs with an engine backend against simulations at the same temperatures.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a sample differs from the simulation, if the default temperature paths are wrong,
+        or if failed batches are not reported.
+    """
+    engine_model = MattinglyBackend()
+    sweep = MissionSweep(
+        short_cruise_factory,
+        *aero_tables,
+        outputs={"fuel_mass": "out_p.fuel_mass"},
+        n_workers=0,
+        engine_model=engine_model,
+    )
+    assert SweepDispersionRunner(sweep).temperatures == BACKEND_TEMPERATURES
+    assert (
+        SweepDispersionRunner(MissionSweep(short_cruise_factory)).temperatures
+        == MISSION_TEMPERATURES
+    )
+
+    runner = SweepDispersionRunner(sweep, mass="m0", temperatures=["temp_delta_ISA"])
+    samples = pandas.DataFrame(
+        {"m0": [65000.0, 65000.0, 60000.0], "dISA": [0.0, 20.0, -10.0]}
+    )
+    outputs = runner(samples)
+    assert outputs["fuel_mass"][1] != pytest.approx(outputs["fuel_mass"][0], rel=1e-4)
+    for index, sample in samples.iterrows():
+        simulator = MissionSimulator(
+            *aero_tables, S=S, n_eng=N_ENG, engine_model=engine_model, dt=5.0
+        )
+        segment = simulator.add_segment(
+            "cruise", Cruise_distance_target=20e3, dISA=sample["dISA"]
+        )
+        result = simulator.run_segment(segment, (0.0, 10000.0, 236.0, sample["m0"]))
+        assert outputs["fuel_mass"][index] == pytest.approx(
+            result["fuel_mass"], rel=1e-6
+        )
+
+    # The default paths are those of a `mission_profile`: every sample fails
+    with pytest.raises(RuntimeError):
+        SweepDispersionRunner(sweep, mass="m0")(samples)
+
+    def failing_runner(samples):
+        return pandas.DataFrame({"fuel_mass": np.full(len(samples), np.nan)})
+
+    dispersion = MissionDispersion(failing_runner, m0=(65000.0, 2000.0), seed=1)
+    with pytest.raises(RuntimeError):
+        dispersion.run()
@@ -0,0 +1,349 @@
+import logging
+import numpy as np
+import pandas
+import pytest
+from cosapp.drivers import NonLinearSolver
+from amad.disciplines.performance.systems.missionFuel import (
+    MissionFuel,
+    run_with_mission_fuel,
+)
+from amad.disciplines.performance.tools.missionSweep import MissionSweep
+from amad.disciplines.performance.tools.missionFuelSurrogate import (
+    GeometrySweepSampler,
+    MissionFuelSurrogate,
+    MissionSweepSampler,
+)
+from amad.disciplines.performance.tools.tests.conftest import aero_cruise_factory
+
+BOUNDS = {
+    "m_mto": (60000.0, 75000.0),
+    "x_range": (1e6, 3e6),
+    "mach_current": (0.7, 0.8),
+}
+
+
+def breguet_fuel(points):
+    """
+    Return the Breguet fuel of the cruise, and constant climb and descent fuel.
+
+    Parameters
+    ----------
+    points : pandas.DataFrame
+        Take-off mass [kg], range [m] and Mach number.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Climb, cruise and descent fuel [kg].
+    """
+    ratio = points["x_range"] / (
+        1.5e7 * (1.0 - 2.0 * (points["mach_current"] - 0.75) ** 2)
+    )
+    return pandas.DataFrame(
+        {
+            "m_fuel_climb": 1e-2 * points["m_mto"],
+            "m_fuel_cruise": points["m_mto"] * (1.0 - np.exp(-ratio)),
+            "m_fuel_descent": np.full(len(points), 300.0),
+        }
+    )
+
+
+def test_surrogate_error_estimate():
+    """
+    Test the surrogate fit and its error estimate on an analytic mission fuel.
+
+    Raises
+    ------
+    AssertionError
+        If the prediction is not within its error estimate.
+    """
+    surrogate = MissionFuelSurrogate(breguet_fuel, BOUNDS, seed=1).fit()
+    assert len(surrogate.samples) == 20
+    assert surrogate.outputs == ["m_fuel_climb", "m_fuel_cruise", "m_fuel_descent"]
+    assert surrogate.cv_error["m_fuel_cruise"] < 1e-3 * 10000.0
+
+    rng = np.random.default_rng(2)
+    points = pandas.DataFrame(
+        {name: rng.uniform(low, high, 50) for name, (low, high) in BOUNDS.items()}
+    )
+    prediction = surrogate.predict(points)
+    exact = breguet_fuel(points)
+    error = (prediction["m_fuel_cruise"] - exact["m_fuel_cruise"]).abs()
+    assert (error <= 4.0 * prediction["m_fuel_cruise_error"]).all()
+    assert prediction["m_fuel_climb"].to_numpy() == pytest.approx(
+        exact["m_fuel_climb"].to_numpy(), rel=1e-9
+    )
+
+    with pytest.raises(ValueError):
+        MissionFuelSurrogate(breguet_fuel, {"m_mto": (1.0, 1.0)})
+    with pytest.raises(ValueError):
+        MissionFuelSurrogate(breguet_fuel, BOUNDS, n_samples=10)
+
+
+def test_surrogate_extension():
+    """
+    Test the extension of the domain when the surrogate is queried outside.
+
+    Raises
+    ------
+    AssertionError
+        If the domain does not contain the point, or if the model is not refitted.
+    """
+    surrogate = MissionFuelSurrogate(breguet_fuel, BOUNDS, seed=1).fit()
+    point = {"m_mto": 80000.0, "x_range": 2e6, "mach_current": 0.75}
+    assert not surrogate.contains(point)
+
+    surrogate.extend(point)
+    assert surrogate.contains(point)
+    assert surrogate.bounds["m_mto"] == (60000.0, 80000.0 + 0.25 * 15000.0)
+    assert surrogate.bounds["x_range"] == BOUNDS["x_range"]
+    assert surrogate.n_fits == 2
+    assert len(surrogate.samples) == 40
+
+    prediction = surrogate.predict(point).iloc[0]
+    exact = breguet_fuel(pandas.DataFrame([point])).iloc[0]
+    assert (
+        abs(prediction["m_fuel_cruise"] - exact["m_fuel_cruise"])
+        <= 4.0 * prediction["m_fuel_cruise_error"]
+    )
+
+
+def test_mission_fuel_system(caplog):
+    """
+    Test the mission fuel system, with a geometry feature and a refit between runs.
+
+    Parameters
+    ----------
+    caplog : pytest.LogCaptureFixture
+        Log capture fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the outputs differ from the surrogate predictions.
+    """
+    bounds = {**BOUNDS, "wing_span": (30.0, 40.0)}
+
+    def sampler(points):
+        fuel = breguet_fuel(points)
+        fuel["m_fuel_cruise"] *= 1.0 - 0.01 * (points["wing_span"] - 35.0)
+        return fuel
+
+    surrogate = MissionFuelSurrogate(sampler, bounds, seed=3)
+    fuel = MissionFuel(
+        "fuel",
+        surrogate=surrogate,
+        geometry_features={"wing_span": lambda geometry: geometry["span"]},
+    )
+    fuel.geom_in.asb_aircraft_geometry = {"span": 36.0}
+    fuel.m_mto = 70000.0
+    fuel.x_range = 2e6
+    fuel.mach_current = 0.78
+    with pytest.raises(RuntimeError, match="must be fitted"):
+        fuel.run_once()
+    assert fuel.update_surrogate()
+    fuel.run_once()
+
+    point = {"m_mto": 70000.0, "x_range": 2e6, "mach_current": 0.78, "wing_span": 36.0}
+    prediction = surrogate.predict(point).iloc[0]
+    assert surrogate.n_fits == 1
+    assert fuel.m_fuel_cruise.mass == pytest.approx(
+        prediction["m_fuel_cruise"], rel=1e-12
+    )
+    assert fuel.m_fuel_climb == pytest.approx(700.0, rel=1e-9)
+    assert fuel.m_fuel_descent == pytest.approx(300.0, rel=1e-9)
+    assert 0.0 < fuel.fuel_error < 1e-2 * fuel.m_fuel_cruise.mass
+    assert not fuel.extrapolated and not fuel.update_surrogate()
+
+    # The computation only extrapolates; the surrogate is extended between runs
+    fuel.geom_in.asb_aircraft_geometry = {"span": 42.0}
+    with caplog.at_level(logging.WARNING):
+        fuel.run_once()
+    assert fuel.extrapolated and "extrapolated" in caplog.text
+    assert surrogate.n_fits == 1
+    assert fuel.update_surrogate()
+    assert surrogate.n_fits == 2
+    assert surrogate.bounds["wing_span"][1] == pytest.approx(44.5)
+    fuel.run_once()
+    assert not fuel.extrapolated
+
+
+def cruise_fuel(cruise):
+    """
+    Return the fuel burnt by a cruise segment.
+
+    Parameters
+    ----------
+    cruise : Cruise_segment
+        Cruise segment, after the run.
+
+    Returns
+    -------
+    float
+        Fuel mass [kg].
+    """
+    return float(np.ravel(cruise.out_p.fuel_mass)[0])
+
+
+def test_mission_sweep_sampler():
+    """
+    Test the surrogate of a cruise segment sampled by a mission sweep.
+
+    Raises
+    ------
+    AssertionError
+        If the prediction differs from a simulated cruise.
+    """
+    sampler = MissionSweepSampler(
+        MissionSweep(aero_cruise_factory, n_workers=0),
+        parameters={"m_mto": "m0", "x_range": "Cruise_distance_target"},
+        outputs={"m_fuel_cruise": cruise_fuel},
+    )
+    bounds = {"m_mto": (60000.0, 70000.0), "x_range": (20e3, 60e3)}
+    surrogate = MissionFuelSurrogate(sampler, bounds, seed=0).fit()
+    assert surrogate.outputs == ["m_fuel_cruise"]
+    assert (surrogate.samples["m_fuel_cruise"] > 0.0).all()
+
+    reference = aero_cruise_factory()
+    reference.m0 = np.array([65000.0])
+    reference.Cruise_distance_target = 40e3
+    reference.run_drivers()
+    prediction = surrogate.predict({"m_mto": 65000.0, "x_range": 40e3}).iloc[0]
+    error = abs(prediction["m_fuel_cruise"] - cruise_fuel(reference))
+    assert error <= max(
+        4.0 * prediction["m_fuel_cruise_error"], 1e-6 * cruise_fuel(reference)
+    )
+
+
+def wing_cruise_factory(geometry):
+    """
+    Build a 40 km cruise segment of the wing area of a geometry.
+
+    Parameters
+    ----------
+    geometry : dict
+        Geometry, with the wing area `s_ref` [m**2].
+
+    Returns
+    -------
+    Cruise_segment
+        Cruise system ready to run.
+    """
+    cruise = aero_cruise_factory()
+    cruise.S = geometry["s_ref"]
+    cruise.Cruise_distance_target = 40e3
+    return cruise
+
+
+def set_wing_area(geometry, value):
+    """
+    Set the wing area of a geometry.
+
+    Parameters
+    ----------
+    geometry : dict
+        Geometry, modified in place.
+    value : float
+        Wing area [m**2].
+    """
+    geometry["s_ref"] = value
+
+
+def test_geometry_sweep_sampler():
+    """
+    Test the refit of a surrogate sampled over the geometry when the geometry drifts.
+
+    Raises
+    ------
+    AssertionError
+        If the geometry is not applied, or if the prediction differs from a simulated cruise.
+    """
+    sampler = GeometrySweepSampler(
+        wing_cruise_factory,
+        {"s_ref": 124.0},
+        {"s_ref": set_wing_area},
+        parameters={"m_mto": "m0"},
+        outputs={"m_fuel_cruise": cruise_fuel},
+    )
+    assert sampler.build_geometry({"s_ref": 130.0}) == {"s_ref": 130.0}
+    assert sampler.geometry == {"s_ref": 124.0}
+
+    surrogate = MissionFuelSurrogate(
+        sampler, {"m_mto": (60000.0, 70000.0), "s_ref": (115.0, 130.0)}, seed=0
+    )
+    fuel = MissionFuel(
+        "fuel",
+        surrogate=surrogate,
+        geometry_features={"s_ref": lambda geometry: geometry["s_ref"]},
+    )
+    fuel.m_mto = 65000.0
+    fuel.geom_in.asb_aircraft_geometry = {"s_ref": 124.0}
+    assert run_with_mission_fuel(fuel, fuel) == 1
+    assert surrogate.n_fits == 1
+
+    # A larger wing is out of the domain: its missions are sampled and the model refitted
+    fuel.geom_in.asb_aircraft_geometry = {"s_ref": 140.0}
+    assert run_with_mission_fuel(fuel, fuel) == 2
+    assert surrogate.n_fits == 2 and not fuel.extrapolated
+    assert surrogate.samples["s_ref"].max() > 140.0
+
+    reference = wing_cruise_factory({"s_ref": 140.0})
+    reference.m0 = np.array([65000.0])
+    reference.run_drivers()
+    prediction = surrogate.predict({"m_mto": 65000.0, "s_ref": 140.0}).iloc[0]
+    error = abs(fuel.m_fuel_cruise.mass - cruise_fuel(reference))
+    assert fuel.m_fuel_cruise.mass == pytest.approx(prediction["m_fuel_cruise"])
+    assert error <= max(
+        4.0 * prediction["m_fuel_cruise_error"], 1e-4 * cruise_fuel(reference)
+    )
+
+
+def test_sizing_loop_mission_fuel():
+    """
+    Test the mission fuel in the mass loop, with its climb and descent fuel.
+
+    Raises
+    ------
+    AssertionError
+        If the mass model does not take the fuel of the mission.
+    """
+    from amad.demo.demo_aircraft_resources import CalculateAircraft
+    from amad.disciplines.design.resources.aircraft_geometry_library import (
+        ac_narrow_body_long as airplane_geom,
+    )
+    from amad.optimization.resources.set_parameters import single_aisle_concept
+
+    surrogate = MissionFuelSurrogate(
+        breguet_fuel,
+        {
+            "m_mto": (60000.0, 90000.0),
+            "x_range": (4e6, 6e6),
+            "mach_current": (0.7, 0.8),
+        },
+        seed=0,
+    )
+    aircraft = single_aisle_concept(
+        CalculateAircraft(
+            "aircraft", airplane_geom=airplane_geom(), fuel_surrogate=surrogate
+        )
+    )
+    aircraft.add_driver(NonLinearSolver("nls", tol=1e-2))
+    aircraft.m_fuel_taxi = 500.0
+    aircraft.z_altitude = 11000.0
+    aircraft.mach_current = 0.78
+    aircraft.x_range = 5e6
+    aircraft.n_pax = 150
+    assert run_with_mission_fuel(aircraft, aircraft.cruise_fuel) == 1
+    assert not aircraft.cruise_fuel.extrapolated
+
+    assert int(aircraft.drivers["nls"].error_code) == 0
+    assert aircraft.m_mto == pytest.approx(aircraft.mass.total_mass, rel=1e-4)
+    assert aircraft.mass.m_fuel_climb == pytest.approx(1e-2 * aircraft.m_mto, rel=1e-6)
+    assert aircraft.mass.m_fuel_descent == pytest.approx(300.0, rel=1e-6)
+    # The fuel mass model sums the climb and descent fuel of the mission
+    fuel = aircraft.mass.fuel
+    assert fuel.m_fuel_climb == aircraft.cruise_fuel.m_fuel_climb
+    assert fuel.m_fuel_descent == aircraft.cruise_fuel.m_fuel_descent
+    assert aircraft.mass.m_fuel_out == pytest.approx(
+        fuel.m_fuel_climb + fuel.m_fuel_cruise + fuel.m_fuel_descent + 500.0
+    )
@@ -0,0 +1,131 @@
+import json
+import numpy as np
+import pytest
+from cosapp.base import System
+from cosapp.drivers import NonLinearSolver
+from amad.disciplines.performance.systems.Acceleration import Accelerate
+from amad.disciplines.performance.tools.adaptiveRungeKutta import AdaptiveRungeKutta
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+from amad.disciplines.performance.tools.missionProfiler import MissionProfiler
+from amad.disciplines.performance.tools.tests.conftest import cruise_factory
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+
+RUN_ONCE = System.run_once
+
+
+def test_profile_cruise(aero_tables, tmp_path):
+    """
+    Test the counters, times and trace of a cruise segment run.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    tmp_path : pathlib.Path
+        Directory of the trace file.
+
+    Raises
+    ------
+    AssertionError
+        If the counters are inconsistent, or if the components are not restored.
+    """
+    engine_model = MattinglyBackend()
+    syst = cruise_factory(engine_model)
+    syst.CLAeroIt, syst.CDAeroIt, syst.DAeroIt = aero_tables
+    syst.m0 = np.array([65000.0])
+    syst.Cruise_distance_target = 10e3
+    driver = syst.drivers["RK"]
+    driver.add_recorder(ColumnarRecorder(includes=["time", "mass"]), period=10)
+
+    profiler = MissionProfiler(syst)
+    with profiler:
+        assert profiler.enabled
+        with pytest.raises(RuntimeError):
+            MissionProfiler(syst).enable()
+        syst.run_drivers()
+        # Classes are patched process-wide, other systems run unprofiled
+        other = System("other")
+        other.run_once()
+    report = profiler.report()
+
+    assert not profiler.enabled
+    assert System.run_once is RUN_ONCE
+    assert syst.CLAeroIt is aero_tables[0]
+    assert "evaluate" not in vars(engine_model)
+    assert "record_state" not in vars(driver.recorder)
+
+    time_driver = report.loc["cruise.RK"]
+    solver = report.loc["cruise.RK.nls"]
+    system = report.loc["cruise"]
+    assert (report["segment"] == "cruise").all()
+    assert "other" not in report.index
+    assert time_driver["kind"] == "time driver"
+    assert time_driver["steps"] == int(np.ceil(10e3 / 236.0 / 5.0))
+    assert solver["resolutions"] == solver["calls"] > time_driver["steps"]
+    assert solver["residual_calls"] >= solver["resolutions"]
+    assert report.loc["cruise.CLAeroIt", "calls"] == system["compute_calls"]
+    assert report.loc["cruise.engine_model", "calls"] == system["compute_calls"]
+    assert report.loc["cruise.RK.recorder", "calls"] == len(driver.recorder)
+    assert report["self_time"].sum() == pytest.approx(time_driver["time"], rel=1e-9)
+    assert system["time"] >= report.loc["cruise.CLAeroIt", "time"]
+
+    segments = profiler.segment_report()
+    assert segments.loc["cruise", "time"] == pytest.approx(time_driver["time"])
+    assert segments.loc["cruise", "aero_time"] == pytest.approx(
+        report.loc[["cruise.CLAeroIt", "cruise.CDAeroIt"], "self_time"].sum()
+    )
+
+    path = tmp_path / "trace.json"
+    profiler.chrome_trace(path)
+    with open(path) as f:
+        events = json.load(f)["traceEvents"]
+    assert len(events) == report["calls"].sum()
+    assert events[0]["name"] == "cruise.RK"
+    end = events[0]["ts"] + events[0]["dur"]
+    assert all(events[0]["ts"] <= e["ts"] <= e["ts"] + e["dur"] <= end for e in events)
+
+    # Statistics are accumulated over the runs, and stop when disabled
+    with profiler:
+        syst.run_drivers()
+    syst.run_drivers()
+    assert profiler.report().loc["cruise.RK", "calls"] == 2
+    profiler.reset()
+    assert profiler.report().empty
+
+
+def test_profile_adaptive(aero_tables):
+    """
+    Test the step counters of an adaptive time driver.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the steps differ from those of the driver.
+    """
+    syst = Accelerate("accelerate", engine_model=MattinglyBackend())
+    syst.CLAeroIt, syst.CDAeroIt, syst.DAeroIt = aero_tables
+    syst.in_p.position = np.array([0.0, 0.0, 3048.0])
+    syst.in_p.TAS_speed = np.array([160.0, 0.0, 0.0])
+    syst.m0 = np.array([67000.0])
+    syst.g = 9.81
+    syst.S = 124.0
+    syst.n_eng = 2
+    syst.Thau = 0.0
+    syst.CAS_target = 300.0
+    driver = syst.add_driver(
+        AdaptiveRungeKutta("adaptive", time_interval=(0, 1000), dt=2.0, rtol=1e-9)
+    )
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+
+    with MissionProfiler(syst, trace=False) as profiler:
+        syst.run_drivers()
+    statistics = profiler.report().loc["accelerate.adaptive"]
+
+    assert statistics["steps"] == driver.n_accepted
+    assert statistics["rejected_steps"] == driver.n_rejected > 0
+    assert not profiler.events
@@ -0,0 +1,329 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+import amad.tools.unit_conversion as uc
+from amad.disciplines.design.resources.aircraft_geometry_library import (
+    ac_narrow_body_long_opti as airplane_geom,
+)
+from amad.disciplines.performance.systems.Acceleration import Accelerate
+from amad.disciplines.performance.systems.Climb import Climb_segment
+from amad.disciplines.performance.systems.Cruise import Cruise_segment
+from amad.disciplines.performance.systems.Deceleration import Decelerate
+from amad.disciplines.performance.systems.Descent import Descent_segment
+from amad.disciplines.performance.systems.missionProfile import mission_profile
+from amad.disciplines.performance.tools.missionSimulator import (
+    MissionSimulator,
+    alpha_slice,
+)
+from amad.disciplines.performance.tools.missionSweep import mission_range, total_fuel
+from amad.disciplines.powerplant.tools.engineBackend import MattinglyBackend
+from amad.disciplines.performance.tools.tests.conftest import N_ENG, S
+
+
+def test_alpha_slice(aero_tables):
+    """
+    Test that the reduced tables match the trilinear interpolation.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the reduced tables differ from the interpolation functions.
+    """
+    alphas = np.linspace(-6.0, 8.0, 15)
+    for table in aero_tables:
+        for mach, altitude in [(0.0, 0.0), (0.45, 3048.0), (0.78, 10668.0)]:
+            pts = np.column_stack(
+                [alphas, np.full_like(alphas, mach), np.full_like(alphas, altitude)]
+            )
+            assert alpha_slice(table, mach, altitude)(alphas) == pytest.approx(
+                table(pts), rel=1e-12
+            )
+            generic = alpha_slice(lambda pt: table(pt), mach, altitude)
+            assert generic(alphas) == pytest.approx(table(pts), rel=1e-12)
+
+    with pytest.raises(ValueError):
+        alpha_slice(aero_tables[0], 0.95, 0.0)
+
+
+def cosapp_segment(segment_class, aero_tables, engine_model, settings, state, duration):
+    """
+    Fly a segment system with the CoSApp drivers of `mission_profile`.
+
+    Parameters
+    ----------
+    segment_class : type
+        Segment system class.
+    aero_tables : tuple
+        Aerodynamic tables.
+    engine_model : EngineBackend
+        Engine performance backend.
+    settings : dict
+        Segment inwards.
+    state : tuple
+        Initial distance, altitude, horizontal speed and mass.
+    duration : float
+        Maximum segment duration [s].
+
+    Returns
+    -------
+    tuple
+        The segment system and its time driver, after the run.
+    """
+    x, z, V, mass = state
+    syst = segment_class(name="segment", engine_model=engine_model)
+    syst.CLAeroIt, syst.CDAeroIt, syst.DAeroIt = aero_tables
+    syst.in_p.position = np.array([x, 0.0, z])
+    syst.in_p.TAS_speed = np.array([V, 0.0, 0.0])
+    syst.m0 = np.array([mass])
+    syst.g = 9.81
+    syst.S = S
+    syst.n_eng = N_ENG
+    syst.Thau = 0.0
+    for name, value in settings.items():
+        syst[name] = value
+    if segment_class is Cruise_segment:
+        syst.Cruise_pos_init = np.array([x, 0.0, z])
+
+    driver = syst.add_driver(RungeKutta(time_interval=(0, duration), dt=1))
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    syst.run_drivers()
+    return syst, driver
+
+
+@pytest.mark.parametrize(
+    "kind, segment_class, settings, state, duration",
+    [
+        (
+            "climb",
+            Climb_segment,
+            {"CAS": 250.0, "acceleration_altitude": 3048.0},
+            (0.0, 2500.0, 0.0, 68000.0),
+            1000.0,
+        ),
+        (
+            "accelerate",
+            Accelerate,
+            {"CAS_target": 300.0},
+            (1000.0, 3048.0, 160.0, 67000.0),
+            1000.0,
+        ),
+        (
+            "cruise",
+            Cruise_segment,
+            {"Cruise_distance_target": 20000.0},
+            (1000.0, 10000.0, 236.0, 65000.0),
+            1000.0,
+        ),
+        (
+            "decelerate",
+            Decelerate,
+            {"CAS_target": 250.0},
+            (1000.0, 3048.0, 180.0, 62500.0),
+            1000.0,
+        ),
+        (
+            "descent",
+            Descent_segment,
+            {"CAS": 250.0, "Iso_Mach": 0.78, "CRD": -10.0, "IsoMach": False},
+            (0.0, 3500.0, 0.0, 62000.0),
+            60.0,
+        ),
+    ],
+)
+def test_segment_matches_cosapp(
+    aero_tables, kind, segment_class, settings, state, duration
+):
+    """
+    Test that a simulated segment matches the CoSApp segment system.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    kind : str
+        Segment kind of the simulator.
+    segment_class : type
+        Segment system class.
+    settings : dict
+        Segment settings.
+    state : tuple
+        Initial distance, altitude, horizontal speed and mass.
+    duration : float
+        Maximum segment duration [s].
+
+    Raises
+    ------
+    AssertionError
+        If the final state or segment outputs differ.
+    """
+    engine_model = MattinglyBackend()
+    syst, driver = cosapp_segment(
+        segment_class, aero_tables, engine_model, settings, state, duration
+    )
+
+    simulator = MissionSimulator(
+        *aero_tables, S=S, n_eng=N_ENG, engine_model=engine_model
+    )
+    segment = simulator.add_segment(kind, **settings)
+    result = simulator.run_segment(segment, state, t_max=duration)
+
+    assert result["time"][-1] == pytest.approx(driver.time, abs=1e-3)
+    x, z, V, mass = result["state"]
+    assert x == pytest.approx(syst.out_p.position[0], abs=0.1)
+    assert z == pytest.approx(syst.out_p.position[2], abs=0.1)
+    assert mass == pytest.approx(np.ravel(syst.mass)[0], abs=1e-3)
+    assert result["alpha"][-1] == pytest.approx(syst.alpha, abs=1e-5)
+    assert result["THR"][-1] == pytest.approx(syst.THR, rel=1e-5)
+    if duration > 100.0:
+        assert result["event"] is not None
+
+
+def test_mission_run(aero_tables):
+    """
+    Test a full mission: segment chaining, IsoMach crossovers and final conditions.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the segments do not end as expected.
+    """
+    simulator = MissionSimulator(*aero_tables, S=S, n_eng=N_ENG, dt=2.0)
+    simulator.add_segment(
+        "climb", name="climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6
+    )
+    simulator.add_segment("accelerate", name="accelerate", Mach_cruise=0.78)
+    simulator.add_segment("cruise", name="cruise", Cruise_distance_target=200e3)
+    simulator.add_segment("decelerate", name="decelerate", Iso_Mach=0.75)
+    simulator.add_segment(
+        "descent",
+        name="descent",
+        CAS=300.0,
+        Iso_Mach=0.75,
+        CRD=-10.0,
+        Fin_appr_altitude=457.2,
+    )
+    results = simulator.run(68000.0)
+
+    assert [result["event"] for result in results.values()] == [
+        "Cruise_altitude_reached",
+        "speed_arrived",
+        "Cruise_distance_reached",
+        "speed_arrived",
+        "Final_approach_altitude_reached",
+    ]
+    assert results["climb"]["Mach"][-1] == pytest.approx(0.75)
+    assert results["accelerate"]["Mach"][-1] == pytest.approx(0.78)
+    assert results["cruise"]["state"][0] - results["cruise"]["x"][0] == pytest.approx(
+        200e3
+    )
+    assert results["descent"]["state"][1] == pytest.approx(457.2)
+    assert results["descent"]["Mach"][0] == pytest.approx(0.75)
+
+    fuel = sum(result["fuel_mass"] for result in results.values())
+    assert 68000.0 - results["descent"]["state"][3] == pytest.approx(fuel)
+
+    with pytest.raises(ValueError):
+        simulator.add_segment("hover")
+    with pytest.raises(ValueError):
+        simulator.add_segment("cruise", CAS=250.0)
+
+
+def test_from_mission_profile(aero_tables):
+    """
+    Test that the simulator reads the segments and settings of a `mission_profile`.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the segments or their pulled settings are wrong.
+    """
+    mission = mission_profile("mission", asb_aircraft_geometry=airplane_geom())
+    mission.CLAeroIt, mission.CDAeroIt, mission.DAeroIt = aero_tables
+    simulator = MissionSimulator.from_mission_profile(mission, dt=2.0)
+
+    assert [segment["name"] for segment in simulator.segments] == [
+        segment.name for segment in mission.flightSegments
+    ]
+    assert isinstance(simulator.engine_model, MattinglyBackend)
+    assert simulator.S == pytest.approx(mission.S)
+    segments = {segment["name"]: segment for segment in simulator.segments}
+    assert segments["Climb_segment_1"]["acceleration_altitude"] == pytest.approx(3048.0)
+    assert segments["Climb_segment_2"]["acceleration_altitude"] == 0.0
+    assert segments["Climb_segment_2"]["Iso_Mach"] == pytest.approx(0.75)
+    assert segments["Acc_Mach"]["Mach_cruise"] == pytest.approx(0.8)
+    assert segments["Descent_segment_1"]["IsoMach"]
+    assert not segments["Descent_segment_2"]["IsoMach"]
+
+
+def test_demo_mission_matches_cosapp(aero_tables):
+    """
+    Test the simulator against the CoSApp drivers on the demo `mission_profile`.
+
+    The segment drivers of the mission are given a solver, for the equilibrium
+    of each step; the cruise is shortened to 50 km to keep the run short.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a segment ends at another time, or if the final mass or range differ
+        by more than 0.1 kg or 1 m.
+    """
+    mission = mission_profile(
+        "mission",
+        asb_aircraft_geometry=airplane_geom(),
+        engine_model=MattinglyBackend(),
+    )
+    mission.CLAeroIt, mission.CDAeroIt, mission.DAeroIt = aero_tables
+    mission.Cruise_segment.Cruise_distance_target = 50e3
+    # Read before the run, which leaves the climb segments in IsoMach mode
+    simulator = MissionSimulator.from_mission_profile(mission, dt=1.0)
+    for driver in mission.drx.values():
+        driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    mission.run_drivers()
+
+    m0 = float(np.ravel(mission.Climb_segment_1.m0)[0])
+    results = simulator.run(m0)
+    for segment in mission.flightSegments:
+        result = results[segment.name]
+        duration = result["time"][-1] - result["time"][0]
+        records = mission.drx[segment.name].recorder.export_data()
+        assert duration == pytest.approx(records["time [-]"].iloc[-1], abs=1e-2)
+        x, z, V, mass = result["state"]
+        assert x == pytest.approx(segment.out_p.position[0], abs=1.0)
+        assert z == pytest.approx(segment.out_p.position[2], abs=1.0)
+        assert mass == pytest.approx(np.ravel(segment.mass)[0], abs=0.1)
+
+    x, z, V, mass = results["Descent_segment_2"]["state"]
+    assert m0 - mass == pytest.approx(total_fuel(mission), abs=0.1)
+    assert x == pytest.approx(mission_range(mission), abs=1.0)
+
+    # Mission history, converted in place from the recorded units
+    history = mission.mission_history({"Altitude": "m", "TAS": "kt"})
+    assert list(history["Segment"].unique()) == [
+        segment.name for segment in mission.flightSegments
+    ]
+    assert history["Altitude [m]"].iloc[0] == pytest.approx(uc.ft2m(1500.0))
+    assert history["TAS [kt]"].to_numpy() == pytest.approx(
+        uc.ms2kt(mission.mission_history()["TAS [m/s]"].to_numpy()), rel=1e-12
+    )
+    assert history["mass [kg]"].iloc[-1] == pytest.approx(mass, abs=0.1)
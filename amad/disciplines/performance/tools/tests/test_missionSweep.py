@@ -0,0 +1,206 @@
+import os
+import numpy as np
+import pytest
+from amad.disciplines.performance.systems.Climb import Climb_segment
+from amad.disciplines.performance.tools.missionSweep import (
+    MissionSweep,
+    attach_table,
+    input_state,
+    restore_state,
+    share_table,
+)
+from amad.disciplines.performance.tools.tests.conftest import cruise_factory
+
+
+# Processes whose first mission build failed
+_FAILED_BUILDS = set()
+
+
+def flaky_factory():
+    """
+    Build a cruise segment, failing on the first call of each process.
+
+    Returns
+    -------
+    Cruise_segment
+        Cruise system ready to run.
+
+    Raises
+    ------
+    OSError
+        On the first call of the process, as CoSApp on a concurrent access to its configuration.
+    """
+    if os.getpid() not in _FAILED_BUILDS:
+        _FAILED_BUILDS.add(os.getpid())
+        raise OSError("Unable to find the user id.")
+    return cruise_factory()
+
+
+def failing_factory():
+    """
+    Fail to build a mission.
+
+    Raises
+    ------
+    ValueError
+        Always.
+    """
+    raise ValueError("Invalid mission")
+
+
+def test_shared_tables(tmp_path, aero_tables):
+    """
+    Test that tables rebuilt from memory-mapped files interpolate identically.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the rebuilt table differs or is not memory-mapped.
+    """
+    table = aero_tables[0]
+    shared = attach_table(share_table(table, str(tmp_path), "CL"))
+    pts = np.array([[1.0, 0.5, 3000.0], [-2.5, 0.78, 10500.0]])
+    assert isinstance(shared.values, np.memmap)
+    assert shared(pts) == pytest.approx(table(pts), rel=1e-15)
+    assert share_table(print, str(tmp_path), "other") is print
+
+
+def test_restore_state():
+    """
+    Test that inputs and output mode variables are restored.
+
+    Raises
+    ------
+    AssertionError
+        If a value keeps its value from the previous run.
+    """
+    syst = Climb_segment("climb")
+    state = input_state(syst)
+    syst.in_p.position = np.array([1.0, 2.0, 3.0])
+    syst.IsoMach = True
+    restore_state(state)
+    assert syst.in_p.position == pytest.approx(np.zeros(3))
+    assert syst.IsoMach is False
+
+
+@pytest.mark.parametrize("n_workers", [0, 2])
+def test_mission_sweep(aero_tables, n_workers, monkeypatch):
+    """
+    Test a sweep of take-off mass and cruise distance against serial runs.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    n_workers : int
+        Number of worker processes.
+    monkeypatch : pytest.MonkeyPatch
+        Fixture setting the environment of the workers.
+
+    Raises
+    ------
+    AssertionError
+        If the sweep results, errors or progress reports are wrong.
+    """
+    table = {
+        "m0": [np.array([65000.0]), np.array([60000.0]), np.array([65000.0])],
+        "Cruise_distance_target": [20e3, 20e3, 40e3],
+    }
+    outputs = {"fuel": "out_p.fuel_mass", "x": "out_p.position"}
+    # CoSApp falls back to the user name when the workers read its configuration file
+    # while another one writes it
+    monkeypatch.setenv("USER", os.environ.get("USER") or "amad")
+    sweep = MissionSweep(
+        cruise_factory,
+        *aero_tables[:2],
+        outputs=outputs,
+        n_workers=n_workers,
+        mp_context="fork",
+    )
+    reports = []
+    results = sweep.run(table, progress=lambda *args: reports.append(args[:2]))
+
+    assert sorted(reports) == [(1, 3), (2, 3), (3, 3)]
+    assert results["index"].tolist() == [0, 1, 2]
+    assert results["error"].isna().all()
+    assert [x[0] for x in results["x"]] == pytest.approx([20e3, 20e3, 40e3])
+    fuel = results["fuel"].to_numpy()
+    assert fuel[1] < fuel[0] < fuel[2]
+
+    syst = cruise_factory()
+    syst.CLAeroIt, syst.CDAeroIt = aero_tables[:2]
+    syst.m0 = np.array([65000.0])
+    syst.Cruise_distance_target = 40e3
+    syst.run_drivers()
+    assert fuel[2] == pytest.approx(np.ravel(syst.out_p.fuel_mass)[0], rel=1e-12)
+
+
+def test_mission_sweep_errors(aero_tables):
+    """
+    Test that failing points are reported without stopping the sweep.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the failing point is not reported.
+    """
+    sweep = MissionSweep(
+        cruise_factory,
+        *aero_tables[:2],
+        outputs={"fuel": "out_p.fuel_mass"},
+        n_workers=0,
+    )
+    records = list(
+        sweep.iter_run(
+            [
+                {"m0": np.array([65000.0]), "Cruise_distance_target": 10e3},
+                {"m0": np.array([65000.0]), "unknown_variable": 1.0},
+            ]
+        )
+    )
+    assert records[0]["error"] is None
+    assert "unknown_variable" in records[1]["error"]
+
+
+def test_mission_sweep_worker_errors(aero_tables, monkeypatch):
+    """
+    Test that workers failing to build their mission report it by point, and recover.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    monkeypatch : pytest.MonkeyPatch
+        Fixture setting the environment of the workers.
+
+    Raises
+    ------
+    AssertionError
+        If the pool is broken, or if the errors are not reported.
+    """
+    points = [
+        {"m0": np.array([65000.0]), "Cruise_distance_target": 10e3} for _ in range(3)
+    ]
+    monkeypatch.setenv("USER", os.environ.get("USER") or "amad")
+    options = dict(outputs={"fuel": "out_p.fuel_mass"}, n_workers=2, mp_context="fork")
+
+    # The mission is built again by the points of a worker whose initialisation failed
+    results = MissionSweep(flaky_factory, *aero_tables[:2], **options).run(points)
+    assert results["error"].isna().all()
+    assert results["fuel"].to_numpy() == pytest.approx(results["fuel"][0], rel=1e-12)
+
+    results = MissionSweep(failing_factory, *aero_tables[:2], **options).run(points)
+    assert len(results) == 3
+    assert all("Invalid mission" in error for error in results["error"])
@@ -0,0 +1,186 @@
+import numpy as np
+import pytest
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+from amad.disciplines.performance.tools.payloadRange import PayloadRange
+
+MASSES = {
+    "OEW": 56000.0,
+    "MTOW": 68000.0,
+    "max_payload": 8000.0,
+    "fuel_capacity": 6000.0,
+}
+
+
+@pytest.fixture(scope="module")
+def simulator(aero_tables):
+    """
+    Create a simulator of a short mission with linear aerodynamic tables.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Returns
+    -------
+    MissionSimulator
+        Climb, acceleration, cruise, deceleration and descent simulator.
+    """
+    simulator = MissionSimulator(*aero_tables, S=124.0, n_eng=2, dt=5.0)
+    simulator.add_segment(
+        "climb", name="climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6
+    )
+    simulator.add_segment("accelerate", name="accelerate", Mach_cruise=0.78)
+    simulator.add_segment("cruise", name="cruise", Cruise_distance_target=200e3)
+    simulator.add_segment("decelerate", name="decelerate", Iso_Mach=0.75)
+    simulator.add_segment(
+        "descent",
+        name="descent",
+        CAS=300.0,
+        Iso_Mach=0.75,
+        CRD=-10.0,
+        Fin_appr_altitude=457.2,
+    )
+    return simulator
+
+
+@pytest.fixture(scope="module")
+def serial_corners(simulator):
+    """
+    Compute the corners of the diagram in the calling process.
+
+    Parameters
+    ----------
+    simulator : MissionSimulator
+        Simulator fixture.
+
+    Returns
+    -------
+    tuple
+        The payload-range engine and its corners.
+    """
+    engine = PayloadRange(simulator, **MASSES, reserve_fraction=0.05)
+    return engine, engine.corners()
+
+
+def test_payload_range_corners(serial_corners):
+    """
+    Test the fuel balance of the corner points and the reuse of the climb.
+
+    Parameters
+    ----------
+    serial_corners : tuple
+        Payload-range engine and corners fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a corner does not balance its masses and fuel.
+    """
+    engine, corners = serial_corners
+
+    assert list(corners.index) == ["max_payload", "max_fuel", "ferry"]
+    assert corners["converged"].all()
+    assert corners["range"].is_monotonic_increasing
+    assert corners["TOW"].tolist() == pytest.approx([68000.0, 68000.0, 62000.0])
+    assert corners["payload"].tolist() == pytest.approx([8000.0, 6000.0, 0.0])
+    assert engine.block_fuel(corners["trip_fuel"]).to_numpy() == pytest.approx(
+        corners["fuel"].to_numpy(), abs=engine.mass_tol
+    )
+    # The climb at MTOW is flown once for the first two corners
+    assert engine.n_prefix_runs == 2
+    assert engine.n_prefix_reused > 0
+
+    flight = engine.fly(68000.0, corners.loc["max_fuel", "cruise_distance"])
+    assert flight["range"] == pytest.approx(corners.loc["max_fuel", "range"])
+
+
+def test_payload_range_points(serial_corners):
+    """
+    Test the points of the envelope between the corners.
+
+    Parameters
+    ----------
+    serial_corners : tuple
+        Payload-range engine and corners fixture.
+
+    Raises
+    ------
+    AssertionError
+        If a point is not on the envelope.
+    """
+    engine, corners = serial_corners
+    ranges = corners["range"].to_numpy()
+
+    short = engine.point(0.5 * ranges[0])
+    assert short["converged"]
+    assert short["payload"] == pytest.approx(8000.0, abs=engine.mass_tol)
+    assert short["TOW"] < 68000.0
+    assert short["fuel"] == pytest.approx(engine.block_fuel(short["trip_fuel"]))
+
+    middle = engine.point(0.5 * (ranges[0] + ranges[1]))
+    assert middle["TOW"] == 68000.0
+    assert 6000.0 < middle["payload"] < 8000.0
+
+    long = engine.point(0.5 * (ranges[1] + ranges[2]))
+    assert long["converged"]
+    assert long["fuel"] == pytest.approx(6000.0, abs=engine.mass_tol)
+    assert 0.0 < long["payload"] < 6000.0
+
+    assert np.isnan(engine.point(1.1 * ranges[2])["payload"])
+
+
+def test_payload_range_parallel(simulator, serial_corners):
+    """
+    Test that the corners computed in parallel processes match the serial ones.
+
+    Parameters
+    ----------
+    simulator : MissionSimulator
+        Simulator fixture.
+    serial_corners : tuple
+        Payload-range engine and corners fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the corners differ.
+    """
+    engine = PayloadRange(simulator, **MASSES, reserve_fraction=0.05, n_workers=3)
+    diagram = engine.diagram()
+    _, corners = serial_corners
+
+    assert diagram["name"].tolist() == [
+        "zero_range",
+        "max_payload",
+        "max_fuel",
+        "ferry",
+    ]
+    assert diagram["range"].iloc[1:].to_numpy() == pytest.approx(
+        corners["range"].to_numpy(), abs=2.0 * engine.xtol
+    )
+
+
+def test_payload_range_errors(simulator):
+    """
+    Test the checks of the mission and masses.
+
+    Parameters
+    ----------
+    simulator : MissionSimulator
+        Simulator fixture.
+
+    Raises
+    ------
+    AssertionError
+        If invalid inputs are accepted.
+    """
+    with pytest.raises(ValueError):
+        PayloadRange(simulator, **dict(MASSES, MTOW=50000.0))
+    with pytest.raises(ValueError):
+        PayloadRange(MissionSimulator(None, None, None, S=124.0, n_eng=2), **MASSES)
+    engine = PayloadRange(simulator, **MASSES)
+    with pytest.raises(ValueError):
+        engine.corner("mtow")
+    with pytest.raises(ValueError):
+        engine.fly(68000.0, 0.0)
@@ -0,0 +1,143 @@
+import numpy as np
+import pytest
+from cosapp.drivers import NonLinearSolver, RungeKutta
+import amad.tools.unit_conversion as uc
+from amad.disciplines.performance.systems.Descent import Descent_segment
+from amad.tools.atmosBADA import AtmosphereAMAD
+from amad.disciplines.performance.tools.speedSchedule import (
+    SegmentSpeedSchedule,
+    SpeedSchedule,
+    speed_schedule,
+)
+from amad.disciplines.performance.tools.tests.conftest import create_aero_tables
+
+
+@pytest.mark.parametrize("dISA", [0.0, 15.0])
+def test_speed_schedule(dISA):
+    """
+    Test the tabulated speeds against the direct conversions on both sides of the crossover altitude.
+
+    Parameters
+    ----------
+    dISA : float
+        Delta ISA temperature [K].
+
+    Raises
+    ------
+    AssertionError
+        If the scheduled speeds differ from the conversions.
+    """
+    atmosphere = AtmosphereAMAD(offset_deg=dISA)
+    schedule = SpeedSchedule(300.0, 0.78, dISA)
+    crossover = schedule.crossover_altitude
+    assert crossover == atmosphere.crossoveralt(uc.kt2ms(300.0), 0.78)
+
+    for altitude in (0.0, 3048.0, 7654.3, crossover - 1e-3):
+        TAS, Mach, CAS = schedule(altitude)
+        assert TAS == pytest.approx(
+            atmosphere.cas2tas(uc.kt2ms(300.0), altitude), rel=1e-5
+        )
+        assert Mach == pytest.approx(atmosphere.tas2mach(TAS, altitude), rel=1e-5)
+        assert CAS == 300.0
+    for altitude in (crossover + 1e-3, 10668.0, 11500.0):
+        TAS, Mach, CAS = schedule(altitude)
+        assert TAS == pytest.approx(atmosphere.mach2tas(0.78, altitude), rel=1e-5)
+        assert Mach == pytest.approx(0.78, rel=1e-12)
+        assert uc.kt2ms(CAS) == pytest.approx(
+            atmosphere.tas2cas(TAS, altitude), rel=1e-5
+        )
+
+    # Continuous switch of law at the crossover altitude
+    below, above = schedule(crossover - 1e-6), schedule(crossover)
+    assert above == pytest.approx(below, rel=1e-6)
+
+    profile = schedule.profile()
+    assert list(profile.columns) == ["TAS", "Mach", "CAS"]
+    assert (profile.loc[profile.index < crossover, "CAS"] == 300.0).all()
+    assert (profile.loc[profile.index >= crossover, "Mach"] == 0.78).all()
+
+
+def test_speed_schedule_cache():
+    """
+    Test the sharing of the schedules and the CAS law without Mach number.
+
+    Raises
+    ------
+    AssertionError
+        If the schedules are not shared, or not reselected at each run.
+    """
+    assert speed_schedule(250.0, 0.0) is speed_schedule(250.0, 0.0)
+    assert speed_schedule(250.0, 0.0) is not speed_schedule(250.0, 0.0, 10.0)
+
+    # Low altitude law without Mach number: constant CAS at any altitude
+    schedule = speed_schedule(250.0, 0.0)
+    assert schedule.crossover_altitude == np.inf
+    assert schedule(12000.0)[2] == 250.0
+
+    segment_schedule = SegmentSpeedSchedule()
+    segment_schedule(300.0, 0.78, 3000.0)
+    assert segment_schedule.schedule is speed_schedule(300.0, 0.78)
+    segment_schedule(280.0, 0.78, 11000.0)
+    assert segment_schedule.schedule is speed_schedule(300.0, 0.78)
+    segment_schedule.reset()
+    segment_schedule(280.0, 0.78, 11000.0)
+    assert segment_schedule.schedule is speed_schedule(280.0, 0.78)
+
+
+def create_descent(speed_schedule):
+    """
+    Create a descent segment with linear aerodynamic tables, flown by a Runge-Kutta driver.
+
+    Parameters
+    ----------
+    speed_schedule : bool
+        Whether the segment speeds are read from a speed schedule.
+
+    Returns
+    -------
+    Descent_segment
+        The initialised segment.
+    """
+    descent = Descent_segment("descent", speed_schedule=speed_schedule)
+    descent.CLAeroIt, descent.CDAeroIt, descent.DAeroIt = create_aero_tables()
+    descent.S = 124.0
+    descent.g = 9.81
+    descent.n_eng = 2
+    descent.m0 = np.array([65000.0])
+    descent.in_p.position = np.array([0.0, 0.0, 10000.0])
+    descent.in_p.TAS_speed = np.array([221.0, 0.0, -10.0])
+    descent.CAS = 300.0
+    descent.Iso_Mach = 0.75
+    descent.CRD = -10.0
+    descent.Fin_appr_altitude = 3048.0
+    driver = descent.add_driver(RungeKutta(time_interval=(0, 1000), dt=5.0))
+    driver.add_child(NonLinearSolver("nls", tol=1e-9))
+    return descent
+
+
+def test_scheduled_descent():
+    """
+    Test that the descent through the crossover altitude matches the IsoMach mode.
+
+    Raises
+    ------
+    AssertionError
+        If the final states differ.
+    """
+    reference = create_descent(False)
+    reference.run_drivers()
+    descent = create_descent(True)
+    descent.run_drivers()
+
+    assert descent.in_p.position[2] == pytest.approx(3048.0, abs=1e-6)
+    # The IsoMach mode leaves at a CAS of 154.3 m/s, i.e. 299.93 kt instead of 300 kt
+    assert descent.out_p.position == pytest.approx(reference.out_p.position, rel=5e-4)
+    assert descent.mass == pytest.approx(reference.mass, rel=1e-5)
+    assert descent.TAS == pytest.approx(reference.TAS, rel=5e-4)
+    assert descent.CAS == 300.0
+
+    # The schedule is selected again at each run
+    descent.CAS = 280.0
+    descent.in_p.position = np.array([0.0, 0.0, 10000.0])
+    descent.run_drivers()
+    assert descent.speed_schedule.schedule is speed_schedule(280.0, 0.75)
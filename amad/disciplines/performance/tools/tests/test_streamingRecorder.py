@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+from cosapp.base import System
+from cosapp.drivers import RungeKutta
+from amad.disciplines.performance.tools.columnarRecorder import ColumnarRecorder
+from amad.disciplines.performance.tools.streamingRecorder import StreamingRecorder
+from amad.disciplines.performance.tools.telemetryWriter import (
+    TelemetryReader,
+    TelemetryWriter,
+)
+
+
+class Projectile(System):
+    """
+    Projectile in vacuum.
+    """
+
+    def setup(self):
+        """
+        Setup method defines system structure.
+        """
+        self.add_inward("position", np.zeros(2), unit="m")
+        self.add_inward("speed", np.array([100.0, 50.0]), unit="m/s")
+        self.add_outward("acceleration", np.array([0.0, -9.81]))
+        self.add_transient("position", der="speed")
+        self.add_transient("speed", der="acceleration")
+
+
+def run_projectile(recorder):
+    """
+    Fly the projectile for 10 s with a recorder.
+
+    Parameters
+    ----------
+    recorder : BaseRecorder
+        Recorder of the time driver.
+
+    Returns
+    -------
+    BaseRecorder
+        The recorder, after the run.
+    """
+    syst = Projectile("projectile")
+    driver = syst.add_driver(RungeKutta(time_interval=(0.0, 10.0), dt=0.1))
+    driver.add_recorder(recorder, period=0.5)
+    syst.run_drivers()
+    return driver.recorder
+
+
+def test_streaming_recorder(tmp_path):
+    """
+    Test that records are streamed in chunks and exported as with `ColumnarRecorder`.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+
+    Raises
+    ------
+    AssertionError
+        If records are lost or buffers grow.
+    """
+    includes = ["position"]
+    expected = run_projectile(
+        ColumnarRecorder(includes=includes, raw_output=False)
+    ).export_data()
+    sink = TelemetryWriter(tmp_path / "telemetry.zip", chunk_size=8)
+    recorder = run_projectile(
+        StreamingRecorder(sink, includes=includes, raw_output=False)
+    )
+
+    # Buffers hold a single chunk
+    assert len(recorder._columns[0]) == 8
+    assert len(recorder) == 21
+    reader = TelemetryReader(sink.path)
+    assert reader.groups == ["projectile"]
+    assert [len(data["time"]) for _, data in reader.iter_chunks()] == [8, 8, 5]
+
+    data = recorder.export_data()
+    assert list(data.columns) == list(expected.columns)
+    assert np.stack(data["position [m]"]) == pytest.approx(
+        np.stack(expected["position [m]"])
+    )
+    assert data["Reference"].tolist() == expected["Reference"].tolist()
+    assert recorder.export_array()["time"] == pytest.approx(np.arange(0.0, 10.01, 0.5))
+
+
+@pytest.mark.parametrize("hold", [False, True])
+def test_streaming_successive_runs(tmp_path, hold):
+    """
+    Test that the records of a previous run are exported only when held.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+    hold : bool
+        Whether the records of successive runs are kept.
+
+    Raises
+    ------
+    AssertionError
+        If the number of records and the export disagree.
+    """
+    sink = TelemetryWriter(tmp_path / "telemetry.zip", chunk_size=8)
+    syst = Projectile("projectile")
+    driver = syst.add_driver(RungeKutta(time_interval=(0.0, 10.0), dt=0.1))
+    driver.add_recorder(
+        StreamingRecorder(sink, includes=["position"], hold=hold), period=0.5
+    )
+    syst.run_drivers()
+    syst.position = np.zeros(2)
+    syst.run_drivers()
+
+    recorder = driver.recorder
+    runs = 2 if hold else 1
+    assert len(recorder) == 21 * runs
+    data = recorder.export_data()
+    assert len(data) == len(recorder)
+    assert data["time"].tolist() == pytest.approx(
+        np.tile(np.arange(0.0, 10.01, 0.5), runs)
+    )
+    # Both runs are kept in the file
+    assert len(TelemetryReader(sink.path).read("projectile")["time"]) == 42
+
+    recorder.clear()
+    assert len(recorder) == 0
+    assert recorder.export_data().empty
@@ -0,0 +1,151 @@
+import os
+import numpy as np
+import pytest
+from amad.disciplines.performance.tools.missionSweep import MissionSweep
+from amad.disciplines.performance.tools.tableRegistry import (
+    TableRegistry,
+    attach_table,
+    detach_table,
+)
+from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+from amad.disciplines.powerplant.tools.engineDeck import EngineDeck
+from amad.disciplines.performance.tools.tests.conftest import cruise_factory
+
+
+@pytest.fixture(scope="module")
+def deck():
+    """
+    Create the engine deck of an engine with default settings.
+
+    Returns
+    -------
+    EngineDeck
+        The engine deck.
+    """
+    return EngineDeck.from_engine(EnginePerfoMattingly("engine"))
+
+
+def deck_mapped(mission):
+    """
+    Return whether the engine deck of a mission is mapped from the shared files.
+
+    Parameters
+    ----------
+    mission : Cruise_segment
+        Mission system.
+
+    Returns
+    -------
+    bool
+        True if the thrust table is a view of a memory-mapped file.
+    """
+    return isinstance(mission.engine_model.thrust.base, np.memmap)
+
+
+def test_table_registry(aero_tables, deck):
+    """
+    Test the publication, attachment and reference counting of shared tables.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    deck : EngineDeck
+        Engine deck fixture.
+
+    Raises
+    ------
+    AssertionError
+        If an attached table differs, is copied, or if its files are not managed.
+    """
+    with TableRegistry() as registry:
+        handles = {
+            "CL": registry.publish("CL", aero_tables[0]),
+            "deck": registry.publish("deck", deck),
+            "array": registry.publish("array", np.arange(6.0).reshape(2, 3)),
+        }
+        assert registry.publish("function", print) is print
+
+        table = attach_table(handles["CL"])
+        assert attach_table(handles["CL"]) is table
+        assert isinstance(table.values, np.memmap)
+        pts = np.array([[1.0, 0.5, 3000.0], [-2.5, 0.78, 10500.0]])
+        assert table(pts) == pytest.approx(aero_tables[0](pts), rel=1e-15)
+
+        shared = attach_table(handles["deck"])
+        assert isinstance(shared.sfc.base, np.memmap)
+        assert shared.key == deck.key
+        alt, mach = np.array([0.0, 9144.0]), np.array([0.2, 0.78])
+        for value, expected in zip(
+            shared.evaluate(alt, mach, "MCRZ", 10.0),
+            deck.evaluate(alt, mach, "MCRZ", 10.0),
+        ):
+            assert value == pytest.approx(expected, rel=1e-12)
+        assert attach_table(handles["array"])[1, 2] == 5.0
+
+        detach_table(handles["CL"])
+        assert attach_table(handles["CL"]) is table
+        for _ in range(2):
+            detach_table(handles["CL"])
+        assert attach_table(handles["CL"]) is not table
+
+        # The files are kept until the last publication is released
+        assert registry.publish("deck", deck) is handles["deck"]
+        with pytest.raises(ValueError):
+            registry.publish("deck", aero_tables[1])
+        paths = list(handles["deck"]["paths"].values())
+        registry.release("deck")
+        assert all(os.path.exists(path) for path in paths)
+        registry.release("deck")
+        assert not any(os.path.exists(path) for path in paths)
+        assert "deck" not in registry.handles
+        directory = registry.directory
+    assert not os.path.exists(directory)
+
+
+def test_sweep_engine_deck(aero_tables, deck, monkeypatch):
+    """
+    Test a mission sweep whose workers map the engine deck.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+    deck : EngineDeck
+        Engine deck fixture.
+    monkeypatch : pytest.MonkeyPatch
+        Fixture setting the environment of the workers.
+
+    Raises
+    ------
+    AssertionError
+        If the workers copy the deck, or if the results differ from a serial run.
+    """
+    # CoSApp falls back to the user name when the workers read its configuration file
+    # while another one writes it
+    monkeypatch.setenv("USER", os.environ.get("USER") or "amad")
+    sweep = MissionSweep(
+        cruise_factory,
+        *aero_tables[:2],
+        outputs={"fuel": "out_p.fuel_mass", "mapped": deck_mapped},
+        n_workers=2,
+        mp_context="fork",
+        engine_model=deck,
+    )
+    results = sweep.run(
+        {
+            "m0": [np.array([65000.0]), np.array([60000.0])],
+            "Cruise_distance_target": [20e3, 20e3],
+        }
+    )
+    assert results["error"].isna().all()
+    assert results["mapped"].all()
+
+    syst = cruise_factory(deck)
+    syst.CLAeroIt, syst.CDAeroIt = aero_tables[:2]
+    syst.m0 = np.array([60000.0])
+    syst.Cruise_distance_target = 20e3
+    syst.run_drivers()
+    assert results["fuel"][1] == pytest.approx(
+        np.ravel(syst.out_p.fuel_mass)[0], rel=1e-12
+    )
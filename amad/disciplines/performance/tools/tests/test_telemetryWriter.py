@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from amad.disciplines.performance.tools.telemetryWriter import (
+    TelemetryReader,
+    TelemetryWriter,
+)
+
+
+def test_append_chunks(tmp_path):
+    """
+    Test that appended rows are written in fixed-size chunks and read back lazily.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+
+    Raises
+    ------
+    AssertionError
+        If the chunks or the data read back are wrong.
+    """
+    path = tmp_path / "telemetry.zip"
+    writer = TelemetryWriter(path, chunk_size=4)
+    time = np.arange(10.0)
+    position = np.column_stack([time, 2.0 * time])
+    labels = np.array(["climb"] * 10, dtype=object)
+    for start in (0, 3, 9):
+        stop = {0: 3, 3: 9, 9: 10}[start]
+        writer.append(
+            "mission/climb",
+            {
+                "time": time[start:stop],
+                "position": position[start:stop],
+                "Segment": labels[start:stop],
+            },
+        )
+    writer.append("mission/cruise", {"time": np.arange(3.0)})
+
+    reader = TelemetryReader(path)
+    assert reader.chunk_keys() == [("mission/climb", 0), ("mission/climb", 1)]
+    writer.close()
+    assert reader.groups == ["mission/climb", "mission/cruise"]
+    assert reader.columns("mission/climb") == ["time", "position", "Segment"]
+
+    chunks = list(reader.iter_chunks("mission/climb", columns=["time"]))
+    assert [len(data["time"]) for _, data in chunks] == [4, 4, 2]
+    assert list(chunks[0][1]) == ["time"]
+
+    data = reader.read("mission/climb")
+    assert data["time"] == pytest.approx(time)
+    assert data["position"] == pytest.approx(position)
+    assert list(data["Segment"]) == ["climb"] * 10
+    df = reader.to_dataframe("mission/cruise")
+    assert df["time"].tolist() == [0.0, 1.0, 2.0]
+
+
+def test_writer_reopen(tmp_path):
+    """
+    Test that chunks are appended to an existing file without overwriting.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory.
+
+    Raises
+    ------
+    AssertionError
+        If the chunks of the first writer are lost.
+    """
+    path = tmp_path / "telemetry.zip"
+    TelemetryWriter(path).write_chunk("case", {"x": np.arange(2.0)})
+    TelemetryWriter(path, overwrite=False).write_chunk(
+        "case", {"x": np.arange(2.0, 5.0)}
+    )
+
+    assert TelemetryReader(path).read("case")["x"] == pytest.approx(np.arange(5.0))
+    TelemetryWriter(path)
+    assert TelemetryReader(path).groups == []
+
+    with pytest.raises(ValueError):
+        TelemetryWriter(path, chunk_size=0)
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas
+import pytest
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+from amad.disciplines.performance.tools.tripFuel import TripFuel
+
+M_OE = 42000.0
+RESERVE = 3000.0
+
+
+def analytic_trip(tow, cruise):
+    """
+    Return the range and fuel of an analytic mission.
+
+    Parameters
+    ----------
+    tow : numpy.ndarray
+        Take-off masses [kg].
+    cruise : numpy.ndarray
+        Cruise distances [m].
+
+    Returns
+    -------
+    tuple
+        Mission range [m] and fuel [kg].
+    """
+    climb = 150e3 + 1.0 * (tow - 60000.0)
+    fuel = 0.02 * tow + 0.98 * tow * (1.0 - np.exp(-cruise / 1.2e7)) + 200.0
+    return climb + cruise + 120e3, fuel
+
+
+class AnalyticSimulator:
+    """
+    Analytic mission with the segment interface of `MissionSimulator`.
+
+    Attributes
+    ----------
+    segments : list of dict
+        Climb, cruise and descent segments.
+    """
+
+    def __init__(self):
+        """
+        Initialise the segments.
+        """
+        self.segments = [
+            {"kind": "climb", "name": "climb"},
+            {"kind": "cruise", "name": "cruise", "Cruise_distance_target": 200e3},
+            {"kind": "descent", "name": "descent"},
+        ]
+
+    def run_segments(self, segments, y0, alpha0=0.0):
+        """
+        Fly segments of the analytic mission.
+
+        Parameters
+        ----------
+        segments : list of dict
+            Segment definitions.
+        y0 : array_like
+            Initial state `[x, z, V, mass]`; the take-off mass gives the climb.
+        alpha0 : float, optional
+            Initial angle of attack guess, unused.
+
+        Returns
+        -------
+        tuple
+            Segment results, final state and angle of attack.
+        """
+        y = np.array(y0, dtype=float)
+        results = {}
+        for segment in segments:
+            if segment["kind"] == "climb":
+                y[0] += 150e3 + 1.0 * (y[3] - 60000.0)
+                y[3] -= 0.02 * y[3]
+            elif segment["kind"] == "cruise":
+                y[0] += segment["Cruise_distance_target"]
+                y[3] *= np.exp(-segment["Cruise_distance_target"] / 1.2e7)
+            else:
+                y[0] += 120e3
+                y[3] -= 200.0
+            results[segment["name"]] = {"event": "end", "state": y.copy()}
+        return results, y, alpha0
+
+
+def exact_trip_fuel(distance, payload):
+    """
+    Solve the take-off mass and trip fuel of the analytic mission.
+
+    Parameters
+    ----------
+    distance : numpy.ndarray
+        Trip distances [m].
+    payload : numpy.ndarray
+        Payloads [kg].
+
+    Returns
+    -------
+    numpy.ndarray
+        Trip fuel [kg].
+    """
+    fuel = np.zeros_like(distance)
+    for _ in range(100):
+        tow = M_OE + payload + RESERVE + fuel
+        cruise = distance - 150e3 - (tow - 60000.0) - 120e3
+        fuel = analytic_trip(tow, cruise)[1]
+    return fuel
+
+
+def test_trip_fuel(tmp_path):
+    """
+    Test the interpolated trip fuel of many trips against the exact solution of an analytic mission.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory of the results file.
+
+    Raises
+    ------
+    AssertionError
+        If the trip fuel is not within tolerance, or if the anchors are not reused.
+    """
+    rng = np.random.default_rng(0)
+    trips = pandas.DataFrame(
+        {
+            "distance": rng.uniform(500e3, 5000e3, 500),
+            "payload": rng.uniform(5000.0, 20000.0, 500),
+        }
+    )
+    calculator = TripFuel(
+        AnalyticSimulator(),
+        M_OE,
+        reserve_fuel=RESERVE,
+        tow_step=2000.0,
+        rtol=1e-3,
+        position=(0.0, 0.0, 0.0),
+    )
+    path = tmp_path / "trips.csv"
+    results = calculator.run(trips, path=path)
+
+    assert results["distance"].is_monotonic_increasing
+    original = trips.loc[results["trip"]]
+    assert results["payload"].to_numpy() == pytest.approx(
+        original["payload"].to_numpy()
+    )
+    exact = exact_trip_fuel(
+        original["distance"].to_numpy(), original["payload"].to_numpy()
+    )
+    assert results["trip_fuel"].to_numpy() == pytest.approx(exact, rel=2e-3)
+    assert results["tow"].to_numpy() == pytest.approx(
+        M_OE + original["payload"].to_numpy() + RESERVE + exact, rel=5e-4
+    )
+    assert results["block_fuel"].to_numpy() == pytest.approx(
+        results["trip_fuel"].to_numpy() + RESERVE
+    )
+    assert calculator.n_missions < 200
+    assert results.attrs["n_missions"] == calculator.n_missions
+    # The climb is flown once per take-off mass node
+    assert calculator.n_prefix_runs == len(calculator.nodes)
+    assert calculator.n_prefix_reused == calculator.n_missions - len(calculator.nodes)
+    pandas.testing.assert_frame_equal(pandas.read_csv(path), results)
+
+    # Trips at solved take-off masses are interpolated without new missions
+    n_missions = calculator.n_missions
+    given = calculator.run(results[["distance", "payload", "tow"]].iloc[::50])
+    assert calculator.n_missions == n_missions
+    assert given["trip_fuel"].to_numpy() == pytest.approx(
+        results["trip_fuel"].to_numpy()[::50], rel=1e-4
+    )
+
+    # Trips shorter than the climb and descent are not computed
+    tow = np.array([65000.0])
+    cruise = 3000e3 - analytic_trip(tow, 0.0)[0]
+    short = calculator.run(
+        {"distance": [200e3, 3000e3], "payload": [0.0, 0.0], "tow": [65000.0] * 2}
+    )
+    assert np.isnan(short["trip_fuel"][0])
+    assert short["trip_fuel"][1] == pytest.approx(
+        analytic_trip(tow, cruise)[1][0], rel=1e-3
+    )
+
+
+def test_trip_fuel_simulator(aero_tables):
+    """
+    Test the trip fuel of a simulated mission against direct flights.
+
+    Parameters
+    ----------
+    aero_tables : tuple
+        Aerodynamic tables fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the trip fuel is not within tolerance, or if the climbs are not reused.
+    """
+    simulator = MissionSimulator(*aero_tables, S=124.0, n_eng=2, dt=2.0)
+    simulator.add_segment(
+        "climb", name="climb", CAS=300.0, Iso_Mach=0.75, cruise_altitude=9753.6
+    )
+    simulator.add_segment("cruise", name="cruise", Cruise_distance_target=200e3)
+    simulator.add_segment(
+        "descent", name="descent", CAS=300.0, Iso_Mach=0.75, CRD=-10.0
+    )
+    calculator = TripFuel(simulator, M_OE, tow_step=2000.0, rtol=1e-3)
+
+    tow = np.array([64500.0, 65200.0, 64100.0])
+    distance, fuel = [], []
+    for mass, cruise in zip(tow, (300e3, 600e3, 900e3)):
+        simulator.segments[1]["Cruise_distance_target"] = cruise
+        results = simulator.run(mass)
+        distance.append(results["descent"]["state"][0])
+        fuel.append(mass - results["descent"]["state"][3])
+    simulator.segments[1]["Cruise_distance_target"] = 200e3
+
+    trips = calculator.run({"distance": distance, "payload": tow - M_OE, "tow": tow})
+    assert trips["trip_fuel"].to_numpy() == pytest.approx(fuel, rel=2e-3)
+    assert calculator.n_prefix_runs == len(calculator.nodes) == 2
+    assert calculator.n_prefix_reused == calculator.n_missions - 2
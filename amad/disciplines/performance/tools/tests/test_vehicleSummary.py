@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from amad.disciplines.aerodynamics.tools.createFlightVehicle import CreateAirplane
+from amad.disciplines.design.resources.aircraft_geometry_library import (
+    ac_narrow_body_long_opti as airplane_geom,
+)
+from amad.disciplines.performance.systems.missionProfile import mission_profile
+from amad.disciplines.performance.tools.vehicleSummary import (
+    VehicleSummary,
+    clear_vehicle_cache,
+    geometry_key,
+)
+from amad.disciplines.systems.fuel.systems.fuelVolume import FuelVolume_Weight
+
+
+def test_geometry_key():
+    """
+    Test that the geometry key depends on the values only.
+
+    Raises
+    ------
+    AssertionError
+        If equivalent geometries have different keys, or different ones the same key.
+    """
+    geometry = airplane_geom()
+    same = dict(reversed(list(geometry.items())))
+    same["wing_chords"] = np.array(same["wing_chords"])
+    same["n_eng"] = np.int64(same["n_eng"])
+    assert geometry_key(same) == geometry_key(geometry)
+
+    other = dict(geometry, wing_chords=[7.9, 4.97058261, 1.11146700683949])
+    assert geometry_key(other) != geometry_key(geometry)
+
+
+def test_vehicle_summary():
+    """
+    Test the summary quantities against the generated flight vehicle, and the cache.
+
+    Raises
+    ------
+    AssertionError
+        If a quantity differs, or if the vehicle is generated again.
+    """
+    clear_vehicle_cache()
+    geometry = airplane_geom()
+    summary = VehicleSummary.from_geometry(geometry)
+    assert VehicleSummary.from_geometry(airplane_geom()) is summary
+    assert summary.flight_vehicle is summary.flight_vehicle
+    assert summary.key == geometry_key(geometry)
+
+    vehicle = CreateAirplane(aero_geom=geometry, generate_airfoil_polars=False)
+    vehicle.generate()
+    assert summary.s_ref == pytest.approx(vehicle.airplane.s_ref)
+    assert summary.n_eng == geometry["n_eng"]
+    assert summary.aspect_ratio == pytest.approx(
+        vehicle.airplane.wings[0].aspect_ratio()
+    )
+    assert summary.fuselage_volume == pytest.approx(
+        vehicle.airplane.fuselages[0].volume()
+    )
+    fuel_volume = FuelVolume_Weight("Fuel_VW")
+    fuel_volume.tau = max(airfoil.max_thickness() for airfoil in vehicle.wing_airfoils)
+    fuel_volume.S = vehicle.airplane.s_ref
+    fuel_volume.AR = vehicle.airplane.wings[0].aspect_ratio()
+    fuel_volume.V_fuselage = vehicle.airplane.fuselages[0].volume()
+    fuel_volume.rho_f = 817
+    fuel_volume.V_f_fuse_ratio = 0.05
+    fuel_volume.run_once()
+    assert summary.W_f == pytest.approx(fuel_volume.W_f)
+
+    # A summary without geometry computes the fuel capacity, but has no flight vehicle
+    quantities = summary.to_dict()
+    del quantities["W_f"]
+    copy = VehicleSummary(**quantities)
+    assert copy.W_f == pytest.approx(summary.W_f)
+    assert copy.flight_vehicle is None and copy.key is None
+    clear_vehicle_cache()
+    assert VehicleSummary.from_geometry(geometry) is not summary
+
+
+def test_mission_from_summary():
+    """
+    Test that missions set up from a geometry or from its summary are the same.
+
+    Raises
+    ------
+    AssertionError
+        If the vehicle quantities differ, if the flight vehicle is not shared, or if a
+        segment has no driver.
+    """
+    geometry = airplane_geom()
+    first = mission_profile("first", asb_aircraft_geometry=geometry)
+    second = mission_profile("second", asb_aircraft_geometry=airplane_geom())
+    assert second.vehicle_summary is first.vehicle_summary
+    assert second.flight_vehicle is first.flight_vehicle
+
+    summary = first.vehicle_summary.to_dict()
+    mission = mission_profile("mission", geometry_summary=summary)
+    assert mission.flight_vehicle is None
+    for name in ("S", "n_eng", "W_f"):
+        assert mission[name] == pytest.approx(first[name])
+    assert [segment.name for segment in mission.flightSegments] == [
+        segment.name for segment in first.flightSegments
+    ]
+    # Segments can be run on their own as soon as the mission is set up
+    for segment in mission.flightSegments:
+        assert list(segment.drivers.values()) == [mission.drx[segment.name]]
+
+    with pytest.raises(ValueError):
+        mission_profile("mission")
@@ -0,0 +1,500 @@
+"""________________________________________________________________________________
+
+                              TRIP FUEL MODULE
+___________________________________________________________________________________"""
+
+# Trip fuel of many (distance, payload) trips of one aircraft, for network studies.
+# The take-off masses are binned on a grid of nodes; for each node, the mission is
+# flown by the fast-path `MissionSimulator` at a few anchor trips, which only differ
+# by their cruise distance: the segments before the cruise are flown once per node and
+# reused by all its anchors. The anchors are refined by bisection until the monotonic
+# cubic interpolation of the trip fuel along the distance is within tolerance. The trips
+# are then interpolated between the anchors of the two nodes around their take-off mass.
+# tripFuel.py
+
+import logging
+import numpy as np
+import pandas
+from scipy.interpolate import PchipInterpolator
+from amad.disciplines.performance.tools.missionSimulator import MissionSimulator
+
+logger = logging.getLogger(__name__)
+
+
+class TripFuel:
+    """
+    Batch calculator of the trip fuel of (distance, payload) trips of one aircraft.
+
+    The take-off mass of a trip is the sum of the operating empty mass, the
+    payload, the reserve fuel and the trip fuel, solved by fixed-point
+    iteration on the interpolated trip fuel, unless given.
+
+    Attributes
+    ----------
+    simulator : MissionSimulator
+        Mission simulator, with one cruise segment.
+    m_oe : float
+        Operating empty mass [kg].
+    reserve_fuel : float
+        Reserve fuel mass, carried but not burnt [kg].
+    tow_step : float
+        Step of the take-off mass nodes [kg].
+    rtol : float
+        Tolerance on the interpolation of the trip fuel between anchor
+        trips, relative to the trip fuel.
+    position : numpy.ndarray
+        Initial position `[x, y, z]` of the mission [m].
+    nodes : dict
+        Anchor trips by take-off mass node: `offset` distance flown out of the
+        cruise [m], `distance` [m] and `fuel` [kg] of the anchors, and the
+        intervals between anchors within tolerance.
+    n_missions : int
+        Number of anchor trips flown.
+    n_prefix_runs : int
+        Number of flights of the segments before the cruise, one per node.
+    n_prefix_reused : int
+        Number of reuses of cached segments before the cruise.
+    """
+
+    def __init__(
+        self,
+        simulator,
+        m_oe,
+        reserve_fuel=0.0,
+        tow_step=2000.0,
+        rtol=1e-3,
+        reference_cruise=200e3,
+        min_cruise=1e3,
+        max_anchors=65,
+        position=(0.0, 0.0, 457.2),
+    ):
+        """
+        Initialise the calculator.
+
+        Parameters
+        ----------
+        simulator : MissionSimulator
+            Mission simulator, with one cruise segment.
+        m_oe : float
+            Operating empty mass [kg].
+        reserve_fuel : float, optional
+            Reserve fuel mass [kg]. Defaults to 0.
+        tow_step : float, optional
+            Step of the take-off mass nodes [kg]. Defaults to 2000 kg.
+        rtol : float, optional
+            Relative tolerance of the interpolation along the distance. Defaults to 1e-3.
+        reference_cruise : float, optional
+            Cruise distance of the first anchor of a node, giving the distance
+            flown out of the cruise [m]. Defaults to 200 km.
+        min_cruise : float, optional
+            Shortest cruise distance of the anchors [m], shorter trips are not
+            computed; also the margin of the anchors beyond the trip distances.
+            Defaults to 1 km.
+        max_anchors : int, optional
+            Maximum number of anchors of a node. Defaults to 65.
+        position : array_like, optional
+            Initial position `[x, y, z]` [m]. Defaults to 1500 ft altitude.
+
+        Raises
+        ------
+        ValueError
+            If the simulator has not exactly one cruise segment.
+        """
+        kinds = [segment["kind"] for segment in simulator.segments]
+        if kinds.count("cruise") != 1:
+            raise ValueError(
+                f"The mission must have exactly one cruise segment; got {kinds}"
+            )
+        self.simulator = simulator
+        self.m_oe = m_oe
+        self.reserve_fuel = reserve_fuel
+        self.tow_step = tow_step
+        self.rtol = rtol
+        self.reference_cruise = reference_cruise
+        self.min_cruise = min_cruise
+        self.max_anchors = max_anchors
+        self.position = np.asarray(position, dtype=float)
+        self.nodes = {}
+        self.n_missions = 0
+        self.n_prefix_runs = 0
+        self.n_prefix_reused = 0
+        i = kinds.index("cruise")
+        self._prefix_segments = simulator.segments[:i]
+        self._cruise = simulator.segments[i]
+        self._suffix_segments = simulator.segments[i:][1:]
+        self._prefix_cache = {}
+
+    @classmethod
+    def from_mission_profile(
+        cls, mission, m_oe, engine_model=None, simulator_options=None, **options
+    ):
+        """
+        Create the calculator of a `mission_profile` system.
+
+        Parameters
+        ----------
+        mission : mission_profile
+            Mission system, with its aerodynamic interpolation functions set.
+        m_oe : float
+            Operating empty mass [kg].
+        engine_model : EngineBackend, optional
+            Engine performance backend (see `MissionSimulator.from_mission_profile`).
+        simulator_options : dict, optional
+            Options of the simulator (`dt`, `order`, ...).
+        **options
+            Other options of the calculator (see `TripFuel`).
+
+        Returns
+        -------
+        TripFuel
+            The trip fuel calculator.
+        """
+        simulator = MissionSimulator.from_mission_profile(
+            mission, engine_model, **(simulator_options or {})
+        )
+        options.setdefault("position", mission.flightSegments[0].in_p.position)
+        return cls(simulator, m_oe, **options)
+
+    def _prefix(self, tow):
+        """
+        Fly the segments before the cruise, or reuse them for a known take-off mass node.
+
+        Parameters
+        ----------
+        tow : float
+            Take-off mass [kg].
+
+        Returns
+        -------
+        tuple
+            Initial state and angle of attack guess of the cruise.
+        """
+        key = float(tow)
+        if key in self._prefix_cache:
+            self.n_prefix_reused += 1
+            return self._prefix_cache[key]
+        y0 = np.array([self.position[0], self.position[2], 0.0, key])
+        results, y, alpha = self.simulator.run_segments(self._prefix_segments, y0)
+        self._check(results)
+        self.n_prefix_runs += 1
+        self._prefix_cache[key] = (y, alpha)
+        return y, alpha
+
+    @staticmethod
+    def _check(results):
+        """
+        Check that the segments flown ended on one of their final events.
+
+        Parameters
+        ----------
+        results : dict
+            Segment results by segment name (see `MissionSimulator.run_segments`).
+
+        Raises
+        ------
+        RuntimeError
+            If a segment reached the maximum duration instead.
+        """
+        for name, result in results.items():
+            if result["event"] is None:
+                raise RuntimeError(
+                    f"Segment {name!r} of an anchor trip did not reach its final event"
+                )
+
+    def _solve(self, points):
+        """
+        Fly the mission for anchor trips.
+
+        Parameters
+        ----------
+        points : list of tuple
+            Take-off mass node [kg] and cruise distance [m] of the anchors.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `fuel` [kg] and `range` [m] of the anchors.
+
+        Raises
+        ------
+        RuntimeError
+            If a segment of an anchor trip did not end on its final event.
+        """
+        fuel, distance = [], []
+        for tow, cruise_distance in points:
+            y, alpha = self._prefix(tow)
+            cruise = dict(self._cruise, Cruise_distance_target=cruise_distance)
+            results, y_end, _ = self.simulator.run_segments(
+                [cruise] + self._suffix_segments, y, alpha
+            )
+            self._check(results)
+            fuel.append(tow - y_end[3])
+            distance.append(y_end[0] - self.position[0])
+        self.n_missions += len(points)
+        return pandas.DataFrame({"fuel": fuel, "range": distance}, dtype=float)
+
+    def _add_anchors(self, points):
+        """
+        Run anchor trips and insert them in their nodes.
+
+        Parameters
+        ----------
+        points : list of tuple
+            Take-off mass node [kg] and cruise distance [m] of the anchors.
+
+        Returns
+        -------
+        list of tuple
+            Distance [m] and trip fuel [kg] of the anchors, None for the anchors
+            at the distance of another anchor (cruise distance out of the
+            capability of the mission), which are not inserted.
+        """
+        if not points:
+            return []
+        results = self._solve(points)
+        anchors = []
+        for (tow, _), fuel, distance in zip(points, results["fuel"], results["range"]):
+            node = self.nodes[tow]
+            index = np.searchsorted(node["distance"], distance)
+            if np.isclose(node["distance"], distance).any():
+                anchors.append(None)
+                continue
+            node["distance"] = np.insert(node["distance"], index, distance)
+            node["fuel"] = np.insert(node["fuel"], index, fuel)
+            anchors.append((distance, fuel))
+        return anchors
+
+    def _cover(self, ranges):
+        """
+        Solve the anchors of the nodes over ranges of trip distances.
+
+        Parameters
+        ----------
+        ranges : dict
+            Shortest and longest trip distances [m] by take-off mass node.
+        """
+        new = [tow for tow in ranges if tow not in self.nodes]
+        results = self._solve([(tow, self.reference_cruise) for tow in new])
+        for tow, fuel, distance in zip(new, results["fuel"], results["range"]):
+            self.nodes[tow] = {
+                "offset": distance - self.reference_cruise,
+                "distance": np.array([distance]),
+                "fuel": np.array([fuel]),
+                "converged": set(),
+                "capped": False,
+            }
+
+        # Anchors at the ends of the ranges, with a margin for the accuracy of the cruise end
+        points = []
+        for tow, (low, high) in ranges.items():
+            node = self.nodes[tow]
+            shortest = node["offset"] + self.min_cruise
+            low = max(low - self.min_cruise, shortest)
+            high = max(high + self.min_cruise, shortest)
+            for distance in (low, high):
+                if not node["distance"][0] <= distance <= node["distance"][-1]:
+                    points.append((tow, distance - node["offset"]))
+        self._add_anchors(points)
+
+        # Bisection of the intervals until the interpolation is within tolerance
+        while True:
+            points, intervals = [], []
+            for tow, (low, high) in ranges.items():
+                node = self.nodes[tow]
+                if len(node["distance"]) >= self.max_anchors:
+                    if not node["capped"]:
+                        logger.warning(
+                            f"Trip fuel: maximum number of anchors reached at take-off mass {tow} kg"
+                        )
+                        node["capped"] = True
+                    continue
+                bounds = zip(node["distance"][:-1], node["distance"][1:])
+                for interval in bounds:
+                    start, end = interval
+                    if interval in node["converged"] or end < low or start > high:
+                        continue
+                    points.append((tow, 0.5 * (start + end) - node["offset"]))
+                    intervals.append(interval)
+            if not points:
+                return
+
+            interpolants = {tow: self._interpolant(self.nodes[tow]) for tow in ranges}
+            anchors = self._add_anchors(points)
+            for (tow, _), interval, anchor in zip(points, intervals, anchors):
+                converged = self.nodes[tow]["converged"]
+                if anchor is None:
+                    converged.add(interval)
+                    continue
+                distance, fuel = anchor
+                if abs(fuel - interpolants[tow](distance)) <= self.rtol * fuel:
+                    converged.update({(interval[0], distance), (distance, interval[1])})
+
+    @staticmethod
+    def _interpolant(node):
+        """
+        Return the interpolation of the trip fuel along the distance between the anchors of a node.
+
+        Parameters
+        ----------
+        node : dict
+            Anchors of a take-off mass node.
+
+        Returns
+        -------
+        callable
+            Monotonic cubic interpolation of the trip fuel [kg] over the distance [m],
+            NaN out of the anchors.
+        """
+        if len(node["distance"]) < 2:
+            return lambda distance: np.full(np.shape(distance), np.nan)
+        return PchipInterpolator(node["distance"], node["fuel"], extrapolate=False)
+
+    def _interpolate(self, distance, tow):
+        """
+        Interpolate the trip fuel between the anchors of the nodes around the take-off masses.
+
+        Parameters
+        ----------
+        distance : numpy.ndarray
+            Trip distances [m].
+        tow : numpy.ndarray
+            Take-off masses [kg].
+
+        Returns
+        -------
+        numpy.ndarray
+            Trip fuel [kg], NaN out of the anchors (trips too short to cruise).
+        """
+        lower = np.floor(tow / self.tow_step) * self.tow_step
+        weight = (tow - lower) / self.tow_step
+        fuel = np.zeros_like(distance)
+        for node_tow, node_weight in (
+            (lower, 1.0 - weight),
+            (lower + self.tow_step, weight),
+        ):
+            for value in np.unique(node_tow):
+                lanes = node_tow == value
+                fuel[lanes] += node_weight[lanes] * self._interpolant(
+                    self.nodes[value]
+                )(distance[lanes])
+        return fuel
+
+    def _predict(self, distance, mass, n_iter):
+        """
+        Predict the trip fuel from the closest solved node, scaled with the take-off mass.
+
+        The prediction gives the take-off masses of the first iteration, so that
+        only the nodes around the solution are solved. Without solved node, the
+        node of the median take-off mass without trip fuel is solved first.
+
+        Parameters
+        ----------
+        distance : numpy.ndarray
+            Trip distances [m].
+        mass : numpy.ndarray
+            Take-off masses without trip fuel [kg].
+        n_iter : int
+            Number of iterations on the take-off masses.
+
+        Returns
+        -------
+        numpy.ndarray
+            Predicted trip fuel [kg].
+        """
+        if not self.nodes:
+            tow = np.round(np.median(mass) / self.tow_step) * self.tow_step
+            self._cover({float(tow): (distance.min(), distance.max())})
+
+        nodes = np.array(list(self.nodes))
+        closest = nodes[np.argmin(np.abs(mass[:, None] - nodes), axis=1)]
+        ratio = np.zeros_like(distance)
+        for value in np.unique(closest):
+            lanes = closest == value
+            ratio[lanes] = self._interpolant(self.nodes[value])(distance[lanes]) / value
+        ratio = np.nan_to_num(ratio)
+        fuel = np.zeros_like(distance)
+        for _ in range(n_iter):
+            fuel = ratio * (mass + fuel)
+        return fuel
+
+    def _require(self, distance, tow):
+        """
+        Solve the anchors needed for the interpolation of trips.
+
+        Parameters
+        ----------
+        distance : numpy.ndarray
+            Trip distances [m].
+        tow : numpy.ndarray
+            Take-off masses [kg].
+        """
+        lower = np.floor(tow / self.tow_step) * self.tow_step
+        ranges = {}
+        for node_tow in (lower, lower + self.tow_step):
+            for value in np.unique(node_tow):
+                lanes = distance[node_tow == value]
+                low, high = ranges.get(value, (np.inf, -np.inf))
+                ranges[float(value)] = (min(low, lanes.min()), max(high, lanes.max()))
+        self._cover(ranges)
+
+    def run(self, trips, path=None, max_iter=20, mass_tol=1.0):
+        """
+        Compute the trip fuel of trips.
+
+        Parameters
+        ----------
+        trips : pandas.DataFrame or dict
+            Trip `distance` [m] and `payload` [kg], and optionally the take-off mass `tow` [kg].
+        path : str or path-like, optional
+            CSV file the results are written to.
+        max_iter : int, optional
+            Maximum number of iterations on the take-off masses. Defaults to 20.
+        mass_tol : float, optional
+            Tolerance on the take-off masses [kg]. Defaults to 1 kg.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Trips sorted by distance, with their original `trip` index, `tow`,
+            `trip_fuel`, `block_fuel` (trip and reserve fuel) and `landing_mass` [kg].
+            The trip fuel is NaN for the trips too short to cruise.
+        """
+        table = pandas.DataFrame(trips).rename_axis("trip").reset_index()
+        table = table.sort_values("distance", kind="stable").reset_index(drop=True)
+        distance = table["distance"].to_numpy(dtype=float)
+        if "tow" in table:
+            tow = table["tow"].to_numpy(dtype=float)
+            self._require(distance, tow)
+            fuel = self._interpolate(distance, tow)
+        else:
+            zero_fuel = self.m_oe + table["payload"].to_numpy(dtype=float)
+            fuel = self._predict(distance, zero_fuel + self.reserve_fuel, max_iter)
+            for _ in range(max_iter):
+                tow = zero_fuel + self.reserve_fuel + np.nan_to_num(fuel)
+                self._require(distance, tow)
+                previous, fuel = fuel, self._interpolate(distance, tow)
+                if np.nanmax(np.abs(fuel - previous), initial=0.0) <= mass_tol:
+                    break
+            else:
+                logger.warning(
+                    f"Trip fuel: take-off masses not converged after {max_iter} iterations"
+                )
+            tow = zero_fuel + self.reserve_fuel + fuel
+
+        short = np.isnan(fuel)
+        if np.any(short):
+            logger.warning(
+                f"Trip fuel: {np.sum(short)} trips too short to cruise are not computed"
+            )
+        table["tow"] = tow
+        table["trip_fuel"] = fuel
+        table["block_fuel"] = fuel + self.reserve_fuel
+        table["landing_mass"] = tow - fuel
+        table.attrs.update(
+            n_missions=self.n_missions,
+            n_prefix_runs=self.n_prefix_runs,
+            n_prefix_reused=self.n_prefix_reused,
+        )
+        if path is not None:
+            table.to_csv(path, index=False)
+        return table
@@ -0,0 +1,243 @@
+"""________________________________________________________________________________
+
+                              VEHICLE SUMMARY MODULE
+___________________________________________________________________________________"""
+
+# Summary of the flight vehicle quantities read by the mission profile: reference
+# surface, number of engines, wing aspect ratio and thickness ratio, fuselage volume and
+# maximum fuel mass. Summaries are cached by a hash of the aircraft geometry, so that the
+# AeroSandbox airplane and the fuel volume system are generated once per geometry rather
+# than once per mission; a summary may also be given directly, without any geometry.
+# vehicleSummary.py
+
+import hashlib
+import json
+
+import numpy as np
+
+from amad.disciplines.aerodynamics.tools.createFlightVehicle import CreateAirplane
+from amad.disciplines.systems.fuel.systems.fuelVolume import FuelVolume_Weight
+
+# Summaries and flight vehicles already generated during the session, keyed by geometry
+_SUMMARY_CACHE = {}
+_VEHICLE_CACHE = {}
+
+
+def _canonical(value):
+    """
+    Convert a geometry value into JSON-serialisable built-in types.
+
+    Parameters
+    ----------
+    value : object
+        Geometry value: number, string, array, or nested list and dict of them.
+
+    Returns
+    -------
+    object
+        Equivalent value made of lists, dicts, floats, ints and strings.
+    """
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def geometry_key(geometry):
+    """
+    Hash identifying an aircraft geometry.
+
+    Parameters
+    ----------
+    geometry : dict
+        Aircraft geometry (see `CreateAirplane`); arrays and lists are equivalent.
+
+    Returns
+    -------
+    str
+        Geometry key.
+    """
+    content = json.dumps(_canonical(geometry), sort_keys=True, default=repr)
+    return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+
+def flight_vehicle(geometry):
+    """
+    Get the flight vehicle of a geometry from the cache, generating it if needed.
+
+    The vehicle is shared by all its users: it must not be updated in place.
+
+    Parameters
+    ----------
+    geometry : dict
+        Aircraft geometry.
+
+    Returns
+    -------
+    CreateAirplane
+        Generated flight vehicle, without airfoil polars.
+    """
+    key = geometry_key(geometry)
+    vehicle = _VEHICLE_CACHE.get(key)
+    if vehicle is None:
+        vehicle = CreateAirplane(aero_geom=geometry, generate_airfoil_polars=False)
+        vehicle.generate()
+        _VEHICLE_CACHE[key] = vehicle
+    return vehicle
+
+
+def clear_vehicle_cache():
+    """
+    Empty the caches of vehicle summaries and flight vehicles.
+    """
+    _SUMMARY_CACHE.clear()
+    _VEHICLE_CACHE.clear()
+
+
+class VehicleSummary:
+    """
+    Flight vehicle quantities needed to set up a mission.
+
+    Attributes
+    ----------
+    s_ref : float
+        Wing reference surface [m**2].
+    n_eng : int
+        Number of engines.
+    aspect_ratio : float
+        Aspect ratio of the main wing.
+    thickness_ratio : float
+        Maximum thickness to chord ratio of the wing airfoils.
+    fuselage_volume : float
+        Volume of the main fuselage [m**3].
+    W_f : float
+        Maximum fuel mass [kg], of the fuel volume in the wing and in the fuselage.
+    geometry : dict or None
+        Aircraft geometry of the summary, if known.
+    key : str or None
+        Hash of the geometry (see `geometry_key`), if known.
+    """
+
+    # Fuel density [kg/m**3] and share of the fuselage volume available for fuel
+    FUEL_DENSITY = 817.0
+    FUSELAGE_FUEL_RATIO = 0.05
+
+    def __init__(
+        self,
+        s_ref,
+        n_eng,
+        aspect_ratio,
+        thickness_ratio,
+        fuselage_volume,
+        W_f=None,
+        geometry=None,
+    ):
+        """
+        Initialise a summary from its quantities.
+
+        Parameters
+        ----------
+        s_ref : float
+            Wing reference surface [m**2].
+        n_eng : int
+            Number of engines.
+        aspect_ratio : float
+            Aspect ratio of the main wing.
+        thickness_ratio : float
+            Maximum thickness to chord ratio of the wing airfoils.
+        fuselage_volume : float
+            Volume of the main fuselage [m**3].
+        W_f : float, optional
+            Maximum fuel mass [kg]. Defaults to the mass computed by `FuelVolume_Weight`.
+        geometry : dict, optional
+            Aircraft geometry, to generate the flight vehicle on demand. Defaults to None.
+        """
+        self.s_ref = float(s_ref)
+        self.n_eng = int(n_eng)
+        self.aspect_ratio = float(aspect_ratio)
+        self.thickness_ratio = float(thickness_ratio)
+        self.fuselage_volume = float(fuselage_volume)
+        self.geometry = geometry
+        self.key = None if geometry is None else geometry_key(geometry)
+        self.W_f = self.fuel_capacity() if W_f is None else float(W_f)
+
+    @classmethod
+    def from_geometry(cls, geometry):
+        """
+        Get the summary of a geometry from the cache, generating it if needed.
+
+        Parameters
+        ----------
+        geometry : dict
+            Aircraft geometry (see `CreateAirplane`).
+
+        Returns
+        -------
+        VehicleSummary
+            Summary of the flight vehicle.
+        """
+        key = geometry_key(geometry)
+        summary = _SUMMARY_CACHE.get(key)
+        if summary is None:
+            vehicle = flight_vehicle(geometry)
+            summary = cls(
+                s_ref=vehicle.airplane.s_ref,
+                n_eng=vehicle.ag["n_eng"],
+                aspect_ratio=vehicle.airplane.wings[0].aspect_ratio(),
+                thickness_ratio=max(
+                    airfoil.max_thickness() for airfoil in vehicle.wing_airfoils
+                ),
+                fuselage_volume=vehicle.airplane.fuselages[0].volume(),
+                geometry=geometry,
+            )
+            _SUMMARY_CACHE[key] = summary
+        return summary
+
+    @property
+    def flight_vehicle(self):
+        """
+        CreateAirplane or None : Shared flight vehicle of the geometry, generated on first access.
+        """
+        if self.geometry is None:
+            return None
+        return flight_vehicle(self.geometry)
+
+    def fuel_capacity(self):
+        """
+        Compute the maximum fuel mass, in the wing and in a share of the fuselage.
+
+        Returns
+        -------
+        float
+            Maximum fuel mass [kg].
+        """
+        fuel_volume = FuelVolume_Weight("Fuel_VW")
+        fuel_volume.tau = self.thickness_ratio
+        fuel_volume.S = self.s_ref
+        fuel_volume.AR = self.aspect_ratio
+        fuel_volume.V_fuselage = self.fuselage_volume
+        fuel_volume.rho_f = self.FUEL_DENSITY
+        fuel_volume.V_f_fuse_ratio = self.FUSELAGE_FUEL_RATIO
+        fuel_volume.run_once()
+        return float(fuel_volume.W_f)
+
+    def to_dict(self):
+        """
+        Return the quantities of the summary, e.g. to store it with the results.
+
+        Returns
+        -------
+        dict
+            Keyword arguments of the summary, without the geometry.
+        """
+        return dict(
+            s_ref=self.s_ref,
+            n_eng=self.n_eng,
+            aspect_ratio=self.aspect_ratio,
+            thickness_ratio=self.thickness_ratio,
+            fuselage_volume=self.fuselage_volume,
+            W_f=self.W_f,
+        )
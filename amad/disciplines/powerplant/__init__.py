@@ -2,7 +2,8 @@
 
 Power Plant Estimation and Analysis
 """
-from amad.disciplines.powerplant import systems
+
+from amad.disciplines.powerplant import systems, tools
 
 
 def find_resources(filename: str = "") -> str:
@@ -26,4 +27,4 @@ def find_resources(filename: str = "") -> str:
     return fullpath
 
 
-__all__ = ["systems"]
+__all__ = ["systems", "tools"]
@@ -1,8 +1,28 @@
+from collections import namedtuple
 from cosapp.base import System
 import math
+import numpy as np
 from amad.tools.unit_conversion import m2ft
 from amad.tools.atmosBADA import AtmosphereAMAD
 
+# Mattingly model constants, shared by the CoSApp system and the array evaluation
+THR_REDUCTION = 0.008
+MODEL_COEFFS = {"k1": 0.6, "k2": 0.568, "k3": 0.25, "k4": 1.2}
+SFC_COEFFS = {"k1": 1.13 * 10**-5, "k2": 1.25 * 10**-5}
+RATING_FACTORS = {"MTO": 0.9, "MCT": 0.88, "MCLB": 0.8, "MCRZ": 0.75, "IDLE": 0.1}
+ANTI_ICE_BLEED_REDUCTIONS = {"OFF": 0.0, "LOW": 0.04, "MEDIUM": 0.06, "HIGH": 0.08}
+AIR_COND_BLEED_REDUCTIONS = {"OFF": 0.0, "LOW": 0.03, "MEDIUM": 0.05, "HIGH": 0.07}
+
+# Integer rating codes, index into RATINGS
+RATINGS = tuple(RATING_FACTORS)
+
+# ISA reference atmosphere for the array evaluation
+_ATMOS_ISA = AtmosphereAMAD(offset_deg=0.0)
+
+MattinglyPerformance = namedtuple(
+    "MattinglyPerformance", ["THR", "THR_Mattingly_max", "THR_Mattingly", "SFC"]
+)
+
 
 class EnginePerfoMattingly(System):
     """
@@ -101,26 +121,19 @@ class EnginePerfoMattingly(System):
 
         # constants
         self.add_property(
-            "thr_reduction", 0.008
+            "thr_reduction", THR_REDUCTION
         )  # Thrust Reduction percentage due to ISA Temperature deviation
         self.add_property(
-            "model_coeffs", {"k1": 0.6, "k2": 0.568, "k3": 0.25, "k4": 1.2}
+            "model_coeffs", dict(MODEL_COEFFS)
         )  # Mattingly engine model coefficients
         self.add_property(
-            "sfc_coeffs", {"k1": 1.13 * 10**-5, "k2": 1.25 * 10**-5}
+            "sfc_coeffs", dict(SFC_COEFFS)
         )  # Mattingly scpecific fuel flow coefficients
         self.add_property(
-            "rating_factors",
-            {"MTO": 0.9, "MCT": 0.88, "MCLB": 0.8, "MCRZ": 0.75, "IDLE": 0.1},
+            "rating_factors", dict(RATING_FACTORS)
         )  # Mattingly engine rating factors
-        self.add_property(
-            "anti_ice_bleed_reductions",
-            {"OFF": 0.0, "LOW": 0.04, "MEDIUM": 0.06, "HIGH": 0.08},
-        )
-        self.add_property(
-            "air_cond_bleed_reductions",
-            {"OFF": 0.0, "LOW": 0.03, "MEDIUM": 0.05, "HIGH": 0.07},
-        )
+        self.add_property("anti_ice_bleed_reductions", dict(ANTI_ICE_BLEED_REDUCTIONS))
+        self.add_property("air_cond_bleed_reductions", dict(AIR_COND_BLEED_REDUCTIONS))
 
         # local computed values
         self.add_property("atmos_ISA", AtmosphereAMAD(offset_deg=0.0))
@@ -212,3 +225,205 @@ class EnginePerfoMattingly(System):
             * sqrt_teta
             * self.f_eng_efficiency
         )
+
+    def evaluate_arrays(
+        self, z_altitude, mach_current, rating_eng=None, temp_delta_ISA=None
+    ):
+        """
+        Evaluate the Mattingly model of this engine over arrays of flight points.
+
+        The engine settings (`thrust_eng`, `f_eng_efficiency`, `anti_ice`,
+        `air_cond`) and coefficients are taken from the system; the system
+        itself is neither run nor modified.
+
+        Parameters
+        ----------
+        z_altitude : array_like
+            Altitude [m].
+        mach_current : array_like
+            Mach number [-].
+        rating_eng : str or array_like, optional
+            Engine rating names or integer codes (index into `RATINGS`). Defaults to `rating_eng`.
+        temp_delta_ISA : array_like, optional
+            Delta ISA temperature [K]. Defaults to `temp_delta_ISA`.
+
+        Returns
+        -------
+        MattinglyPerformance
+            Named tuple of arrays `(THR, THR_Mattingly_max, THR_Mattingly, SFC)`.
+        """
+        return mattingly_performance(
+            z_altitude,
+            mach_current,
+            rating_eng=self.rating_eng if rating_eng is None else rating_eng,
+            temp_delta_ISA=(
+                self.temp_delta_ISA if temp_delta_ISA is None else temp_delta_ISA
+            ),
+            thrust_eng=self.thrust_eng,
+            f_eng_efficiency=self.f_eng_efficiency,
+            anti_ice=self.anti_ice,
+            air_cond=self.air_cond,
+            thr_reduction=self.thr_reduction,
+            model_coeffs=self.model_coeffs,
+            sfc_coeffs=self.sfc_coeffs,
+            rating_factors=self.rating_factors,
+            anti_ice_bleed_reductions=self.anti_ice_bleed_reductions,
+            air_cond_bleed_reductions=self.air_cond_bleed_reductions,
+        )
+
+
+def rating_codes(rating_eng, rating_factors=RATING_FACTORS):
+    """
+    Convert engine rating names into integer rating codes.
+
+    Parameters
+    ----------
+    rating_eng : str or array_like
+        Engine rating names (e.g. 'MCRZ') or integer codes.
+    rating_factors : dict, optional
+        Rating factors defining the rating order. Defaults to `RATING_FACTORS`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer rating codes, index into the rating factors keys.
+
+    Raises
+    ------
+    KeyError
+        If a rating name is unknown.
+    ValueError
+        If a rating code is not in `[0, len(rating_factors))`.
+    """
+    rating_eng = np.asarray(rating_eng)
+    if np.issubdtype(rating_eng.dtype, np.integer):
+        invalid = (rating_eng < 0) | (rating_eng >= len(rating_factors))
+        if np.any(invalid):
+            raise ValueError(
+                f"Engine rating code(s) {np.unique(rating_eng[invalid]).tolist()} out of range "
+                f"[0, {len(rating_factors)})"
+            )
+        return rating_eng
+
+    names = list(rating_factors)
+    unique_ratings, inverse = np.unique(rating_eng, return_inverse=True)
+    unique_codes = np.array(
+        [names.index(str(r)) if str(r) in names else -1 for r in unique_ratings]
+    )
+    if np.any(unique_codes < 0):
+        raise KeyError(f"Unknown engine rating(s) {unique_ratings[unique_codes < 0]}")
+    return unique_codes[inverse].reshape(rating_eng.shape)
+
+
+def mattingly_performance(
+    z_altitude,
+    mach_current,
+    rating_eng="MCT",
+    temp_delta_ISA=0.0,
+    thrust_eng=121000.0,
+    f_eng_efficiency=1.0,
+    anti_ice="OFF",
+    air_cond="OFF",
+    thr_reduction=THR_REDUCTION,
+    model_coeffs=MODEL_COEFFS,
+    sfc_coeffs=SFC_COEFFS,
+    rating_factors=RATING_FACTORS,
+    anti_ice_bleed_reductions=ANTI_ICE_BLEED_REDUCTIONS,
+    air_cond_bleed_reductions=AIR_COND_BLEED_REDUCTIONS,
+):
+    """
+    Evaluate the Mattingly thrust and SFC model over arrays in one NumPy pass.
+
+    This is the array counterpart of `EnginePerfoMattingly.compute`: all
+    flight point inputs are broadcast against each other, so full engine maps
+    or thousands of mission points are evaluated without instantiating any
+    CoSApp system.
+
+    Parameters
+    ----------
+    z_altitude : array_like
+        Altitude [m].
+    mach_current : array_like
+        Mach number [-].
+    rating_eng : str or array_like, optional
+        Engine rating names or integer codes (index into `RATINGS`). Defaults to 'MCT'.
+    temp_delta_ISA : array_like, optional
+        Delta ISA temperature [K]. Defaults to 0.
+    thrust_eng : float, optional
+        Maximum given thrust [N]. Defaults to 121000.
+    f_eng_efficiency : float, optional
+        Engine efficiency factor. Defaults to 1.
+    anti_ice : str, optional
+        Anti-ice setting. Defaults to 'OFF'.
+    air_cond : str, optional
+        Air conditioning setting. Defaults to 'OFF'.
+    thr_reduction : float, optional
+        Thrust reduction per K above the kink point. Defaults to `THR_REDUCTION`.
+    model_coeffs : dict, optional
+        Mattingly thrust coefficients. Defaults to `MODEL_COEFFS`.
+    sfc_coeffs : dict, optional
+        Mattingly SFC coefficients. Defaults to `SFC_COEFFS`.
+    rating_factors : dict, optional
+        Engine rating factors. Defaults to `RATING_FACTORS`.
+    anti_ice_bleed_reductions : dict, optional
+        Thrust reductions per anti-ice setting. Defaults to `ANTI_ICE_BLEED_REDUCTIONS`.
+    air_cond_bleed_reductions : dict, optional
+        Thrust reductions per air conditioning setting. Defaults to `AIR_COND_BLEED_REDUCTIONS`.
+
+    Returns
+    -------
+    MattinglyPerformance
+        Named tuple of arrays `(THR, THR_Mattingly_max, THR_Mattingly, SFC)` with the broadcast shape of the inputs.
+    """
+    z_altitude = np.asarray(z_altitude, dtype=float)
+    mach_current = np.asarray(mach_current, dtype=float)
+    temp_delta_ISA = np.asarray(temp_delta_ISA, dtype=float)
+    factors = np.array(list(rating_factors.values()))[
+        rating_codes(rating_eng, rating_factors)
+    ]
+
+    altitude_ft = m2ft(z_altitude)
+
+    # dISA-specific properties
+    temp_ALT_ISA_DEGC = _ATMOS_ISA.airtemp_k_array(z_altitude) - 273.15
+    temp_ALT_dISA = _ATMOS_ISA.airtemp_k_array(z_altitude, temp_delta_ISA)
+    relative_density = _ATMOS_ISA.airdens_kgpm3_array(
+        z_altitude, temp_delta_ISA
+    ) / _ATMOS_ISA.airdens_kgpm3_array(0.0, temp_delta_ISA)
+
+    # temperature abatement
+    T_ref = -0.002 * altitude_ft + 30.0
+    dISA_ref = T_ref - temp_ALT_ISA_DEGC
+    THR = np.where(
+        temp_delta_ISA > dISA_ref,
+        thrust_eng * (1.0 - (thr_reduction * (temp_delta_ISA - dISA_ref))),
+        thrust_eng,
+    )
+
+    # max thrust at altitude
+    THR_Mattingly_max = (
+        THR
+        * relative_density ** model_coeffs["k1"]
+        * (
+            model_coeffs["k2"]
+            + model_coeffs["k3"] * (model_coeffs["k4"] - mach_current) ** 3.0
+        )
+    )
+
+    # rating and bleed integration
+    bleed_abatement = (
+        anti_ice_bleed_reductions[anti_ice] + air_cond_bleed_reductions[air_cond]
+    )
+    THR_Mattingly = (1.0 - bleed_abatement) * THR_Mattingly_max * factors
+
+    # Mattingly SFC calculation
+    Tref = _ATMOS_ISA.T0 + temp_delta_ISA
+    SFC = (
+        (sfc_coeffs["k1"] + sfc_coeffs["k2"] * mach_current)
+        * np.sqrt(temp_ALT_dISA / Tref)
+        * f_eng_efficiency
+    )
+
+    return MattinglyPerformance(
+        *np.broadcast_arrays(THR, THR_Mattingly_max, THR_Mattingly, SFC)
+    )
@@ -1,5 +1,11 @@
+import numpy as np
 import pytest
 from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+from amad.disciplines.powerplant.systems.enginePerfoMattingly import (
+    RATINGS,
+    mattingly_performance,
+    rating_codes,
+)
 from amad.tools.unit_conversion import ft2m
 
 
@@ -30,6 +36,7 @@ def factory():
     EnginePerfoMattingly
         An instance of the EnginePerfoMattingly class initialized with the given parameters.
     """
+
     def factory_impl(dISA, Mach, altitude, max_thrust, rating, anti_ice, air_cond):
         """
         Create an instance of the EnginePerfoMattingly class.
@@ -167,3 +174,89 @@ def test_enginePerfo_run_once(
     assert THR == pytest.approx(expected_THR, rel=1e-5)
     assert THR_Mattingly == pytest.approx(expected_THR_Mattingly, rel=1e-4)
     assert CSR_Mattingly == pytest.approx(expected_CSR_Mattingly, rel=1e-4)
+
+
+@pytest.mark.parametrize("anti_ice, air_cond", [("OFF", "OFF"), ("HIGH", "LOW")])
+def test_enginePerfo_evaluate_arrays(factory, anti_ice, air_cond):
+    """
+    Test the array evaluation of the Mattingly model against `run_once`.
+
+    Parameters
+    ----------
+    factory : function
+        The function for creating an engine model.
+    anti_ice : str
+        The status of the anti-ice system.
+    air_cond : str
+        The status of the air conditioning system.
+
+    Raises
+    ------
+    AssertionError
+        If any array result differs from the single point computation.
+    """
+    altitudes = np.array([0.0, ft2m(10000.0), ft2m(30000.0), ft2m(40000.0)])
+    machs = np.array([0.1, 0.45, 0.8])
+    disas = np.array([-10.0, 0.0, 20.0, 40.0])
+    ratings = np.array(RATINGS)
+
+    alt, mach, disa, rating = np.meshgrid(
+        altitudes, machs, disas, ratings, indexing="ij"
+    )
+    enginemodel = factory(0.0, 0.1, 0.0, 130410.0, "MCT", anti_ice, air_cond)
+    perfo = enginemodel.evaluate_arrays(alt, mach, rating, disa)
+    perfo_codes = mattingly_performance(
+        alt,
+        mach,
+        rating_codes(rating),
+        disa,
+        thrust_eng=130410.0,
+        anti_ice=anti_ice,
+        air_cond=air_cond,
+    )
+
+    assert perfo.THR_Mattingly.shape == alt.shape
+    assert perfo_codes.THR_Mattingly.ravel() == pytest.approx(
+        perfo.THR_Mattingly.ravel(), rel=1e-12
+    )
+
+    for index in np.ndindex(alt.shape):
+        enginemodel = factory(
+            disa[index],
+            mach[index],
+            alt[index],
+            130410.0,
+            rating[index],
+            anti_ice,
+            air_cond,
+        )
+        enginemodel.run_once()
+        assert perfo.THR[index] == pytest.approx(enginemodel.THR, rel=1e-12)
+        assert perfo.THR_Mattingly_max[index] == pytest.approx(
+            enginemodel.THR_Mattingly_max, rel=1e-12
+        )
+        assert perfo.THR_Mattingly[index] == pytest.approx(
+            enginemodel.THR_Mattingly, rel=1e-12
+        )
+        assert perfo.SFC[index] == pytest.approx(enginemodel.SFC, rel=1e-12)
+
+
+def test_rating_codes():
+    """
+    Test the conversion of engine rating names into integer codes.
+
+    Raises
+    ------
+    AssertionError
+        If the codes are wrong, or an unknown rating or out-of-range code is accepted.
+    """
+    assert rating_codes(["MCRZ", "MTO", "IDLE", "MCRZ"]).tolist() == [3, 0, 4, 3]
+    assert rating_codes("MCLB") == 2
+    assert rating_codes(np.array([4, 0])).tolist() == [4, 0]
+    with pytest.raises(KeyError):
+        rating_codes(["MCRZ", "TOGA"])
+    for codes in ([0, 5], -1):
+        with pytest.raises(ValueError, match=r"\[-?\d\] out of range \[0, 5\)"):
+            rating_codes(np.array(codes))
+    with pytest.raises(ValueError, match="out of range"):
+        mattingly_performance(10000.0, 0.78, rating_eng=np.array([3, 7]))
@@ -0,0 +1,281 @@
+import abc
+import numpy as np
+from amad.disciplines.powerplant.systems.enginePerfoMattingly import (
+    mattingly_performance,
+)
+
+
+def engine_settings(engine):
+    """
+    Collect the settings of an engine system defining its performance.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine performance system.
+
+    Returns
+    -------
+    dict
+        Engine settings and model coefficients.
+    """
+    return {
+        "thrust_eng": float(engine.thrust_eng),
+        "f_eng_efficiency": float(engine.f_eng_efficiency),
+        "anti_ice": engine.anti_ice,
+        "air_cond": engine.air_cond,
+        "thr_reduction": engine.thr_reduction,
+        "model_coeffs": dict(engine.model_coeffs),
+        "sfc_coeffs": dict(engine.sfc_coeffs),
+        "rating_factors": dict(engine.rating_factors),
+        "anti_ice_bleed_reductions": dict(engine.anti_ice_bleed_reductions),
+        "air_cond_bleed_reductions": dict(engine.air_cond_bleed_reductions),
+    }
+
+
+class EngineBackend:
+    """
+    Engine performance backend used by the performance segments and `CruiseFuel`.
+
+    A backend evaluates the thrust and SFC per engine for batches of flight
+    points; scalar inputs return floats, array inputs are broadcast against
+    each other and return arrays.
+    """
+
+    @abc.abstractmethod
+    def evaluate(self, alt, mach, rating="MCT", disa=0.0):
+        """
+        Evaluate the rated thrust and SFC per engine.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        rating : str, int or array_like, optional
+            Engine rating names or codes. Defaults to 'MCT'.
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        tuple
+            Thrust per engine [N] and SFC [kg/(s*N)].
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that must be implemented by a subclass.
+        """
+        pass
+
+    @abc.abstractmethod
+    def max_thrust(self, alt, mach, disa=0.0):
+        """
+        Evaluate the maximum thrust per engine, used with a throttle setting.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Maximum thrust per engine [N].
+
+        Raises
+        ------
+        NotImplementedError
+            This is an abstract method that must be implemented by a subclass.
+        """
+        pass
+
+
+class MattinglyBackend(EngineBackend):
+    """
+    Engine backend evaluating the Mattingly model directly.
+
+    Attributes
+    ----------
+    settings : dict
+        Keyword arguments of `mattingly_performance` (thrust_eng, f_eng_efficiency, coefficients, ...).
+    """
+
+    def __init__(self, **settings):
+        """
+        Initialise the backend.
+
+        Parameters
+        ----------
+        **settings
+            Keyword arguments of `mattingly_performance`, defaults are used for the missing ones.
+        """
+        self.settings = settings
+
+    @classmethod
+    def from_engine(cls, engine):
+        """
+        Create a backend with the current settings of an engine system.
+
+        Parameters
+        ----------
+        engine : EnginePerfoMattingly
+            Engine performance system.
+
+        Returns
+        -------
+        MattinglyBackend
+            The engine backend.
+        """
+        return cls(**engine_settings(engine))
+
+    def _performance(self, alt, mach, rating, disa):
+        """
+        Run the vectorised Mattingly model.
+
+        Parameters
+        ----------
+        alt, mach, rating, disa : float or array_like
+            Flight points.
+
+        Returns
+        -------
+        MattinglyPerformance
+            Model outputs.
+        """
+        return mattingly_performance(
+            alt, mach, rating_eng=rating, temp_delta_ISA=disa, **self.settings
+        )
+
+    def evaluate(self, alt, mach, rating="MCT", disa=0.0):
+        """
+        Evaluate the rated thrust and SFC per engine.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        rating : str, int or array_like, optional
+            Engine rating names or codes. Defaults to 'MCT'.
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        tuple
+            Thrust per engine [N] and SFC [kg/(s*N)], floats for scalar inputs.
+        """
+        perfo = self._performance(alt, mach, rating, disa)
+        if np.ndim(perfo.THR_Mattingly) == 0:
+            return float(perfo.THR_Mattingly), float(perfo.SFC)
+        return perfo.THR_Mattingly, perfo.SFC
+
+    def max_thrust(self, alt, mach, disa=0.0):
+        """
+        Evaluate the maximum thrust per engine (before rating and bleeds).
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Maximum thrust per engine [N].
+        """
+        thrust_max = self._performance(alt, mach, "MCT", disa).THR_Mattingly_max
+        if np.ndim(thrust_max) == 0:
+            return float(thrust_max)
+        return thrust_max
+
+
+class SurrogateBackend(EngineBackend):
+    """
+    Engine backend wrapping user functions, e.g. a fitted surrogate model.
+
+    Attributes
+    ----------
+    evaluate_function : callable
+        Function `(alt, mach, rating, disa) -> (thrust, sfc)` per engine.
+    max_thrust_function : callable or None
+        Function `(alt, mach, disa) -> thrust_max` per engine.
+    """
+
+    def __init__(self, evaluate_function, max_thrust_function=None):
+        """
+        Initialise the backend.
+
+        Parameters
+        ----------
+        evaluate_function : callable
+            Function `(alt, mach, rating, disa) -> (thrust, sfc)` per engine.
+        max_thrust_function : callable, optional
+            Function `(alt, mach, disa) -> thrust_max` per engine, only
+            needed by throttle-driven segments (descent). Defaults to None.
+        """
+        self.evaluate_function = evaluate_function
+        self.max_thrust_function = max_thrust_function
+
+    def evaluate(self, alt, mach, rating="MCT", disa=0.0):
+        """
+        Evaluate the rated thrust and SFC per engine with the user function.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        rating : str, int or array_like, optional
+            Engine rating names or codes. Defaults to 'MCT'.
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        tuple
+            Thrust per engine [N] and SFC [kg/(s*N)].
+        """
+        return self.evaluate_function(alt, mach, rating, disa)
+
+    def max_thrust(self, alt, mach, disa=0.0):
+        """
+        Evaluate the maximum thrust per engine with the user function.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Maximum thrust per engine [N].
+
+        Raises
+        ------
+        NotImplementedError
+            If no maximum thrust function was given.
+        """
+        if self.max_thrust_function is None:
+            raise NotImplementedError(
+                "This surrogate engine backend has no maximum thrust function"
+            )
+        return self.max_thrust_function(alt, mach, disa)
@@ -0,0 +1,494 @@
+import bisect
+import hashlib
+import json
+import os
+import numpy as np
+from amad.disciplines.powerplant.systems.enginePerfoMattingly import rating_codes
+from amad.disciplines.powerplant.tools.engineBackend import (
+    EngineBackend,
+    engine_settings,
+)
+
+# Default deck grid, the tropopause (11000 m) is a grid node
+DECK_ALTITUDES = np.arange(0.0, 13000.0 + 1.0, 250.0)
+DECK_MACHS = np.arange(0.0, 0.9 + 1e-9, 0.02)
+DECK_DISAS = np.arange(-20.0, 40.0 + 1.0, 5.0)
+
+# Decks already generated during the session, keyed by engine settings and grid
+_DECK_CACHE = {}
+
+
+def deck_key(settings, altitudes, machs, disas):
+    """
+    Hash identifying a deck from its engine settings and grid.
+
+    Parameters
+    ----------
+    settings : dict
+        Engine settings (see `engine_settings`).
+    altitudes, machs, disas : array_like
+        Deck grid [m], [-], [K].
+
+    Returns
+    -------
+    str
+        Deck key.
+    """
+    content = dict(
+        settings,
+        altitudes=np.asarray(altitudes, dtype=float).tolist(),
+        machs=np.asarray(machs, dtype=float).tolist(),
+        disas=np.asarray(disas, dtype=float).tolist(),
+    )
+    return hashlib.sha1(json.dumps(content, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _locate(grid, x):
+    """
+    Find the interpolation interval and weight of values in a grid.
+
+    Values outside of the grid are clipped to its bounds.
+
+    Parameters
+    ----------
+    grid : numpy.ndarray
+        Strictly increasing grid.
+    x : numpy.ndarray
+        Values to locate.
+
+    Returns
+    -------
+    tuple
+        Lower node indices and linear weights of the upper node.
+    """
+    x = np.clip(x, grid[0], grid[-1])
+    i = np.clip(np.searchsorted(grid, x, side="right") - 1, 0, len(grid) - 2)
+    w = (x - grid[i]) / (grid[i + 1] - grid[i])
+    return i, w
+
+
+def _locate_scalar(grid, x):
+    """
+    Scalar counterpart of `_locate`, on a grid given as a list of floats.
+
+    Parameters
+    ----------
+    grid : list of float
+        Strictly increasing grid.
+    x : float
+        Value to locate.
+
+    Returns
+    -------
+    tuple
+        Lower node index and linear weight of the upper node.
+    """
+    x = min(max(x, grid[0]), grid[-1])
+    i = min(max(bisect.bisect_right(grid, x) - 1, 0), len(grid) - 2)
+    return i, (x - grid[i]) / (grid[i + 1] - grid[i])
+
+
+class EngineDeck(EngineBackend):
+    """
+    Tabulated engine deck backend with fast multilinear lookup.
+
+    Thrust and SFC of an `EnginePerfoMattingly` engine are precomputed over
+    altitude x Mach x rating x delta ISA, stored in a compressed `.npz` file
+    and interpolated linearly in altitude, Mach and delta ISA; the rating is
+    an exact table index. Lookups outside of the grid are clipped to its bounds.
+
+    A deck is a snapshot of the engine settings it was generated with: it keeps
+    no reference to the engine system and does not follow later changes of e.g.
+    `thrust_eng`. The caller must check `is_valid_for` and get a new deck with
+    `from_engine` before running segments with changed engine settings.
+
+    Attributes
+    ----------
+    altitudes, machs, disas : numpy.ndarray
+        Deck grid [m], [-], [K].
+    ratings : tuple
+        Engine ratings, the table index of a rating is its rating code.
+    thrust : numpy.ndarray
+        Rated thrust per engine `THR_Mattingly` [N], shape (rating, altitude, Mach, dISA).
+    sfc : numpy.ndarray
+        Specific fuel consumption [kg/(s*N)], same shape as `thrust`.
+    thrust_max : numpy.ndarray
+        Maximum thrust per engine `THR_Mattingly_max` [N], shape (altitude, Mach, dISA).
+    settings : dict
+        Engine settings and coefficients the deck was generated with.
+    key : str
+        Hash of the settings and grid, used to invalidate cached decks.
+    """
+
+    def __init__(
+        self, altitudes, machs, disas, ratings, thrust, sfc, thrust_max, settings
+    ):
+        """
+        Initialise the deck from its tables.
+
+        Parameters
+        ----------
+        altitudes, machs, disas : array_like
+            Deck grid [m], [-], [K].
+        ratings : sequence of str
+            Engine ratings.
+        thrust, sfc : array_like
+            Tables of shape (rating, altitude, Mach, dISA).
+        thrust_max : array_like
+            Table of shape (altitude, Mach, dISA).
+        settings : dict
+            Engine settings the tables were generated with.
+        """
+        self.altitudes = np.asarray(altitudes, dtype=float)
+        self.machs = np.asarray(machs, dtype=float)
+        self.disas = np.asarray(disas, dtype=float)
+        self.ratings = tuple(ratings)
+        self.thrust = np.asarray(thrust, dtype=float)
+        self.sfc = np.asarray(sfc, dtype=float)
+        self.thrust_max = np.asarray(thrust_max, dtype=float)
+        self.settings = settings
+        self.key = deck_key(settings, self.altitudes, self.machs, self.disas)
+        # Per-step lookups of the segments are scalar, kept off NumPy
+        self._grids = (
+            self.altitudes.tolist(),
+            self.machs.tolist(),
+            self.disas.tolist(),
+        )
+        self._rating_index = {rating: code for code, rating in enumerate(self.ratings)}
+
+    @classmethod
+    def generate(
+        cls, engine, altitudes=DECK_ALTITUDES, machs=DECK_MACHS, disas=DECK_DISAS
+    ):
+        """
+        Generate the deck of an engine with the vectorised Mattingly model.
+
+        Parameters
+        ----------
+        engine : EnginePerfoMattingly
+            Engine performance system providing settings and coefficients.
+        altitudes, machs, disas : array_like, optional
+            Deck grid [m], [-], [K]. Defaults to `DECK_ALTITUDES`, `DECK_MACHS`, `DECK_DISAS`.
+
+        Returns
+        -------
+        EngineDeck
+            The generated deck.
+        """
+        ratings = tuple(engine.rating_factors)
+        codes = np.arange(len(ratings))
+        rating, alt, mach, disa = np.meshgrid(
+            codes, altitudes, machs, disas, indexing="ij"
+        )
+        perfo = engine.evaluate_arrays(alt, mach, rating, disa)
+
+        return cls(
+            altitudes,
+            machs,
+            disas,
+            ratings,
+            perfo.THR_Mattingly,
+            perfo.SFC,
+            perfo.THR_Mattingly_max[0],
+            engine_settings(engine),
+        )
+
+    @classmethod
+    def from_engine(
+        cls,
+        engine,
+        altitudes=DECK_ALTITUDES,
+        machs=DECK_MACHS,
+        disas=DECK_DISAS,
+        cache_dir=None,
+    ):
+        """
+        Get the deck of an engine from the cache, generating it if needed.
+
+        Decks are cached in memory and, if `cache_dir` is given, on disk.
+        The cache key covers the grid and every engine setting and coefficient,
+        so changing e.g. `thrust_eng` or `f_eng_efficiency` yields a new deck.
+
+        Parameters
+        ----------
+        engine : EnginePerfoMattingly
+            Engine performance system providing settings and coefficients.
+        altitudes, machs, disas : array_like, optional
+            Deck grid [m], [-], [K]. Defaults to `DECK_ALTITUDES`, `DECK_MACHS`, `DECK_DISAS`.
+        cache_dir : str, optional
+            Directory of the deck files. Defaults to None (memory cache only).
+
+        Returns
+        -------
+        EngineDeck
+            The engine deck.
+        """
+        key = deck_key(engine_settings(engine), altitudes, machs, disas)
+        deck = _DECK_CACHE.get(key)
+
+        filename = None
+        if cache_dir is not None:
+            filename = os.path.join(cache_dir, f"engine_deck_{key}.npz")
+
+        if deck is None and filename is not None and os.path.exists(filename):
+            deck = cls.load(filename)
+        if deck is None:
+            deck = cls.generate(engine, altitudes, machs, disas)
+        if filename is not None and not os.path.exists(filename):
+            os.makedirs(cache_dir, exist_ok=True)
+            deck.save(filename)
+
+        _DECK_CACHE[key] = deck
+        return deck
+
+    def is_valid_for(self, engine):
+        """
+        Check that the deck was generated with the current settings of an engine.
+
+        Parameters
+        ----------
+        engine : EnginePerfoMattingly
+            Engine performance system.
+
+        Returns
+        -------
+        bool
+            True if the engine settings and coefficients are unchanged.
+        """
+        return self.key == deck_key(
+            engine_settings(engine), self.altitudes, self.machs, self.disas
+        )
+
+    def save(self, filename):
+        """
+        Save the deck into a compressed `.npz` file.
+
+        Tables are saved in double precision, so a deck loaded from the disk
+        cache gives the same results as a freshly generated one.
+
+        Parameters
+        ----------
+        filename : str
+            File name with path.
+
+        Returns
+        -------
+        None
+        """
+        np.savez_compressed(
+            filename,
+            altitudes=self.altitudes,
+            machs=self.machs,
+            disas=self.disas,
+            ratings=np.array(self.ratings),
+            thrust=self.thrust,
+            sfc=self.sfc,
+            thrust_max=self.thrust_max,
+            settings=json.dumps(self.settings),
+        )
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a deck from a `.npz` file written by `save`.
+
+        Parameters
+        ----------
+        filename : str
+            File name with path.
+
+        Returns
+        -------
+        EngineDeck
+            The loaded deck.
+        """
+        with np.load(filename) as data:
+            return cls(
+                data["altitudes"],
+                data["machs"],
+                data["disas"],
+                [str(r) for r in data["ratings"]],
+                data["thrust"],
+                data["sfc"],
+                data["thrust_max"],
+                json.loads(str(data["settings"])),
+            )
+
+    def _interpolate(self, tables, alt, mach, disa):
+        """
+        Trilinear interpolation of tables in altitude, Mach and delta ISA.
+
+        Parameters
+        ----------
+        tables : list of numpy.ndarray
+            Tables of shape (..., altitude, Mach, dISA), already indexed on leading axes.
+        alt, mach, disa : numpy.ndarray
+            Broadcast flight point values.
+
+        Returns
+        -------
+        list of numpy.ndarray
+            Interpolated values for each table.
+        """
+        i, wi = _locate(self.altitudes, alt)
+        j, wj = _locate(self.machs, mach)
+        k, wk = _locate(self.disas, disa)
+
+        results = []
+        for table in tables:
+            value = 0.0
+            for di, fi in ((0, 1.0 - wi), (1, wi)):
+                for dj, fj in ((0, 1.0 - wj), (1, wj)):
+                    for dk, fk in ((0, 1.0 - wk), (1, wk)):
+                        value = value + fi * fj * fk * table(i + di, j + dj, k + dk)
+            results.append(value)
+        return results
+
+    def _interpolate_scalar(self, tables, alt, mach, disa):
+        """
+        Scalar counterpart of `_interpolate`, on tables of shape (altitude, Mach, dISA).
+
+        Parameters
+        ----------
+        tables : list of numpy.ndarray
+            Tables of shape (altitude, Mach, dISA).
+        alt, mach, disa : float
+            Flight point values.
+
+        Returns
+        -------
+        list of float
+            Interpolated values for each table.
+        """
+        i, wi = _locate_scalar(self._grids[0], alt)
+        j, wj = _locate_scalar(self._grids[1], mach)
+        k, wk = _locate_scalar(self._grids[2], disa)
+        weights = (
+            (1.0 - wj) * (1.0 - wk),
+            (1.0 - wj) * wk,
+            wj * (1.0 - wk),
+            wj * wk,
+        )
+
+        results = []
+        for table in tables:
+            cells = table[i : i + 2, j : j + 2, k : k + 2].ravel().tolist()
+            low = sum(w * c for w, c in zip(weights, cells[:4]))
+            high = sum(w * c for w, c in zip(weights, cells[4:]))
+            results.append((1.0 - wi) * low + wi * high)
+        return results
+
+    def evaluate(self, alt, mach, rating="MCT", disa=0.0):
+        """
+        Look up the rated thrust and SFC per engine.
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        rating : str, int or array_like, optional
+            Engine rating names or codes. Defaults to 'MCT'.
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        tuple
+            Thrust per engine [N] and SFC [kg/(s*N)], floats for scalar inputs.
+        """
+        if (
+            isinstance(rating, str)
+            and np.ndim(alt) == 0
+            and np.ndim(mach) == 0
+            and np.ndim(disa) == 0
+        ):
+            code = self._rating_index[rating]
+            thrust, sfc = self._interpolate_scalar(
+                [self.thrust[code], self.sfc[code]],
+                float(alt),
+                float(mach),
+                float(disa),
+            )
+            return thrust, sfc
+
+        codes = rating_codes(rating, dict.fromkeys(self.ratings))
+        alt, mach, codes, disa = np.broadcast_arrays(
+            np.asarray(alt, dtype=float), np.asarray(mach, dtype=float), codes, disa
+        )
+        thrust, sfc = self._interpolate(
+            [
+                lambda i, j, k: self.thrust[codes, i, j, k],
+                lambda i, j, k: self.sfc[codes, i, j, k],
+            ],
+            alt,
+            mach,
+            disa,
+        )
+        if np.ndim(thrust) == 0:
+            return float(thrust), float(sfc)
+        return thrust, sfc
+
+    def max_thrust(self, alt, mach, disa=0.0):
+        """
+        Look up the maximum thrust per engine (before rating and bleeds).
+
+        Parameters
+        ----------
+        alt : float or array_like
+            Altitude [m].
+        mach : float or array_like
+            Mach number [-].
+        disa : float or array_like, optional
+            Delta ISA temperature [K]. Defaults to 0.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            Maximum thrust per engine [N].
+        """
+        if np.ndim(alt) == 0 and np.ndim(mach) == 0 and np.ndim(disa) == 0:
+            (thrust_max,) = self._interpolate_scalar(
+                [self.thrust_max], float(alt), float(mach), float(disa)
+            )
+            return thrust_max
+
+        alt, mach, disa = np.broadcast_arrays(
+            np.asarray(alt, dtype=float), np.asarray(mach, dtype=float), disa
+        )
+        (thrust_max,) = self._interpolate(
+            [lambda i, j, k: self.thrust_max[i, j, k]], alt, mach, disa
+        )
+        if np.ndim(thrust_max) == 0:
+            return float(thrust_max)
+        return thrust_max
+
+
+if __name__ == "__main__":
+    import time
+    from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+
+    engine = EnginePerfoMattingly("engine")
+    deck = EngineDeck.from_engine(engine)
+
+    engine.z_altitude = 9000.0
+    engine.mach_current = 0.78
+    engine.rating_eng = "MCLB"
+    n_points = 1000
+
+    start_time = time.perf_counter()
+    for _ in range(n_points):
+        engine.run_once()
+    time_system = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(n_points):
+        deck.evaluate(9000.0, 0.78, "MCLB")
+    time_deck = time.perf_counter() - start_time
+
+    print(f"system: THR={engine.THR_Mattingly:.1f}N SFC={engine.SFC:.4e}")
+    print("deck:   THR={:.1f}N SFC={:.4e}".format(*deck.evaluate(9000.0, 0.78, "MCLB")))
+    print(
+        f"time system:{1e6 * time_system / n_points:.1f}us/point time deck:{1e6 * time_deck / n_points:.1f}us/point"
+    )
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+from amad.disciplines.powerplant.tools.engineBackend import (
+    EngineBackend,
+    MattinglyBackend,
+    SurrogateBackend,
+)
+from amad.disciplines.powerplant.tools.engineDeck import EngineDeck
+
+
+@pytest.fixture
+def engine():
+    """
+    Create an engine performance system with non default settings.
+
+    Returns
+    -------
+    EnginePerfoMattingly
+        The engine performance system.
+    """
+    engine = EnginePerfoMattingly("engine")
+    engine.thrust_eng = 110000.0
+    engine.f_eng_efficiency = 0.97
+    return engine
+
+
+@pytest.mark.parametrize("rating", ["MTO", "MCLB", "IDLE"])
+@pytest.mark.parametrize(
+    "altitude, mach, dISA", [(0.0, 0.2, 0.0), (9144.0, 0.78, 10.0)]
+)
+def test_mattingly_backend_matches_system(engine, rating, altitude, mach, dISA):
+    """
+    Test that the Mattingly backend matches the `EnginePerfoMattingly` system.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+    rating : str
+        Engine rating.
+    altitude : float
+        Altitude [m].
+    mach : float
+        Mach number [-].
+    dISA : float
+        Delta ISA temperature [K].
+
+    Raises
+    ------
+    AssertionError
+        If the backend outputs differ from the system outputs.
+    """
+    backend = MattinglyBackend.from_engine(engine)
+
+    engine.z_altitude = altitude
+    engine.mach_current = mach
+    engine.temp_delta_ISA = dISA
+    engine.rating_eng = rating
+    engine.run_once()
+
+    thrust, sfc = backend.evaluate(altitude, mach, rating, dISA)
+    assert isinstance(thrust, float)
+    assert thrust == pytest.approx(engine.THR_Mattingly, rel=1e-12)
+    assert sfc == pytest.approx(engine.SFC, rel=1e-12)
+    assert backend.max_thrust(altitude, mach, dISA) == pytest.approx(
+        engine.THR_Mattingly_max, rel=1e-12
+    )
+
+
+@pytest.mark.parametrize("backend_type", ["mattingly", "deck"])
+def test_backends_batch_evaluate(engine, backend_type):
+    """
+    Test that the backends evaluate batches of flight points consistently.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+    backend_type : str
+        Backend to test.
+
+    Raises
+    ------
+    AssertionError
+        If the batch evaluation differs from the point by point evaluation.
+    """
+    if backend_type == "mattingly":
+        backend = MattinglyBackend.from_engine(engine)
+    else:
+        backend = EngineDeck.from_engine(engine)
+    assert isinstance(backend, EngineBackend)
+
+    altitudes = np.array([0.0, 3000.0, 9000.0, 11000.0])
+    machs = np.array([0.2, 0.5, 0.78, 0.8])
+    ratings = np.array(["MTO", "MCT", "MCLB", "MCRZ"])
+    thrust, sfc = backend.evaluate(altitudes, machs, ratings, -5.0)
+
+    assert thrust.shape == sfc.shape == altitudes.shape
+    for i in range(len(altitudes)):
+        assert (thrust[i], sfc[i]) == pytest.approx(
+            backend.evaluate(altitudes[i], machs[i], ratings[i], -5.0), rel=1e-12
+        )
+
+
+def test_surrogate_backend():
+    """
+    Test that a surrogate backend forwards calls to the user functions.
+
+    Raises
+    ------
+    AssertionError
+        If the surrogate outputs are wrong or the missing maximum thrust is not reported.
+    """
+
+    def evaluate(alt, mach, rating, disa):
+        return 50000.0 * (1.0 - alt / 20000.0), 1.7e-5 + 1e-6 * mach
+
+    backend = SurrogateBackend(evaluate)
+    thrust, sfc = backend.evaluate(10000.0, 0.5, "MCRZ")
+    assert thrust == pytest.approx(25000.0)
+    assert sfc == pytest.approx(1.75e-5)
+
+    with pytest.raises(NotImplementedError):
+        backend.max_thrust(10000.0, 0.5)
+
+    backend = SurrogateBackend(evaluate, lambda alt, mach, disa: 60000.0)
+    assert backend.max_thrust(10000.0, 0.5) == 60000.0
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+from amad.disciplines.powerplant.systems import EnginePerfoMattingly
+from amad.disciplines.powerplant.tools.engineDeck import EngineDeck
+
+
+@pytest.fixture
+def engine():
+    """
+    Create an engine performance system with default settings.
+
+    Returns
+    -------
+    EnginePerfoMattingly
+        The engine performance system.
+    """
+    return EnginePerfoMattingly("engine")
+
+
+@pytest.mark.parametrize("rating", ["MTO", "MCLB", "MCRZ", "IDLE"])
+@pytest.mark.parametrize(
+    "altitude, mach, dISA",
+    [(0.0, 0.2, 0.0), (3048.0, 0.45, 10.0), (9144.0, 0.78, -5.0), (11500.0, 0.8, 0.0)],
+)
+def test_engine_deck_matches_system(engine, rating, altitude, mach, dISA):
+    """
+    Test that the deck lookup matches the `EnginePerfoMattingly` system.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+    rating : str
+        Engine rating.
+    altitude : float
+        Altitude [m].
+    mach : float
+        Mach number [-].
+    dISA : float
+        Delta ISA temperature [K].
+
+    Raises
+    ------
+    AssertionError
+        If the interpolated values differ from the system outputs.
+    """
+    deck = EngineDeck.from_engine(engine)
+
+    engine.z_altitude = altitude
+    engine.mach_current = mach
+    engine.temp_delta_ISA = dISA
+    engine.rating_eng = rating
+    engine.run_once()
+
+    thrust, sfc = deck.evaluate(altitude, mach, rating, dISA)
+    assert thrust == pytest.approx(engine.THR_Mattingly, rel=1e-3)
+    assert sfc == pytest.approx(engine.SFC, rel=1e-4)
+    assert deck.max_thrust(altitude, mach, dISA) == pytest.approx(
+        engine.THR_Mattingly_max, rel=1e-3
+    )
+
+
+def test_engine_deck_arrays(engine):
+    """
+    Test that array lookups match scalar lookups.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+
+    Raises
+    ------
+    AssertionError
+        If the array and scalar lookups differ.
+    """
+    deck = EngineDeck.from_engine(engine)
+    altitudes = np.array([500.0, 6000.0, 10000.0, 14000.0])
+    machs = np.array([0.3, 0.6, 0.78, 0.95])
+    ratings = np.array(["MTO", "MCLB", "MCRZ", "IDLE"])
+
+    thrust, sfc = deck.evaluate(altitudes, machs, ratings, 5.0)
+    expected = [
+        deck.evaluate(a, m, r, 5.0) for a, m, r in zip(altitudes, machs, ratings)
+    ]
+
+    assert thrust == pytest.approx([t for t, _ in expected], rel=1e-12)
+    assert sfc == pytest.approx([s for _, s in expected], rel=1e-12)
+    assert deck.max_thrust(altitudes, machs, 5.0) == pytest.approx(
+        [deck.max_thrust(a, m, 5.0) for a, m in zip(altitudes, machs)], rel=1e-12
+    )
+
+
+def test_engine_deck_cache(engine, tmp_path):
+    """
+    Test the deck cache and its invalidation on engine setting changes.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+    tmp_path : pathlib.Path
+        Temporary cache directory.
+
+    Raises
+    ------
+    AssertionError
+        If a stale deck is returned or the deck file is not reused.
+    """
+    deck = EngineDeck.from_engine(engine, cache_dir=str(tmp_path))
+    assert EngineDeck.from_engine(engine) is deck
+    assert (tmp_path / f"engine_deck_{deck.key}.npz").exists()
+    assert deck.is_valid_for(engine)
+
+    engine.thrust_eng = 100000.0
+    assert not deck.is_valid_for(engine)
+    resized = EngineDeck.from_engine(engine, cache_dir=str(tmp_path))
+    assert resized.key != deck.key
+    assert resized.evaluate(0.0, 0.0, "MTO")[0] == pytest.approx(
+        deck.evaluate(0.0, 0.0, "MTO")[0] * 100000.0 / 121000.0
+    )
+
+    engine.thrust_eng = 121000.0
+    engine.sfc_coeffs["k1"] *= 1.1
+    assert not deck.is_valid_for(engine)
+
+
+def test_engine_deck_save_load(engine, tmp_path):
+    """
+    Test that a saved deck is restored identically.
+
+    Parameters
+    ----------
+    engine : EnginePerfoMattingly
+        Engine fixture.
+    tmp_path : pathlib.Path
+        Temporary directory.
+
+    Raises
+    ------
+    AssertionError
+        If the loaded deck differs from the saved one.
+    """
+    deck = EngineDeck.from_engine(engine)
+    filename = str(tmp_path / "deck.npz")
+    deck.save(filename)
+    loaded = EngineDeck.load(filename)
+
+    assert loaded.key == deck.key
+    assert loaded.ratings == deck.ratings
+    for name in ("thrust", "sfc", "thrust_max"):
+        assert getattr(loaded, name).dtype == getattr(deck, name).dtype
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(deck, name))
+    assert loaded.evaluate(7000.0, 0.6, "MCLB") == deck.evaluate(7000.0, 0.6, "MCLB")
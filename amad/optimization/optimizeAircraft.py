@@ -6,6 +6,7 @@ from cosapp.drivers import Optimizer, NonLinearSolver
 
 # from cosapp.recorders import DataFrameRecorder
 from amad.disciplines.performance.systems import CruiseFuel
+from amad.disciplines.performance.systems.missionFuel import MissionFuel, PHASE_OUTPUTS
 from amad.disciplines.flight_dynamics.systems import TakeOffLift
 from amad.disciplines.mass.systems import AircraftMass
 from amad.disciplines.design.systems import GenerateAeroGeom
@@ -50,12 +51,23 @@ class OptimizeAircraftMass(System):
     m_fuel_cruise : float
         The fuel mass used during cruise.
     """
-    def setup(self):
+
+    def setup(self, fuel_surrogate=None, geometry_features=None):
         """
         Initialize and set up the aircraft model.
 
         This function sets up the aircraft model by adding child models and connecting them with input and output variables. It also adds inward and unknown variables, and defines an equation.
 
+        Parameters
+        ----------
+        fuel_surrogate : MissionFuelSurrogate, optional
+            If given, the fuel is predicted by a `MissionFuel` system with this surrogate of the mission simulation,
+            whose climb and descent fuel are connected to the mass model, instead of a `CruiseFuel` system with
+            constant climb and descent fuel inwards. The surrogate is fitted and extended between runs: run the
+            system with `run_with_mission_fuel`. Defaults to None.
+        geometry_features : dict, optional
+            Functions of the aircraft geometry, by surrogate feature name (see `MissionFuel`). Defaults to None.
+
         Returns
         -------
         None
@@ -64,13 +76,6 @@ class OptimizeAircraftMass(System):
         ------
         None
         """
-        model_list = [
-            GenerateAeroGeom("ac_geom"),
-            AircraftMass("mass"),
-            CruiseFuel("cruise_fuel", asb_aircraft_geometry=airplane_geom()),
-            TakeOffLift("to_lift", asb_aircraft_geometry=airplane_geom()),
-        ]
-
         exceptions = [
             "m_fuel_cruise",
             "m_fuel_cruise_out",
@@ -78,6 +83,27 @@ class OptimizeAircraftMass(System):
             "asb_aircraft_geometry_out",
         ]
 
+        if fuel_surrogate is None:
+            model_list = [
+                GenerateAeroGeom("ac_geom"),
+                AircraftMass("mass"),
+                CruiseFuel("cruise_fuel", asb_aircraft_geometry=airplane_geom()),
+                TakeOffLift("to_lift", asb_aircraft_geometry=airplane_geom()),
+            ]
+        else:
+            # The mission fuel is computed before the mass model, which takes its climb and descent fuel
+            model_list = [
+                GenerateAeroGeom("ac_geom"),
+                MissionFuel(
+                    "cruise_fuel",
+                    surrogate=fuel_surrogate,
+                    geometry_features=geometry_features,
+                ),
+                AircraftMass("mass"),
+                TakeOffLift("to_lift", asb_aircraft_geometry=airplane_geom()),
+            ]
+            exceptions.extend(PHASE_OUTPUTS)
+
         for model in model_list:
             self.add_child(
                 model,
@@ -89,6 +115,8 @@ class OptimizeAircraftMass(System):
         self.connect(self.ac_geom.geom_out, self.cruise_fuel.geom_in)
         self.connect(self.ac_geom.geom_out, self.to_lift.geom_in)
         self.connect(self.ac_geom, self.mass, {"x_fuse_out": "x_fuse"})
+        if fuel_surrogate is not None:
+            self.connect(self.cruise_fuel, self.mass, list(PHASE_OUTPUTS))
 
         self.add_inward("sweep_outer")
         self.add_inward("span_outer")
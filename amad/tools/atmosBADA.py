@@ -1,4 +1,5 @@
 import math
+import numpy as np
 
 
 class AtmosphereAMAD:
@@ -116,6 +117,173 @@ class AtmosphereAMAD:
         density = p / (self.R * T)
         return density
 
+    def airtemp_k_array(self, alt, dISA=None):
+        """
+        ISA air temperature in K for arrays of altitude (and delta ISA).
+
+        Parameters
+        ----------
+        alt : array_like
+            Altitude [m].
+        dISA : array_like, optional
+            Delta ISA temp [K], broadcast against `alt`. Defaults to the object offset.
+
+        Returns
+        -------
+        numpy.ndarray
+            Temperature [K].
+        """
+        alt = np.asarray(alt, dtype=float)
+        dISA = self.dISA if dISA is None else np.asarray(dISA, dtype=float)
+        T_ISA = np.where(
+            alt < self.H_trop, self.T0 + self.beta_t * alt, self.T_ISA_trop
+        )
+        return T_ISA + dISA
+
+    def airpress_pa_array(self, alt):
+        """
+        ISA air pressure in Pa for an array of altitudes.
+
+        The pressure only depends on the pressure altitude, not on delta ISA.
+
+        Parameters
+        ----------
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Pressure [Pa].
+        """
+        alt = np.asarray(alt, dtype=float)
+        T_ISA = np.where(
+            alt < self.H_trop, self.T0 + self.beta_t * alt, self.T_ISA_trop
+        )
+        p_low = self.p0 * (T_ISA / self.T0) ** -(self.g0 / (self.beta_t * self.R))
+        p_high = self.p_trop * np.exp(
+            -self.g0 / (self.R * self.T_ISA_trop) * (alt - self.H_trop)
+        )
+        return np.where(alt < self.H_trop, p_low, p_high)
+
+    def airdens_kgpm3_array(self, alt, dISA=None):
+        """
+        ISA air density [kg/m**3] for arrays of altitude (and delta ISA).
+
+        Parameters
+        ----------
+        alt : array_like
+            Altitude [m].
+        dISA : array_like, optional
+            Delta ISA temp [K], broadcast against `alt`. Defaults to the object offset.
+
+        Returns
+        -------
+        numpy.ndarray
+            Density [kg/m**3].
+        """
+        return self.airpress_pa_array(alt) / (self.R * self.airtemp_k_array(alt, dISA))
+
+    def vsound_mps_array(self, alt):
+        """
+        Speed of sound [m/s] for an array of altitudes.
+
+        Parameters
+        ----------
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Speed of sound [m/s].
+        """
+        return np.sqrt(self.kappa * self.R * self.airtemp_k_array(alt))
+
+    def tas2mach_array(self, tas, alt):
+        """
+        Speed conversion TAS [m/s] to Mach [-] for arrays of speed and altitude.
+
+        Parameters
+        ----------
+        tas : array_like
+            Speed TAS [m/s].
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Mach speed [-].
+        """
+        return np.asarray(tas, dtype=float) / self.vsound_mps_array(alt)
+
+    def mach2tas_array(self, M, alt):
+        """
+        Speed conversion Mach [-] to TAS [m/s] for arrays of speed and altitude.
+
+        Parameters
+        ----------
+        M : array_like
+            Mach speed [-].
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Speed TAS [m/s].
+        """
+        return np.asarray(M, dtype=float) * self.vsound_mps_array(alt)
+
+    def cas2tas_array(self, cas, alt):
+        """
+        Speed conversion CAS to TAS for arrays of speed and altitude.
+
+        Parameters
+        ----------
+        cas : array_like
+            Speed CAS [m/s].
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Speed TAS [m/s].
+        """
+        cas = np.asarray(cas, dtype=float)
+        p = self.airpress_pa_array(alt)
+        rho = p / (self.R * self.airtemp_k_array(alt))
+        mu = (self.kappa - 1.0) / self.kappa
+        part1 = (1.0 + mu / 2.0 * self.rho0 / self.p0 * cas**2.0) ** (1.0 / mu)
+        part2 = (1.0 + self.p0 / p * (part1 - 1.0)) ** mu - 1.0
+        return np.sqrt(2.0 / mu * p / rho * part2)
+
+    def tas2cas_array(self, tas, alt):
+        """
+        Speed conversion TAS to CAS for arrays of speed and altitude.
+
+        Parameters
+        ----------
+        tas : array_like
+            Speed TAS [m/s].
+        alt : array_like
+            Altitude [m].
+
+        Returns
+        -------
+        numpy.ndarray
+            Speed CAS [m/s].
+        """
+        tas = np.asarray(tas, dtype=float)
+        p = self.airpress_pa_array(alt)
+        rho = p / (self.R * self.airtemp_k_array(alt))
+        mu = (self.kappa - 1.0) / self.kappa
+        part1 = (1.0 + mu / 2.0 * rho / p * tas**2.0) ** (1.0 / mu)
+        part2 = (1.0 + p / self.p0 * (part1 - 1.0)) ** mu - 1.0
+        return np.sqrt(2.0 / mu * self.p0 / self.rho0 * part2)
+
     def vsound_mps(self, alt):
         """
         Speed of Sound [m/s] as function pf altitude
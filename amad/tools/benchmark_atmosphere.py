@@ -0,0 +1,77 @@
+import time
+import numpy
+from ambiance import Atmosphere
+from amad.tools.atmosBADA import AtmosphereAMAD
+
+# One descent from cruise level to the final approach altitude, one point per RK step.
+altitudes = list(numpy.linspace(10668.0, 457.2, 2000))
+speedsclass = AtmosphereAMAD()
+
+
+def benchmark_density_ambiance():
+    """
+    Benchmark the per-step air density evaluation with `ambiance.Atmosphere`.
+
+    This reproduces the former `Descent_segment.compute` path, where a new
+    `Atmosphere` object was built at every step.
+
+    Returns
+    -------
+    float
+        The total execution time of the benchmark [s].
+    """
+    start_time = time.perf_counter()
+
+    for alt in altitudes:
+        rho = Atmosphere(alt).density  # noqa: F841
+
+    end_time = time.perf_counter()
+
+    return end_time - start_time
+
+
+def benchmark_density_amad():
+    """
+    Benchmark the per-step air density evaluation with the shared `AtmosphereAMAD` instance.
+
+    This is the path used by all the performance segments.
+
+    Returns
+    -------
+    float
+        The total execution time of the benchmark [s].
+    """
+    start_time = time.perf_counter()
+
+    for alt in altitudes:
+        rho = speedsclass.airdens_kgpm3(alt)  # noqa: F841
+
+    end_time = time.perf_counter()
+
+    return end_time - start_time
+
+
+def max_density_deviation():
+    """
+    Maximum relative deviation between the `ambiance` and `AtmosphereAMAD` densities along the descent.
+
+    Returns
+    -------
+    float
+        Maximum relative density deviation [-].
+    """
+    rho_ambiance = numpy.array([float(Atmosphere(alt).density) for alt in altitudes])
+    rho_amad = numpy.array([speedsclass.airdens_kgpm3(alt) for alt in altitudes])
+    return numpy.max(numpy.abs(rho_ambiance / rho_amad - 1.0))
+
+
+if __name__ == "__main__":
+    time_ambiance = benchmark_density_ambiance()
+    time_amad = benchmark_density_amad()
+    n_steps = len(altitudes)
+
+    print(
+        f"time ambiance:{1e6 * time_ambiance / n_steps:.1f}us/step time AMAD:{1e6 * time_amad / n_steps:.1f}us/step"
+    )
+    print(f"AMAD takes {100 * time_amad / time_ambiance:.1f}% of the time")
+    print(f"max density deviation between models: {100 * max_density_deviation():.3f}%")
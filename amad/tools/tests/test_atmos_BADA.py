@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from amad.tools.atmosBADA import AtmosphereAMAD
 
@@ -125,3 +126,31 @@ def test_xoveralt(disa, Mach, casxover, xoveralt_ref):
     atmos.offset_deg = disa
     xovertalt = atmos.crossoveralt(cas=casxover, mach=Mach) / 0.3048  # [m2ft]
     assert xovertalt == pytest.approx(xoveralt_ref, rel=1e-4)
+
+
+@pytest.mark.parametrize("disa", [0.0, 10.0])
+def test_speed_conversions_arrays(disa):
+    """
+    Test that the array speed conversions match the scalar ones.
+
+    Parameters
+    ----------
+    disa : float
+        The value of the DISA (offset_deg) parameter.
+
+    Raises
+    ------
+    AssertionError
+        If an array conversion differs from the scalar conversion.
+    """
+    atmos = AtmosphereAMAD(offset_deg=disa)
+    alts = np.array([0.0, 3048.0, 9753.6, 11000.0, 12500.0])
+    speeds = np.array([80.0, 150.0, 230.0, 240.0, 250.0])
+
+    for name in ["tas2mach", "cas2tas", "tas2cas"]:
+        expected = [getattr(atmos, name)(v, h) for v, h in zip(speeds, alts)]
+        assert getattr(atmos, name + "_array")(speeds, alts) == pytest.approx(
+            expected, rel=1e-12
+        )
+    expected = [atmos.mach2tas(0.78, h) for h in alts]
+    assert atmos.mach2tas_array(0.78, alts) == pytest.approx(expected, rel=1e-12)
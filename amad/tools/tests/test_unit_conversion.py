@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+import pytest
+import amad.tools.unit_conversion as uc
+
+test_cases_registry = [
+    (uc.k2degc, "K", "degC"),
+    (uc.degc2k, "degC", "K"),
+    (uc.lb2kg, "lb", "kg"),
+    (uc.kg2lb, "kg", "lb"),
+    (uc.sqm2sqft, "m**2", "ft**2"),
+    (uc.sqft2sqm, "ft**2", "m**2"),
+    (uc.m2ft, "m", "ft"),
+    (uc.ft2m, "ft", "m"),
+    (uc.m2in, "m", "inch"),
+    (uc.in2m, "inch", "m"),
+    (uc.m2nm, "m", "NM"),
+    (uc.nm2m, "NM", "m"),
+    (uc.ms2kt, "m/s", "kt"),
+    (uc.kt2ms, "kt", "m/s"),
+    (uc.ftm2ms, "ft/min", "m/s"),
+    (uc.ms2ftm, "m/s", "ft/min"),
+    (uc.n2lb, "N", "lbf"),
+    (uc.lb2n, "lbf", "N"),
+    (uc.pa2psi, "Pa", "psi"),
+    (uc.psi2pa, "psi", "Pa"),
+]
+
+
+@pytest.mark.parametrize("function, from_unit, to_unit", test_cases_registry)
+def test_registry_matches_functions(function, from_unit, to_unit):
+    """
+    Test that the conversion registry agrees with the named conversion functions.
+
+    Parameters
+    ----------
+    function : function
+        Named conversion function.
+    from_unit : str
+        Source unit.
+    to_unit : str
+        Target unit.
+
+    Raises
+    ------
+    AssertionError
+        If the registry and the function give different results.
+    """
+    values = np.array([-10.0, 0.0, 1.0, 250.0, 10668.0])
+    assert uc.convert(values, from_unit, to_unit) == pytest.approx(
+        function(values), rel=1e-12
+    )
+
+
+def test_scalar_conversion_type():
+    """
+    Test that scalar conversions keep returning plain floats.
+
+    Raises
+    ------
+    AssertionError
+        If the returned type or value is not as expected.
+    """
+    assert type(uc.m2ft(1.0)) is float
+    assert uc.m2ft(1.0) == 3.28084
+    assert uc.kt2ms(1.94384) == 1.0
+    assert uc.sqft2sqm(1.0) == 0.092903
+
+
+def test_inplace_conversion():
+    """
+    Test the in-place conversion through the `out` parameter.
+
+    Raises
+    ------
+    AssertionError
+        If the result is not written into the given array.
+    """
+    altitude = np.array([0.0, 1000.0, 10000.0])
+    result = uc.m2ft(altitude, out=altitude)
+    assert result is altitude
+    assert altitude == pytest.approx([0.0, 3280.84, 32808.4])
+
+    temperature = np.array([288.15, 216.65])
+    uc.convert(temperature, "K", "degC", out=temperature)
+    assert temperature == pytest.approx([15.0, -56.5])
+
+
+def test_unknown_conversion():
+    """
+    Test that an unregistered conversion raises a KeyError.
+
+    Raises
+    ------
+    AssertionError
+        If no KeyError is raised.
+    """
+    with pytest.raises(KeyError):
+        uc.convert(1.0, "m", "kg")
+
+
+def test_convert_columns_dataframe():
+    """
+    Test the conversion of DataFrame columns without copying float columns.
+
+    Raises
+    ------
+    AssertionError
+        If the columns are not converted or the float column was copied.
+    """
+    df = pd.DataFrame(
+        {"Altitude": [0.0, 1000.0], "Distance": [1852.0, 3704.0], "Step": [1, 2]}
+    )
+    altitude = df["Altitude"].to_numpy()
+
+    result = uc.convert_columns(
+        df, {"Altitude": ("m", "ft"), "Distance": ("m", "NM"), "Step": ("m", "ft")}
+    )
+
+    assert result is df
+    assert df["Altitude"].to_list() == pytest.approx([0.0, 3280.84])
+    assert df["Distance"].to_list() == pytest.approx([1.0, 2.0])
+    assert df["Step"].to_list() == pytest.approx([3.28084, 6.56168])
+    if altitude.flags.writeable:
+        assert np.shares_memory(altitude, df["Altitude"].to_numpy())
+
+
+def test_convert_columns_structured_array():
+    """
+    Test the in-place conversion of structured array fields.
+
+    Raises
+    ------
+    AssertionError
+        If the fields are not converted in place.
+    """
+    data = np.zeros(2, dtype=[("TAS", "f8"), ("RC", "f8")])
+    data["TAS"] = [100.0, 200.0]
+    data["RC"] = [5.08, -5.08]
+
+    uc.convert_columns(data, {"TAS": ("m/s", "kt"), "RC": ("m/s", "ft/min")})
+
+    assert data["TAS"] == pytest.approx([194.384, 388.768])
+    assert data["RC"] == pytest.approx([1000.0, -1000.0])
@@ -1,351 +1,641 @@
-from typing import Union
+from typing import Optional, Union
+import numpy as np
+
+ArrayLike = Union[float, int, np.ndarray]
+
+# conversion constants
+_K_DEGC_OFFSET = 273.15
+_LB_KG = 0.453592
+_SQM_SQFT = 10.7639
+_SQFT_SQM = 0.092903
+_M_FT = 3.28084
+_M_IN = 12 * 3.28084
+_NM_M = 1852
+_MS_KT = 1.94384
+_FTM_MS = 0.00508
+_N_LBF = 0.2248089431
+_PSI_PA = 6894.76
+
+
+def _multiply(value: ArrayLike, constant: float, out: Optional[np.ndarray] = None):
+    """
+    Multiply a value by a conversion constant, optionally in place.
+
+    Parameters
+    ----------
+    value : float or numpy.ndarray
+        Value(s) to convert.
+    constant : float
+        Conversion constant.
+    out : numpy.ndarray, optional
+        Array receiving the result. Defaults to None.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Converted value(s), `out` if given.
+    """
+    if out is None:
+        return value * constant
+    return np.multiply(value, constant, out=out)
+
+
+def _divide(value: ArrayLike, constant: float, out: Optional[np.ndarray] = None):
+    """
+    Divide a value by a conversion constant, optionally in place.
+
+    Parameters
+    ----------
+    value : float or numpy.ndarray
+        Value(s) to convert.
+    constant : float
+        Conversion constant.
+    out : numpy.ndarray, optional
+        Array receiving the result. Defaults to None.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Converted value(s), `out` if given.
+    """
+    if out is None:
+        return value / constant
+    return np.divide(value, constant, out=out)
+
+
+def _add(value: ArrayLike, constant: float, out: Optional[np.ndarray] = None):
+    """
+    Add a conversion offset to a value, optionally in place.
+
+    Parameters
+    ----------
+    value : float or numpy.ndarray
+        Value(s) to convert.
+    constant : float
+        Conversion offset.
+    out : numpy.ndarray, optional
+        Array receiving the result. Defaults to None.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Converted value(s), `out` if given.
+    """
+    if out is None:
+        return value + constant
+    return np.add(value, constant, out=out)
+
+
+def _subtract(value: ArrayLike, constant: float, out: Optional[np.ndarray] = None):
+    """
+    Subtract a conversion offset from a value, optionally in place.
+
+    Parameters
+    ----------
+    value : float or numpy.ndarray
+        Value(s) to convert.
+    constant : float
+        Conversion offset.
+    out : numpy.ndarray, optional
+        Array receiving the result. Defaults to None.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Converted value(s), `out` if given.
+    """
+    if out is None:
+        return value - constant
+    return np.subtract(value, constant, out=out)
 
 
 # temperature conversion
-def k2degc(temperature: Union[float, int]):
+def k2degc(temperature: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Temperature conversion Kelvin to DEG C
 
     Parameters
     ----------
-    temperature : Union[float, int]
+    temperature : float or numpy.ndarray
         temperature [K]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Temperature [DEG C]
     """
-    return temperature - 273.15
+    return _subtract(temperature, _K_DEGC_OFFSET, out)
 
 
-def degc2k(temperature: Union[float, int]):
+def degc2k(temperature: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Temperature conversion DEG C to Kelvin
 
     Parameters
     ----------
-    temperature : Union[float, int]
+    temperature : float or numpy.ndarray
         temperature [DEG C]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         temperature [K]
     """
-    return temperature + 273.15
+    return _add(temperature, _K_DEGC_OFFSET, out)
 
 
 # mass conversions
-def lb2kg(mass: Union[float, int]):
+def lb2kg(mass: ArrayLike, out: Optional[np.ndarray] = None):
     """
     mass conversion from lbs to kg
 
     Parameters
     ----------
-    mass : Union[float, int]
+    mass : float or numpy.ndarray
         mass in lbs
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         mass in kg
     """
-    return mass * 0.453592
+    return _multiply(mass, _LB_KG, out)
 
 
-def kg2lb(mass: Union[float, int]):
+def kg2lb(mass: ArrayLike, out: Optional[np.ndarray] = None):
     """
     mass conversion from kg to lbs
 
     Parameters
     ----------
-    mass : Union[float, int]
+    mass : float or numpy.ndarray
         The mass in kilograms.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The mass in pounds.
     """
-    return mass / 0.453592
+    return _divide(mass, _LB_KG, out)
 
 
 # area conversions
-def sqm2sqft(area: Union[float, int]):
+def sqm2sqft(area: ArrayLike, out: Optional[np.ndarray] = None):
     """
     conversion from square meter to square feet
 
     Parameters
     ----------
-    area : Union[float, int]
+    area : float or numpy.ndarray
         Area in square meters.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Area in square feet.
     """
-    return area * 10.7639
+    return _multiply(area, _SQM_SQFT, out)
 
 
-def sqft2sqm(area: Union[float, int]):
+def sqft2sqm(area: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Conversion from square feet to square meters.
 
     Parameters
     ----------
-    area : Union[float, int]
+    area : float or numpy.ndarray
         The area in square feet.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The area in square meters.
     """
-    return area * 0.092903
+    return _multiply(area, _SQFT_SQM, out)
 
 
 # length conversions
-def m2ft(length: Union[float, int]):
+def m2ft(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Meter to feet conversion.
 
     Parameters
     ----------
-    length : Union[float, int]
+    length : float or numpy.ndarray
         The length in meters.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The length in feet.
     """
-    return length * 3.28084
+    return _multiply(length, _M_FT, out)
 
 
-def ft2m(length: Union[float, int]):
+def ft2m(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     feet to meter conversion
 
     Parameters
     ----------
-    length : float or int
+    length : float or numpy.ndarray
         Length in feet.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Length in meters.
     """
-    return length / 3.28084
+    return _divide(length, _M_FT, out)
 
 
-def m2in(length: Union[float, int]):
+def m2in(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     meter to inch conversion
 
     Parameters
     ----------
-    length : Union[float, int]
+    length : float or numpy.ndarray
         The length in meters.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The length in inches.
     """
-    return length * (12 * 3.28084)
+    return _multiply(length, _M_IN, out)
 
 
-def in2m(length: Union[float, int]):
+def in2m(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     in to meter conversion
 
     Parameters
     ----------
-    length : Union[float, int]
+    length : float or numpy.ndarray
         Length in [in]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Length in [m]
     """
-    return length / (12 * 3.28084)
+    return _divide(length, _M_IN, out)
 
 
-def m2nm(length: Union[float, int]):
+def m2nm(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Meter to Nautical Miles conversion.
 
     Parameters
     ----------
-    length : Union[float, int]
+    length : float or numpy.ndarray
         Length in meters.
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Length in nautical miles.
     """
-    return length / 1852
+    return _divide(length, _NM_M, out)
 
 
-def nm2m(length: Union[float, int]):
+def nm2m(length: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Nautical miles to meter conversion
 
     Parameters
     ----------
-    length : Union[float, int]
+    length : float or numpy.ndarray
         Length in nautical miles [NM].
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Length in meters [m].
     """
-    return length * 1852
+    return _multiply(length, _NM_M, out)
 
 
 # speed conversions
-def ms2kt(speed: Union[float, int]):
+def ms2kt(speed: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Speed conversion from m/s to kt.
 
     Parameters
     ----------
-    speed : Union[float, int]
+    speed : float or numpy.ndarray
         The speed in meters per second [m/s].
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The speed in knots [kt].
     """
-    return speed * 1.94384
+    return _multiply(speed, _MS_KT, out)
 
 
-def kt2ms(speed: Union[float, int]):
+def kt2ms(speed: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Speed conversion from kt to m/s
 
     Parameters
     ----------
-    speed : Union[float, int]
+    speed : float or numpy.ndarray
         Speed in knots [kt]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Speed in meters per second [m/s]
     """
-    return speed / 1.94384
+    return _divide(speed, _MS_KT, out)
 
 
-def ftm2ms(speed: Union[float, int]):
+def ftm2ms(speed: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Speed conversion from ft/min to m/s
 
     Parameters
     ----------
-    speed : Union[float, int]
+    speed : float or numpy.ndarray
         Speed in ft/min
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         Speed in m/s
     """
-    return speed * 0.00508
+    return _multiply(speed, _FTM_MS, out)
 
 
-def ms2ftm(speed: Union[float, int]):
+def ms2ftm(speed: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Speed conversion from m/s to ft/min
 
     Parameters
     ----------
-    speed : Union[float, int]
+    speed : float or numpy.ndarray
         speed [m/s]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         speed [ft/min]
     """
-    return speed / 0.00508
+    return _divide(speed, _FTM_MS, out)
 
 
 # force conversions
-def n2lb(force: Union[float, int]):
+def n2lb(force: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Force conversion from Newton to lbf
 
     Parameters
     ----------
-    force : Union[float, int]
+    force : float or numpy.ndarray
         force [N]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         force [lbf]
     """
-    return force * 0.2248089431
+    return _multiply(force, _N_LBF, out)
 
 
-def lb2n(force: Union[float, int]):
+def lb2n(force: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Force conversion from lbf to N.
 
     Parameters
     ----------
-    force : Union[float, int]
+    force : float or numpy.ndarray
         The force in pounds force (lbf).
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The force in newtons (N).
     """
-    return force / 0.2248089431
+    return _divide(force, _N_LBF, out)
 
 
 # pressure conversions
-def pa2psi(pressure: Union[float, int]):
+def pa2psi(pressure: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Pressure conversion from Pascal to PSI
 
     Parameters
     ----------
-    pressure : Union[float, int]
+    pressure : float or numpy.ndarray
         pressure [Pa]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         pressure [psi]
     """
-    return pressure / 6894.76
+    return _divide(pressure, _PSI_PA, out)
 
 
-def psi2pa(pressure: Union[float, int]):
+def psi2pa(pressure: ArrayLike, out: Optional[np.ndarray] = None):
     """
     Pressure conversion from PSI to Pascal
 
     Parameters
     ----------
-    pressure : Union[float, int]
+    pressure : float or numpy.ndarray
         pressure [psi]
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion. Defaults to None.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         pressure [Pa]
     """
-    return pressure * 6894.76
+    return _multiply(pressure, _PSI_PA, out)
+
+
+# conversion registry
+# Maps (from_unit, to_unit) to (factor, offset) so that to = from * factor + offset.
+# Unit names follow the CoSApp unit strings used in the AMAD systems.
+CONVERSION_FACTORS = {}
+
+
+def register_conversion(
+    from_unit: str, to_unit: str, factor: float, offset: float = 0.0
+):
+    """
+    Register a linear conversion and its inverse in `CONVERSION_FACTORS`.
+
+    Parameters
+    ----------
+    from_unit : str
+        Source unit.
+    to_unit : str
+        Target unit.
+    factor : float
+        Multiplicative factor from source to target unit.
+    offset : float, optional
+        Additive offset applied after the factor. Defaults to 0.
+
+    Returns
+    -------
+    None
+    """
+    CONVERSION_FACTORS[(from_unit, to_unit)] = (factor, offset)
+    CONVERSION_FACTORS[(to_unit, from_unit)] = (1.0 / factor, -offset / factor)
+
+
+register_conversion("K", "degC", 1.0, -_K_DEGC_OFFSET)
+register_conversion("lb", "kg", _LB_KG)
+register_conversion("ft**2", "m**2", _SQFT_SQM)
+# sqm2sqft keeps its own rounded factor rather than the inverse of _SQFT_SQM
+CONVERSION_FACTORS[("m**2", "ft**2")] = (_SQM_SQFT, 0.0)
+register_conversion("m", "ft", _M_FT)
+register_conversion("m", "inch", _M_IN)
+register_conversion("NM", "m", _NM_M)
+register_conversion("m/s", "kt", _MS_KT)
+register_conversion("ft/min", "m/s", _FTM_MS)
+register_conversion("N", "lbf", _N_LBF)
+register_conversion("psi", "Pa", _PSI_PA)
+
+
+def convert(
+    value: ArrayLike, from_unit: str, to_unit: str, out: Optional[np.ndarray] = None
+):
+    """
+    Convert value(s) between two registered units in one vectorised pass.
+
+    Parameters
+    ----------
+    value : float or array_like
+        Value(s) in `from_unit`.
+    from_unit : str
+        Source unit (e.g. 'm').
+    to_unit : str
+        Target unit (e.g. 'ft').
+    out : numpy.ndarray, optional
+        Array receiving the result for an in-place conversion; may be `value` itself. Defaults to None.
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Value(s) in `to_unit`, `out` if given.
+
+    Raises
+    ------
+    KeyError
+        If the conversion is not registered in `CONVERSION_FACTORS`.
+    """
+    if from_unit == to_unit:
+        if out is None:
+            return value
+        out[...] = value
+        return out
+
+    try:
+        factor, offset = CONVERSION_FACTORS[(from_unit, to_unit)]
+    except KeyError:
+        raise KeyError(f"No conversion registered from '{from_unit}' to '{to_unit}'")
+
+    if out is None:
+        if not np.isscalar(value):
+            value = np.asarray(value)
+        result = value * factor
+        return result + offset if offset else result
+
+    np.multiply(value, factor, out=out)
+    if offset:
+        np.add(out, offset, out=out)
+    return out
+
+
+def convert_columns(data, conversions: dict):
+    """
+    Convert whole columns of a table in place, one vectorised pass per column.
+
+    Supported tables are pandas DataFrames, numpy structured arrays and
+    dictionaries of numpy arrays (e.g. recorder buffers). Floating point
+    columns are overwritten in place without copying; other columns are
+    replaced by their converted values.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame, numpy.ndarray or dict
+        Table holding the columns to convert.
+    conversions : dict
+        Mapping `{column: (from_unit, to_unit)}`.
+
+    Returns
+    -------
+    pandas.DataFrame, numpy.ndarray or dict
+        The converted `data` object.
+
+    Raises
+    ------
+    KeyError
+        If a column or a conversion is not found.
+    """
+    for column, (from_unit, to_unit) in conversions.items():
+        if isinstance(data, np.ndarray):
+            # fields of a structured array are views on the array buffer
+            values = data[column]
+        elif isinstance(data, dict):
+            values = np.asarray(data[column])
+        else:
+            values = data[column].to_numpy()
+
+        if values.flags.writeable and np.issubdtype(values.dtype, np.floating):
+            convert(values, from_unit, to_unit, out=values)
+            if isinstance(data, dict):
+                data[column] = values
+        elif isinstance(data, np.ndarray):
+            data[column] = convert(values, from_unit, to_unit)
+        else:
+            data[column] = convert(values.astype(float), from_unit, to_unit)
+
+    return data
 
 
 if __name__ == "__main__":